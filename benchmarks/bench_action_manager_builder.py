@@ -0,0 +1,141 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Benchmarks for building menu bars from action sets.
+
+The menu bar is built from 'ACTIONS' synthetic actions spread over 'MENUS'
+menus with 'GROUPS' groups each. Most of the actions are placed 'before' or
+'after' other actions, in chains of 'CHAIN' actions that are contributed in
+the opposite order to the one that they can be placed in (as happens when
+plugins contribute actions relative to each other).
+
+The size of the menu bar is fixed (i.e. it doesn't depend on the size of the
+synthetic application).
+
+The menu bar is either built from scratch, or (as for every window after the
+first) created from a compiled tree shared through a tree cache.
+
+"""
+
+
+# Enthought library imports.
+from envisage.ui.action.api import AbstractActionManagerBuilder
+from envisage.ui.action.api import Action, ActionManagerTreeCache
+from envisage.ui.action.api import ActionSet, Menu
+from pyface.action.api import Action as ActionImplementation
+from pyface.action.api import Group as GroupImplementation
+from pyface.action.api import MenuBarManager, MenuManager
+
+# Local imports.
+from runner import Benchmark
+
+
+#: The number of actions in the menu bar.
+ACTIONS = 2000
+
+#: The number of menus in the menu bar.
+MENUS = 20
+
+#: The number of groups in each menu.
+GROUPS = 5
+
+#: The number of actions in each chain of 'before'/'after' constraints.
+CHAIN = 10
+
+
+class BenchmarkActionManagerBuilder(AbstractActionManagerBuilder):
+    """ A builder that creates plain Pyface actions, groups and menus. """
+
+    def _create_action(self, definition):
+        return ActionImplementation(id=definition.class_name)
+
+    def _create_group(self, definition):
+        return GroupImplementation(id=definition.id)
+
+    def _create_menu_manager(self, definition):
+        menu_manager = MenuManager(id=definition.id, name=definition.name)
+        for group in definition.groups:
+            menu_manager.insert(-1, GroupImplementation(id=group.id))
+
+        return menu_manager
+
+    def _create_menu_bar_manager(self):
+        return MenuBarManager(id="MenuBar")
+
+
+def make_action_sets():
+    """ Create the action sets for the synthetic menu bar. """
+
+    menus = [
+        Menu(
+            name="Menu %d" % index,
+            id="menu_%d" % index,
+            path="MenuBar",
+            groups=["group_%d" % group for group in range(GROUPS)],
+        )
+        for index in range(MENUS)
+    ]
+
+    actions = []
+    for index in range(ACTIONS):
+        position = index % CHAIN
+        traits = {
+            "class_name": "action_%d" % index,
+            "path": "MenuBar/menu_%d" % (index // CHAIN % MENUS),
+            "group": "group_%d" % (index // (CHAIN * MENUS) % GROUPS),
+        }
+
+        # Each action (except the last in its chain) is placed relative to
+        # the *next* action, so a chain can only be placed back to front.
+        if position < CHAIN - 1:
+            if position % 2 == 0:
+                traits["after"] = "action_%d" % (index + 1)
+
+            else:
+                traits["before"] = "action_%d" % (index + 1)
+
+        actions.append(Action(**traits))
+
+    return [ActionSet(menus=menus, actions=actions)]
+
+
+def _setup_build_menu_bar(spec):
+    return BenchmarkActionManagerBuilder(action_sets=make_action_sets())
+
+
+def _setup_create_menu_bar_from_tree(spec):
+    tree_cache = ActionManagerTreeCache()
+
+    # Build the menu bar once (e.g. for the first window) to fill the cache.
+    BenchmarkActionManagerBuilder(
+        action_sets=make_action_sets(), tree_cache=tree_cache
+    ).create_menu_bar_manager("MenuBar")
+
+    return BenchmarkActionManagerBuilder(
+        action_sets=make_action_sets(), tree_cache=tree_cache
+    )
+
+
+def _run_build_menu_bar(builder):
+    return builder.create_menu_bar_manager("MenuBar")
+
+
+BENCHMARKS = [
+    Benchmark(
+        name="build_menu_bar",
+        setup=_setup_build_menu_bar,
+        run=_run_build_menu_bar,
+        teardown=None,
+    ),
+    Benchmark(
+        name="create_menu_bar_from_tree",
+        setup=_setup_create_menu_bar_from_tree,
+        run=_run_build_menu_bar,
+        teardown=None,
+    ),
+]
@@ -0,0 +1,73 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Benchmarks for running scripts from the text editor in the Python shell.
+
+The script has 'FUNCTIONS' functions in it, and is run again without being
+changed (as happens in an edit-run loop when only one cell is changed). The
+size of the script is fixed (i.e. it doesn't depend on the size of the
+synthetic application).
+
+"""
+
+
+# Enthought library imports.
+from envisage.plugins.python_shell.api import CodeCache
+
+# Local imports.
+from runner import Benchmark
+
+
+#: The number of functions in the script.
+FUNCTIONS = 1000
+
+
+def _make_script():
+    return "".join(
+        "def function_%d(x):\n    return x * %d + 1\n\n" % (index, index)
+        for index in range(FUNCTIONS)
+    )
+
+
+def _setup_compile_script(spec):
+    return _make_script()
+
+
+def _run_compile_script(source):
+    return compile(source, "script.py", "exec")
+
+
+def _setup_compile_cached_script(spec):
+    source = _make_script()
+
+    code_cache = CodeCache()
+    code_cache.compile(source, "script.py")
+
+    return code_cache, source
+
+
+def _run_compile_cached_script(state):
+    code_cache, source = state
+
+    return code_cache.compile(source, "script.py")
+
+
+BENCHMARKS = [
+    Benchmark(
+        name="compile_script",
+        setup=_setup_compile_script,
+        run=_run_compile_script,
+        teardown=None,
+    ),
+    Benchmark(
+        name="compile_cached_script",
+        setup=_setup_compile_cached_script,
+        run=_run_compile_cached_script,
+        teardown=None,
+    ),
+]
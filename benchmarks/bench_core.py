@@ -0,0 +1,282 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Benchmarks for the Envisage core (applications, extensions, services).
+
+Each benchmark is a 'Benchmark' whose 'setup' takes a 'SyntheticSpec' and
+returns some state, whose 'run' is timed with that state and whose
+'teardown' cleans up afterwards. Only 'run' is timed.
+
+"""
+
+
+# Enthought library imports.
+from envisage.api import ClassLoadHook, ClassLoadHookDispatcher
+from envisage.api import ExtensionRegistry, ExtensionPoint, Plugin
+from envisage.api import bind_extension_point
+from traits.api import HasTraits, List
+
+# Local imports.
+from runner import Benchmark
+from synthetic import (
+    SyntheticService,
+    extension_point_id,
+    make_application,
+    make_plugin_classes,
+)
+
+
+class BoundObject(HasTraits):
+    """ An object with a trait that is bound to an extension point. """
+
+    values = List
+
+
+class ExtraPlugin(Plugin):
+    """ A plugin that is added and removed while the application runs. """
+
+    id = "benchmarks.extra"
+    name = "Extra"
+
+
+def _make_extra_plugin(spec):
+    """ Create a plugin that contributes to every synthetic extension point.
+    """
+
+    traits = {
+        "contributions_%d" % index: List(
+            [-1, -2, -3], contributes_to=extension_point_id(index)
+        )
+        for index in range(spec.extension_points)
+    }
+    klass = type("ExtraBenchmarkPlugin", (ExtraPlugin,), traits)
+
+    return klass()
+
+
+def _touch_extension_points(application, spec):
+    """ Access every extension point (the registry populates lazily). """
+
+    for index in range(spec.extension_points):
+        application.get_extensions(extension_point_id(index))
+
+
+#### Application lifecycle ####################################################
+
+
+def _setup_application(spec):
+    return make_application(spec, make_plugin_classes(spec))
+
+
+def _setup_started_application(spec):
+    application = _setup_application(spec)
+    application.start()
+
+    return application
+
+
+def _run_start(application):
+    application.start()
+
+
+def _run_stop(application):
+    application.stop()
+
+
+#### Extensions ###############################################################
+
+
+def _setup_extensions(spec):
+    application = _setup_started_application(spec)
+    _touch_extension_points(application, spec)
+
+    return application, spec
+
+
+def _run_get_extensions(state):
+    application, spec = state
+    for index in range(spec.extension_points):
+        application.get_extensions(extension_point_id(index))
+
+
+def _teardown_extensions(state):
+    application, spec = state
+    application.stop()
+
+
+#### Services #################################################################
+
+
+def _run_get_services(state):
+    application, spec = state
+    application.get_services(SyntheticService)
+    application.get_services(SyntheticService, query="priority >= 5")
+    application.get_services(SyntheticService, minimize="priority")
+    application.get_service(SyntheticService, maximize="priority")
+
+
+#### Providers ################################################################
+
+
+def _setup_providers(spec):
+    application, spec = _setup_extensions(spec)
+
+    return application, spec, _make_extra_plugin(spec)
+
+
+def _run_add_remove_provider(state):
+    application, spec, plugin = state
+    application.add_plugin(plugin)
+    application.remove_plugin(plugin)
+
+
+def _teardown_providers(state):
+    application, spec, plugin = state
+    application.stop()
+
+
+#### Bindings #################################################################
+
+# The number of objects bound to each extension point.
+BINDINGS_PER_EXTENSION_POINT = 5
+
+
+def _setup_registry_bindings(spec):
+    application, spec, plugin = _setup_providers(spec)
+
+    objs = []
+    for index in range(spec.extension_points):
+        for _ in range(BINDINGS_PER_EXTENSION_POINT):
+            obj = BoundObject()
+            bind_extension_point(
+                obj, "values", extension_point_id(index), application
+            )
+            objs.append(obj)
+
+    return application, spec, plugin, objs
+
+
+def _run_registry_bindings(state):
+    application, spec, plugin, objs = state
+    application.add_plugin(plugin)
+    application.remove_plugin(plugin)
+
+
+def _teardown_registry_bindings(state):
+    application, spec, plugin, objs = state
+    application.stop()
+
+
+def _setup_trait_bindings(spec):
+    registry = ExtensionRegistry()
+
+    objs = []
+    for index in range(spec.extension_points):
+        id = extension_point_id(index)
+        registry.add_extension_point(ExtensionPoint(List, id=id))
+        registry.set_extensions(id, list(range(spec.contributions)))
+        obj = BoundObject()
+        bind_extension_point(obj, "values", id, registry)
+        objs.append(obj)
+
+    return registry, objs
+
+
+def _run_trait_bindings(state):
+    registry, objs = state
+    for obj in objs:
+        obj.values.append(-1)
+        del obj.values[-1]
+
+
+#### Class load hooks #########################################################
+
+
+def _setup_class_load_hooks(spec):
+    # Half of the hooks are for classes that are already loaded.
+    loaded = [
+        "synthetic.SyntheticService",
+        "synthetic.SyntheticApplication",
+        "bench_core.BoundObject",
+        "bench_core.ExtraPlugin",
+    ]
+    hooks = [
+        ClassLoadHook(
+            class_name=(
+                loaded[index % len(loaded)]
+                if index % 2 == 0
+                else "benchmarks.not_loaded_%d.Class" % index
+            ),
+            on_load=lambda cls: None,
+        )
+        for index in range(spec.contributions)
+    ]
+
+    return ClassLoadHookDispatcher(), hooks
+
+
+def _run_connect_class_load_hooks(state):
+    dispatcher, hooks = state
+    dispatcher.connect(hooks)
+
+
+def _teardown_class_load_hooks(state):
+    dispatcher, hooks = state
+    dispatcher.disconnect(hooks)
+
+
+BENCHMARKS = [
+    Benchmark(
+        name="application_start",
+        setup=_setup_application,
+        run=_run_start,
+        teardown=_run_stop,
+    ),
+    Benchmark(
+        name="application_stop",
+        setup=_setup_started_application,
+        run=_run_stop,
+        teardown=None,
+    ),
+    Benchmark(
+        name="get_extensions",
+        setup=_setup_extensions,
+        run=_run_get_extensions,
+        teardown=_teardown_extensions,
+    ),
+    Benchmark(
+        name="get_services",
+        setup=_setup_extensions,
+        run=_run_get_services,
+        teardown=_teardown_extensions,
+    ),
+    Benchmark(
+        name="add_remove_provider",
+        setup=_setup_providers,
+        run=_run_add_remove_provider,
+        teardown=_teardown_providers,
+    ),
+    Benchmark(
+        name="binding_registry_update",
+        setup=_setup_registry_bindings,
+        run=_run_registry_bindings,
+        teardown=_teardown_registry_bindings,
+    ),
+    Benchmark(
+        name="binding_trait_update",
+        setup=_setup_trait_bindings,
+        run=_run_trait_bindings,
+        teardown=None,
+    ),
+    Benchmark(
+        name="connect_class_load_hooks",
+        setup=_setup_class_load_hooks,
+        run=_run_connect_class_load_hooks,
+        teardown=_teardown_class_load_hooks,
+    ),
+]
@@ -0,0 +1,77 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Benchmarks for the creation of extension point and plugin events.
+
+One 'ExtensionPointChangedEvent' is created per extension point change and
+one 'PluginEvent' per plugin added or removed, so the number of events
+created is scaled by the number of contributions and plugins respectively.
+
+"""
+
+
+# Enthought library imports.
+from envisage.api import ExtensionPointChangedEvent, Plugin
+from envisage.plugin_event import PluginEvent
+
+# Local imports.
+from runner import AllocationBenchmark, Benchmark
+from synthetic import extension_point_id
+
+
+def _setup_extension_point_changed_events(spec):
+    return [
+        (extension_point_id(index % spec.extension_points), index)
+        for index in range(spec.contributions * spec.extension_points)
+    ]
+
+
+def _run_extension_point_changed_events(arguments):
+    return [
+        ExtensionPointChangedEvent(
+            extension_point_id=id, index=index, removed=[], added=[index]
+        )
+        for id, index in arguments
+    ]
+
+
+def _setup_plugin_events(spec):
+    return [Plugin(id="benchmarks.plugin_%d" % i) for i in range(spec.plugins)]
+
+
+def _run_plugin_events(plugins):
+    # Each plugin gets an event when it is added and when it is removed.
+    return [PluginEvent(plugin=plugin) for plugin in plugins + plugins]
+
+
+BENCHMARKS = [
+    Benchmark(
+        name="create_extension_point_changed_events",
+        setup=_setup_extension_point_changed_events,
+        run=_run_extension_point_changed_events,
+        teardown=None,
+    ),
+    AllocationBenchmark(
+        name="allocate_extension_point_changed_events",
+        setup=_setup_extension_point_changed_events,
+        run=_run_extension_point_changed_events,
+        teardown=None,
+    ),
+    Benchmark(
+        name="create_plugin_events",
+        setup=_setup_plugin_events,
+        run=_run_plugin_events,
+        teardown=None,
+    ),
+    AllocationBenchmark(
+        name="allocate_plugin_events",
+        setup=_setup_plugin_events,
+        run=_run_plugin_events,
+        teardown=None,
+    ),
+]
@@ -0,0 +1,82 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Benchmarks for keeping the Python shell's namespace view up to date.
+
+The namespace has 'NAMES' names in it, and each update adds 'CHANGES' names
+and removes 'CHANGES' others (as happens when the user runs a command in the
+shell). The size of the namespace is fixed (i.e. it doesn't depend on the
+size of the synthetic application).
+
+"""
+
+
+# Enthought library imports.
+from envisage.plugins.python_shell.view.namespace_bindings import (
+    NamespaceBindings,
+)
+
+# Local imports.
+from runner import Benchmark
+
+
+#: The number of names in the namespace.
+NAMES = 20000
+
+#: The number of names added and removed by each update.
+CHANGES = 10
+
+
+def _setup_populate_namespace_bindings(spec):
+    return dict(("name_%d" % index, index) for index in range(NAMES))
+
+
+def _run_populate_namespace_bindings(namespace):
+    NamespaceBindings().update(namespace)
+
+
+def _setup_update_namespace_bindings(spec):
+    namespace = dict(("name_%d" % index, index) for index in range(NAMES))
+
+    model = NamespaceBindings()
+    model.update(namespace)
+
+    return model, namespace
+
+
+def _run_update_namespace_bindings(state):
+    model, namespace = state
+
+    # Replace some names, and then put them back for the next run.
+    removed = dict(
+        ("name_%d" % index, namespace.pop("name_%d" % index))
+        for index in range(0, NAMES, NAMES // CHANGES)
+    )
+    namespace.update(("new_%d" % index, index) for index in range(CHANGES))
+    model.update(namespace)
+
+    for index in range(CHANGES):
+        del namespace["new_%d" % index]
+    namespace.update(removed)
+    model.update(namespace)
+
+
+BENCHMARKS = [
+    Benchmark(
+        name="populate_namespace_bindings",
+        setup=_setup_populate_namespace_bindings,
+        run=_run_populate_namespace_bindings,
+        teardown=None,
+    ),
+    Benchmark(
+        name="update_namespace_bindings",
+        setup=_setup_update_namespace_bindings,
+        run=_run_update_namespace_bindings,
+        teardown=None,
+    ),
+]
@@ -0,0 +1,161 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Benchmarks for saving and loading large single_project projects.
+
+The synthetic project holds 'ARRAYS' arrays of 'ARRAY_BYTES' bytes each (like
+the arrays of a data-heavy project) and 'RECORDS' small records, and is saved
+and loaded with each pickle policy:
+
+- 'legacy': protocol 1 without a header (the default for projects),
+- 'highest': the highest protocol, with the arrays pickled in-band,
+- 'out_of_band': the highest protocol, with the arrays saved out-of-band.
+
+The size of the project is fixed (i.e. it doesn't depend on the size of the
+synthetic application).
+
+"""
+
+
+# Standard library imports.
+import os
+import pickle
+import shutil
+import tempfile
+
+# Enthought library imports.
+from envisage.pickle_policy import PicklePolicy
+from envisage.ui.single_project.api import Project
+from traits.api import List
+
+# Local imports.
+from runner import Benchmark
+
+
+#: The number of arrays in the synthetic project.
+ARRAYS = 64
+
+#: The size of each array (in bytes).
+ARRAY_BYTES = 1024 * 1024
+
+#: The number of small records in the synthetic project.
+RECORDS = 10000
+
+#: Out-of-band pickle buffers (Python 3.8 and later).
+PickleBuffer = getattr(pickle, "PickleBuffer", None)
+
+
+class SyntheticArray(object):
+    """ A minimal array that can be pickled out-of-band (like NumPy's). """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5 and PickleBuffer is not None:
+            return (SyntheticArray, (PickleBuffer(self.data),))
+
+        return (SyntheticArray, (bytearray(self.data),))
+
+
+class LegacyProject(Project):
+    """ A synthetic project saved with the default (legacy) policy. """
+
+    arrays = List
+
+    records = List
+
+
+class HighestProtocolProject(LegacyProject):
+    """ A synthetic project saved with the highest protocol (in-band). """
+
+    PICKLE_POLICY = PicklePolicy(out_of_band=False)
+
+
+class OutOfBandProject(LegacyProject):
+    """ A synthetic project saved with out-of-band buffers. """
+
+    PICKLE_POLICY = PicklePolicy()
+
+
+#: The project class for each policy.
+PROJECT_CLASSES = [
+    ("legacy", LegacyProject),
+    ("highest", HighestProtocolProject),
+    ("out_of_band", OutOfBandProject),
+]
+
+
+def _make_project(project_class, location):
+    project = project_class(location=location)
+    project.arrays = [
+        SyntheticArray(bytearray(os.urandom(ARRAY_BYTES)))
+        for _ in range(ARRAYS)
+    ]
+    project.records = [
+        {"name": "record_%d" % index, "index": index, "tags": ["a", "b"]}
+        for index in range(RECORDS)
+    ]
+
+    return project
+
+
+def _make_setup_save(project_class):
+    def setup(spec):
+        directory = tempfile.mkdtemp()
+        location = os.path.join(directory, "project")
+
+        return directory, _make_project(project_class, location)
+
+    return setup
+
+
+def _run_save(state):
+    directory, project = state
+
+    project.save(overwrite=True)
+
+
+def _make_setup_load(project_class):
+    def setup(spec):
+        directory, project = _make_setup_save(project_class)(spec)
+        project.save()
+
+        return directory, project_class, project.location
+
+    return setup
+
+
+def _run_load(state):
+    directory, project_class, location = state
+
+    return project_class.load(location, None)
+
+
+def _teardown(state):
+    shutil.rmtree(state[0])
+
+
+BENCHMARKS = []
+for _name, _project_class in PROJECT_CLASSES:
+    BENCHMARKS.append(
+        Benchmark(
+            name="save_project_%s" % _name,
+            setup=_make_setup_save(_project_class),
+            run=_run_save,
+            teardown=_teardown,
+        )
+    )
+    BENCHMARKS.append(
+        Benchmark(
+            name="load_project_%s" % _name,
+            setup=_make_setup_load(_project_class),
+            run=_run_load,
+            teardown=_teardown,
+        )
+    )
@@ -0,0 +1,115 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Run the Envisage benchmarks.
+
+e.g.::
+
+    python benchmarks/run_benchmarks.py --size medium --output before.json
+    ... check out another commit ...
+    python benchmarks/run_benchmarks.py --size medium --compare before.json
+
+The benchmarks run headless (no GUI toolkit is required) and all application
+data is written to a temporary directory.
+
+"""
+
+
+# Standard library imports.
+import argparse
+import os
+import sys
+
+# The benchmarks never need a GUI toolkit.
+os.environ.setdefault("ETS_TOOLKIT", "null")
+
+# Benchmark the checked out source tree (even if Envisage isn't installed, or
+# a different version of it is).
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def main(argv=None):
+    """ Entry point for the benchmark runner. """
+
+    # Local imports (deferred so that the toolkit is selected first).
+    from runner import (
+        collect_benchmarks,
+        format_results,
+        load_results,
+        run_benchmarks,
+        save_results,
+    )
+    from synthetic import SIZES, SyntheticSpec
+    from envisage.tests.ets_config_patcher import ETSConfigPatcher
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size",
+        choices=sorted(SIZES),
+        default="small",
+        help="the size of the synthetic application (default: small)",
+    )
+    for field in SyntheticSpec._fields:
+        parser.add_argument(
+            "--" + field.replace("_", "-"),
+            type=int,
+            default=None,
+            help="override the number of %s" % field.replace("_", " "),
+        )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="the number of samples per benchmark (default: 5)",
+    )
+    parser.add_argument(
+        "--filter",
+        default=None,
+        help="only run benchmarks whose name contains this string",
+    )
+    parser.add_argument(
+        "--output", default=None, help="save the results as JSON to this file"
+    )
+    parser.add_argument(
+        "--compare",
+        default=None,
+        help="compare the results with a previously saved JSON file",
+    )
+    args = parser.parse_args(argv)
+
+    overrides = {
+        field: getattr(args, field)
+        for field in SyntheticSpec._fields
+        if getattr(args, field) is not None
+    }
+    spec = SIZES[args.size]._replace(**overrides)
+    size = args.size if len(overrides) == 0 else "custom"
+
+    benchmarks = collect_benchmarks(args.filter)
+
+    patcher = ETSConfigPatcher()
+    patcher.start()
+    try:
+        results = run_benchmarks(benchmarks, size, spec, args.repeat)
+
+    finally:
+        patcher.stop()
+
+    baseline = None if args.compare is None else load_results(args.compare)
+    print(format_results(results, baseline))
+
+    if args.output is not None:
+        save_results(results, args.output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Support for defining, running and reporting benchmarks. """
+
+
+# Standard library imports.
+from collections import namedtuple
+import gc
+import glob
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+#: A single benchmark.
+#:
+#: 'setup' is called with a 'SyntheticSpec' and returns the state passed to
+#: 'run' (which is the only part that is timed) and then to 'teardown' (which
+#: may be None).
+Benchmark = namedtuple("Benchmark", ["name", "setup", "run", "teardown"])
+
+
+#: A benchmark that counts memory allocations rather than timing.
+#:
+#: This is like a 'Benchmark' except that 'run' must return everything that
+#: it allocated (so that it is still alive when memory is measured).
+AllocationBenchmark = namedtuple(
+    "AllocationBenchmark", ["name", "setup", "run", "teardown"]
+)
+
+
+#: The directory containing the benchmark modules.
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def collect_benchmarks(pattern=None):
+    """ Return all benchmarks defined by the 'bench_*.py' modules.
+
+    If a pattern is given then only benchmarks whose names contain it are
+    returned.
+
+    """
+
+    benchmarks = []
+    for path in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = importlib.import_module(module_name)
+        benchmarks.extend(module.BENCHMARKS)
+
+    if pattern is not None:
+        benchmarks = [b for b in benchmarks if pattern in b.name]
+
+    return benchmarks
+
+
+def measure(benchmark, spec, repeat):
+    """ Time a benchmark 'repeat' times and return summary statistics.
+
+    Each sample gets a fresh state from 'setup' and, as with 'timeit', the
+    garbage collector is disabled while 'run' is being timed.
+
+    """
+
+    samples = []
+    for _ in range(repeat):
+        state = benchmark.setup(spec)
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            benchmark.run(state)
+            samples.append(time.perf_counter() - start)
+
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        if benchmark.teardown is not None:
+            benchmark.teardown(state)
+
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "repeat": repeat,
+    }
+
+
+def measure_allocations(benchmark, spec):
+    """ Count the memory blocks (and bytes) still allocated after 'run'. """
+
+    state = benchmark.setup(spec)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        allocated = benchmark.run(state)
+        after = tracemalloc.take_snapshot()
+
+    finally:
+        tracemalloc.stop()
+
+    differences = after.compare_to(before, "filename")
+    blocks = sum(difference.count_diff for difference in differences)
+    size = sum(difference.size_diff for difference in differences)
+
+    del allocated
+    if benchmark.teardown is not None:
+        benchmark.teardown(state)
+
+    return {"blocks": blocks, "bytes": size}
+
+
+def run_benchmarks(benchmarks, size, spec, repeat):
+    """ Run benchmarks and return the results as a JSON-serializable dict.
+    """
+
+    results = {}
+    for benchmark in benchmarks:
+        key = "%s[%s]" % (benchmark.name, size)
+        if isinstance(benchmark, AllocationBenchmark):
+            results[key] = measure_allocations(benchmark, spec)
+
+        else:
+            results[key] = measure(benchmark, spec, repeat)
+
+    return {
+        "metadata": _get_metadata(size, spec),
+        "results": results,
+    }
+
+
+def save_results(results, filename):
+    """ Save results as JSON.
+
+    Keys are sorted so that result files can be diffed between commits.
+
+    """
+
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(filename):
+    """ Load results previously saved with 'save_results'. """
+
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_results(results, baseline=None):
+    """ Format results (and their ratio to a baseline) as a text table. """
+
+    lines = []
+    header = "%-55s %12s %12s" % ("benchmark", "median (ms)", "min (ms)")
+    if baseline is not None:
+        header += " %10s" % "ratio"
+    lines.append(header)
+    lines.append("-" * len(header))
+
+    baseline_results = {} if baseline is None else baseline["results"]
+    for key, result in sorted(results["results"].items()):
+        # Allocation results are shown as blocks and KiB instead of times.
+        if "blocks" in result:
+            metric = "bytes"
+            line = "%-55s %8d blks %8.1f KiB" % (
+                key,
+                result["blocks"],
+                result["bytes"] / 1024,
+            )
+
+        else:
+            metric = "median"
+            line = "%-55s %12.3f %12.3f" % (
+                key,
+                result["median"] * 1000,
+                result["min"] * 1000,
+            )
+
+        if baseline is not None:
+            old = baseline_results.get(key)
+            if old is None or metric not in old:
+                line += " %10s" % "new"
+            elif old[metric] == 0:
+                line += " %10s" % "-"
+            else:
+                line += " %10.2f" % (result[metric] / old[metric])
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def _get_metadata(size, spec):
+    """ Return information about the environment the results came from. """
+
+    import envisage
+    import traits
+
+    return {
+        "envisage": getattr(envisage, "__version__", "unknown"),
+        "git_revision": _get_git_revision(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "size": size,
+        "spec": spec._asdict(),
+        "traits": traits.__version__,
+    }
+
+
+def _get_git_revision():
+    """ Return the current Git revision, or None if it is not available. """
+
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=HERE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode("ascii").strip()
+
+
+# Make sure that the benchmark modules can always import each other.
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
@@ -0,0 +1,152 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A generator for synthetic Envisage applications used by the benchmarks.
+
+A synthetic application is described by a 'SyntheticSpec' and contains:
+
+- the core plugin (so that service offers are registered),
+- 'plugins' generated plugins,
+- 'extension_points' extension points, spread round-robin over the plugins,
+- 'contributions' contributions to *each* extension point, spread
+  round-robin over the plugins,
+- 'service_offers' service offers, spread round-robin over the plugins, each
+  with a 'priority' property so that they can be queried.
+
+The generated plugin classes are deterministic for a given spec so that
+results are comparable between runs (and between commits!).
+
+"""
+
+
+# Standard library imports.
+from collections import namedtuple
+
+# Enthought library imports.
+from envisage.api import Application, ExtensionPoint, Plugin, ServiceOffer
+from envisage.core_plugin import CorePlugin
+from traits.api import HasTraits, Int, List, Str
+
+
+#: The shape of a synthetic application.
+SyntheticSpec = namedtuple(
+    "SyntheticSpec",
+    ["plugins", "extension_points", "contributions", "service_offers"],
+)
+
+
+#: Named specs used by the benchmark runner.
+SIZES = {
+    "small": SyntheticSpec(
+        plugins=10, extension_points=10, contributions=10, service_offers=10
+    ),
+    "medium": SyntheticSpec(
+        plugins=50, extension_points=50, contributions=100, service_offers=100
+    ),
+    "large": SyntheticSpec(
+        plugins=200,
+        extension_points=200,
+        contributions=1000,
+        service_offers=1000,
+    ),
+}
+
+
+#: The number of distinct priorities given to synthetic service offers.
+PRIORITIES = 10
+
+
+class SyntheticService(HasTraits):
+    """ The protocol (and factory) for synthetic service offers. """
+
+    # The name of the service.
+    name = Str
+
+    # The priority of the service (used in queries).
+    priority = Int
+
+
+class SyntheticApplication(Application):
+    """ The application used by the benchmarks. """
+
+    id = "envisage.benchmarks"
+
+
+def extension_point_id(index):
+    """ Return the Id of the synthetic extension point with an index. """
+
+    return "benchmarks.extension_point_%d" % index
+
+
+def make_plugin_class(spec, plugin_index):
+    """ Create the class of the synthetic plugin with the given index.
+
+    The plugin offers every extension point whose index is congruent to
+    'plugin_index' modulo the number of plugins, and contributes its share of
+    the contributions to every extension point.
+
+    """
+
+    namespace = {
+        "id": "benchmarks.plugin_%d" % plugin_index,
+        "name": "Benchmark Plugin %d" % plugin_index,
+    }
+
+    for index in range(plugin_index, spec.extension_points, spec.plugins):
+        namespace["extension_point_%d" % index] = ExtensionPoint(
+            List, id=extension_point_id(index)
+        )
+
+    contributions = list(
+        range(plugin_index, spec.contributions, spec.plugins)
+    )
+    if len(contributions) > 0:
+        for index in range(spec.extension_points):
+            namespace["contributions_%d" % index] = List(
+                contributions, contributes_to=extension_point_id(index)
+            )
+
+    service_offers = [
+        ServiceOffer(
+            protocol=SyntheticService,
+            factory=SyntheticService,
+            properties={
+                "name": "service_%d" % index,
+                "priority": index % PRIORITIES,
+            },
+        )
+        for index in range(plugin_index, spec.service_offers, spec.plugins)
+    ]
+    if len(service_offers) > 0:
+        namespace["service_offers"] = List(
+            service_offers, contributes_to=CorePlugin.SERVICE_OFFERS
+        )
+
+    return type("BenchmarkPlugin%d" % plugin_index, (Plugin,), namespace)
+
+
+def make_plugin_classes(spec):
+    """ Create the classes of all of the synthetic plugins for a spec. """
+
+    return [make_plugin_class(spec, index) for index in range(spec.plugins)]
+
+
+def make_application(spec, plugin_classes=None):
+    """ Create a synthetic application for a spec.
+
+    If 'plugin_classes' is not specified then they are generated from the
+    spec (pass them in to avoid measuring class creation).
+
+    """
+
+    if plugin_classes is None:
+        plugin_classes = make_plugin_classes(spec)
+
+    plugins = [CorePlugin()] + [klass() for klass in plugin_classes]
+
+    return SyntheticApplication(plugins=plugins)
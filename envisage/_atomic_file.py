@@ -0,0 +1,80 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Write files via a temporary file so that they are never half-written. """
+
+
+# Standard library imports.
+from contextlib import contextmanager
+import os
+import shutil
+import tempfile
+
+
+@contextmanager
+def atomic_open(path, mode="wb", **kwargs):
+    """ Open a file for writing via a temporary file.
+
+    The temporary file is created in the same directory as the file (with
+    the same permissions if the file already exists, or the permissions that
+    'open' would create it with if it doesn't) and is flushed to disk
+    before it replaces the file, which only happens if the 'with' block
+    completes. Otherwise the file is left as it was and the temporary file
+    is removed.
+
+    Any keyword arguments are passed to 'open'.
+
+    """
+
+    directory, filename = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        prefix="." + filename + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        with open(fd, mode, **kwargs) as f:
+            yield f
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+
+        # 'mkstemp' creates the file readable and writable by its owner only.
+        else:
+            os.chmod(temp_path, 0o666 & ~_get_umask())
+
+        os.replace(temp_path, path)
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        raise
+
+    return
+
+
+def _get_umask():
+    """ Return the process's umask. """
+
+    # Linux reports the umask without having to change it (which would
+    # affect files created by other threads in the meantime).
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+
+    except (OSError, ValueError, IndexError):
+        pass
+
+    umask = os.umask(0o022)
+    os.umask(umask)
+
+    return umask
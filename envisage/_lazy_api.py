@@ -0,0 +1,73 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Support for 'api' modules that import their names on first access. """
+
+
+# Standard library imports.
+import sys
+
+
+def install_lazy_api(module_globals, names):
+    """ Make the names in an 'api' module load on first access.
+
+    Parameters
+    ----------
+    module_globals : dict
+        The globals of the 'api' module (i.e. 'globals()').
+    names : dict
+        Maps each public name to the (relative) name of the module that
+        defines it, e.g. ``{"Application": ".application"}``.
+
+    Module-level '__getattr__' (PEP 562) is only supported from Python 3.7
+    onwards, so on older versions all of the names are imported immediately.
+
+    """
+
+    module_name = module_globals["__name__"]
+
+    def __getattr__(name):
+        """ Import a public name the first time that it is accessed. """
+
+        try:
+            defining_module_name = names[name]
+
+        except KeyError:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(module_name, name)
+            )
+
+        # This is exactly what 'from .module import name' does (we use it
+        # rather than 'importlib' so that '-X importtime' reports the import).
+        level = len(defining_module_name) - len(
+            defining_module_name.lstrip(".")
+        )
+        module = __import__(
+            defining_module_name[level:], module_globals, None, [name], level
+        )
+        value = getattr(module, name)
+
+        # Cache the value so that '__getattr__' is only called once per name.
+        module_globals[name] = value
+
+        return value
+
+    def __dir__():
+        """ Return the public (and already imported) names of the module. """
+
+        return sorted(set(module_globals) | set(names))
+
+    module_globals["__getattr__"] = __getattr__
+    module_globals["__dir__"] = __dir__
+    module_globals["__all__"] = sorted(names)
+
+    if sys.version_info < (3, 7):
+        for name in names:
+            __getattr__(name)
+
+    return
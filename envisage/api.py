@@ -6,38 +6,52 @@
 # under the conditions described in the aforementioned license.  The license
 # is also available online at http://www.enthought.com/licenses/BSD.txt
 # Thanks for using Enthought open source!
-""" Envisage package Copyright 2003-2007 Enthought, Inc. """
+""" Envisage package Copyright 2003-2007 Enthought, Inc.
 
-from .i_application import IApplication
-from .i_extension_point import IExtensionPoint
-from .i_extension_point_user import IExtensionPointUser
-from .i_extension_provider import IExtensionProvider
-from .i_extension_registry import IExtensionRegistry
-from .i_import_manager import IImportManager
-from .i_plugin import IPlugin
-from .i_plugin_activator import IPluginActivator
-from .i_plugin_manager import IPluginManager
-from .i_service_registry import IServiceRegistry
+The names in this module are imported on first access, so that importing
+'envisage.api' does not import every core module (and, in turn, heavy
+dependencies such as 'pkg_resources' and 'apptools') up front.
 
-from .application import Application
-from .class_load_hook import ClassLoadHook
-from .egg_plugin_manager import EggPluginManager
-from .extension_registry import ExtensionRegistry
-from .extension_point import ExtensionPoint, contributes_to
-from .extension_point_binding import (
-    ExtensionPointBinding,
-    bind_extension_point,
+"""
+
+from ._lazy_api import install_lazy_api
+
+install_lazy_api(
+    globals(),
+    {
+        "IApplication": ".i_application",
+        "IExtensionPoint": ".i_extension_point",
+        "IExtensionPointUser": ".i_extension_point_user",
+        "IExtensionProvider": ".i_extension_provider",
+        "IExtensionRegistry": ".i_extension_registry",
+        "IImportManager": ".i_import_manager",
+        "IPlugin": ".i_plugin",
+        "IPluginActivator": ".i_plugin_activator",
+        "IPluginManager": ".i_plugin_manager",
+        "IServiceRegistry": ".i_service_registry",
+        "Application": ".application",
+        "ClassLoadHook": ".class_load_hook",
+        "ClassLoadHookDispatcher": ".class_load_hook_dispatcher",
+        "EggPluginManager": ".egg_plugin_manager",
+        "ExtensionRegistry": ".extension_registry",
+        "ExtensionPoint": ".extension_point",
+        "contributes_to": ".extension_point",
+        "ExtensionPointBinding": ".extension_point_binding",
+        "bind_extension_point": ".extension_point_binding",
+        "ExtensionProvider": ".extension_provider",
+        "ExtensionPointChangedEvent": ".extension_point_changed_event",
+        "ImportManager": ".import_manager",
+        "PicklePolicy": ".pickle_policy",
+        "Plugin": ".plugin",
+        "PluginActivator": ".plugin_activator",
+        "PluginExtensionRegistry": ".plugin_extension_registry",
+        "PluginManager": ".plugin_manager",
+        "ProviderExtensionRegistry": ".provider_extension_registry",
+        "Service": ".service",
+        "ServiceOffer": ".service_offer",
+        "NoSuchServiceError": ".service_registry",
+        "ServiceRegistry": ".service_registry",
+        "UnknownExtension": ".unknown_extension",
+        "UnknownExtensionPoint": ".unknown_extension_point",
+    },
 )
-from .extension_provider import ExtensionProvider
-from .extension_point_changed_event import ExtensionPointChangedEvent
-from .import_manager import ImportManager
-from .plugin import Plugin
-from .plugin_activator import PluginActivator
-from .plugin_extension_registry import PluginExtensionRegistry
-from .plugin_manager import PluginManager
-from .provider_extension_registry import ProviderExtensionRegistry
-from .service import Service
-from .service_offer import ServiceOffer
-from .service_registry import NoSuchServiceError, ServiceRegistry
-from .unknown_extension import UnknownExtension
-from .unknown_extension_point import UnknownExtensionPoint
@@ -248,6 +248,16 @@ class Application(HasTraits):
 
         return
 
+    def update_extensions(self, extension_point_id, index, removed, added):
+        """ Replace some of the extensions contributed to an extension point.
+        """
+
+        self.extension_registry.update_extensions(
+            extension_point_id, index, removed, added
+        )
+
+        return
+
     ###########################################################################
     # 'IImportManager' interface.
     ###########################################################################
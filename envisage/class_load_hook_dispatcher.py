@@ -0,0 +1,153 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A dispatcher that connects many class load hooks at once. """
+
+
+# Standard library imports.
+import sys
+
+# Enthought library imports.
+from traits.api import Bool, Dict, HasTraits, MetaHasTraits
+
+
+class ClassLoadHookDispatcher(HasTraits):
+    """ A dispatcher that connects many class load hooks at once.
+
+    Connecting each 'ClassLoadHook' individually registers a listener with
+    'MetaHasTraits' and looks for the class in 'sys.modules' for every hook.
+    Instead, the dispatcher groups its hooks by module and class name,
+    registers a *single* listener that is called whenever any 'HasTraits'
+    class is created, and looks for already loaded classes in a single pass
+    over its hooks (i.e. each module is looked up only once).
+
+    Each hook's 'on_class_loaded' method is called exactly as if the hook
+    had been connected itself, but at most once per class even if the same
+    hook is connected more than once.
+
+    """
+
+    #### Private interface ####################################################
+
+    # The connected hooks.
+    #
+    # { Str module_name : { Str class_name : [ClassLoadHook] } }
+    #
+    # Hooks whose class name is not dotted are stored under the module name
+    # '' (they can only ever be called if a class is created in a module with
+    # an empty name!).
+    _hooks = Dict
+
+    # Is our listener registered with 'MetaHasTraits'?
+    _listening = Bool(False)
+
+    ###########################################################################
+    # 'ClassLoadHookDispatcher' interface.
+    ###########################################################################
+
+    def connect(self, class_load_hooks):
+        """ Connect class load hooks.
+
+        The hooks for any classes that have already been loaded are called
+        immediately.
+
+        """
+
+        added = {}
+        for class_load_hook in class_load_hooks:
+            module_name, class_name = self._split_class_name(
+                class_load_hook.class_name
+            )
+
+            hooks = self._hooks.setdefault(module_name, {}).setdefault(
+                class_name, []
+            )
+            if class_load_hook not in hooks:
+                hooks.append(class_load_hook)
+                added.setdefault(module_name, {}).setdefault(
+                    class_name, []
+                ).append(class_load_hook)
+
+        if not self._listening and len(self._hooks) > 0:
+            MetaHasTraits.add_listener(self._on_class_loaded)
+            self._listening = True
+
+        # If any of the classes have already been loaded then run the hooks
+        # now!
+        self._call_hooks_for_loaded_classes(added)
+
+        return
+
+    def disconnect(self, class_load_hooks):
+        """ Disconnect class load hooks. """
+
+        for class_load_hook in class_load_hooks:
+            module_name, class_name = self._split_class_name(
+                class_load_hook.class_name
+            )
+
+            classes = self._hooks.get(module_name, {})
+            hooks = classes.get(class_name, [])
+            if class_load_hook in hooks:
+                hooks.remove(class_load_hook)
+
+            if len(hooks) == 0:
+                classes.pop(class_name, None)
+
+            if len(classes) == 0:
+                self._hooks.pop(module_name, None)
+
+        if self._listening and len(self._hooks) == 0:
+            MetaHasTraits.remove_listener(self._on_class_loaded)
+            self._listening = False
+
+        return
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _call_hooks_for_loaded_classes(self, hooks_by_module):
+        """ Call the hooks for any classes that have already been loaded. """
+
+        for module_name, classes in hooks_by_module.items():
+            # Only check if the class name has at least a partial hierarchy
+            # (as 'ClassLoadHook' does).
+            if len(module_name) == 0:
+                continue
+
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+
+            for class_name, hooks in classes.items():
+                klass = getattr(module, class_name, None)
+                if klass is not None:
+                    for class_load_hook in hooks:
+                        class_load_hook.on_class_loaded(klass)
+
+        return
+
+    def _on_class_loaded(self, klass):
+        """ Listener called by 'MetaHasTraits' when any class is created. """
+
+        classes = self._hooks.get(klass.__module__)
+        if classes is not None:
+            # Copy the list in case a hook connects or disconnects hooks.
+            for class_load_hook in classes.get(klass.__name__, [])[:]:
+                class_load_hook.on_class_loaded(klass)
+
+        return
+
+    def _split_class_name(self, class_path):
+        """ Split a (possibly) dotted class name into module and class names.
+        """
+
+        module_name, _, class_name = class_path.rpartition(".")
+
+        return module_name, class_name
@@ -9,6 +9,9 @@
 """ The Envisage core plugin. """
 
 
+# Standard library imports.
+import os
+
 # Enthought library imports.
 from envisage.api import ExtensionPoint, Plugin, ServiceOffer
 from traits.api import List, Instance, on_trait_change, Str
@@ -152,6 +155,18 @@ class CorePlugin(Plugin):
 
     # None.
 
+    #### Private interface ####################################################
+
+    # The dispatcher that all class load hooks are connected to.
+    _class_load_hook_dispatcher = Instance(
+        "envisage.class_load_hook_dispatcher.ClassLoadHookDispatcher", ()
+    )
+
+    # The compiled cache of the contributed preferences files.
+    _preferences_cache = Instance(
+        "envisage.preferences_cache.PreferencesCache"
+    )
+
     ###########################################################################
     # 'IPlugin' interface.
     ###########################################################################
@@ -179,20 +194,36 @@ class CorePlugin(Plugin):
     # Private interface.
     ###########################################################################
 
+    def __preferences_cache_default(self):
+        """ Trait initializer. """
+
+        # Enthought library imports.
+        from envisage.preferences_cache import PreferencesCache
+
+        # The cache is saved in the application's home directory (if it has
+        # one).
+        home = getattr(self.application, "home", "")
+        if home:
+            filename = os.path.join(home, "preferences.cache")
+
+        else:
+            filename = ""
+
+        return PreferencesCache(filename=filename)
+
     def _connect_class_load_hooks(self, class_load_hooks):
         """ Connect all class load hooks. """
 
-        for class_load_hook in class_load_hooks:
-            class_load_hook.connect()
+        # The hooks are connected in a single batch via a dispatcher rather
+        # than one at a time (there can be hundreds of them, e.g. for adapter
+        # registrations).
+        self._class_load_hook_dispatcher.connect(class_load_hooks)
 
         return
 
     def _load_preferences(self, preferences):
         """ Load all contributed preferences into a preferences node. """
 
-        # Enthought library imports.
-        from envisage.resource.api import ResourceManager
-
         # We add the plugin preferences to the default scope. The default scope
         # is a transient scope which means that (quite nicely ;^) we never
         # save the actual default plugin preference values. They will only get
@@ -200,15 +231,10 @@ class CorePlugin(Plugin):
         # is exactly what happens in the preferences UI.
         default = self.application.preferences.node("default/")
 
-        # The resource manager is used to find the preferences files.
-        resource_manager = ResourceManager()
-        for resource_name in preferences:
-            f = resource_manager.file(resource_name)
-            try:
-                default.load(f)
-
-            finally:
-                f.close()
+        # The cache merges all of the files into a single snapshot so that
+        # they are loaded in one pass (and only parsed if they have changed
+        # since they were last loaded).
+        default.load(self._preferences_cache.load(preferences))
 
         return
 
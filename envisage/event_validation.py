@@ -0,0 +1,48 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Debug-mode validation of Envisage's lightweight event objects.
+
+Events such as 'ExtensionPointChangedEvent' and 'PluginEvent' are created in
+large numbers (e.g. when loading many plugins) so they are plain objects with
+'__slots__' rather than 'HasTraits' instances and, by default, their
+attributes are not validated.
+
+Validation can be switched on while debugging either by setting the
+'ENVISAGE_VALIDATE_EVENTS' environment variable to a non-empty value before
+Envisage is imported, or by calling 'set_event_validation(True)'.
+
+"""
+
+
+# Standard library imports.
+import os
+
+
+# Whether events validate their attributes when they are created.
+_validate_events = bool(os.environ.get("ENVISAGE_VALIDATE_EVENTS"))
+
+
+def is_event_validation_enabled():
+    """ Return True if events validate their attributes when created. """
+
+    return _validate_events
+
+
+def set_event_validation(enabled):
+    """ Switch the validation of event attributes on or off.
+
+    Returns the previous setting (so that it can be restored).
+
+    """
+
+    global _validate_events
+
+    previous, _validate_events = _validate_events, bool(enabled)
+
+    return previous
@@ -49,6 +49,10 @@ class ExtensionPointBinding(HasTraits):
     # A flag that prevents us from setting a trait twice.
     _event_handled = False
 
+    # A flag that prevents us from applying a change that we made to the
+    # extension point back to the trait.
+    _extensions_updating = False
+
     ###########################################################################
     # 'object' interface.
     ###########################################################################
@@ -103,7 +107,13 @@ class ExtensionPointBinding(HasTraits):
         """ Dynamic trait change handler. """
 
         if not self._event_handled:
-            self._set_extensions(getattr(obj, self.trait_name))
+            # Extended slices (i.e. with a step) can't be expressed as a
+            # single contiguous change so we just set all of the extensions.
+            if isinstance(event.index, int):
+                self._update_extensions(event)
+
+            else:
+                self._set_extensions(getattr(obj, self.trait_name))
 
         return
 
@@ -112,13 +122,20 @@ class ExtensionPointBinding(HasTraits):
     def _extension_point_listener(self, extension_registry, event):
         """ Listener called when an extension point is changed. """
 
+        # Ignore changes that we made ourselves (the trait already has them).
+        if self._extensions_updating:
+            return
+
         self._event_handled = True
-        if event.index is not None:
-            self._update_trait(event)
+        try:
+            if event.index is not None:
+                self._update_trait(event)
 
-        else:
-            self._set_trait(notify=True)
-        self._event_handled = False
+            else:
+                self._set_trait(notify=True)
+
+        finally:
+            self._event_handled = False
 
         return
 
@@ -154,7 +171,13 @@ class ExtensionPointBinding(HasTraits):
     def _update_trait(self, event):
         """ Update the object's trait to the value of the extension point. """
 
-        self._set_trait(notify=False)
+        # Apply the change to the trait's list in place so that the time
+        # taken is proportional to the size of the change rather than to the
+        # number of extensions. If that isn't possible (which should only
+        # happen if the trait has got out of step with the extension point)
+        # then we re-read all of the extensions.
+        if not self._apply_event_to_trait(event):
+            self._set_trait(notify=False)
 
         self.obj.trait_property_changed(
             self.trait_name + "_items", Undefined, event
@@ -162,15 +185,83 @@ class ExtensionPointBinding(HasTraits):
 
         return
 
+    def _apply_event_to_trait(self, event):
+        """ Apply an extension point changed event to the trait's list.
+
+        Returns True if the event was applied, otherwise False.
+
+        """
+
+        index = event.index
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                return False
+
+            index = 0 if index.start is None else index.start
+
+        value = getattr(self.obj, self.trait_name)
+        if not isinstance(value, list):
+            return False
+
+        removed = list(event.removed)
+        stop = index + len(removed)
+        if value[index:stop] != removed:
+            return False
+
+        # The list is changed without notification as we fire a single
+        # '_items' event for the whole change (the items added are still
+        # validated).
+        self.obj._trait_change_notify(False)
+        try:
+            value[index:stop] = event.added
+
+        finally:
+            self.obj._trait_change_notify(True)
+
+        return True
+
     def _set_extensions(self, extensions):
         """ Set the extensions to an extension point. """
 
+        # Pass a copy so that the extension registry doesn't share the
+        # trait's list (which we change in place when the extension point
+        # changes).
+        if isinstance(extensions, list):
+            extensions = list(extensions)
+
         self.extension_registry.set_extensions(
             self.extension_point_id, extensions
         )
 
         return
 
+    def _update_extensions(self, event):
+        """ Update the extensions to an extension point from a list event. """
+
+        update_extensions = getattr(
+            self.extension_registry, "update_extensions", None
+        )
+
+        # Extension registries written before 'update_extensions' was added
+        # to 'IExtensionRegistry' only support setting all the extensions.
+        if update_extensions is None:
+            self._set_extensions(getattr(self.obj, self.trait_name))
+            return
+
+        self._extensions_updating = True
+        try:
+            update_extensions(
+                self.extension_point_id,
+                event.index,
+                event.removed,
+                event.added,
+            )
+
+        finally:
+            self._extensions_updating = False
+
+        return
+
 
 # Factory function for creating bindings.
 def bind_extension_point(
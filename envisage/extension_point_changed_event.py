@@ -10,19 +10,81 @@
 
 
 # Enthought library imports.
-from traits.api import TraitListEvent
+from traits.api import Either, HasStrictTraits, Instance, Int, List, Str
 
+# Local imports.
+from .event_validation import is_event_validation_enabled
 
-class ExtensionPointChangedEvent(TraitListEvent):
-    """ An event fired when an extension point's extensions have changed. """
 
-    def __init__(self, extension_point_id=None, **kw):
+class ExtensionPointChangedEvent(object):
+    """ An event fired when an extension point's extensions have changed.
+
+    This has the same attributes as a 'TraitListEvent' (plus the Id of the
+    extension point), but it is a lightweight object with '__slots__' as one
+    is created for every change to every extension point. Its attributes are
+    only validated in debug mode (see 'envisage.event_validation').
+
+    """
+
+    __slots__ = ("extension_point_id", "index", "removed", "added")
+
+    def __init__(
+        self, extension_point_id=None, index=0, removed=None, added=None
+    ):
         """ Constructor. """
 
-        # The base class has the 'index', 'removed' and 'added' attributes.
-        super(ExtensionPointChangedEvent, self).__init__(**kw)
+        if removed is None:
+            removed = []
+
+        if added is None:
+            added = []
 
-        # We add the extension point Id.
+        if is_event_validation_enabled():
+            _ExtensionPointChangedEventTraits(
+                extension_point_id=extension_point_id,
+                index=index,
+                removed=removed,
+                added=added,
+            )
+
+        # The Id of the extension point.
         self.extension_point_id = extension_point_id
 
+        # The index (or slice) at which the extensions were added/removed.
+        # This is None if the extension point's extensions were replaced
+        # wholesale.
+        self.index = index
+
+        # The extensions that were removed.
+        self.removed = removed
+
+        # The extensions that were added.
+        self.added = added
+
         return
+
+    def __repr__(self):
+        """ Return a string representation of the event. """
+
+        return (
+            "{}(extension_point_id={!r}, index={!r}, removed={!r}, "
+            "added={!r})".format(
+                type(self).__name__,
+                self.extension_point_id,
+                self.index,
+                self.removed,
+                self.added,
+            )
+        )
+
+
+class _ExtensionPointChangedEventTraits(HasStrictTraits):
+    """ The traits used to validate an event in debug mode. """
+
+    extension_point_id = Either(None, Str)
+
+    index = Either(None, Int, Instance(slice))
+
+    removed = List
+
+    added = List
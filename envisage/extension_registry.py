@@ -160,14 +160,37 @@ class ExtensionRegistry(HasTraits):
 
         self._check_extension_point(extension_point_id)
 
+        # We keep our own copy of the list so that 'update_extensions' can
+        # change it in place (the caller may still be using the one it passed
+        # in).
         old = self._get_extensions(extension_point_id)
-        self._extensions[extension_point_id] = extensions
+        self._extensions[extension_point_id] = list(extensions)
 
         refs = self._get_listener_refs(extension_point_id)
         self._call_listeners(refs, extension_point_id, extensions, old, None)
 
         return
 
+    def update_extensions(self, extension_point_id, index, removed, added):
+        """ Replace some of the extensions contributed to an extension point.
+        """
+
+        self._check_extension_point(extension_point_id)
+
+        # The list is our own (see 'set_extensions'), so it is changed in
+        # place, in time proportional to the size of the change (plus the
+        # extensions after it that have to move).
+        extensions = self._get_extensions(extension_point_id)
+        stop = index + len(removed)
+        removed = extensions[index:stop]
+        added = list(added)
+        extensions[index:stop] = added
+
+        refs = self._get_listener_refs(extension_point_id)
+        self._call_listeners(refs, extension_point_id, added, removed, index)
+
+        return
+
     ###########################################################################
     # Protected 'ExtensionRegistry' interface.
     ###########################################################################
@@ -10,7 +10,6 @@
 
 
 # Enthought library imports.
-from apptools.preferences.api import IPreferences
 from traits.api import Event, Instance, Str, VetoableEvent
 
 # Local imports.
@@ -40,7 +39,10 @@ class IApplication(
     user_data = Str
 
     # The root preferences node.
-    preferences = Instance(IPreferences)
+    #
+    # The interface is named rather than imported so that 'apptools' is only
+    # imported when an application is actually created.
+    preferences = Instance("apptools.preferences.api.IPreferences")
 
     #### Events ####
 
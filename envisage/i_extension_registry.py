@@ -87,3 +87,12 @@ class IExtensionRegistry(Interface):
         """ Set the extensions contributed to an extension point.
 
         """
+
+    def update_extensions(self, extension_point_id, index, removed, added):
+        """ Replace some of the extensions contributed to an extension point.
+
+        The 'removed' extensions starting at 'index' are replaced by the
+        'added' extensions, and listeners are told exactly what changed (so
+        that they only have to do work proportional to the change).
+
+        """
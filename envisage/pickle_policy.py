@@ -0,0 +1,410 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A policy for how objects are pickled to files.
+
+Run this module as a script to migrate existing pickle files to a policy::
+
+    python -m envisage.pickle_policy --protocol 5 project.pkl ...
+
+"""
+
+
+# Standard library imports.
+import argparse
+import io
+import pickle
+import struct
+import sys
+
+# Enthought library imports.
+from traits.api import Bool, HasTraits, Int
+
+# Local imports.
+from ._atomic_file import atomic_open
+
+
+#: The bytes at the start of a file saved with a header ('E' isn't a pickle
+#: opcode, so a pickle without a header can never start with them).
+MAGIC = b"EPKL"
+
+#: The version of the header (incremented when it changes incompatibly).
+FORMAT_VERSION = 1
+
+#: The protocol needed for out-of-band buffers.
+OUT_OF_BAND_PROTOCOL = 5
+
+# The header: the magic bytes, the format version, the pickle protocol, the
+# number of out-of-band buffers and the length of the pickle. The pickle
+# follows the header, and each buffer (preceded by its length) follows that.
+_HEADER = struct.Struct(">4sBBIQ")
+_BUFFER_LENGTH = struct.Struct(">Q")
+
+
+class PicklePolicy(HasTraits):
+    """ A policy for how objects are pickled to files.
+
+    A policy chooses the pickle protocol, whether files start with a header
+    that records it (so that a file saved with a protocol that the running
+    Python doesn't support is rejected with a clear error before anything
+    is unpickled), and whether large buffers (e.g. the data of NumPy arrays)
+    are saved out-of-band.
+
+    Out-of-band buffers are saved after the pickle instead of being copied
+    into it, and are loaded straight into their own (writable) memory, which
+    saves a copy of all of the data both ways. They need protocol 5 (Python
+    3.8 and later) and a header; with any other policy the same objects are
+    simply pickled in-band.
+
+    Loading doesn't depend on the policy: files with and without a header
+    can be loaded by any policy.
+
+    """
+
+    #### 'PicklePolicy' interface #############################################
+
+    # The pickle protocol.
+    protocol = Int(pickle.HIGHEST_PROTOCOL)
+
+    # Does a file start with a header?
+    header = Bool(True)
+
+    # Are 'PickleBuffer's saved out-of-band (if the protocol supports it)?
+    out_of_band = Bool(True)
+
+    ###########################################################################
+    # 'PicklePolicy' interface.
+    ###########################################################################
+
+    def dump(self, obj, file, pickle_package=None, configure=None):
+        """ Pickle an object to a (binary) file.
+
+        If 'pickle_package' is not None then it is used to pickle the object
+        (e.g. 'apptools.sweet_pickle'). If 'configure' is not None then it is
+        called with the pickler (the package's 'Pickler') before anything is
+        pickled (e.g. to set its 'persistent_id' or 'dispatch_table').
+
+        """
+
+        for block in self.serialize(obj, pickle_package, configure):
+            file.write(block)
+
+        return
+
+    def dumps(self, obj, pickle_package=None, configure=None):
+        """ Pickle an object to bytes (see 'dump'). """
+
+        return b"".join(self.serialize(obj, pickle_package, configure))
+
+    def load(self, file, pickle_package=None, configure=None):
+        """ Unpickle an object from a (binary, seekable) file.
+
+        The file may or may not start with a header. 'pickle_package' and
+        'configure' are used as in 'dump' (but with the package's
+        'Unpickler'), except that files with out-of-band buffers are always
+        unpickled by the standard unpickler (as other unpicklers, such as
+        'apptools.sweet_pickle's, may not support them).
+
+        Raises a 'ValueError' if the file was saved with a newer format or
+        pickle protocol than is supported.
+
+        """
+
+        start = file.tell()
+        header = file.read(_HEADER.size)
+        if not header.startswith(MAGIC):
+            file.seek(start)
+            return self._unpickle(file, [], pickle_package, configure)
+
+        if len(header) < _HEADER.size:
+            raise EOFError("The pickle header is truncated")
+
+        magic, version, protocol, count, length = _HEADER.unpack(header)
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                "The pickle was saved with a newer format (version %d)"
+                % version
+            )
+
+        if protocol > pickle.HIGHEST_PROTOCOL:
+            raise ValueError(
+                "The pickle was saved with protocol %d, but this version of "
+                "Python only supports protocols up to %d"
+                % (protocol, pickle.HIGHEST_PROTOCOL)
+            )
+
+        # The buffers are read first (as the unpickler needs them), and then
+        # the pickle is unpickled straight from the file (without a copy).
+        position = file.tell()
+        if file.seek(0, io.SEEK_END) - position < length:
+            raise EOFError("The pickle is truncated")
+
+        file.seek(position + length)
+        buffers = []
+        for index in range(count):
+            (size,) = _BUFFER_LENGTH.unpack(
+                _read_exactly(file, _BUFFER_LENGTH.size)
+            )
+            buffers.append(_read_exactly(file, size))
+
+        end = file.tell()
+        file.seek(position)
+        obj = self._unpickle(file, buffers, pickle_package, configure)
+        file.seek(end)
+
+        return obj
+
+    def loads(self, data, pickle_package=None, configure=None):
+        """ Unpickle an object from bytes (see 'load'). """
+
+        return self.load(io.BytesIO(data), pickle_package, configure)
+
+    def serialize(self, obj, pickle_package=None, configure=None,
+                  copy_buffers=False):
+        """ Pickle an object to a list of blocks of bytes.
+
+        The blocks (bytes-like objects) are the contents of the file that
+        'dump' writes. Large out-of-band buffers are included as they are
+        (i.e. they still refer to the objects' own memory), unless
+        'copy_buffers' is True (e.g. if the blocks are written after the
+        objects may have been changed).
+
+        """
+
+        if self.protocol > pickle.HIGHEST_PROTOCOL:
+            raise ValueError(
+                "Pickle protocol %d is not supported (the highest is %d)"
+                % (self.protocol, pickle.HIGHEST_PROTOCOL)
+            )
+
+        out_of_band = (
+            self.out_of_band
+            and self.header
+            and self.protocol >= OUT_OF_BAND_PROTOCOL
+        )
+
+        buffers = []
+        file = io.BytesIO()
+        if (
+            pickle_package is not None
+            and configure is None
+            and not out_of_band
+        ):
+            pickle_package.dump(obj, file, self.protocol)
+
+        else:
+            pickler_class = pickle.Pickler
+            if pickle_package is not None:
+                pickler_class = pickle_package.Pickler
+
+            if out_of_band:
+                pickler = pickler_class(
+                    file, self.protocol, buffer_callback=buffers.append
+                )
+
+            else:
+                pickler = pickler_class(file, self.protocol)
+
+            if configure is not None:
+                configure(pickler)
+
+            pickler.dump(obj)
+
+        data = file.getbuffer()
+        if not self.header:
+            return [data]
+
+        blocks = [
+            _HEADER.pack(
+                MAGIC, FORMAT_VERSION, self.protocol, len(buffers), len(data)
+            ),
+            data,
+        ]
+        for buffer in buffers:
+            try:
+                raw = buffer.raw()
+
+            # Non-contiguous buffers have to be copied.
+            except BufferError:
+                raw = memoryview(bytes(memoryview(buffer)))
+
+            else:
+                if copy_buffers:
+                    raw = memoryview(bytes(raw))
+
+            blocks.append(_BUFFER_LENGTH.pack(raw.nbytes))
+            blocks.append(raw)
+
+        return blocks
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _unpickle(self, file, buffers, pickle_package, configure):
+        """ Unpickle an object from a file (without a header). """
+
+        if pickle_package is not None and configure is None and not buffers:
+            return pickle_package.load(file)
+
+        if len(buffers) > 0:
+            unpickler = pickle.Unpickler(file, buffers=buffers)
+
+        elif pickle_package is not None:
+            unpickler = pickle_package.Unpickler(file)
+
+        else:
+            unpickler = pickle.Unpickler(file)
+
+        if configure is not None:
+            configure(unpickler)
+
+        return unpickler.load()
+
+
+def migrate(filename, policy, pickle_package=None):
+    """ Save a pickle file again with a different policy.
+
+    The file is replaced atomically. Persistent IDs in the pickle are kept
+    as they are, so the objects that they refer to don't need to exist.
+
+    Returns the pickle protocol that the file was saved with before (or
+    None if it didn't have a header).
+
+    """
+
+    with open(filename, "rb") as f:
+        header = f.read(_HEADER.size)
+        f.seek(0)
+        obj = policy.load(f, pickle_package, _keep_persistent_ids)
+
+    old_protocol = None
+    if header.startswith(MAGIC) and len(header) == _HEADER.size:
+        old_protocol = _HEADER.unpack(header)[2]
+
+    with atomic_open(filename) as f:
+        policy.dump(obj, f, pickle_package, _keep_persistent_ids)
+
+    return old_protocol
+
+
+def main(argv=None):
+    """ Migrate pickle files to a policy (from the command line). """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m envisage.pickle_policy",
+        description="Save pickle files again with a different pickle policy.",
+    )
+    parser.add_argument("filenames", nargs="+", metavar="FILE")
+    parser.add_argument(
+        "--protocol",
+        type=int,
+        default=pickle.HIGHEST_PROTOCOL,
+        help="the pickle protocol (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-header",
+        action="store_true",
+        help="don't start the files with a header",
+    )
+    parser.add_argument(
+        "--in-band",
+        action="store_true",
+        help="don't save large buffers out-of-band",
+    )
+    parser.add_argument(
+        "--sweet-pickle",
+        action="store_true",
+        help=(
+            "load and save with apptools.sweet_pickle, applying its class "
+            "mappings and state functions (e.g. for projects)"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    policy = PicklePolicy(
+        protocol=args.protocol,
+        header=not args.no_header,
+        out_of_band=not args.in_band,
+    )
+
+    pickle_package = None
+    if args.sweet_pickle:
+        import apptools.sweet_pickle as pickle_package
+
+    status = 0
+    for filename in args.filenames:
+        try:
+            old_protocol = migrate(filename, policy, pickle_package)
+
+        except Exception as exc:
+            print("%s: %s" % (filename, exc), file=sys.stderr)
+            status = 1
+
+        else:
+            print(
+                "%s: migrated from %s to protocol %d"
+                % (
+                    filename,
+                    "no header"
+                    if old_protocol is None
+                    else "protocol %d" % old_protocol,
+                    policy.protocol,
+                )
+            )
+
+    return status
+
+
+class _PersistentID(object):
+    """ A persistent ID kept as it is by 'migrate'. """
+
+    def __init__(self, persistent_id):
+        """ Constructor. """
+
+        self.persistent_id = persistent_id
+
+        return
+
+
+def _keep_persistent_ids(pickler_or_unpickler):
+    """ Make a (un)pickler keep persistent IDs as they are. """
+
+    # Not all unpicklers derive from 'pickle.Unpickler' (e.g. the one in
+    # 'apptools.sweet_pickle').
+    if not hasattr(pickler_or_unpickler, "dump"):
+        pickler_or_unpickler.persistent_load = _PersistentID
+
+    else:
+        pickler_or_unpickler.persistent_id = (
+            lambda obj: obj.persistent_id
+            if isinstance(obj, _PersistentID)
+            else None
+        )
+
+    return
+
+
+def _read_exactly(file, size):
+    """ Read exactly 'size' bytes from a file (into writable memory). """
+
+    data = bytearray(size)
+    view = memoryview(data)
+    offset = 0
+    while offset < size:
+        count = file.readinto(view[offset:])
+        if not count:
+            raise EOFError("The pickle is truncated")
+
+        offset += count
+
+    return data
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,11 +10,46 @@
 
 
 # Enthought library imports.
-from traits.api import Instance, Vetoable
+from traits.api import Bool, HasStrictTraits, Instance
 
+# Local imports.
+from .event_validation import is_event_validation_enabled
 
-class PluginEvent(Vetoable):
-    """ A plugin event. """
 
-    # The plugin that the event is for.
+class PluginEvent(object):
+    """ A plugin event.
+
+    This is a lightweight object with '__slots__' as one is created every
+    time a plugin is added or removed. Its attributes are only validated in
+    debug mode (see 'envisage.event_validation').
+
+    """
+
+    __slots__ = ("plugin", "veto")
+
+    def __init__(self, plugin=None, veto=False):
+        """ Constructor. """
+
+        if is_event_validation_enabled():
+            _PluginEventTraits(plugin=plugin, veto=veto)
+
+        # The plugin that the event is for.
+        self.plugin = plugin
+
+        # Should the request be vetoed?
+        self.veto = veto
+
+        return
+
+    def __repr__(self):
+        """ Return a string representation of the event. """
+
+        return "{}(plugin={!r})".format(type(self).__name__, self.plugin)
+
+
+class _PluginEventTraits(HasStrictTraits):
+    """ The traits used to validate an event in debug mode. """
+
     plugin = Instance("envisage.api.IPlugin")
+
+    veto = Bool(False)
@@ -6,4 +6,6 @@
 # under the conditions described in the aforementioned license.  The license
 # is also available online at http://www.enthought.com/licenses/BSD.txt
 # Thanks for using Enthought open source!
+from .background_executor import BackgroundExecutor, BackgroundJob
+from .code_cache import CodeCache
 from .i_python_shell import IPythonShell
@@ -0,0 +1,426 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Executes Python code in a namespace on a worker thread. """
+
+
+# Standard library imports.
+import ctypes
+import logging
+import queue
+import sys
+import threading
+import traceback
+from types import CodeType
+
+# Enthought library imports.
+from traits.api import Any, Event, HasTraits, Instance, Int, Property
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJob(object):
+    """ A piece of code submitted to a background executor. """
+
+    def __init__(self, code, filename, hidden=False):
+        """ Constructor. """
+
+        # The compiled code.
+        self.code = code
+
+        # The name of the file that the code came from (or a pseudo-filename
+        # such as '<input>').
+        self.filename = filename
+
+        # If True then no output events are fired for the job.
+        self.hidden = hidden
+
+        # The position of the job in the order that jobs were submitted.
+        self.sequence = 0
+
+        # Was the job cancelled before it completed?
+        self.cancelled = False
+
+        # The exception raised by the code (if any).
+        self.exception = None
+
+        # A (shallow) copy of the executor's namespace taken when the job
+        # finished. Unlike the namespace itself, this can safely be used on
+        # another thread while the next job is running.
+        self.namespace = None
+
+        # Set when the job has finished (whether it completed, failed or was
+        # cancelled).
+        self._done = threading.Event()
+
+        return
+
+    def __repr__(self):
+        """ Return the 'official' string representation of the object. """
+
+        return "BackgroundJob(%r)" % self.filename
+
+    @property
+    def done(self):
+        """ Has the job finished? """
+
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """ Wait for the job to finish.
+
+        Return True if the job has finished, or False if the timeout expired
+        first.
+
+        """
+
+        return self._done.wait(timeout)
+
+
+class BackgroundExecutor(HasTraits):
+    """ Executes Python code in a namespace on a worker thread.
+
+    Jobs are executed one at a time, in the order that they were submitted,
+    on a single worker thread (created when the first job is submitted).
+    Anything that a job writes to 'sys.stdout' or 'sys.stderr' is fired as
+    an 'output' event as it is written, and the traceback of any exception
+    that it raises is written to 'stderr'.
+
+    To do that, the executor replaces 'sys.stdout' and 'sys.stderr' (once,
+    when it is created, until it is shut down) with streams that send text
+    written by the thread running a job to the job, and everything else to
+    the original streams.
+
+    The 'output' and 'finished' events are fired on the worker thread, so
+    GUI code should listen to them with 'dispatch="ui"' (and use the copy of
+    the namespace in each finished job rather than the namespace itself,
+    which the next job may already be changing).
+
+    """
+
+    #### 'BackgroundExecutor' interface #######################################
+
+    # The namespace that the code is executed in. This is *not* copied, so
+    # the code can use and change the same namespace as everything else
+    # (e.g. an interactive interpreter).
+    namespace = Instance(dict, ())
+
+    # Fired with a tuple in the form (job, stream_name, text) when a job
+    # writes to 'stdout' or 'stderr' (the stream name is one of those).
+    output = Event
+
+    # Fired with each job when it has finished.
+    finished = Event
+
+    # The job that is currently running (or None if no job is running).
+    running_job = Property
+
+    #### Private interface ####################################################
+
+    # The jobs waiting to be run ('None' tells the worker thread to exit).
+    _queue = Instance(queue.Queue, ())
+
+    # The worker thread.
+    _thread = Instance(threading.Thread)
+
+    # The job that is currently running.
+    _running_job = Any
+
+    # The number of jobs submitted so far.
+    _submitted = Int
+
+    # The number of jobs submitted when the jobs were last cancelled (jobs
+    # up to and including this one are skipped if they haven't started).
+    _cancelled = Int
+
+    # Protects the running job (so that a job is never cancelled once it
+    # has finished).
+    _lock = Any
+
+    # The job being run by each thread (i.e. the worker thread, and any
+    # thread running a job with 'execute').
+    #
+    # { int thread_ident : BackgroundJob job }
+    _thread_jobs = Instance(dict, ())
+
+    # The streams that replace 'sys.stdout' and 'sys.stderr'.
+    _stdout = Any
+    _stderr = Any
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        super(BackgroundExecutor, self).__init__(**traits)
+
+        self._lock = threading.Lock()
+
+        # The streams are replaced once, rather than for each job, as other
+        # code (e.g. a shell running commands in the GUI thread) may replace
+        # them too while a job is running.
+        self._stdout = sys.stdout = _ThreadStream(sys.stdout, "stdout", self)
+        self._stderr = sys.stderr = _ThreadStream(sys.stderr, "stderr", self)
+
+        return
+
+    ###########################################################################
+    # 'BackgroundExecutor' interface.
+    ###########################################################################
+
+    def cancel(self):
+        """ Cancel the running job and any jobs that are waiting to run.
+
+        The running job is cancelled by raising a 'KeyboardInterrupt' in the
+        worker thread (just like pressing Ctrl-C in a console). Note that
+        this only happens when the thread next executes Python code, so a
+        job that is blocked in a long call into an extension module will
+        only be cancelled when that call returns.
+
+        """
+
+        with self._lock:
+            # Jobs that haven't started yet are skipped by the worker.
+            self._cancelled = self._submitted
+
+            if self._running_job is not None:
+                self._running_job.cancelled = True
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                    ctypes.c_ulong(self._thread.ident),
+                    ctypes.py_object(KeyboardInterrupt),
+                )
+
+        return
+
+    def shutdown(self, timeout=None):
+        """ Cancel all jobs and stop the worker thread.
+
+        The original 'sys.stdout' and 'sys.stderr' are restored (unless they
+        have been replaced again since the executor was created).
+
+        """
+
+        self.cancel()
+
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+        if sys.stdout is self._stdout:
+            sys.stdout = self._stdout.stream
+
+        if sys.stderr is self._stderr:
+            sys.stderr = self._stderr.stream
+
+        return
+
+    def execute(self, source, filename="<input>", symbol="exec", hidden=False):
+        """ Execute some code immediately on the calling thread.
+
+        The arguments are the same as for 'submit', and the code's output,
+        and the 'finished' event, are handled exactly as they are for jobs
+        run in the background (but the code can't be cancelled).
+
+        Returns the (finished) job.
+
+        """
+
+        job = self._create_job(source, filename, symbol, hidden)
+
+        self._run(job)
+        self._finish(job)
+
+        return job
+
+    def submit(self, source, filename="<input>", symbol="exec", hidden=False):
+        """ Submit some code to be executed in the background.
+
+        'source' is either a string or a code object. Strings are compiled
+        immediately, so a 'SyntaxError' (or an 'OverflowError' or
+        'ValueError') is raised here if the code cannot be compiled.
+        'symbol' is the same as in the builtin 'compile' (use 'single' to
+        print the value of an expression as an interactive interpreter
+        does). If 'hidden' is True then anything that the code writes to
+        'stdout' or 'stderr' is discarded.
+
+        Returns the job (which can be used to wait for the code to finish).
+
+        """
+
+        job = self._create_job(source, filename, symbol, hidden)
+
+        with self._lock:
+            self._submitted += 1
+            job.sequence = self._submitted
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._work, name="BackgroundExecutor"
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+        self._queue.put(job)
+
+        return job
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_running_job(self):
+        """ Property getter. """
+
+        return self._running_job
+
+    def _create_job(self, source, filename, symbol, hidden):
+        """ Create a job for some source code or a code object. """
+
+        if isinstance(source, CodeType):
+            code = source
+
+        else:
+            code = compile(source, filename, symbol)
+
+        return BackgroundJob(code, filename, hidden)
+
+    def _finish(self, job):
+        """ Mark a job as finished. """
+
+        # Copying a dictionary doesn't run any Python code, so no other
+        # thread can change the namespace while it is being copied.
+        job.namespace = dict(self.namespace)
+        job._done.set()
+        self.finished = job
+
+        return
+
+    def _run(self, job):
+        """ Run a job (in the worker thread). """
+
+        ident = threading.get_ident()
+        self._thread_jobs[ident] = job
+        try:
+            try:
+                try:
+                    exec(job.code, self.namespace)
+
+                finally:
+                    with self._lock:
+                        if self._running_job is job:
+                            self._running_job = None
+
+            except KeyboardInterrupt:
+                job.cancelled = True
+
+            except BaseException as exc:
+                job.exception = exc
+
+                # Leave this module's frame out of the traceback.
+                lines = traceback.format_exception(
+                    type(exc), exc, exc.__traceback__.tb_next
+                )
+                self._write(job, "stderr", "".join(lines))
+
+        # If the job was cancelled just as it was finishing then the
+        # exception might not be raised until we get here.
+        except KeyboardInterrupt:
+            job.cancelled = True
+
+        finally:
+            del self._thread_jobs[ident]
+
+        return
+
+    def _write(self, job, name, text):
+        """ Fire an output event for some text written by a job. """
+
+        if not job.hidden:
+            self.output = (job, name, text)
+
+        return
+
+    def _work(self):
+        """ Run jobs until asked to exit (in the worker thread). """
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            with self._lock:
+                if job.sequence <= self._cancelled:
+                    job.cancelled = True
+
+                else:
+                    self._running_job = job
+
+            if not job.cancelled:
+                self._run(job)
+
+            try:
+                self._finish(job)
+
+            except Exception:
+                logger.exception("Error in finished handler for %s", job)
+
+        return
+
+
+class _ThreadStream(object):
+    """ Routes text written by the threads running jobs to the jobs.
+
+    Text written by any other thread is written to the original stream.
+
+    """
+
+    def __init__(self, stream, name, executor):
+        """ Constructor. """
+
+        self.stream = stream
+        self._name = name
+        self._executor = executor
+
+        return
+
+    def __getattr__(self, name):
+        """ Delegate everything else to the original stream. """
+
+        return getattr(self.stream, name)
+
+    def flush(self):
+        """ Flush the stream. """
+
+        if threading.get_ident() not in self._executor._thread_jobs:
+            self.stream.flush()
+
+        return
+
+    def write(self, text):
+        """ Write some text to the stream. """
+
+        job = self._executor._thread_jobs.get(threading.get_ident())
+        if job is not None:
+            self._executor._write(job, self._name, text)
+
+        else:
+            self.stream.write(text)
+
+        return len(text)
+
+    def writelines(self, lines):
+        """ Write a list of lines to the stream. """
+
+        for line in lines:
+            self.write(line)
+
+        return
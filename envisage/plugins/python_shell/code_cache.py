@@ -0,0 +1,108 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A cache of compiled code objects keyed by the hash of their source. """
+
+
+# Standard library imports.
+from collections import OrderedDict
+import hashlib
+
+
+#: The default maximum number of code objects in a cache.
+MAX_SIZE = 128
+
+
+class CodeCache(object):
+    """ A cache of compiled code objects keyed by the hash of their source.
+
+    Running the same source code again (e.g. running a script again after
+    editing a different part of it) reuses the code object compiled the
+    first time instead of compiling it from scratch. Only the most recently
+    used code objects are kept.
+
+    """
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, max_size=MAX_SIZE):
+        """ Constructor. """
+
+        # The maximum number of code objects in the cache.
+        self.max_size = max_size
+
+        # The number of times that a code object was found in the cache.
+        self.hits = 0
+
+        # The number of times that source code had to be compiled.
+        self.misses = 0
+
+        # The code objects keyed by (hash, filename, symbol, first_line), in
+        # order of use.
+        self._code = OrderedDict()
+
+        return
+
+    def __len__(self):
+        """ Return the number of code objects in the cache. """
+
+        return len(self._code)
+
+    ###########################################################################
+    # 'CodeCache' interface.
+    ###########################################################################
+
+    def clear(self):
+        """ Remove all of the code objects from the cache. """
+
+        self._code.clear()
+
+        return
+
+    def compile(self, source, filename="<input>", symbol="exec", first_line=1):
+        """ Return the code object for some source code.
+
+        'first_line' is the line number of the first line of the source code
+        in the file that it came from (e.g. if it is a single cell or the
+        selected lines in an editor), so that the line numbers in tracebacks
+        are those in the file.
+
+        Raises a 'SyntaxError' (or an 'OverflowError' or 'ValueError') if the
+        source code cannot be compiled, exactly like the builtin 'compile'.
+
+        """
+
+        digest = hashlib.sha1(
+            source.encode("utf-8", "surrogatepass")
+        ).digest()
+        key = (digest, filename, symbol, first_line)
+
+        code = self._code.get(key)
+        if code is None:
+            self.misses += 1
+
+            # Blank lines are cheap to compile, and much simpler than
+            # adjusting the line numbers in the code object afterwards.
+            code = compile(
+                "\n" * (first_line - 1) + source,
+                filename,
+                symbol,
+                dont_inherit=True,
+            )
+
+            self._code[key] = code
+            if len(self._code) > self.max_size:
+                self._code.popitem(last=False)
+
+        else:
+            self.hits += 1
+            self._code.move_to_end(key)
+
+        return code
@@ -0,0 +1,233 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import io
+import sys
+import threading
+import unittest
+
+from envisage.plugins.python_shell.api import BackgroundExecutor
+
+#: The time (in seconds) to wait for a job before giving up.
+TIMEOUT = 10.0
+
+
+class TestBackgroundExecutor(unittest.TestCase):
+    def setUp(self):
+        self.namespace = {}
+        self.executor = BackgroundExecutor(namespace=self.namespace)
+        self.addCleanup(self.executor.shutdown, TIMEOUT)
+
+        self.output = []
+        self.executor.on_trait_change(self._on_output, "output")
+
+    def _on_output(self, output):
+        job, name, text = output
+        self.output.append((name, text))
+
+    def _text(self, name):
+        return "".join(text for stream, text in self.output if stream == name)
+
+    def test_shared_namespace(self):
+        self.namespace["x"] = 1
+
+        job = self.executor.submit("y = x + 1")
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertEqual(self.namespace["y"], 2)
+        self.assertIsNone(job.exception)
+        self.assertFalse(job.cancelled)
+
+    def test_runs_on_worker_thread(self):
+        job = self.executor.submit(
+            "import threading; thread = threading.current_thread()"
+        )
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertIsNot(self.namespace["thread"], threading.current_thread())
+
+    def test_output_is_streamed(self):
+        job = self.executor.submit(
+            "import sys\nprint('hello')\nsys.stderr.write('oops\\n')"
+        )
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertEqual(self._text("stdout"), "hello\n")
+        self.assertEqual(self._text("stderr"), "oops\n")
+
+    def test_streams_are_not_replaced_for_each_job(self):
+        stdout, stderr = sys.stdout, sys.stderr
+
+        job = self.executor.submit("print('hello')")
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertIs(sys.stdout, stdout)
+        self.assertIs(sys.stderr, stderr)
+
+    def test_streams_are_restored_on_shutdown(self):
+        stdout, stderr = sys.stdout, sys.stderr
+        executor = BackgroundExecutor()
+        self.assertIsNot(sys.stdout, stdout)
+
+        executor.shutdown(TIMEOUT)
+
+        self.assertIs(sys.stdout, stdout)
+        self.assertIs(sys.stderr, stderr)
+
+    def test_streams_replaced_while_job_is_running(self):
+        # Something else (e.g. a shell running a command in the GUI thread)
+        # replaces 'sys.stdout' while a job is running, and restores it
+        # afterwards.
+        started = threading.Event()
+        release = threading.Event()
+        self.namespace.update(started=started, release=release)
+        stdout = sys.stdout
+
+        job = self.executor.submit(
+            "started.set()\nrelease.wait(%s)\nprint('first')" % TIMEOUT
+        )
+        self.assertTrue(started.wait(TIMEOUT))
+        saved, sys.stdout = sys.stdout, io.StringIO()
+        try:
+            release.set()
+            self.assertTrue(job.wait(TIMEOUT))
+
+        finally:
+            other, sys.stdout = sys.stdout, saved
+
+        # Later jobs still have their output routed to them (and the job's
+        # output while the stream was replaced went to the replacement).
+        job = self.executor.submit("print('second')")
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertIs(sys.stdout, stdout)
+        self.assertEqual(other.getvalue(), "first\n")
+        self.assertEqual(self._text("stdout"), "second\n")
+
+    def test_other_threads_write_to_original_stream(self):
+        stream = self.executor._stdout.stream
+        original = self.executor._stdout.stream = io.StringIO()
+        try:
+            print("not from a job")
+
+        finally:
+            self.executor._stdout.stream = stream
+
+        self.assertEqual(original.getvalue(), "not from a job\n")
+        self.assertEqual(self.output, [])
+
+    def test_hidden_output(self):
+        job = self.executor.submit("print('hello')", hidden=True)
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertEqual(self.output, [])
+
+    def test_single_prints_expression(self):
+        job = self.executor.submit("6 * 7", symbol="single")
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertEqual(self._text("stdout"), "42\n")
+
+    def test_exception(self):
+        job = self.executor.submit("1 / 0")
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertIsInstance(job.exception, ZeroDivisionError)
+        self.assertIn("ZeroDivisionError", self._text("stderr"))
+        self.assertNotIn("background_executor", self._text("stderr"))
+
+    def test_syntax_error(self):
+        with self.assertRaises(SyntaxError):
+            self.executor.submit("1 +")
+
+    def test_jobs_run_in_order(self):
+        jobs = [
+            self.executor.submit("order = []"),
+            self.executor.submit("order.append(1)"),
+            self.executor.submit("order.append(2)"),
+        ]
+
+        self.assertTrue(jobs[-1].wait(TIMEOUT))
+        self.assertEqual(self.namespace["order"], [1, 2])
+
+    def test_cancel(self):
+        started = threading.Event()
+        self.namespace["started"] = started
+
+        running = self.executor.submit("started.set()\nwhile True: pass")
+        waiting = self.executor.submit("x = 1")
+        self.assertTrue(started.wait(TIMEOUT))
+
+        self.executor.cancel()
+
+        self.assertTrue(running.wait(TIMEOUT))
+        self.assertTrue(waiting.wait(TIMEOUT))
+        self.assertTrue(running.cancelled)
+        self.assertTrue(waiting.cancelled)
+        self.assertNotIn("x", self.namespace)
+        self.assertIsNone(self.executor.running_job)
+
+        # The executor can still be used after a job is cancelled.
+        job = self.executor.submit("x = 2")
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertEqual(self.namespace["x"], 2)
+
+    def test_finished_event(self):
+        finished = []
+        self.executor.on_trait_change(
+            lambda job: finished.append(job), "finished"
+        )
+
+        job = self.executor.submit("pass")
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.executor.shutdown(TIMEOUT)
+        self.assertEqual(finished, [job])
+
+    def test_finished_job_has_copy_of_namespace(self):
+        # Queue jobs back to back, each of which changes the namespace.
+        jobs = [self.executor.submit("x = 0")]
+        for i in range(1, 50):
+            jobs.append(self.executor.submit("y%d = x\nx += 1" % i))
+
+        self.assertTrue(jobs[-1].wait(TIMEOUT))
+
+        # Each job's copy is the namespace as that job left it (even though
+        # later jobs had already changed the namespace by the time that it
+        # was used).
+        for i, job in enumerate(jobs):
+            self.assertIsNot(job.namespace, self.namespace)
+            self.assertEqual(job.namespace["x"], i)
+            self.assertNotIn("y%d" % (i + 1), job.namespace)
+
+    def test_submit_code_object(self):
+        code = compile("x = 1", "script.py", "exec")
+
+        job = self.executor.submit(code, "script.py")
+
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertIs(job.code, code)
+        self.assertEqual(self.namespace["x"], 1)
+
+    def test_execute(self):
+        job = self.executor.execute(
+            "import threading\n"
+            "thread = threading.current_thread()\n"
+            "print('hello')"
+        )
+
+        self.assertTrue(job.done)
+        self.assertIs(self.namespace["thread"], threading.current_thread())
+        self.assertEqual(self._text("stdout"), "hello\n")
+
+    def test_execute_exception(self):
+        job = self.executor.execute("1 / 0")
+
+        self.assertIsInstance(job.exception, ZeroDivisionError)
+        self.assertIn("ZeroDivisionError", self._text("stderr"))
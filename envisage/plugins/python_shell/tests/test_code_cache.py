@@ -0,0 +1,74 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import traceback
+import unittest
+
+from envisage.plugins.python_shell.api import CodeCache
+
+
+class TestCodeCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = CodeCache(max_size=2)
+
+    def test_same_source_is_only_compiled_once(self):
+        code = self.cache.compile("x = 1", "script.py")
+
+        self.assertIs(self.cache.compile("x = 1", "script.py"), code)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_different_source(self):
+        code = self.cache.compile("x = 1", "script.py")
+
+        self.assertIsNot(self.cache.compile("x = 2", "script.py"), code)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_different_filename_or_first_line(self):
+        code = self.cache.compile("x = 1", "script.py")
+
+        self.assertIsNot(self.cache.compile("x = 1", "other.py"), code)
+        self.assertIsNot(
+            self.cache.compile("x = 1", "script.py", first_line=3), code
+        )
+
+    def test_first_line(self):
+        code = self.cache.compile("x = 1\n1 / 0\n", "script.py", first_line=10)
+
+        try:
+            exec(code, {})
+
+        except ZeroDivisionError as exc:
+            frame = traceback.extract_tb(exc.__traceback__)[-1]
+
+        self.assertEqual((frame.filename, frame.lineno), ("script.py", 11))
+
+    def test_least_recently_used_code_is_discarded(self):
+        first = self.cache.compile("x = 1")
+        self.cache.compile("x = 2")
+
+        # Use the first code object again, so the second is discarded.
+        self.cache.compile("x = 1")
+        self.cache.compile("x = 3")
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIs(self.cache.compile("x = 1"), first)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_syntax_error(self):
+        with self.assertRaises(SyntaxError):
+            self.cache.compile("x = ")
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_clear(self):
+        self.cache.compile("x = 1")
+
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
@@ -0,0 +1,133 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import unittest
+from unittest import mock
+
+from envisage.plugins.python_shell.view import namespace_bindings
+from envisage.plugins.python_shell.view.namespace_bindings import (
+    NamespaceBinding,
+    NamespaceBindings,
+)
+
+
+class TestNamespaceBinding(unittest.TestCase):
+    def test_type_and_module(self):
+        binding = NamespaceBinding("x", unittest.TestCase)
+
+        self.assertEqual(binding.name, "x")
+        self.assertEqual(binding.type, "builtins.type")
+        self.assertEqual(binding.module, "unittest.case")
+
+    def test_no_module(self):
+        binding = NamespaceBinding("x", 1)
+
+        self.assertEqual(binding.type, "builtins.int")
+        self.assertEqual(binding.module, "")
+
+    def test_rebinding_resets_type(self):
+        binding = NamespaceBinding("x", 1)
+        self.assertEqual(binding.type, "builtins.int")
+
+        binding.value = "one"
+
+        self.assertEqual(binding.type, "builtins.str")
+
+
+class TestNamespaceBindings(unittest.TestCase):
+    def setUp(self):
+        self.model = NamespaceBindings()
+
+        self.events = []
+        self.model.on_trait_change(self._record, "bindings_items")
+        self.model.on_trait_change(self._record, "bindings_updated")
+
+    def _record(self, object, name, old, new):
+        self.events.append((name, new))
+
+    def _names(self):
+        return [binding.name for binding in self.model.bindings]
+
+    def test_initial_bindings(self):
+        self.model.update({"a": 1, "b": 2, "c": 3})
+
+        self.assertEqual(self._names(), ["a", "b", "c"])
+
+    def test_rows_are_reused(self):
+        value = object()
+        self.model.update({"a": 1, "b": value})
+        rows = list(self.model.bindings)
+        del self.events[:]
+
+        self.model.update({"a": 1, "b": value, "c": 3})
+
+        self.assertEqual(self._names(), ["a", "b", "c"])
+        self.assertIs(self.model.bindings[0], rows[0])
+        self.assertIs(self.model.bindings[1], rows[1])
+
+        # Only the new row is added.
+        self.assertEqual(len(self.events), 1)
+        name, event = self.events[0]
+        self.assertEqual(event.index, 2)
+        self.assertEqual([binding.name for binding in event.added], ["c"])
+
+    def test_removed_names(self):
+        namespace = dict((name, None) for name in "abcdefg")
+        self.model.update(namespace)
+        del self.events[:]
+
+        for name in "bcdf":
+            del namespace[name]
+        self.model.update(namespace)
+
+        self.assertEqual(self._names(), ["a", "e", "g"])
+
+        # Consecutive rows are removed together.
+        removed = [
+            [binding.name for binding in event.removed]
+            for name, event in self.events
+        ]
+        self.assertEqual(removed, [["f"], ["b", "c", "d"]])
+
+    def test_clear(self):
+        self.model.update(dict((name, None) for name in "abc"))
+        del self.events[:]
+
+        self.model.update({})
+
+        self.assertEqual(self._names(), [])
+        self.assertEqual(len(self.events), 1)
+
+    def test_rebound_name(self):
+        self.model.update({"a": 1, "b": 2})
+        row = self.model.bindings[1]
+        self.assertEqual(row.type, "builtins.int")
+        del self.events[:]
+
+        self.model.update({"a": 1, "b": "two"})
+
+        self.assertIs(self.model.bindings[1], row)
+        self.assertEqual(row.type, "builtins.str")
+        self.assertEqual([name for name, event in self.events], [
+            "bindings_updated"
+        ])
+
+    def test_types_are_computed_lazily(self):
+        self.model.update(
+            dict(("x%d" % index, index) for index in range(100))
+        )
+
+        type_to_str = mock.Mock(wraps=namespace_bindings.type_to_str)
+        with mock.patch.object(namespace_bindings, "type_to_str", type_to_str):
+            # e.g. Only the first few rows are visible.
+            for binding in self.model.bindings[:10]:
+                self.assertEqual(binding.type, "builtins.int")
+                self.assertEqual(binding.type, "builtins.int")
+
+        self.assertEqual(type_to_str.call_count, 10)
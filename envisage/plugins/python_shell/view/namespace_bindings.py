@@ -0,0 +1,191 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" An incrementally updated model of the bindings in a namespace. """
+
+
+# Enthought library imports.
+from traits.api import Event, HasTraits, Instance, List
+
+
+def type_to_str(obj):
+    """
+    Make a string out `obj`'s type robustly.
+    """
+    typ = type(obj)
+    if typ.__name__ == "vtkobject":
+        typ = obj.__class__
+    if type.__module__ == "__builtin__":
+        # Make things like int and str easier to read.
+        return typ.__name__
+    else:
+        name = "%s.%s" % (typ.__module__, typ.__name__)
+        return name
+
+
+def module_to_str(obj):
+    """
+    Return the string representation of *obj*'s ``__module__`` attribute, or
+    an empty string if there is no such attribute.
+    """
+    if hasattr(obj, "__module__"):
+        return str(obj.__module__)
+    else:
+        return ""
+
+
+class NamespaceBinding(object):
+    """ A row in the namespace view (i.e. a name bound in the namespace).
+
+    The 'type' and 'module' strings are only computed when they are first
+    asked for (e.g. when the row is scrolled into view), and are recomputed
+    if the name is bound to a different value.
+
+    """
+
+    # There can be a *lot* of these (one for every name in the namespace).
+    __slots__ = ("name", "_value", "_type", "_module")
+
+    def __init__(self, name, value):
+        """ Constructor. """
+
+        self.name = name
+        self.value = value
+
+        return
+
+    def __repr__(self):
+        """ Return the 'official' string representation of the object. """
+
+        return "NamespaceBinding(%r)" % self.name
+
+    #### Properties ###########################################################
+
+    @property
+    def value(self):
+        """ The value bound to the name. """
+
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._type = None
+        self._module = None
+
+    @property
+    def type(self):
+        """ The name of the type of the value. """
+
+        if self._type is None:
+            self._type = type_to_str(self._value)
+
+        return self._type
+
+    @property
+    def module(self):
+        """ The module that the value was defined in (if any). """
+
+        if self._module is None:
+            self._module = module_to_str(self._value)
+
+        return self._module
+
+
+class NamespaceBindings(HasTraits):
+    """ An incrementally updated model of the bindings in a namespace.
+
+    Each update compares the namespace with the existing rows, so only the
+    rows for names that have been added or removed are created or deleted,
+    and rows for names that are still bound to the same value are reused
+    as they are (along with their 'type' and 'module' strings).
+
+    """
+
+    #### 'NamespaceBindings' interface ########################################
+
+    # The bindings in the namespace (in the order that the names are in the
+    # namespace when they are first added).
+    bindings = List
+
+    # Fired when names that are already in the bindings are bound to
+    # different values (i.e. when existing rows have changed).
+    bindings_updated = Event
+
+    #### Private interface ####################################################
+
+    # The row for each name in the bindings.
+    _rows = Instance(dict, ())
+
+    ###########################################################################
+    # 'NamespaceBindings' interface.
+    ###########################################################################
+
+    def update(self, namespace):
+        """ Update the bindings to match a namespace. """
+
+        rows = self._rows
+
+        # Remove the rows for names that are no longer bound.
+        removed = [
+            index
+            for index, row in enumerate(self.bindings)
+            if row.name not in namespace
+        ]
+        if len(removed) > 0:
+            for index in removed:
+                del rows[self.bindings[index].name]
+
+            self._delete_rows(removed)
+
+        # Add rows for new names and update the rows for rebound names.
+        added = []
+        updated = False
+        for name, value in namespace.items():
+            row = rows.get(name)
+            if row is None:
+                row = rows[name] = NamespaceBinding(name, value)
+                added.append(row)
+
+            elif row.value is not value:
+                row.value = value
+                updated = True
+
+        if len(added) > 0:
+            self.bindings.extend(added)
+
+        if updated:
+            self.bindings_updated = True
+
+        return
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _delete_rows(self, indices):
+        """ Delete the rows at the given (ascending) indices.
+
+        Consecutive rows are deleted as a single slice (so that, for example,
+        clearing the namespace only deletes a single range of rows).
+
+        """
+
+        # Work backwards so that deleting rows doesn't move the others.
+        end = start = indices[-1]
+        for index in reversed(indices[:-1]):
+            if index == start - 1:
+                start = index
+
+            else:
+                del self.bindings[start:end + 1]
+                end = start = index
+
+        del self.bindings[start:end + 1]
+
+        return
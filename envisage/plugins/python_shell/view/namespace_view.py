@@ -11,6 +11,12 @@
 # Enthought library imports.
 
 from envisage.plugins.python_shell.api import IPythonShell
+# 'module_to_str' and 'type_to_str' used to be defined in this module.
+from envisage.plugins.python_shell.view.namespace_bindings import (  # noqa
+    NamespaceBindings,
+    module_to_str,
+    type_to_str,
+)
 from envisage.plugins.python_shell.view.python_shell_view import (
     PythonShellView,
 )
@@ -18,66 +24,37 @@ from envisage.plugins.python_shell.view.python_shell_view import (
 from pyface.workbench.api import View
 
 from traits.api import (
-    HasTraits,
-    Str,
     Property,
     List,
     Instance,
     DelegatesTo,
-    cached_property,
+    on_trait_change,
 )
 
-from traitsui.api import Item, TableEditor, VGroup
+from traitsui.api import Item, TabularEditor, VGroup
 from traitsui.api import View as TraitsView
-from traitsui.table_column import ObjectColumn
-from traitsui.table_filter import RuleTableFilter
-from traitsui.table_filter import MenuFilterTemplate
-from traitsui.table_filter import EvalFilterTemplate
-from traitsui.table_filter import RuleFilterTemplate
-
-
-# Table editor definition:
-filters = [EvalFilterTemplate, MenuFilterTemplate, RuleFilterTemplate]
-
-table_editor = TableEditor(
-    columns=[
-        ObjectColumn(name="name"),
-        ObjectColumn(name="type"),
-        ObjectColumn(name="module"),
-    ],
-    editable=False,
-    deletable=False,
-    sortable=True,
-    sort_model=False,
-    filters=filters,
-    search=RuleTableFilter(),
-)
+from traitsui.tabular_adapter import TabularAdapter
 
 
-def type_to_str(obj):
-    """
-    Make a string out `obj`'s type robustly.
-    """
-    typ = type(obj)
-    if typ.__name__ == "vtkobject":
-        typ = obj.__class__
-    if type.__module__ == "__builtin__":
-        # Make things like int and str easier to read.
-        return typ.__name__
-    else:
-        name = "%s.%s" % (typ.__module__, typ.__name__)
-        return name
-
-
-def module_to_str(obj):
-    """
-    Return the string representation of *obj*'s ``__module__`` attribute, or
-    an empty string if there is no such attribute.
+class NamespaceBindingsAdapter(TabularAdapter):
+    """ Adapts the bindings in a namespace for a tabular editor.
+
+    The editor only asks for the text of the rows that are visible, so the
+    type and module of each value are only computed as rows are scrolled
+    into view.
+
     """
-    if hasattr(obj, "__module__"):
-        return str(obj.__module__)
-    else:
-        return ""
+
+    columns = [("Name", "name"), ("Type", "type"), ("Module", "module")]
+
+
+# Tabular editor definition:
+bindings_editor = TabularEditor(
+    adapter=NamespaceBindingsAdapter(),
+    editable=False,
+    operations=[],
+    update="object.bindings_model.bindings_updated",
+)
 
 
 class NamespaceView(View):
@@ -97,9 +74,12 @@ class NamespaceView(View):
 
     #### 'NamespaceView' interface ############################################
 
-    # The bindings in the namespace.  This is a list of HasTraits objects with
-    # 'name', 'type' and 'module' string attributes.
-    bindings = Property(List, depends_on=["namespace"])
+    # The bindings in the namespace.  This is a list of 'NamespaceBinding'
+    # objects with 'name', 'type' and 'module' string attributes.
+    bindings = Property(List)
+
+    # The model that keeps the bindings up to date with the namespace.
+    bindings_model = Instance(NamespaceBindings, ())
 
     shell_view = Instance(PythonShellView)
 
@@ -109,9 +89,9 @@ class NamespaceView(View):
     traits_view = TraitsView(
         VGroup(
             Item(
-                "bindings",
+                "object.bindings_model.bindings",
                 id="table",
-                editor=table_editor,
+                editor=bindings_editor,
                 springy=True,
                 resizable=True,
             ),
@@ -146,23 +126,27 @@ class NamespaceView(View):
 
     #### Properties ###########################################################
 
-    @cached_property
     def _get_bindings(self):
         """ Property getter. """
 
+        return self.bindings_model.bindings
+
+    #### Trait change handlers ################################################
+
+    @on_trait_change("shell_view, namespace")
+    def _update_bindings(self, object, name, new):
+        """ Update the bindings to match the shell's namespace. """
+
         if self.shell_view is None:
-            return []
+            self.bindings_model.update({})
 
-        class item(HasTraits):
-            name = Str
-            type = Str
-            module = Str
+        # The shell fires the change with a copy of the namespace (which,
+        # unlike the namespace itself, can't be changed by code running in
+        # the background while it is being compared).
+        elif name == "namespace":
+            self.bindings_model.update(new)
 
-        data = [
-            item(
-                name=name, type=type_to_str(value), module=module_to_str(value)
-            )
-            for name, value in self.shell_view.namespace.items()
-        ]
+        else:
+            self.bindings_model.update(dict(self.shell_view.namespace))
 
-        return data
+        return
@@ -12,14 +12,25 @@
 # Standard library imports.
 import logging
 import sys
+import traceback
 
 # Enthought library imports.
 from envisage.api import IExtensionRegistry
 from envisage.api import ExtensionPoint
+from envisage.plugins.python_shell.api import BackgroundExecutor, CodeCache
 from envisage.plugins.python_shell.api import IPythonShell
 from pyface.api import PythonShell
 from pyface.workbench.api import View
-from traits.api import Any, Dict, Event, Instance, Property, provides, Str
+from traits.api import (
+    Any,
+    Dict,
+    Enum,
+    Event,
+    Instance,
+    Property,
+    provides,
+    Str,
+)
 
 # Setup a logger for this module.
 logger = logging.getLogger(__name__)
@@ -76,6 +87,20 @@ class PythonShellView(View):
     # Stdout text is posted to this event
     stdout_text = Event
 
+    # Where commands and files executed via the 'IPythonShell' interface are
+    # run. In the 'foreground' they are run on the GUI thread (which blocks
+    # the application until they finish). In the 'background' they are run
+    # on a worker thread (in the same namespace), their output is written to
+    # the shell as it is produced, and they can be stopped with 'cancel'.
+    execution_mode = Enum("foreground", "background")
+
+    # The executor that runs commands and files in the background (created
+    # when it is first needed).
+    executor = Instance(BackgroundExecutor)
+
+    # The cache of code objects compiled by 'execute_source'.
+    code_cache = Instance(CodeCache, ())
+
     #### 'IExtensionPointUser' interface ######################################
 
     # The extension registry that the object's extension points are stored in.
@@ -144,6 +169,11 @@ class PythonShellView(View):
 
         super(PythonShellView, self).destroy_control()
 
+        # Stop running anything in the background.
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
         # Unregister the view as a service.
         self.window.application.unregister_service(self._service_id)
 
@@ -180,16 +210,67 @@ class PythonShellView(View):
 
         return
 
+    def cancel(self):
+        """ Cancel any commands and files running in the background. """
+
+        if self.executor is not None:
+            self.executor.cancel()
+
+        return
+
     def execute_command(self, command, hidden=True):
         """ Execute a command in the interpreter. """
 
+        if self.execution_mode == "background":
+            # Commands are compiled the way that the interactive interpreter
+            # compiles them (so the values of expressions are printed).
+            return self._execute_in_background(
+                command, "<input>", "single", hidden
+            )
+
         return self.shell.execute_command(command, hidden)
 
     def execute_file(self, path, hidden=True):
         """ Execute a command in the interpreter. """
 
+        if self.execution_mode == "background":
+            with open(path) as f:
+                source = f.read()
+
+            return self._execute_in_background(source, path, "exec", hidden)
+
         return self.shell.execute_file(path, hidden)
 
+    def execute_source(
+        self, source, filename="<input>", first_line=1, hidden=True
+    ):
+        """ Execute some source code (e.g. the text in an editor).
+
+        The code object is cached, so executing the same source code again
+        doesn't compile it again. 'first_line' is the line number of the
+        first line of the source code in the file that it came from (e.g. if
+        it is only part of a file), and is used in tracebacks.
+
+        The code is executed in the current 'execution_mode'.
+
+        Returns the background job, or None if the code was executed in the
+        foreground or could not be compiled (in which case the error is
+        written to the shell).
+
+        """
+
+        try:
+            code = self.code_cache.compile(
+                source, filename, "exec", first_line
+            )
+
+        except (OverflowError, SyntaxError, ValueError):
+            self._write_compile_error(hidden)
+
+            return None
+
+        return self._execute_code(code, filename, hidden)
+
     def lookup(self, name):
         """ Returns the value bound to a name in the interpreter's namespace.
 
@@ -201,23 +282,74 @@ class PythonShellView(View):
     # Private interface.
     ###########################################################################
 
-    def _write_stdout(self, text):
-        """ Handles text written to stdout. """
+    def _execute_code(self, code, filename, hidden):
+        """ Execute a code object in the current execution mode.
 
-        self.stdout_text = text
+        Returns the background job (or None if the code was executed in the
+        foreground).
+
+        """
+
+        # In the foreground the code is run by the shell's interpreter, just
+        # like the commands typed into the shell.
+        if self.execution_mode == "foreground":
+            self.shell.interpreter().runcode(code)
+            self._on_command_executed(self.shell)
+
+            return None
+
+        if self.executor is None:
+            self.executor = executor = BackgroundExecutor(
+                namespace=self.namespace
+            )
+            executor.on_trait_change(
+                self._on_executor_output, "output", dispatch="ui"
+            )
+            executor.on_trait_change(
+                self._on_executor_finished, "finished", dispatch="ui"
+            )
+
+        return self.executor.submit(code, filename, hidden=hidden)
+
+    def _execute_in_background(self, source, filename, symbol, hidden):
+        """ Execute some source code in the background.
+
+        Returns the background job, or None if the source code could not be
+        compiled (in which case the error is written to the shell).
+
+        """
+
+        try:
+            code = compile(source, filename, symbol)
+
+        except (OverflowError, SyntaxError, ValueError):
+            self._write_compile_error(hidden)
+
+            return None
+
+        return self._execute_code(code, filename, hidden)
+
+    def _write_compile_error(self, hidden):
+        """ Write the error from compiling some source code to the shell. """
+
+        if not hidden:
+            self.shell.control.write(traceback.format_exc(limit=0))
 
         return
 
-    #### Trait change handlers ################################################
+    def _update_namespace(self, namespace):
+        """ Fire the namespace events if names have been added or removed.
 
-    def _on_command_executed(self, shell):
-        """ Dynamic trait change handler. """
+        'namespace' is a copy of the interpreter's namespace (which is the
+        new value of the 'namespace' event).
+
+        """
 
         if self.control is not None:
             # Get the set of tuples of names and types in the current
             # namespace.
             namespace_types = set(
-                (name, type(value)) for name, value in self.namespace.items()
+                (name, type(value)) for name, value in namespace.items()
             )
             # Figure out the changes in the namespace, if any.
             added = namespace_types.difference(self._namespace_types)
@@ -226,8 +358,46 @@ class PythonShellView(View):
             self._namespace_types = namespace_types
             # Fire events if there are change.
             if len(added) > 0 or len(removed) > 0:
-                self.trait_property_changed("namespace", {}, self.namespace)
-                self.trait_property_changed("names", [], self.names)
+                self.trait_property_changed("namespace", {}, namespace)
+                self.trait_property_changed("names", [], list(namespace))
+
+        return
+
+    def _write_stdout(self, text):
+        """ Handles text written to stdout. """
+
+        self.stdout_text = text
+
+        return
+
+    #### Trait change handlers ################################################
+
+    def _on_command_executed(self, shell):
+        """ Dynamic trait change handler. """
+
+        # A job may be changing the namespace in the background, so compare
+        # a copy of it (copying a dictionary doesn't run any Python code, so
+        # no other thread can change the namespace while it is copied).
+        self._update_namespace(dict(self.namespace))
+
+        return
+
+    def _on_executor_finished(self, job):
+        """ Dynamic trait change handler. """
+
+        # Anything run in the background may have changed the namespace, but
+        # the next job may already be changing it again, so use the copy
+        # taken when the job finished.
+        self._update_namespace(job.namespace)
+
+        return
+
+    def _on_executor_output(self, output):
+        """ Dynamic trait change handler. """
+
+        job, name, text = output
+        if self.control is not None:
+            self.shell.control.write(text)
 
         return
 
@@ -0,0 +1,91 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Find the regions of a Python script to run (e.g. cells). """
+
+
+# Standard library imports.
+import re
+import textwrap
+
+
+#: Lines that separate cells (as used by Spyder, VS Code, PyCharm etc).
+CELL_MARKER = re.compile(r"^[ \t]*#[ \t]*%%", re.MULTILINE)
+
+
+def get_cell(text, line):
+    """ Return the cell that contains a (1-based) line.
+
+    Cells are separated by lines that start with '# %%'. If there aren't any
+    then the whole text is a single cell.
+
+    Returns a tuple in the form (first_line, source).
+
+    """
+
+    start = get_line_offset(text, line)
+
+    # The cell starts at the last marker at or before the line and ends at
+    # the next marker.
+    cell_start = 0
+    cell_end = len(text)
+    for match in CELL_MARKER.finditer(text):
+        if match.start() > start:
+            cell_end = match.start()
+            break
+
+        cell_start = match.start()
+
+    return get_lines(text, cell_start, cell_end)
+
+
+def get_line_offset(text, line):
+    """ Return the offset of the start of a (1-based) line.
+
+    If the text has fewer lines then the offset of the start of the last
+    line is returned.
+
+    """
+
+    offset = 0
+    for i in range(line - 1):
+        index = text.find("\n", offset)
+        if index < 0:
+            break
+
+        offset = index + 1
+
+    return offset
+
+
+def get_lines(text, start, end):
+    """ Return the source code between two offsets.
+
+    If the region is empty then the line that contains 'start' is returned
+    instead (e.g. to run the line that the cursor is on), and if it spans
+    more than one line then it is extended to the start of its first line.
+    The source code is dedented (e.g. so the body of a function can be run
+    on its own).
+
+    Returns a tuple in the form (first_line, source).
+
+    """
+
+    line_start = text.rfind("\n", 0, start) + 1
+    if start == end:
+        start = line_start
+        end = text.find("\n", start)
+        if end < 0:
+            end = len(text)
+
+    elif text.find("\n", start, end) >= 0:
+        start = line_start
+
+    first_line = text.count("\n", 0, start) + 1
+
+    return first_line, textwrap.dedent(text[start:end])
@@ -0,0 +1,424 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A piece table for editing large UTF-8 text files. """
+
+
+# Standard library imports.
+from collections import OrderedDict
+import mmap
+import os
+
+# Local imports.
+from envisage._atomic_file import atomic_open
+
+
+#: The (approximate) size in bytes of the chunks that a file is read in.
+CHUNK_SIZE = 1024 * 1024
+
+#: The maximum number of decoded chunks that are kept in memory.
+MAX_CACHED_CHUNKS = 16
+
+# UTF-8 continuation bytes (i.e. the bytes that don't start a character).
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+# A fast check for ASCII text (Python 3.7 and later only).
+_isascii = getattr(bytes, "isascii", None)
+
+
+class PieceTable(object):
+    """ A piece table for editing large UTF-8 text files.
+
+    The text is made up of a list of pieces, each of which is a range of
+    characters in either the original file or a string that has been
+    inserted. The original file is memory-mapped and split into chunks as
+    the text is first used (so opening a file is cheap however large it is),
+    chunks are only decoded when their text is needed (and only a few
+    decoded chunks are kept in memory at any one time), and editing only
+    ever copies the text that is inserted.
+
+    Every edit increments the table's 'generation', so whether the text has
+    changed since it was last saved is a simple comparison of numbers
+    rather than of strings.
+
+    All offsets are in characters, not bytes.
+
+    """
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, text=""):
+        """ Constructor.
+
+        Use 'PieceTable.open' to edit a file.
+
+        """
+
+        # The number of edits made to the text.
+        self.generation = 0
+
+        # The generation when the text was last opened or saved.
+        self.saved_generation = 0
+
+        # The path of the file that the original text is mapped from.
+        self.path = None
+
+        # The memory-mapped file.
+        self._file = None
+        self._map = None
+
+        # The (approximate) size in bytes of the chunks of the file.
+        self._chunk_size = CHUNK_SIZE
+
+        # The size in bytes of the file.
+        self._size = 0
+
+        # The (start, end) byte offsets of each chunk of the file split so
+        # far. The rest of the file (which hasn't been split yet) always
+        # follows the last piece.
+        self._chunks = []
+
+        # The length (in characters) of each chunk of the file.
+        self._chunk_lengths = []
+
+        # The most recently used decoded chunks, keyed by chunk index.
+        self._cache = OrderedDict()
+
+        # The pieces, as tuples in the form (source, start, length) where
+        # 'source' is either the index of a chunk of the file or a string.
+        if len(text) > 0:
+            self._pieces = [(text, 0, len(text))]
+
+        else:
+            self._pieces = []
+
+        return
+
+    def __len__(self):
+        """ Return the length of the text (in characters). """
+
+        while self._split_chunk():
+            pass
+
+        return sum(length for source, start, length in self._pieces)
+
+    ###########################################################################
+    # 'PieceTable' interface.
+    ###########################################################################
+
+    @classmethod
+    def open(cls, path, chunk_size=CHUNK_SIZE):
+        """ Create a piece table for editing a UTF-8 encoded file. """
+
+        piece_table = cls()
+        piece_table._map_file(path, chunk_size)
+
+        return piece_table
+
+    @property
+    def dirty(self):
+        """ Has the text been edited since it was last opened or saved? """
+
+        return self.generation != self.saved_generation
+
+    def close(self):
+        """ Close the file that the original text is mapped from.
+
+        The piece table can't be used after it has been closed.
+
+        """
+
+        self._unmap_file()
+        self._pieces = []
+
+        return
+
+    def delete(self, start, end):
+        """ Delete the text between two offsets. """
+
+        self.replace(start, end, "")
+
+        return
+
+    def find(self, sub, start=0):
+        """ Return the offset of the first occurrence of a (non-empty) string
+        at or after an offset, or -1 if it doesn't occur.
+
+        """
+
+        # Keep enough of the end of the text searched so far to find any
+        # occurrence that spans two pieces.
+        offset = start
+        tail = ""
+        for text in self.iter_text(start):
+            text = tail + text
+            index = text.find(sub)
+            if index >= 0:
+                return offset - len(tail) + index
+
+            offset += len(text) - len(tail)
+            tail = text[len(text) - len(sub) + 1:] if len(sub) > 1 else ""
+
+        return -1
+
+    def get_text(self, start=0, end=None):
+        """ Return the text between two offsets. """
+
+        return "".join(self.iter_text(start, end))
+
+    def insert(self, offset, text):
+        """ Insert some text at an offset. """
+
+        self.replace(offset, offset, text)
+
+        return
+
+    def iter_text(self, start=0, end=None):
+        """ Iterate over the text between two offsets a piece at a time. """
+
+        # More of the file is split into chunks as the text is needed.
+        pieces = self._pieces
+        index = 0
+        offset = 0
+        while end is None or offset < end:
+            if index == len(pieces):
+                if not self._split_chunk():
+                    break
+
+                continue
+
+            source, piece_start, length = pieces[index]
+            index += 1
+
+            if offset + length > start:
+                first = max(start - offset, 0)
+                if end is None:
+                    last = length
+
+                else:
+                    last = min(end - offset, length)
+
+                yield self._get_source_text(source)[
+                    piece_start + first:piece_start + last
+                ]
+
+            offset += length
+
+        return
+
+    def replace(self, start, end, text):
+        """ Replace the text between two offsets with some other text. """
+
+        if start > end:
+            raise ValueError(
+                "start offset %d is after end offset %d" % (start, end)
+            )
+
+        # Make sure that there are pieces up to the end.
+        known = sum(length for source, _, length in self._pieces)
+        while known < end and self._split_chunk():
+            known += self._chunk_lengths[-1]
+
+        # The pieces before the start, and after the end, of the text being
+        # replaced (splitting any pieces that either offset is in).
+        before = []
+        after = []
+        offset = 0
+        for source, piece_start, length in self._pieces:
+            if offset < start:
+                before.append(
+                    (source, piece_start, min(length, start - offset))
+                )
+
+            if offset + length > end:
+                skip = max(end - offset, 0)
+                after.append((source, piece_start + skip, length - skip))
+
+            offset += length
+
+        if start > offset:
+            raise IndexError(
+                "offset %d is past the end of the text (%d)" % (start, offset)
+            )
+
+        if len(text) > 0:
+            before.append((text, 0, len(text)))
+
+        self._pieces = before + after
+        self.generation += 1
+
+        return
+
+    def save(self, path=None):
+        """ Save the text to a file (by default the one that it came from).
+
+        The text is written to a temporary file which then replaces the
+        file, so the file is never left half-written. Afterwards, the piece
+        table edits the saved file (as if it had just been opened).
+
+        """
+
+        if path is None:
+            path = self.path
+
+        chunk_size = self._chunk_size
+        try:
+            with atomic_open(path, "wb") as f:
+                self._write(f)
+
+                # The file can't be replaced while it is mapped on some
+                # platforms.
+                self._unmap_file()
+
+        except Exception:
+            if self.path is not None and self._file is None:
+                self._map_file(self.path, chunk_size, reset=False)
+
+            raise
+
+        self._map_file(path, chunk_size)
+        self.saved_generation = self.generation
+
+        return
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_source_text(self, source):
+        """ Return the text of the source of a piece. """
+
+        if isinstance(source, str):
+            return source
+
+        text = self._cache.get(source)
+        if text is None:
+            start, end = self._chunks[source]
+            text = self._map[start:end].decode("utf-8")
+
+            self._cache[source] = text
+            if len(self._cache) > MAX_CACHED_CHUNKS:
+                self._cache.popitem(last=False)
+
+        else:
+            self._cache.move_to_end(source)
+
+        return text
+
+    def _is_continuation(self, offset):
+        """ Is the byte at an offset in the file a continuation byte? """
+
+        return self._map[offset] in _CONTINUATION_BYTES
+
+    def _map_file(self, path, chunk_size, reset=True):
+        """ Memory-map a file.
+
+        If 'reset' is True then the text is replaced by the file's contents
+        (otherwise the file must be the one that was mapped before).
+
+        """
+
+        self.path = path
+        self._chunk_size = chunk_size
+        self._cache = OrderedDict()
+
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size > 0:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        if reset:
+            self._size = size
+            self._chunks = []
+            self._chunk_lengths = []
+            self._pieces = []
+            self.saved_generation = self.generation
+
+        return
+
+    def _split_chunk(self):
+        """ Split the next chunk from the part of the file not yet split.
+
+        The chunk's piece is added after the last piece. Returns False if
+        the whole file has already been split.
+
+        """
+
+        start = self._chunks[-1][1] if len(self._chunks) > 0 else 0
+        if start >= self._size:
+            return False
+
+        # Move the end back to the start of a character (or forward if the
+        # chunk is smaller than the character).
+        size = self._size
+        end = min(start + self._chunk_size, size)
+        while end > start and end < size and self._is_continuation(end):
+            end -= 1
+
+        if end == start:
+            end += 1
+            while end < size and self._is_continuation(end):
+                end += 1
+
+        # Count the characters without decoding them (every character has
+        # exactly one byte that isn't a continuation byte).
+        data = self._map[start:end]
+        if _isascii is not None and _isascii(data):
+            length = len(data)
+
+        else:
+            length = len(data.translate(None, _CONTINUATION_BYTES))
+
+        self._chunks.append((start, end))
+        self._chunk_lengths.append(length)
+        if length > 0:
+            self._pieces.append((len(self._chunks) - 1, 0, length))
+
+        return True
+
+    def _unmap_file(self):
+        """ Close the memory-mapped file (if there is one). """
+
+        self._cache = OrderedDict()
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        return
+
+    def _write(self, f):
+        """ Write the text to a binary file as UTF-8. """
+
+        while self._split_chunk():
+            pass
+
+        for source, start, length in self._pieces:
+            # Whole chunks of the original file are copied without decoding
+            # (and re-encoding) them.
+            if (
+                not isinstance(source, str)
+                and start == 0
+                and length == self._chunk_lengths[source]
+            ):
+                chunk_start, chunk_end = self._chunks[source]
+                f.write(self._map[chunk_start:chunk_end])
+
+            else:
+                text = self._get_source_text(source)
+                f.write(text[start:start + length].encode("utf-8"))
+
+        return
@@ -10,20 +10,34 @@
 
 
 # Standard library imports.
+import os
 from os.path import basename
 
 # Enthought library imports.
 from pyface.workbench.api import TraitsUIEditor
 from pyface.api import FileDialog, CANCEL
-from traits.api import Code, Instance
+from traits.api import Bool, Code, Instance, Int, Property
 from traitsui.api import CodeEditor, Group, Item, View
 from traitsui.key_bindings import KeyBinding, KeyBindings
 from traitsui.menu import NoButtons
 
 # Local imports.
+from envisage._atomic_file import atomic_open
+from .code_regions import get_cell, get_line_offset, get_lines
+from .piece_table import PieceTable
 from .text_editor_handler import TextEditorHandler
 
 
+#: Files larger than this (in bytes) are opened in large file mode.
+LARGE_FILE_SIZE = 32 * 1024 * 1024
+
+#: The (approximate) number of characters shown at once in large file mode.
+PAGE_SIZE = 1024 * 1024
+
+# The number of characters compared at once when finding what has changed.
+_COMPARE_BLOCK_SIZE = 4096
+
+
 def _id_generator():
     """ A generator that returns the next number for untitled files. """
 
@@ -38,6 +52,48 @@ def _id_generator():
 _id_generator = _id_generator()
 
 
+def _get_changed_span(old, new):
+    """ Return the span of a string that has changed.
+
+    Returns a tuple in the form (start, old_end, new_end) such that
+    'old[start:old_end]' was replaced by 'new[start:new_end]' (i.e. the
+    text before 'start', and after the ends, is the same in both).
+
+    """
+
+    # Compare whole blocks first (which is much quicker than comparing
+    # character by character).
+    limit = min(len(old), len(new))
+    start = 0
+    while (
+        start + _COMPARE_BLOCK_SIZE <= limit
+        and old[start:start + _COMPARE_BLOCK_SIZE]
+        == new[start:start + _COMPARE_BLOCK_SIZE]
+    ):
+        start += _COMPARE_BLOCK_SIZE
+
+    while start < limit and old[start] == new[start]:
+        start += 1
+
+    # The common suffix can't overlap the common prefix.
+    limit -= start
+    length = 0
+    while (
+        length + _COMPARE_BLOCK_SIZE <= limit
+        and old[len(old) - length - _COMPARE_BLOCK_SIZE:len(old) - length]
+        == new[len(new) - length - _COMPARE_BLOCK_SIZE:len(new) - length]
+    ):
+        length += _COMPARE_BLOCK_SIZE
+
+    while (
+        length < limit
+        and old[len(old) - length - 1] == new[len(new) - length - 1]
+    ):
+        length += 1
+
+    return start, len(old) - length, len(new) - length
+
+
 class TextEditor(TraitsUIEditor):
     """ A text editor. """
 
@@ -46,9 +102,47 @@ class TextEditor(TraitsUIEditor):
     # The key bindings used by the editor.
     key_bindings = Instance(KeyBindings)
 
-    # The text being edited.
+    # The text being edited (in large file mode, the text of the current
+    # page).
     text = Code
 
+    # The (1-based) line that the cursor is on.
+    cursor_line = Int(1)
+
+    # The offsets of the start and end of the selected text.
+    selection_start = Int
+    selection_end = Int
+
+    #### Large file mode ####
+
+    # Files larger than this (in bytes) are opened in large file mode. In
+    # large file mode the file is memory-mapped into a piece table (the
+    # 'document') and only one page of it is shown (and edited) at a time.
+    large_file_size = Int(LARGE_FILE_SIZE)
+
+    # The (approximate) number of characters in each page in large file mode
+    # (pages always end at the end of a line).
+    page_size = Int(PAGE_SIZE)
+
+    # The document being edited in large file mode (None otherwise).
+    document = Instance(PieceTable)
+
+    # Is the editor in large file mode?
+    large_file = Property(Bool, depends_on="document")
+
+    # The offset (in characters) of the start of the current page in the
+    # document.
+    page_start = Int
+
+    # The offset (in characters) of the end of the current page in the
+    # document.
+    page_end = Int
+
+    #### Private interface ####################################################
+
+    # Is the text being set to show a page of the document?
+    _showing_page = Bool(False)
+
     ###########################################################################
     # 'IEditor' interface.
     ###########################################################################
@@ -60,9 +154,14 @@ class TextEditor(TraitsUIEditor):
         if len(self.obj.path) == 0:
             self.save_as()
 
+        elif self.document is not None:
+            self.document.save(self.obj.path)
+
+            # We have just saved the file so we ain't dirty no more!
+            self.dirty = False
+
         else:
-            with open(self.obj.path, "w", encoding="utf-8") as f:
-                f.write(self.text)
+            self._save_text(self.obj.path)
 
             # We have just saved the file so we ain't dirty no more!
             self.dirty = False
@@ -104,27 +203,83 @@ class TextEditor(TraitsUIEditor):
 
         return ui
 
+    def destroy_control(self):
+        """ Destroy the toolkit-specific control that represents the editor.
+
+        """
+
+        super(TextEditor, self).destroy_control()
+
+        if self.document is not None:
+            self.document.close()
+            self.document = None
+
+        return
+
     ###########################################################################
     # 'TextEditor' interface.
     ###########################################################################
 
+    def next_page(self):
+        """ Show the next page of the document in large file mode. """
+
+        if self.document is not None and self.page_end < len(self.document):
+            self._show_page(self.page_end)
+
+        return
+
+    def previous_page(self):
+        """ Show the previous page of the document in large file mode. """
+
+        if self.document is not None and self.page_start > 0:
+            self._show_page(self._find_page_start(self.page_start))
+
+        return
+
     def run(self):
         """ Runs the file as Python. """
 
-        # The file must be saved first!
-        self.save()
-
-        # Execute the code.
-        if len(self.obj.path) > 0:
-            view = self.window.get_view_by_id(
-                "envisage.plugins.python_shell_view"
-            )
+        # In large file mode only the current page is in memory, so the file
+        # is saved and run from disk.
+        if self.document is not None:
+            self.save()
 
-            if view is not None:
+            view = self._get_python_shell_view()
+            if view is not None and len(self.obj.path) > 0:
                 view.execute_command(
                     'exec(open(r"%s").read())' % self.obj.path, hidden=False
                 )
 
+        else:
+            self._run_source(1, self.text)
+
+        return
+
+    def run_cell(self):
+        """ Runs the cell that the cursor is in as Python.
+
+        Cells are separated by lines that start with '# %%'.
+
+        """
+
+        first_line, source = get_cell(self.text, self.cursor_line)
+        self._run_source(first_line, source)
+
+        return
+
+    def run_selection(self):
+        """ Runs the selected text (or the line that the cursor is on) as
+        Python.
+
+        """
+
+        start, end = self.selection_start, self.selection_end
+        if start == end:
+            start = end = get_line_offset(self.text, self.cursor_line)
+
+        first_line, source = get_lines(self.text, start, end)
+        self._run_source(first_line, source)
+
         return
 
     def select_line(self, lineno):
@@ -154,10 +309,37 @@ class TextEditor(TraitsUIEditor):
                 description="Run the file",
                 method_name="run",
             ),
+            KeyBinding(
+                binding1="Ctrl-Return",
+                description="Run the current cell",
+                method_name="run_cell",
+            ),
+            KeyBinding(
+                binding1="F9",
+                description="Run the selection or the current line",
+                method_name="run_selection",
+            ),
+            KeyBinding(
+                binding1="Ctrl-Page Down",
+                description="Show the next page of a large file",
+                method_name="next_page",
+            ),
+            KeyBinding(
+                binding1="Ctrl-Page Up",
+                description="Show the previous page of a large file",
+                method_name="previous_page",
+            ),
         )
 
         return key_bindings
 
+    #### Trait properties #####################################################
+
+    def _get_large_file(self):
+        """ Trait property getter. """
+
+        return self.document is not None
+
     #### Trait change handlers ################################################
 
     def _obj_changed(self, new):
@@ -173,15 +355,35 @@ class TextEditor(TraitsUIEditor):
             self.id = new.path
             self.name = basename(new.path)
 
-            with open(new.path, "r", encoding="utf-8") as f:
-                self.text = f.read()
+            if os.path.getsize(new.path) > self.large_file_size:
+                self.document = PieceTable.open(new.path)
+                self._show_page(0)
+
+            else:
+                with open(new.path, "r", encoding="utf-8") as f:
+                    self.text = f.read()
 
         return
 
     def _text_changed(self, trait_name, old, new):
         """ Static trait change handler. """
 
-        if self.traits_inited():
+        if not self.traits_inited() or self._showing_page:
+            return
+
+        # In large file mode, the page is edited in the document (which
+        # keeps track of whether it has changed since it was last saved).
+        if self.document is not None:
+            start, old_end, new_end = _get_changed_span(old, new)
+            self.document.replace(
+                self.page_start + start,
+                self.page_start + old_end,
+                new[start:new_end],
+            )
+            self.page_end = self.page_start + len(new)
+            self.dirty = self.document.dirty
+
+        else:
             self.dirty = True
 
         return
@@ -212,7 +414,13 @@ class TextEditor(TraitsUIEditor):
         view = View(
             Group(
                 Item(
-                    "text", editor=CodeEditor(key_bindings=self.key_bindings)
+                    "text",
+                    editor=CodeEditor(
+                        key_bindings=self.key_bindings,
+                        line="cursor_line",
+                        selected_start_pos="selection_start",
+                        selected_end_pos="selection_end",
+                    ),
                 ),
                 show_labels=False,
             ),
@@ -227,6 +435,94 @@ class TextEditor(TraitsUIEditor):
 
         return view
 
+    def _find_page_start(self, end):
+        """ Return the start of the page that ends at an offset. """
+
+        # Search backwards a chunk at a time for the end of the line before
+        # the start of the page.
+        start = max(end - self.page_size, 0)
+        while start > 0:
+            text = self.document.get_text(
+                max(start - self.page_size, 0), start
+            )
+            index = text.rfind("\n")
+            if index >= 0:
+                return start - len(text) + index + 1
+
+            start -= len(text)
+
+        return 0
+
+    def _get_python_shell_view(self):
+        """ Return the Python shell view (or None if there isn't one). """
+
+        return self.window.get_view_by_id(
+            "envisage.plugins.python_shell_view"
+        )
+
+    def _run_source(self, first_line, source):
+        """ Run some of the text as Python in the Python shell view.
+
+        The text is sent straight from the editor (it doesn't have to be
+        saved first), and the shell only compiles it if it has changed
+        since it was last run.
+
+        """
+
+        view = self._get_python_shell_view()
+        if view is not None:
+            # In large file mode, line numbers are relative to the page.
+            if self.document is not None:
+                first_line += sum(
+                    text.count("\n")
+                    for text in self.document.iter_text(0, self.page_start)
+                )
+
+            view.execute_source(
+                source,
+                filename=self.obj.path or "<%s>" % self.name,
+                first_line=first_line,
+                hidden=False,
+            )
+
+        return
+
+    def _save_text(self, path):
+        """ Save the text to a file via a temporary file.
+
+        The file is only replaced once the text has been written, so a
+        failed save never leaves a half-written file.
+
+        """
+
+        with atomic_open(path, "w", encoding="utf-8") as f:
+            f.write(self.text)
+
+        return
+
+    def _show_page(self, start):
+        """ Show the page of the document that starts at an offset. """
+
+        # Pages end at the end of a line (unless a line is longer than a
+        # page).
+        end = self.document.find("\n", start + self.page_size)
+        if end < 0:
+            end = len(self.document)
+
+        else:
+            end += 1
+
+        self._showing_page = True
+        try:
+            self.page_start = start
+            self.page_end = end
+            self.text = self.document.get_text(start, end)
+
+        finally:
+            self._showing_page = False
+
+        return
+
     def _get_unique_id(self, prefix="Untitled "):
         """ Return a unique id for a new file. """
 
@@ -23,6 +23,20 @@ class TextEditorHandler(Handler):
     # fixme: We need to work out how to create these 'dispatch' methods
     # dynamically! Plugins will want to add bindings to the editor to bind
     # a key to an action.
+    def next_page(self, info):
+        """ Show the next page of a large file. """
+
+        info.object.next_page()
+
+        return
+
+    def previous_page(self, info):
+        """ Show the previous page of a large file. """
+
+        info.object.previous_page()
+
+        return
+
     def run(self, info):
         """ Run the text as Python code. """
 
@@ -30,6 +44,20 @@ class TextEditorHandler(Handler):
 
         return
 
+    def run_cell(self, info):
+        """ Run the current cell as Python code. """
+
+        info.object.run_cell()
+
+        return
+
+    def run_selection(self, info):
+        """ Run the selected text as Python code. """
+
+        info.object.run_selection()
+
+        return
+
     def save(self, info):
         """ Save the text to disk. """
 
@@ -0,0 +1,83 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import unittest
+
+from envisage.plugins.text_editor.editor.code_regions import (
+    get_cell,
+    get_line_offset,
+    get_lines,
+)
+
+SCRIPT = """\
+import math
+
+# %% First cell
+x = 1
+y = 2
+
+  #%% Second cell
+def f():
+    return math.pi
+"""
+
+
+class TestCodeRegions(unittest.TestCase):
+    def test_no_cells(self):
+        text = "x = 1\ny = 2\n"
+
+        self.assertEqual(get_cell(text, 2), (1, text))
+
+    def test_before_first_cell(self):
+        self.assertEqual(get_cell(SCRIPT, 1), (1, "import math\n\n"))
+
+    def test_cell(self):
+        expected = (3, "# %% First cell\nx = 1\ny = 2\n\n")
+
+        for line in (3, 4, 6):
+            self.assertEqual(get_cell(SCRIPT, line), expected)
+
+    def test_last_cell(self):
+        first_line, source = get_cell(SCRIPT, 9)
+
+        self.assertEqual(first_line, 7)
+        self.assertTrue(source.startswith("  #%% Second cell\ndef f():"))
+        compile(source, "<cell>", "exec")
+
+    def test_line_offset(self):
+        self.assertEqual(get_line_offset(SCRIPT, 1), 0)
+        self.assertEqual(get_line_offset(SCRIPT, 3), SCRIPT.index("# %%"))
+
+        # Past the last line.
+        self.assertEqual(get_line_offset("a\nb", 10), 2)
+
+    def test_selection_within_a_line(self):
+        start = SCRIPT.index("math.pi")
+
+        self.assertEqual(get_lines(SCRIPT, start, start + 7), (9, "math.pi"))
+
+    def test_selection_is_dedented(self):
+        start = SCRIPT.index("return")
+
+        self.assertEqual(
+            get_lines(SCRIPT, start - 4, len(SCRIPT)),
+            (9, "return math.pi\n"),
+        )
+
+    def test_multiline_selection_starts_at_start_of_line(self):
+        start = SCRIPT.index("1\ny = 2")
+
+        self.assertEqual(
+            get_lines(SCRIPT, start, start + 7), (4, "x = 1\ny = 2")
+        )
+
+    def test_empty_selection_is_current_line(self):
+        offset = SCRIPT.index("y = 2") + 2
+
+        self.assertEqual(get_lines(SCRIPT, offset, offset), (5, "y = 2"))
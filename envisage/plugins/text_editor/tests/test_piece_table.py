@@ -0,0 +1,192 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from envisage.plugins.text_editor.editor import piece_table
+from envisage.plugins.text_editor.editor.piece_table import PieceTable
+
+#: Text with multi-byte characters (so chunks can't split at any byte).
+TEXT = "".join("line %d: café €\U0001f600\n" % i for i in range(200))
+
+
+class TestPieceTable(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.path = os.path.join(self.directory, "file.txt")
+        with open(self.path, "wb") as f:
+            f.write(TEXT.encode("utf-8"))
+
+        # Use small chunks so that the text is spread over lots of them.
+        self.document = PieceTable.open(self.path, chunk_size=7)
+        self.addCleanup(self.document.close)
+
+    def test_open(self):
+        self.assertEqual(len(self.document), len(TEXT))
+        self.assertEqual(self.document.get_text(), TEXT)
+        self.assertEqual(self.document.get_text(100, 250), TEXT[100:250])
+        self.assertFalse(self.document.dirty)
+
+    def test_open_empty_file(self):
+        with open(self.path, "wb"):
+            pass
+
+        document = PieceTable.open(self.path)
+        self.addCleanup(document.close)
+
+        self.assertEqual(len(document), 0)
+        self.assertEqual(document.get_text(), "")
+
+    def test_chunks_are_decoded_lazily(self):
+        with mock.patch.object(piece_table, "MAX_CACHED_CHUNKS", 2):
+            document = PieceTable.open(self.path, chunk_size=1024)
+            self.addCleanup(document.close)
+
+            self.assertEqual(document.get_text(0, 10), TEXT[:10])
+            self.assertEqual(list(document._cache), [0])
+
+            # Only a few decoded chunks are kept.
+            document.get_text()
+            self.assertEqual(len(document._cache), 2)
+
+    def test_file_is_split_lazily(self):
+        document = PieceTable.open(self.path, chunk_size=1024)
+        self.addCleanup(document.close)
+
+        # Nothing is split until the text is used.
+        self.assertEqual(document._chunks, [])
+
+        # Only as much as is needed.
+        self.assertEqual(document.get_text(0, 10), TEXT[:10])
+        self.assertEqual(len(document._chunks), 1)
+
+        offset = document._chunk_lengths[0] + 10
+        document.insert(offset, "x")
+        self.assertEqual(len(document._chunks), 2)
+
+        self.assertEqual(len(document), len(TEXT) + 1)
+        self.assertEqual(document._chunks[-1][1], len(TEXT.encode("utf-8")))
+        self.assertEqual(
+            document.get_text(), TEXT[:offset] + "x" + TEXT[offset:]
+        )
+
+    def test_edit_at_end_of_split_text(self):
+        document = PieceTable.open(self.path, chunk_size=1024)
+        self.addCleanup(document.close)
+
+        # Insert text between the split text and the rest of the file.
+        document.get_text(0, 10)
+        end = document._chunk_lengths[0]
+        document.insert(end, "x")
+
+        self.assertEqual(document.get_text(), TEXT[:end] + "x" + TEXT[end:])
+
+    def test_edits(self):
+        text = TEXT
+        for start, end, new in [
+            (0, 0, "first\n"),
+            (10, 20, ""),
+            (50, 55, "€€€"),
+            (len(text) - 60, len(text) - 60, "middle"),
+        ]:
+            self.document.replace(start, end, new)
+            text = text[:start] + new + text[end:]
+
+        self.document.insert(5, "insert")
+        text = text[:5] + "insert" + text[5:]
+        self.document.delete(30, 40)
+        text = text[:30] + text[40:]
+
+        self.assertEqual(self.document.get_text(), text)
+        self.assertEqual(len(self.document), len(text))
+        self.assertEqual(self.document.get_text(3, 60), text[3:60])
+
+    def test_invalid_edits(self):
+        with self.assertRaises(ValueError):
+            self.document.replace(10, 5, "")
+
+        with self.assertRaises(IndexError):
+            self.document.insert(len(TEXT) + 1, "x")
+
+    def test_find(self):
+        self.assertEqual(self.document.find("\n"), TEXT.find("\n"))
+        self.assertEqual(
+            self.document.find("line 150"), TEXT.find("line 150")
+        )
+        self.assertEqual(
+            self.document.find("€\U0001f600", 500),
+            TEXT.find("€\U0001f600", 500),
+        )
+        self.assertEqual(self.document.find("missing"), -1)
+
+    def test_dirty_tracks_generation(self):
+        self.document.insert(0, "x")
+        self.assertTrue(self.document.dirty)
+
+        # Undoing the edit by hand is still an edit.
+        self.document.delete(0, 1)
+        self.assertTrue(self.document.dirty)
+
+        self.document.save()
+        self.assertFalse(self.document.dirty)
+
+    def test_save(self):
+        self.document.replace(0, 4, "LINE")
+        self.document.insert(len(self.document), "last\n")
+
+        self.document.save()
+
+        expected = "LINE" + TEXT[4:] + "last\n"
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read().decode("utf-8"), expected)
+
+        # The document now edits the saved file.
+        self.assertEqual(self.document.get_text(), expected)
+        self.assertEqual(
+            [type(source) for source, _, _ in self.document._pieces],
+            [int] * len(self.document._pieces),
+        )
+
+    def test_save_as(self):
+        path = os.path.join(self.directory, "other.txt")
+
+        self.document.save(path)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read().decode("utf-8"), TEXT)
+        self.assertEqual(self.document.path, path)
+
+    def test_failed_save_leaves_file_unchanged(self):
+        self.document.insert(0, "x")
+
+        with mock.patch.object(
+            PieceTable, "_write", side_effect=OSError("disk full")
+        ):
+            with self.assertRaises(OSError):
+                self.document.save()
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read().decode("utf-8"), TEXT)
+
+        # The document can still be used.
+        self.assertEqual(self.document.get_text(), "x" + TEXT)
+        self.assertTrue(self.document.dirty)
+        self.assertEqual(os.listdir(self.directory), ["file.txt"])
+
+    def test_in_memory(self):
+        document = PieceTable("hello")
+        document.insert(5, " world")
+
+        self.assertEqual(document.get_text(), "hello world")
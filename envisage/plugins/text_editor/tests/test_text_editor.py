@@ -0,0 +1,60 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import unittest
+from unittest import mock
+
+from envisage.plugins.text_editor.editor import text_editor
+from envisage.plugins.text_editor.editor.text_editor import (
+    _get_changed_span,
+)
+
+
+class TestGetChangedSpan(unittest.TestCase):
+    def check(self, old, new):
+        start, old_end, new_end = _get_changed_span(old, new)
+
+        self.assertEqual(old[:start], new[:start])
+        self.assertEqual(old[old_end:], new[new_end:])
+        self.assertEqual(old[:start] + new[start:new_end] + old[old_end:], new)
+
+        return start, old_end, new_end
+
+    def test_insert(self):
+        self.assertEqual(self.check("hello", "helllo"), (4, 4, 5))
+
+    def test_delete(self):
+        self.assertEqual(self.check("hello", "helo"), (3, 4, 3))
+
+    def test_replace(self):
+        self.assertEqual(self.check("hello", "hEllo"), (1, 2, 2))
+
+    def test_unchanged(self):
+        self.assertEqual(self.check("hello", "hello"), (5, 5, 5))
+
+    def test_everything_changed(self):
+        self.assertEqual(self.check("abc", "xyz"), (0, 3, 3))
+        self.assertEqual(self.check("", "xyz"), (0, 0, 3))
+        self.assertEqual(self.check("abc", ""), (0, 3, 0))
+
+    def test_repeated_text(self):
+        # The prefix and suffix don't overlap.
+        self.assertEqual(self.check("aaaa", "aaaaa"), (4, 4, 5))
+        self.assertEqual(self.check("aaaaa", "aa"), (2, 5, 2))
+
+    def test_blocks(self):
+        with mock.patch.object(text_editor, "_COMPARE_BLOCK_SIZE", 4):
+            text = "".join("line %d\n" % i for i in range(100))
+            for index in [0, 3, 4, 5, 200, len(text) - 1]:
+                new = text[:index] + "x" + text[index + 1:]
+                self.assertEqual(
+                    self.check(text, new), (index, index + 1, index + 1)
+                )
+                self.check(text, text[:index] + text[index + 7:])
+                self.check(text, text[:index] + "new" + text[index:])
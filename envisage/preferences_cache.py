@@ -0,0 +1,236 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A compiled cache of contributed preferences files. """
+
+
+# Standard library imports.
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import pickle
+
+# Enthought library imports.
+from traits.api import Any, HasTraits, Instance, Str
+
+# Local imports.
+from ._atomic_file import atomic_open
+
+
+# Logging.
+logger = logging.getLogger(__name__)
+
+
+class PreferencesCache(HasTraits):
+    """ A compiled cache of contributed preferences files.
+
+    Parsing preferences files (with 'ConfigObj') on every start is measurable
+    when there are dozens of plugins. The cache merges the parsed contents of
+    all of the files into a single snapshot that can be loaded into a
+    preferences node in one pass, and saves it (pickled) so that files are
+    only parsed again when they change.
+
+    Each source is validated by its URL and, if it can be found on the file
+    system, its modification time and size (otherwise by a hash of its
+    contents). Sources are parsed individually, so if one file changes only
+    that file is parsed again.
+
+    """
+
+    #### 'PreferencesCache' interface #########################################
+
+    # The name of the file that the cache is saved to. If this is empty then
+    # the cache is only kept in memory.
+    filename = Str
+
+    # The resource manager used to read the preferences files.
+    resource_manager = Instance("envisage.resource.api.IResourceManager")
+
+    #### Private interface ####################################################
+
+    # The cache contents (loaded from 'filename' on first use).
+    #
+    # {
+    #     'sources'  : { Str url : (validator, {section : {key : value}}) },
+    #     'snapshot' : (tuple(urls), [validator], {section : {key : value}})
+    # }
+    _cache = Any
+
+    ###########################################################################
+    # 'PreferencesCache' interface.
+    ###########################################################################
+
+    def load(self, urls):
+        """ Return the merged preferences from the files at the given URLs.
+
+        The result is a dictionary in the form::
+
+            { section_name : { key : value } }
+
+        which is suitable for passing to the 'load' method of a preferences
+        node. Sections and keys in later files override those in earlier
+        files, exactly as if each file was loaded into the node in turn.
+
+        """
+
+        urls = tuple(urls)
+        if self._cache is None:
+            self._cache = self._read_cache()
+
+        sources = self._cache["sources"]
+        validators = []
+        changed = False
+        for url in urls:
+            validator, data = self._get_validator(url)
+            validators.append(validator)
+
+            entry = sources.get(url)
+            if entry is None or entry[0] != validator:
+                logger.debug("parsing preferences file %s", url)
+                sources[url] = (validator, self._parse(url, data))
+                changed = True
+
+        snapshot = self._cache["snapshot"]
+        if (
+            not changed
+            and snapshot is not None
+            and snapshot[0] == urls
+            and snapshot[1] == validators
+        ):
+            return snapshot[2]
+
+        merged = {}
+        for url in urls:
+            for section, values in sources[url][1].items():
+                merged.setdefault(section, {}).update(values)
+
+        self._cache["snapshot"] = (urls, validators, merged)
+        self._write_cache()
+
+        return merged
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _resource_manager_default(self):
+        """ Trait initializer. """
+
+        from envisage.resource.api import ResourceManager
+
+        return ResourceManager()
+
+    def _get_validator(self, url):
+        """ Return a value that changes whenever the file at a URL changes.
+
+        Returns a tuple in the form (validator, data) where data is the
+        contents of the file if they had to be read to compute the validator
+        (otherwise None).
+
+        """
+
+        path = self._get_path(url)
+        if path is not None:
+            try:
+                stat = os.stat(path)
+
+            except OSError:
+                pass
+
+            else:
+                return ("stat", path, stat.st_mtime_ns, stat.st_size), None
+
+        data = self._read(url)
+
+        return ("sha1", hashlib.sha1(data).hexdigest()), data
+
+    def _get_path(self, url):
+        """ Return the path of the file at a URL (or None if there isn't one).
+        """
+
+        protocol, _, address = url.partition("://")
+        if protocol == "file":
+            return address
+
+        if protocol == "pkgfile" and "/" in address:
+            package, _, resource_name = address.partition("/")
+            try:
+                spec = importlib.util.find_spec(package)
+
+            except (ImportError, ValueError):
+                return None
+
+            if spec is None or spec.submodule_search_locations is None:
+                return None
+
+            for location in spec.submodule_search_locations:
+                path = os.path.join(location, *resource_name.split("/"))
+                if os.path.isfile(path):
+                    return path
+
+        return None
+
+    def _parse(self, url, data):
+        """ Parse the preferences file at a URL. """
+
+        # Major package imports.
+        from configobj import ConfigObj
+
+        if data is None:
+            data = self._read(url)
+
+        # This is how 'Preferences.load' parses files.
+        return ConfigObj(io.BytesIO(data), encoding="utf-8").dict()
+
+    def _read(self, url):
+        """ Read the contents of the file at a URL. """
+
+        f = self.resource_manager.file(url)
+        try:
+            return f.read()
+
+        finally:
+            f.close()
+
+    def _read_cache(self):
+        """ Read the cache from its file (if there is one). """
+
+        cache = {"sources": {}, "snapshot": None}
+        if len(self.filename) > 0 and os.path.exists(self.filename):
+            try:
+                with open(self.filename, "rb") as f:
+                    cache = pickle.load(f)
+
+            except Exception:
+                logger.warning(
+                    "ignoring corrupt preferences cache %s", self.filename
+                )
+
+        return cache
+
+    def _write_cache(self):
+        """ Write the cache to its file (if there is one). """
+
+        if len(self.filename) == 0:
+            return
+
+        # Write to a temporary file first so that the cache file is never left
+        # half written.
+        try:
+            with atomic_open(self.filename) as f:
+                pickle.dump(self._cache, f, pickle.HIGHEST_PROTOCOL)
+
+        except OSError:
+            logger.warning(
+                "cannot write preferences cache %s", self.filename,
+                exc_info=True
+            )
+
+        return
@@ -43,6 +43,12 @@ class ProviderExtensionRegistry(ExtensionRegistry):
 
         raise SystemError("extension points cannot be set")
 
+    def update_extensions(self, extension_point_id, index, removed, added):
+        """ Replace some of the extensions contributed to an extension point.
+        """
+
+        raise SystemError("extension points cannot be set")
+
     ###########################################################################
     # 'ProviderExtensionRegistry' interface.
     ###########################################################################
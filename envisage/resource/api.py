@@ -6,11 +6,28 @@
 # under the conditions described in the aforementioned license.  The license
 # is also available online at http://www.enthought.com/licenses/BSD.txt
 # Thanks for using Enthought open source!
-from .i_resource_protocol import IResourceProtocol
-from .i_resource_manager import IResourceManager
+""" The resource API.
 
-from .file_resource_protocol import FileResourceProtocol
-from .http_resource_protocol import HTTPResourceProtocol
-from .no_such_resource_error import NoSuchResourceError
-from .package_resource_protocol import PackageResourceProtocol
-from .resource_manager import ResourceManager
+The names in this module are imported on first access, so that, for example,
+'pkg_resources' is only imported when the 'PackageResourceProtocol' is used.
+
+"""
+
+from envisage._lazy_api import install_lazy_api
+
+install_lazy_api(
+    globals(),
+    {
+        "IAsyncResourceProtocol": ".i_async_resource_protocol",
+        "IResourceProtocol": ".i_resource_protocol",
+        "IResourceManager": ".i_resource_manager",
+        "CachingResourceManager": ".caching_resource_manager",
+        "FileResourceProtocol": ".file_resource_protocol",
+        "HTTPResourceProtocol": ".http_resource_protocol",
+        "ImportlibResourceProtocol": ".importlib_resource_protocol",
+        "NoSuchResourceError": ".no_such_resource_error",
+        "PackageResourceProtocol": ".package_resource_protocol",
+        "PooledHTTPResourceProtocol": ".pooled_http_resource_protocol",
+        "ResourceManager": ".resource_manager",
+    },
+)
@@ -0,0 +1,245 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A resource manager that caches the contents of resources. """
+
+
+# Standard library imports.
+from collections import OrderedDict
+from io import BytesIO
+import os
+import threading
+
+# Enthought library imports.
+from traits.api import Any, Int, Set
+
+# Local imports.
+from .resource_manager import ResourceManager
+
+
+class CachingResourceManager(ResourceManager):
+    """ A resource manager that caches the contents of resources.
+
+    The contents of resources are kept in memory in a least recently used
+    (LRU) cache keyed by URL, so that resources that are used over and over
+    again (e.g. icons and preferences files) are only read once. The protocols
+    themselves know nothing about the cache.
+
+    'file://' resources are validated by their modification time and size
+    every time that they are used, and are read again if they have changed.
+    Resources from any other protocol are cached until they are evicted, or
+    until 'invalidate' is called.
+
+    """
+
+    #### 'CachingResourceManager' interface ###################################
+
+    # The maximum total size (in bytes) of the cached resources. Resources
+    # that are larger than this are never cached (unless they are pinned).
+    max_size = Int(32 * 1024 * 1024)
+
+    # The number of times that a resource was found in the cache.
+    hits = Int
+
+    # The number of times that a resource had to be read.
+    misses = Int
+
+    # The total size (in bytes) of the cached resources.
+    size = Int
+
+    #### Private interface ####################################################
+
+    # The cached resources in least to most recently used order.
+    #
+    # { Str url : (validator, bytes data) }
+    _cache = Any
+
+    # The lock that protects the cache (resources can be read concurrently by
+    # 'files' and 'read_many').
+    _lock = Any
+
+    # The URLs of the pinned resources.
+    _pinned = Set
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        super().__init__(**traits)
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    ###########################################################################
+    # 'IResourceManager' interface.
+    ###########################################################################
+
+    def file(self, url):
+        """ Return a readable file-like object for the specified url. """
+
+        return BytesIO(self._get(url))
+
+    def open_buffer(self, url):
+        """ Return a read-only memoryview of the specified url. """
+
+        # A view of the cached bytes is both read-only and copy-free.
+        return memoryview(self._get(url))
+
+    ###########################################################################
+    # 'CachingResourceManager' interface.
+    ###########################################################################
+
+    def clear(self):
+        """ Remove all resources (including pinned ones) from the cache. """
+
+        with self._lock:
+            self._cache.clear()
+            self._pinned.clear()
+            self.size = 0
+
+        return
+
+    def invalidate(self, url):
+        """ Remove a resource from the cache.
+
+        The resource is read again the next time that it is used (and if it
+        is pinned then it stays pinned).
+
+        """
+
+        with self._lock:
+            self._remove(url)
+
+        return
+
+    def pin(self, url):
+        """ Pin a resource in the cache.
+
+        The resource is read now (if it is not already cached) and it is
+        never evicted to make room for other resources.
+
+        """
+
+        with self._lock:
+            self._pinned.add(url)
+
+        try:
+            self._get(url)
+
+        except Exception:
+            with self._lock:
+                self._pinned.discard(url)
+            raise
+
+        return
+
+    def unpin(self, url):
+        """ Unpin a resource so that it can be evicted again. """
+
+        with self._lock:
+            self._pinned.discard(url)
+            self._evict()
+
+        return
+
+    def is_cached(self, url):
+        """ Return True if a resource is in the cache. """
+
+        with self._lock:
+            return url in self._cache
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get(self, url):
+        """ Return the contents of a resource (from the cache if possible).
+        """
+
+        validator = self._get_validator(url)
+
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is not None and entry[0] == validator:
+                self._cache.move_to_end(url)
+                self.hits += 1
+
+                return entry[1]
+
+            self.misses += 1
+
+        # Read the resource outside of the lock so that other resources can be
+        # read concurrently.
+        try:
+            f = super().file(url)
+
+        except Exception:
+            # Make sure that we don't keep a resource that no longer exists.
+            self.invalidate(url)
+            raise
+
+        try:
+            data = f.read()
+
+        finally:
+            f.close()
+
+        with self._lock:
+            self._remove(url)
+            if url in self._pinned or len(data) <= self.max_size:
+                self._cache[url] = (validator, data)
+                self.size += len(data)
+                self._evict()
+
+        return data
+
+    def _get_validator(self, url):
+        """ Return a value that changes whenever a resource changes.
+
+        Only 'file://' resources can be validated, so for all others this
+        returns None.
+
+        """
+
+        protocol_name, _, address = url.partition("://")
+        if protocol_name != "file":
+            return None
+
+        try:
+            stat = os.stat(address)
+
+        except OSError:
+            # Let the protocol raise the appropriate error when the resource
+            # is read.
+            return None
+
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _evict(self):
+        """ Evict least recently used resources until the cache fits. """
+
+        for url in list(self._cache):
+            if self.size <= self.max_size:
+                break
+
+            if url not in self._pinned:
+                self._remove(url)
+
+        return
+
+    def _remove(self, url):
+        """ Remove a resource from the cache (if it is there). """
+
+        entry = self._cache.pop(url, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+        return
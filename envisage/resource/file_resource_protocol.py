@@ -11,6 +11,7 @@
 
 # Standard library imports.
 import errno
+import mmap
 
 # Enthought library imports.
 from traits.api import HasTraits, provides
@@ -44,3 +45,29 @@ class FileResourceProtocol(HasTraits):
                 raise
 
         return f
+
+    ###########################################################################
+    # 'FileResourceProtocol' interface.
+    ###########################################################################
+
+    def buffer(self, address):
+        """ Return a read-only memoryview of the specified address.
+
+        The view is over a memory-mapped file, so nothing is copied until
+        the contents are actually used. The file is unmapped when the view
+        (and anything created from it) is released or garbage collected.
+
+        """
+
+        f = self.file(address)
+        try:
+            # Empty files can't be mapped.
+            if f.seek(0, 2) == 0:
+                return memoryview(b"")
+
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        finally:
+            f.close()
+
+        return memoryview(buffer)
@@ -0,0 +1,33 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" The interface for protocols that can read resources asynchronously. """
+
+
+# Local imports.
+from .i_resource_protocol import IResourceProtocol
+
+
+class IAsyncResourceProtocol(IResourceProtocol):
+    """ The interface for protocols that can read resources asynchronously.
+
+    Protocols that only provide 'IResourceProtocol' can still be used with
+    'ResourceManager.aread' (their 'file' method is called on a thread pool).
+
+    """
+
+    async def aread(self, address):
+        """ Return the contents (as bytes) of the specified address.
+
+        Raise a 'NoSuchResourceError' if the resource does not exist.
+
+        e.g.::
+
+          data = await protocol.aread('acme.ui.workbench/preferences.ini')
+
+        """
@@ -32,3 +32,44 @@ class IResourceManager(Interface):
           manager.file('pkgfile://acme.ui.workbench/preferences.ini')
 
         """
+
+    def open_buffer(self, url):
+        """ Return a read-only memoryview of the specified url.
+
+        Raise a 'NoSuchResourceError' if the resource does not exist.
+
+        Where possible (e.g. for 'file://' URLs) the view is over a
+        memory-mapped file so that the contents are never copied.
+
+        """
+
+    async def aread(self, url):
+        """ Return the contents (as bytes) of the specified url.
+
+        Raise a 'NoSuchResourceError' if the resource does not exist.
+
+        e.g.::
+
+          data = await manager.aread('pkgfile://acme.ui/preferences.ini')
+
+        """
+
+    def files(self, urls, ordered=True):
+        """ Resolve many resources concurrently.
+
+        Returns an iterable of (url, future) pairs. The result of each future
+        is a readable file-like object, or raises a 'NoSuchResourceError' if
+        the resource does not exist.
+
+        If 'ordered' is True then the pairs are in the same order as the URLs,
+        otherwise they are in the order that the resources are resolved.
+
+        """
+
+    def read_many(self, urls, ordered=True):
+        """ Read the contents of many resources concurrently.
+
+        This is the same as 'files' except that the result of each future is
+        the contents of the resource (as bytes).
+
+        """
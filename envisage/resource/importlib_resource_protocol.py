@@ -0,0 +1,119 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A resource protocol for package resources using 'importlib'. """
+
+
+# Standard library imports.
+import importlib
+from io import BytesIO
+import os
+
+# Enthought library imports.
+from traits.api import Dict, HasTraits, provides
+
+# Local imports.
+from .i_resource_protocol import IResourceProtocol
+from .no_such_resource_error import NoSuchResourceError
+
+
+try:
+    from importlib.resources import files
+
+except ImportError:
+    # Python < 3.9.
+    files = None
+
+
+@provides(IResourceProtocol)
+class ImportlibResourceProtocol(HasTraits):
+    """ A resource protocol for package resources using 'importlib'.
+
+    This protocol is an alternative to the 'PackageResourceProtocol' that
+    uses 'importlib.resources' instead of 'pkg_resources'. It doesn't need to
+    scan the working set, and it reads resources in zipped packages straight
+    from the archive instead of extracting them to temporary files.
+
+    The addresses are the same as for the 'PackageResourceProtocol'::
+
+        'acme.ui.workbench/preferences.ini'
+
+    """
+
+    #### Private interface ####################################################
+
+    # The location of each package's resources (this is resolved only once
+    # per package).
+    #
+    # { Str package : Traversable }
+    _roots = Dict
+
+    ###########################################################################
+    # 'IResourceProtocol' interface.
+    ###########################################################################
+
+    def file(self, address):
+        """ Return a readable file-like object for the specified address. """
+
+        first_forward_slash = address.index("/")
+
+        package = address[:first_forward_slash]
+        resource_name = address[first_forward_slash + 1:]
+
+        try:
+            root = self._get_root(package)
+            if files is None:
+                return BytesIO(root(resource_name))
+
+            resource = root.joinpath(*resource_name.split("/"))
+            if not resource.is_file():
+                raise NoSuchResourceError(address)
+
+            return resource.open("rb")
+
+        except (ImportError, OSError, TypeError):
+            raise NoSuchResourceError(address)
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_root(self, package):
+        """ Return the location of a package's resources. """
+
+        root = self._roots.get(package)
+        if root is None:
+            if files is not None:
+                root = files(package)
+
+            else:
+                root = self._get_data_function(package)
+
+            self._roots[package] = root
+
+        return root
+
+    def _get_data_function(self, package):
+        """ Return a function that reads a package's resources.
+
+        This is only used for Python versions that don't have
+        'importlib.resources.files'. The package's loader is used directly, so
+        zipped resources are still not extracted.
+
+        """
+
+        module = importlib.import_module(package)
+        loader = module.__spec__.loader
+        dirname = os.path.dirname(module.__file__)
+
+        def get_data(resource_name):
+            return loader.get_data(
+                os.path.join(dirname, *resource_name.split("/"))
+            )
+
+        return get_data
@@ -12,9 +12,6 @@
 # Standard library imports.
 import errno
 
-# 3rd party imports.
-import pkg_resources
-
 # Enthought library imports.
 from traits.api import HasTraits, provides
 
@@ -47,6 +44,10 @@ class PackageResourceProtocol(HasTraits):
     def file(self, address):
         """ Return a readable file-like object for the specified address. """
 
+        # Do the import here because 'pkg_resources' is slow to import and is
+        # only needed once a package resource is actually requested.
+        import pkg_resources
+
         first_forward_slash = address.index("/")
 
         package = address[:first_forward_slash]
@@ -0,0 +1,311 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A resource protocol for HTTP documents with connection pooling. """
+
+
+# Standard library imports.
+import hashlib
+import http.client
+from io import BytesIO
+import json
+import logging
+import os
+import threading
+from urllib.parse import urljoin, urlsplit
+
+# Enthought library imports.
+from traits.api import Any, Dict, Float, HasTraits, Int, Str, provides
+
+# Local imports.
+from envisage._atomic_file import atomic_open
+from .i_resource_protocol import IResourceProtocol
+from .no_such_resource_error import NoSuchResourceError
+
+
+# Logging.
+logger = logging.getLogger(__name__)
+
+
+# The HTTP status codes that are followed as redirects.
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+@provides(IResourceProtocol)
+class PooledHTTPResourceProtocol(HasTraits):
+    """ A resource protocol for HTTP documents with connection pooling.
+
+    Unlike the 'HTTPResourceProtocol', which opens a new connection for every
+    resource, this protocol keeps connections alive and reuses them for
+    requests to the same host.
+
+    Responses that have an 'ETag' or 'Last-Modified' header are also cached
+    on disk (in 'cache_directory'), and are revalidated with a conditional
+    request the next time that they are used, so that unchanged documents
+    are not downloaded again.
+
+    To use it instead of the default protocol::
+
+        resource_manager.resource_protocols['http'] = (
+            PooledHTTPResourceProtocol()
+        )
+
+    """
+
+    #### 'PooledHTTPResourceProtocol' interface ###############################
+
+    # The directory that responses are cached in. By default this is the
+    # 'http_cache' directory in the application home. If it is empty then
+    # responses are not cached.
+    cache_directory = Str
+
+    # The maximum number of idle connections kept alive for each host.
+    max_connections_per_host = Int(4)
+
+    # The maximum number of redirects that are followed for a resource.
+    max_redirects = Int(5)
+
+    # The timeout (in seconds) for connecting to a host and for each read.
+    timeout = Float(30.0)
+
+    #### Private interface ####################################################
+
+    # The idle connections for each host.
+    #
+    # { Str host : [http.client.HTTPConnection] }
+    _connections = Dict
+
+    # The lock that protects the idle connections.
+    _lock = Any
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        super().__init__(**traits)
+
+        self._lock = threading.Lock()
+
+    ###########################################################################
+    # 'IResourceProtocol' interface.
+    ###########################################################################
+
+    def file(self, address):
+        """ Return a readable file-like object for the specified address. """
+
+        url = "http://" + address
+        for _ in range(self.max_redirects + 1):
+            status, headers, body = self._get(url)
+            if status not in REDIRECT_STATUSES:
+                break
+
+            # Relative redirects are relative to the current URL.
+            location = urljoin(url, headers.get("Location", ""))
+            if urlsplit(location).scheme != "http":
+                raise NoSuchResourceError(
+                    "%s redirects to %s, but only 'http' URLs are supported"
+                    % (address, location)
+                )
+
+            url = location
+
+        else:
+            raise NoSuchResourceError(address)
+
+        if status >= 400:
+            raise NoSuchResourceError(address)
+
+        return BytesIO(body)
+
+    ###########################################################################
+    # 'PooledHTTPResourceProtocol' interface.
+    ###########################################################################
+
+    def close(self):
+        """ Close all idle connections. """
+
+        with self._lock:
+            connections, self._connections = self._connections, {}
+
+        for host_connections in connections.values():
+            for connection in host_connections:
+                connection.close()
+
+        return
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _cache_directory_default(self):
+        """ Trait initializer. """
+
+        from traits.etsconfig.api import ETSConfig
+
+        return os.path.join(ETSConfig.application_home, "http_cache")
+
+    def _get(self, url):
+        """ GET a URL, revalidating any cached response.
+
+        Returns a tuple in the form (status, headers, body).
+
+        """
+
+        cached = self._read_cache(url)
+
+        request_headers = {}
+        if cached is not None:
+            if cached["etag"] is not None:
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"] is not None:
+                request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        host, path = self._split_url(url)
+        status, headers, body = self._request(host, path, request_headers)
+
+        if status == 304 and cached is not None:
+            logger.debug("using cached response for %s", url)
+            return 200, headers, cached["body"]
+
+        if status == 200:
+            etag = headers.get("ETag")
+            last_modified = headers.get("Last-Modified")
+            if etag is not None or last_modified is not None:
+                self._write_cache(url, etag, last_modified, body)
+
+        return status, headers, body
+
+    def _request(self, host, path, headers):
+        """ Make a GET request on a pooled connection. """
+
+        connection = self._acquire_connection(host)
+        try:
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+
+            except ConnectionError:
+                # The server may have closed an idle connection, so try once
+                # more on a new one.
+                connection.close()
+                connection = self._create_connection(host)
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+
+            body = response.read()
+
+        except Exception:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+
+        else:
+            self._release_connection(host, connection)
+
+        return response.status, response.headers, body
+
+    def _acquire_connection(self, host):
+        """ Return an idle connection to a host (or a new one). """
+
+        with self._lock:
+            connections = self._connections.get(host)
+            if connections:
+                return connections.pop()
+
+        return self._create_connection(host)
+
+    def _release_connection(self, host, connection):
+        """ Return a connection to the pool. """
+
+        with self._lock:
+            connections = self._connections.setdefault(host, [])
+            if len(connections) < self.max_connections_per_host:
+                connections.append(connection)
+                connection = None
+
+        if connection is not None:
+            connection.close()
+
+        return
+
+    def _create_connection(self, host):
+        """ Create a new connection to a host. """
+
+        return http.client.HTTPConnection(host, timeout=self.timeout)
+
+    def _split_url(self, url):
+        """ Split an 'http://' URL into its host and path. """
+
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        return parts.netloc, path
+
+    #### Response cache #######################################################
+
+    def _get_cache_filename(self, url):
+        """ Return the name of the file that a response is cached in.
+
+        The file contains a line of JSON with the URL and the response's
+        validators, followed by the body. Keeping them in one file means that
+        a body can never be paired with another response's validators.
+
+        """
+
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+        return os.path.join(self.cache_directory, key + ".response")
+
+    def _read_cache(self, url):
+        """ Return the cached response for a URL (or None if there isn't one).
+        """
+
+        if len(self.cache_directory) == 0:
+            return None
+
+        try:
+            with open(self._get_cache_filename(url), "rb") as f:
+                cached = json.loads(f.readline().decode("utf-8"))
+                cached["body"] = f.read()
+
+        except (OSError, ValueError):
+            return None
+
+        # Guard against hash collisions.
+        if cached.get("url") != url:
+            return None
+
+        return cached
+
+    def _write_cache(self, url, etag, last_modified, body):
+        """ Cache a response. """
+
+        if len(self.cache_directory) == 0:
+            return
+
+        metadata = {"url": url, "etag": etag, "last_modified": last_modified}
+        try:
+            if not os.path.exists(self.cache_directory):
+                os.makedirs(self.cache_directory, exist_ok=True)
+
+            # JSON never contains a newline (unless it is indented).
+            with atomic_open(self._get_cache_filename(url)) as f:
+                f.write(json.dumps(metadata).encode("utf-8") + b"\n")
+                f.write(body)
+
+        except OSError:
+            logger.warning("cannot cache response for %s", url, exc_info=True)
+
+        return
@@ -9,10 +9,16 @@
 """ The default resource manager. """
 
 
+# Standard library imports.
+import asyncio
+from concurrent.futures import as_completed, ThreadPoolExecutor
+import weakref
+
 # Enthought library imports.
-from traits.api import Dict, HasTraits, Str, provides
+from traits.api import Any, Dict, Enum, HasTraits, Int, Str, provides
 
 # Local imports.
+from .i_async_resource_protocol import IAsyncResourceProtocol
 from .i_resource_manager import IResourceManager
 from .i_resource_protocol import IResourceProtocol
 
@@ -26,6 +32,46 @@ class ResourceManager(HasTraits):
     # The protocols used by the manager to resolve resource URLs.
     resource_protocols = Dict(Str, IResourceProtocol)
 
+    #### 'ResourceManager' interface ##########################################
+
+    # The maximum number of threads used to resolve resources concurrently
+    # (see 'files' and 'read_many'), and the maximum number of resources
+    # that 'aread' reads concurrently for each protocol by default.
+    max_workers = Int(8)
+
+    # The maximum number of resources that 'aread' reads concurrently for
+    # each protocol (by protocol name). Protocols that are not in here are
+    # limited to 'max_workers'.
+    #
+    # e.g. { 'http' : 2 }
+    async_concurrency = Dict(Str, Int)
+
+    # The implementation used for the 'pkgfile' protocol by default:-
+    #
+    # 'pkg_resources' - 'PackageResourceProtocol'
+    # 'importlib'     - 'ImportlibResourceProtocol' (this doesn't import
+    #                   'pkg_resources' or extract zipped resources).
+    pkgfile_implementation = Enum("pkg_resources", "importlib")
+
+    #### Private interface ####################################################
+
+    # The semaphores that limit the concurrency of 'aread' for each event
+    # loop (asyncio semaphores can only be used with a single loop).
+    #
+    # { event_loop : { Str protocol_name : asyncio.Semaphore } }
+    _async_semaphores = Any
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        super().__init__(**traits)
+
+        self._async_semaphores = weakref.WeakKeyDictionary()
+
     ###########################################################################
     # 'IResourceManager' interface.
     ###########################################################################
@@ -39,7 +85,14 @@ class ResourceManager(HasTraits):
         # that doesn't use the default protocol(s).
         from .file_resource_protocol import FileResourceProtocol
         from .http_resource_protocol import HTTPResourceProtocol
-        from .package_resource_protocol import PackageResourceProtocol
+
+        if self.pkgfile_implementation == "importlib":
+            from .importlib_resource_protocol import (
+                ImportlibResourceProtocol as PackageResourceProtocol
+            )
+
+        else:
+            from .package_resource_protocol import PackageResourceProtocol
 
         resource_protocols = {
             "file": FileResourceProtocol(),
@@ -54,10 +107,161 @@ class ResourceManager(HasTraits):
     def file(self, url):
         """ Return a readable file-like object for the specified url. """
 
+        protocol, address = self._get_protocol(url)
+
+        return protocol.file(address)
+
+    def open_buffer(self, url):
+        """ Return a read-only memoryview of the specified url.
+
+        If the resource's protocol supports it (e.g. 'file://') then the view
+        is over a memory-mapped file so that the contents are not copied
+        (e.g. 'numpy.frombuffer' can use it directly). Otherwise, the view is
+        over the contents read from the resource's file-like object.
+
+        """
+
+        protocol, address = self._get_protocol(url)
+
+        buffer = getattr(protocol, "buffer", None)
+        if buffer is not None:
+            return buffer(address)
+
+        f = protocol.file(address)
+        try:
+            return memoryview(f.read())
+
+        finally:
+            f.close()
+
+    async def aread(self, url):
+        """ Return the contents (as bytes) of the specified url.
+
+        This is a coroutine, so resources can be read without blocking the
+        event loop (e.g. in a GUI). Protocols that provide
+        'IAsyncResourceProtocol' read the resource themselves, and the 'file'
+        method of any other protocol is called on the event loop's default
+        executor (so the event loop owns, and shuts down, the threads).
+
+        Raise a 'NoSuchResourceError' if the resource does not exist.
+
+        e.g.::
+
+          data = await manager.aread('pkgfile://acme.ui/preferences.ini')
+
+        """
+
+        protocol_name, _, _ = url.partition("://")
+        protocol, address = self._get_protocol(url)
+
+        async with self._get_async_semaphore(protocol_name):
+            if isinstance(protocol, IAsyncResourceProtocol):
+                return await protocol.aread(address)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._read, url)
+
+    def files(self, urls, ordered=True):
+        """ Resolve many resources concurrently.
+
+        Returns an iterable of (url, future) pairs, one for each URL. The
+        result of each future is a readable file-like object (which the
+        caller is responsible for closing) and, just as with 'file', asking
+        for the result raises a 'NoSuchResourceError' if the resource does not
+        exist. Errors for one URL do not affect any of the others.
+
+        If 'ordered' is True then the pairs are in the same order as the URLs,
+        otherwise they are yielded as each resource is resolved.
+
+        """
+
+        return self._map(self.file, urls, ordered)
+
+    def read_many(self, urls, ordered=True):
+        """ Read the contents of many resources concurrently.
+
+        This is the same as 'files' except that the result of each future is
+        the contents of the resource (as bytes) and the file-like objects are
+        closed for you.
+
+        e.g.::
+
+          for url, future in manager.read_many(urls):
+              try:
+                  data = future.result()
+
+              except NoSuchResourceError:
+                  ...
+
+        """
+
+        return self._map(self._read, urls, ordered)
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_async_semaphore(self, protocol_name):
+        """ Return the semaphore limiting 'aread' for a protocol. """
+
+        loop = asyncio.get_running_loop()
+        semaphores = self._async_semaphores.setdefault(loop, {})
+
+        semaphore = semaphores.get(protocol_name)
+        if semaphore is None:
+            limit = self.async_concurrency.get(protocol_name, self.max_workers)
+            semaphore = asyncio.Semaphore(max(1, limit))
+            semaphores[protocol_name] = semaphore
+
+        return semaphore
+
+    def _get_protocol(self, url):
+        """ Return the protocol and the address for the specified url. """
+
         protocol_name, address = url.split("://")
 
         protocol = self.resource_protocols.get(protocol_name)
         if protocol is None:
             raise ValueError("unknown protocol in URL %s" % url)
 
-        return protocol.file(address)
+        return protocol, address
+
+    def _map(self, function, urls, ordered):
+        """ Call a function with each URL on a thread pool. """
+
+        urls = list(urls)
+        if len(urls) == 0:
+            return []
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(urls)))
+        )
+        try:
+            pairs = [(url, executor.submit(function, url)) for url in urls]
+
+        finally:
+            # The worker threads exit as soon as all of the URLs have been
+            # resolved, so we don't need to wait for them here.
+            executor.shutdown(wait=False)
+
+        if ordered:
+            return pairs
+
+        return self._as_completed(pairs)
+
+    def _as_completed(self, pairs):
+        """ Yield (url, future) pairs as each future completes. """
+
+        urls = {future: url for url, future in pairs}
+        for future in as_completed(urls):
+            yield urls[future], future
+
+    def _read(self, url):
+        """ Read the contents of the resource at the specified url. """
+
+        f = self.file(url)
+        try:
+            return f.read()
+
+        finally:
+            f.close()
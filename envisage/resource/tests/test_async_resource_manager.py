@@ -0,0 +1,223 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for reading resources asynchronously with the resource manager. """
+
+
+# Standard library imports.
+import asyncio
+import functools
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from io import BytesIO
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# Enthought library imports.
+from envisage.resource.api import IAsyncResourceProtocol, IResourceProtocol
+from envisage.resource.api import NoSuchResourceError, ResourceManager
+from traits.api import HasTraits, Int, provides
+
+
+@provides(IResourceProtocol)
+class SlowResourceProtocol(HasTraits):
+    """ A blocking protocol that records how many reads overlap. """
+
+    # The number of reads in progress.
+    active = Int
+
+    # The largest number of reads that were in progress at the same time.
+    max_active = Int
+
+    def file(self, address):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.05)
+
+        finally:
+            self.active -= 1
+
+        return BytesIO(address.encode("ascii"))
+
+
+@provides(IAsyncResourceProtocol)
+class NativeAsyncResourceProtocol(HasTraits):
+    """ A protocol that reads resources natively on the event loop. """
+
+    def file(self, address):
+        raise AssertionError("'aread' should not call 'file'")
+
+    async def aread(self, address):
+        if address == "bogus":
+            raise NoSuchResourceError(address)
+
+        await asyncio.sleep(0)
+
+        return address.encode("ascii")
+
+
+class QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """ A request handler that doesn't log every request. """
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AsyncResourceManagerTestCase(unittest.TestCase):
+    """ Tests for reading resources asynchronously. """
+
+    ###########################################################################
+    # 'TestCase' interface.
+    ###########################################################################
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "data.txt")
+        with open(self.filename, "wb") as f:
+            f.write(b"This is a test file.\n")
+
+        self.rm = ResourceManager()
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        shutil.rmtree(self.tmpdir)
+
+    ###########################################################################
+    # Tests.
+    ###########################################################################
+
+    def test_file_resource(self):
+        """ file resource """
+
+        data = self._run(self.rm.aread("file://" + self.filename))
+        self.assertEqual(b"This is a test file.\n", data)
+
+    def test_package_resource(self):
+        """ package resource """
+
+        data = self._run(self.rm.aread("pkgfile://envisage.resource/api.py"))
+
+        filename = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "api.py"
+        )
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_http_resource(self):
+        """ http resource """
+
+        server = HTTPServer(
+            ("127.0.0.1", 0),
+            functools.partial(QuietHTTPRequestHandler, directory=self.tmpdir),
+        )
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            url = "http://127.0.0.1:%d/" % server.server_address[1]
+
+            data = self._run(self.rm.aread(url + "data.txt"))
+            self.assertEqual(b"This is a test file.\n", data)
+
+            with self.assertRaises(NoSuchResourceError):
+                self._run(self.rm.aread(url + "bogus.txt"))
+
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+    def test_no_such_resource(self):
+        """ no such resource """
+
+        with self.assertRaises(NoSuchResourceError):
+            self._run(self.rm.aread("file://../bogus.py"))
+
+        with self.assertRaises(NoSuchResourceError):
+            self._run(self.rm.aread("pkgfile://envisage.resource/bogus.py"))
+
+        with self.assertRaises(ValueError):
+            self._run(self.rm.aread("bogus://foo/bar/baz"))
+
+    def test_native_async_protocol(self):
+        """ native async protocol """
+
+        self.rm.resource_protocols["native"] = NativeAsyncResourceProtocol()
+
+        self.assertEqual(b"foo", self._run(self.rm.aread("native://foo")))
+
+        with self.assertRaises(NoSuchResourceError):
+            self._run(self.rm.aread("native://bogus"))
+
+    def test_concurrency_limit(self):
+        """ concurrency limit """
+
+        slow = SlowResourceProtocol()
+        self.rm.resource_protocols["slow"] = slow
+        self.rm.async_concurrency = {"slow": 2}
+
+        async def read_all():
+            return await asyncio.gather(
+                *[self.rm.aread("slow://%d" % i) for i in range(6)]
+            )
+
+        results = self._run(read_all())
+
+        self.assertEqual([str(i).encode("ascii") for i in range(6)], results)
+        self.assertEqual(2, slow.max_active)
+
+    def test_event_loop_is_not_blocked(self):
+        """ event loop is not blocked """
+
+        self.rm.resource_protocols["slow"] = SlowResourceProtocol()
+
+        ticks = []
+
+        async def tick():
+            for _ in range(3):
+                ticks.append(time.time())
+                await asyncio.sleep(0)
+
+        async def read_and_tick():
+            await asyncio.gather(self.rm.aread("slow://foo"), tick())
+
+        self._run(read_and_tick())
+
+        # The ticks all happened while the resource was being read.
+        self.assertEqual(3, len(ticks))
+        self.assertLess(ticks[-1] - ticks[0], 0.05)
+
+    def test_no_threads_outlive_the_event_loop(self):
+        """ no threads outlive the event loop """
+
+        threads = set(threading.enumerate())
+
+        data = asyncio.run(self.rm.aread("file://" + self.filename))
+
+        self.assertEqual(b"This is a test file.\n", data)
+        self.assertEqual(set(), set(threading.enumerate()) - threads)
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _run(self, coroutine):
+        """ Run a coroutine on a new event loop and return its result. """
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+
+        finally:
+            loop.close()
@@ -0,0 +1,200 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the caching resource manager. """
+
+
+# Standard library imports.
+from io import BytesIO
+import os
+import shutil
+import tempfile
+import unittest
+
+# Enthought library imports.
+from envisage.resource.api import CachingResourceManager
+from envisage.resource.api import IResourceProtocol, NoSuchResourceError
+from traits.api import Dict, HasTraits, provides
+
+
+@provides(IResourceProtocol)
+class MemoryResourceProtocol(HasTraits):
+    """ A resource protocol that counts how often each resource is read. """
+
+    # The resources by address.
+    resources = Dict
+
+    # The number of times each resource has been read, by address.
+    reads = Dict
+
+    def file(self, address):
+        if address not in self.resources:
+            raise NoSuchResourceError(address)
+
+        self.reads[address] = self.reads.get(address, 0) + 1
+
+        return BytesIO(self.resources[address])
+
+
+class CachingResourceManagerTestCase(unittest.TestCase):
+    """ Tests for the caching resource manager. """
+
+    ###########################################################################
+    # 'TestCase' interface.
+    ###########################################################################
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.tmpdir = tempfile.mkdtemp()
+
+        self.protocol = MemoryResourceProtocol(
+            resources={"a": b"a" * 10, "b": b"b" * 10, "c": b"c" * 10}
+        )
+        self.rm = CachingResourceManager(max_size=25)
+        self.rm.resource_protocols["memory"] = self.protocol
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        shutil.rmtree(self.tmpdir)
+
+    ###########################################################################
+    # Tests.
+    ###########################################################################
+
+    def test_cache_hit(self):
+        """ cache hit """
+
+        for _ in range(3):
+            self.assertEqual(b"a" * 10, self.rm.file("memory://a").read())
+
+        self.assertEqual({"a": 1}, self.protocol.reads)
+        self.assertEqual(2, self.rm.hits)
+        self.assertEqual(1, self.rm.misses)
+        self.assertEqual(10, self.rm.size)
+
+    def test_lru_eviction(self):
+        """ lru eviction """
+
+        self.rm.file("memory://a")
+        self.rm.file("memory://b")
+
+        # Use 'a' so that 'b' is the least recently used.
+        self.rm.file("memory://a")
+        self.rm.file("memory://c")
+
+        self.assertTrue(self.rm.is_cached("memory://a"))
+        self.assertFalse(self.rm.is_cached("memory://b"))
+        self.assertTrue(self.rm.is_cached("memory://c"))
+        self.assertEqual(20, self.rm.size)
+
+    def test_too_large_to_cache(self):
+        """ too large to cache """
+
+        self.protocol.resources["big"] = b"x" * 100
+
+        self.assertEqual(b"x" * 100, self.rm.file("memory://big").read())
+        self.assertFalse(self.rm.is_cached("memory://big"))
+        self.assertEqual(0, self.rm.size)
+
+    def test_pin(self):
+        """ pin """
+
+        self.rm.pin("memory://a")
+        self.assertEqual({"a": 1}, self.protocol.reads)
+
+        self.rm.file("memory://b")
+        self.rm.file("memory://c")
+
+        # 'a' is the least recently used but it is pinned, so 'b' goes.
+        self.assertTrue(self.rm.is_cached("memory://a"))
+        self.assertFalse(self.rm.is_cached("memory://b"))
+        self.assertTrue(self.rm.is_cached("memory://c"))
+
+        self.rm.unpin("memory://a")
+        self.rm.file("memory://b")
+        self.assertFalse(self.rm.is_cached("memory://a"))
+
+    def test_pin_no_such_resource(self):
+        """ pin no such resource """
+
+        with self.assertRaises(NoSuchResourceError):
+            self.rm.pin("memory://bogus")
+
+        self.assertFalse(self.rm.is_cached("memory://bogus"))
+
+    def test_invalidate(self):
+        """ invalidate """
+
+        self.rm.file("memory://a")
+        self.protocol.resources["a"] = b"changed"
+        self.assertEqual(b"a" * 10, self.rm.file("memory://a").read())
+
+        self.rm.invalidate("memory://a")
+        self.assertEqual(b"changed", self.rm.file("memory://a").read())
+
+    def test_clear(self):
+        """ clear """
+
+        self.rm.pin("memory://a")
+        self.rm.file("memory://b")
+        self.rm.clear()
+
+        self.assertFalse(self.rm.is_cached("memory://a"))
+        self.assertFalse(self.rm.is_cached("memory://b"))
+        self.assertEqual(0, self.rm.size)
+
+    def test_file_resource_is_validated(self):
+        """ file resource is validated """
+
+        filename = os.path.join(self.tmpdir, "data.txt")
+        with open(filename, "wb") as f:
+            f.write(b"old")
+
+        url = "file://" + filename
+        self.assertEqual(b"old", self.rm.file(url).read())
+        self.assertEqual(b"old", self.rm.file(url).read())
+        self.assertEqual(1, self.rm.hits)
+
+        # Make sure that the modification time changes even on file systems
+        # with a coarse timestamp resolution.
+        mtime = os.stat(filename).st_mtime + 10
+        with open(filename, "wb") as f:
+            f.write(b"new!")
+        os.utime(filename, (mtime, mtime))
+
+        self.assertEqual(b"new!", self.rm.file(url).read())
+        self.assertEqual(2, self.rm.misses)
+
+        os.remove(filename)
+        with self.assertRaises(NoSuchResourceError):
+            self.rm.file(url)
+        self.assertFalse(self.rm.is_cached(url))
+
+    def test_open_buffer(self):
+        """ open buffer """
+
+        view = self.rm.open_buffer("memory://a")
+        self.assertTrue(view.readonly)
+        self.assertEqual(b"a" * 10, view.tobytes())
+
+        self.rm.open_buffer("memory://a")
+        self.assertEqual(1, self.rm.hits)
+
+    def test_read_many(self):
+        """ read many """
+
+        urls = ["memory://a", "memory://b", "memory://a", "memory://bogus"]
+        futures = [future for _, future in self.rm.read_many(urls)]
+
+        self.assertEqual(b"a" * 10, futures[0].result())
+        self.assertEqual(b"b" * 10, futures[1].result())
+        self.assertEqual(b"a" * 10, futures[2].result())
+        with self.assertRaises(NoSuchResourceError):
+            futures[3].result()
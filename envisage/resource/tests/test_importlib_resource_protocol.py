@@ -0,0 +1,136 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the importlib resource protocol. """
+
+
+# Standard library imports.
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+
+# Enthought library imports.
+from envisage.resource.api import ImportlibResourceProtocol
+from envisage.resource.api import NoSuchResourceError, ResourceManager
+
+
+class ImportlibResourceProtocolTestCase(unittest.TestCase):
+    """ Tests for the importlib resource protocol. """
+
+    ###########################################################################
+    # 'TestCase' interface.
+    ###########################################################################
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        shutil.rmtree(self.tmpdir)
+
+    ###########################################################################
+    # Tests.
+    ###########################################################################
+
+    def test_package_resource(self):
+        """ package resource """
+
+        protocol = ImportlibResourceProtocol()
+
+        f = protocol.file("envisage.resource/api.py")
+        contents = f.read()
+        f.close()
+
+        filename = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "api.py"
+        )
+        with open(filename, "rb") as g:
+            self.assertEqual(g.read(), contents)
+
+    def test_nested_package_resource(self):
+        """ nested package resource """
+
+        protocol = ImportlibResourceProtocol()
+
+        f = protocol.file("envisage.resource/tests/__init__.py")
+        f.close()
+
+    def test_no_such_package_resource(self):
+        """ no such package resource """
+
+        protocol = ImportlibResourceProtocol()
+
+        with self.assertRaises(NoSuchResourceError):
+            protocol.file("envisage.resource/bogus.py")
+
+        with self.assertRaises(NoSuchResourceError):
+            protocol.file("envisage.resource/tests")
+
+        with self.assertRaises(NoSuchResourceError):
+            protocol.file("completely.bogus/bogus.py")
+
+    def test_package_is_resolved_once(self):
+        """ package is resolved once """
+
+        protocol = ImportlibResourceProtocol()
+
+        protocol.file("envisage.resource/api.py").close()
+        root = protocol._roots["envisage.resource"]
+
+        protocol.file("envisage.resource/__init__.py").close()
+        self.assertIs(root, protocol._roots["envisage.resource"])
+
+    def test_zipped_package_resource(self):
+        """ zipped package resource """
+
+        archive = os.path.join(self.tmpdir, "zipped.zip")
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("zipped_resources/__init__.py", "")
+            z.writestr("zipped_resources/data/preferences.ini", "x = 42\n")
+
+        sys.path.insert(0, archive)
+        try:
+            protocol = ImportlibResourceProtocol()
+
+            f = protocol.file("zipped_resources/data/preferences.ini")
+            self.assertEqual(b"x = 42\n", f.read())
+            f.close()
+
+            with self.assertRaises(NoSuchResourceError):
+                protocol.file("zipped_resources/data/bogus.ini")
+
+        finally:
+            sys.path.remove(archive)
+            sys.modules.pop("zipped_resources", None)
+
+    def test_resource_manager(self):
+        """ resource manager """
+
+        # Selecting the importlib implementation means that 'pkg_resources'
+        # is never imported (this has to be checked in a fresh interpreter).
+        code = (
+            "import sys; "
+            "from envisage.resource.api import ResourceManager; "
+            "rm = ResourceManager(pkgfile_implementation='importlib'); "
+            "rm.file('pkgfile://envisage.resource/api.py').close(); "
+            "print('pkg_resources' in sys.modules)"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual(b"False", output.strip())
+
+        rm = ResourceManager(pkgfile_implementation="importlib")
+        self.assertIsInstance(
+            rm.resource_protocols["pkgfile"], ImportlibResourceProtocol
+        )
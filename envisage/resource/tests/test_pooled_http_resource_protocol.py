@@ -0,0 +1,269 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the pooled HTTP resource protocol. """
+
+
+# Standard library imports.
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+# Enthought library imports.
+from envisage.resource.api import NoSuchResourceError
+from envisage.resource.api import PooledHTTPResourceProtocol
+from envisage.resource.api import ResourceManager
+
+
+class DocumentServer(HTTPServer):
+    """ A local HTTP server for a few documents. """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DocumentRequestHandler)
+
+        # The documents by path, as (ETag, body) tuples.
+        self.documents = {}
+
+        # The locations that paths are redirected to ('{host}' is replaced
+        # by the server's host).
+        self.redirects = {
+            "/redirect": "/a.txt",
+            "/absolute-redirect": "http://{host}/b.txt",
+            "/https-redirect": "https://{host}/a.txt",
+        }
+
+        # The number of connections accepted.
+        self.connections = 0
+
+        # The (path, If-None-Match) of every request.
+        self.requests = []
+
+    def process_request(self, request, client_address):
+        # Each connection is handled in its own thread so that idle
+        # (kept-alive) connections don't block new ones.
+        self.connections += 1
+        thread = threading.Thread(
+            target=self.process_request_thread, args=(request, client_address)
+        )
+        thread.daemon = True
+        thread.start()
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+
+        finally:
+            self.shutdown_request(request)
+
+
+class DocumentRequestHandler(BaseHTTPRequestHandler):
+    """ Serves the documents of a 'DocumentServer' with keep-alive. """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        etag = self.headers.get("If-None-Match")
+        self.server.requests.append((self.path, etag))
+
+        redirect = self.server.redirects.get(self.path)
+        if redirect is not None:
+            self.send_response(302)
+            self.send_header(
+                "Location", redirect.format(host=self.headers["Host"])
+            )
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        document = self.server.documents.get(self.path)
+        if document is None:
+            self.send_error(404)
+            return
+
+        if etag == document[0]:
+            self.send_response(304)
+            self.send_header("ETag", document[0])
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", document[0])
+        self.send_header("Content-Length", str(len(document[1])))
+        self.end_headers()
+        self.wfile.write(document[1])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledHTTPResourceProtocolTestCase(unittest.TestCase):
+    """ Tests for the pooled HTTP resource protocol. """
+
+    ###########################################################################
+    # 'TestCase' interface.
+    ###########################################################################
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.server = DocumentServer()
+        self.server.documents = {
+            "/a.txt": ('"a1"', b"This is a test file.\n"),
+            "/b.txt": ('"b1"', b"This is another test file.\n"),
+        }
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+        self.host = "127.0.0.1:%d" % self.server.server_address[1]
+        self.cache_directory = tempfile.mkdtemp()
+        self.protocol = self._create_protocol()
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        self.protocol.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.cache_directory)
+
+    ###########################################################################
+    # Tests.
+    ###########################################################################
+
+    def test_file(self):
+        """ file """
+
+        f = self.protocol.file(self.host + "/a.txt")
+        self.assertEqual(b"This is a test file.\n", f.read())
+
+    def test_no_such_resource(self):
+        """ no such resource """
+
+        with self.assertRaises(NoSuchResourceError):
+            self.protocol.file(self.host + "/bogus.txt")
+
+    def test_connections_are_reused(self):
+        """ connections are reused """
+
+        for _ in range(3):
+            self.protocol.file(self.host + "/a.txt")
+            self.protocol.file(self.host + "/b.txt")
+
+        self.assertEqual(1, self.server.connections)
+
+    def test_closed_connection_is_replaced(self):
+        """ closed connection is replaced """
+
+        self.protocol.file(self.host + "/a.txt")
+
+        # Simulate the server closing the idle connection.
+        for connection in self.protocol._connections[self.host]:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+
+        f = self.protocol.file(self.host + "/b.txt")
+        self.assertEqual(b"This is another test file.\n", f.read())
+
+    def test_revalidation(self):
+        """ revalidation """
+
+        self.protocol.file(self.host + "/a.txt")
+
+        # A new protocol (e.g. the next time the application is started) uses
+        # the on-disk cache.
+        protocol = self._create_protocol()
+        try:
+            f = protocol.file(self.host + "/a.txt")
+            self.assertEqual(b"This is a test file.\n", f.read())
+
+            # The document changes.
+            self.server.documents["/a.txt"] = ('"a2"', b"Changed.\n")
+            f = protocol.file(self.host + "/a.txt")
+            self.assertEqual(b"Changed.\n", f.read())
+
+        finally:
+            protocol.close()
+
+        self.assertEqual(
+            [("/a.txt", None), ("/a.txt", '"a1"'), ("/a.txt", '"a1"')],
+            self.server.requests,
+        )
+
+    def test_no_cache_directory(self):
+        """ no cache directory """
+
+        protocol = PooledHTTPResourceProtocol(cache_directory="")
+        try:
+            protocol.file(self.host + "/a.txt")
+            protocol.file(self.host + "/a.txt")
+
+        finally:
+            protocol.close()
+
+        self.assertEqual(
+            [("/a.txt", None), ("/a.txt", None)], self.server.requests
+        )
+
+    def test_redirect(self):
+        """ redirect """
+
+        f = self.protocol.file(self.host + "/redirect")
+        self.assertEqual(b"This is a test file.\n", f.read())
+
+    def test_absolute_redirect(self):
+        """ absolute redirect """
+
+        f = self.protocol.file(self.host + "/absolute-redirect")
+        self.assertEqual(b"This is another test file.\n", f.read())
+
+    def test_redirect_to_another_scheme(self):
+        """ redirect to another scheme """
+
+        with self.assertRaises(NoSuchResourceError) as context:
+            self.protocol.file(self.host + "/https-redirect")
+
+        self.assertIn("https://", str(context.exception))
+
+        # The redirect wasn't followed as a (bogus) 'http' URL.
+        self.assertEqual([("/https-redirect", None)], self.server.requests)
+
+    def test_response_is_cached_in_one_file(self):
+        """ response is cached in one file """
+
+        self.protocol.file(self.host + "/a.txt")
+
+        # The body and its validators are written together, so a body can
+        # never be paired with another response's ETag.
+        self.assertEqual(1, len(os.listdir(self.cache_directory)))
+        cached = self.protocol._read_cache("http://%s/a.txt" % self.host)
+        self.assertEqual('"a1"', cached["etag"])
+        self.assertEqual(b"This is a test file.\n", cached["body"])
+
+    def test_resource_manager(self):
+        """ resource manager """
+
+        rm = ResourceManager()
+        rm.resource_protocols["http"] = self.protocol
+
+        f = rm.file("http://" + self.host + "/b.txt")
+        self.assertEqual(b"This is another test file.\n", f.read())
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _create_protocol(self):
+        """ Create a protocol that caches responses in the test directory. """
+
+        return PooledHTTPResourceProtocol(
+            cache_directory=self.cache_directory, timeout=10.0
+        )
@@ -10,6 +10,10 @@
 
 
 # Standard library imports.
+import mmap
+import os
+import tempfile
+import threading
 import unittest
 from urllib.error import HTTPError
 import urllib.request
@@ -22,6 +26,8 @@ from pkg_resources import resource_filename
 # Enthought library imports.
 from envisage.resource.api import ResourceManager
 from envisage.resource.api import NoSuchResourceError
+from envisage.resource.api import IResourceProtocol
+from traits.api import HasTraits, provides
 
 # Module to patch urlopen in during testing.
 url_library = urllib.request
@@ -45,6 +51,26 @@ def stubout_urlopen(url):
         raise ValueError("Unexpected URL %r in stubout_urlopen" % url)
 
 
+@provides(IResourceProtocol)
+class BarrierResourceProtocol(HasTraits):
+    """ A resource protocol whose resources can only be opened concurrently.
+
+    Each 'file' call waits until the given number of calls are in progress,
+    so resolving the resources one at a time would raise an error.
+
+    """
+
+    def __init__(self, parties, **traits):
+        super().__init__(**traits)
+
+        self.barrier = threading.Barrier(parties, timeout=10)
+
+    def file(self, address):
+        self.barrier.wait()
+
+        return StringIO(address)
+
+
 class ResourceManagerTestCase(unittest.TestCase):
     """ Tests for the resource manager. """
 
@@ -154,3 +180,131 @@ class ResourceManagerTestCase(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             rm.file("bogus://foo/bar/baz")
+
+    def test_read_many(self):
+        """ read many """
+
+        rm = ResourceManager()
+
+        urls = [
+            "pkgfile://envisage.resource/api.py",
+            "http://localhost:1234/file.dat",
+            "file://" + resource_filename("envisage.resource", "api.py"),
+        ]
+        results = [
+            (url, future.result()) for url, future in rm.read_many(urls)
+        ]
+
+        with open(resource_filename("envisage.resource", "api.py"), "rb") as f:
+            contents = f.read()
+
+        self.assertEqual(
+            [
+                (urls[0], contents),
+                (urls[1], "This is a test file.\n"),
+                (urls[2], contents),
+            ],
+            results,
+        )
+
+    def test_read_many_no_such_resource(self):
+        """ read many no such resource """
+
+        rm = ResourceManager()
+
+        urls = [
+            "pkgfile://envisage.resource/bogus.py",
+            "http://localhost:1234/file.dat",
+            "file://../bogus.py",
+            "bogus://foo/bar/baz",
+        ]
+        futures = dict(rm.read_many(urls))
+
+        # Each URL gets the same error as it would from 'file'.
+        with self.assertRaises(NoSuchResourceError):
+            futures[urls[0]].result()
+
+        self.assertEqual("This is a test file.\n", futures[urls[1]].result())
+
+        with self.assertRaises(NoSuchResourceError):
+            futures[urls[2]].result()
+
+        with self.assertRaises(ValueError):
+            futures[urls[3]].result()
+
+    def test_files_are_resolved_concurrently(self):
+        """ files are resolved concurrently """
+
+        rm = ResourceManager(max_workers=4)
+        rm.resource_protocols["barrier"] = BarrierResourceProtocol(4)
+
+        urls = ["barrier://%d" % i for i in range(4)]
+        results = rm.files(urls, ordered=False)
+
+        files = {url: future.result() for url, future in results}
+        self.assertEqual(set(urls), set(files))
+        for url, f in files.items():
+            self.assertEqual(url[len("barrier://"):], f.read())
+            f.close()
+
+    def test_read_many_no_urls(self):
+        """ read many no urls """
+
+        rm = ResourceManager()
+
+        self.assertEqual([], list(rm.read_many([])))
+        self.assertEqual([], list(rm.read_many([], ordered=False)))
+
+    def test_open_buffer_file_resource(self):
+        """ open buffer file resource """
+
+        rm = ResourceManager()
+
+        filename = resource_filename("envisage.resource", "api.py")
+
+        view = rm.open_buffer("file://" + filename)
+        self.assertTrue(view.readonly)
+        self.assertIsInstance(view.obj, mmap.mmap)
+
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), view.tobytes())
+
+        view.release()
+
+    def test_open_buffer_empty_file_resource(self):
+        """ open buffer empty file resource """
+
+        rm = ResourceManager()
+
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            view = rm.open_buffer("file://" + filename)
+            self.assertEqual(b"", view.tobytes())
+
+        finally:
+            os.remove(filename)
+
+    def test_open_buffer_package_resource(self):
+        """ open buffer package resource """
+
+        rm = ResourceManager()
+
+        # Package resources don't support buffers, so the contents are read.
+        view = rm.open_buffer("pkgfile://envisage.resource/api.py")
+        self.assertTrue(view.readonly)
+
+        filename = resource_filename("envisage.resource", "api.py")
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), view.tobytes())
+
+    def test_open_buffer_no_such_resource(self):
+        """ open buffer no such resource """
+
+        rm = ResourceManager()
+
+        with self.assertRaises(NoSuchResourceError):
+            rm.open_buffer("file://../bogus.py")
+
+        with self.assertRaises(NoSuchResourceError):
+            rm.open_buffer("pkgfile://envisage.resource/bogus.py")
@@ -0,0 +1,160 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the (lazily imported) 'api' modules. """
+
+
+# Standard library imports.
+import os
+import subprocess
+import sys
+import unittest
+
+# Enthought library imports.
+import envisage.api
+import envisage.resource.api
+
+
+#: Modules that must not be imported by a plain 'import envisage.api'.
+HEAVY_MODULES = [
+    "apptools",
+    "envisage.egg_plugin_manager",
+    "pkg_resources",
+    "traits",
+]
+
+#: The budget (in seconds) for the time spent in Envisage's own modules when
+#: importing 'envisage.api'. Importing every core module eagerly takes an
+#: order of magnitude more than this. Wall-clock budgets are unreliable on
+#: loaded machines, so this is only checked if the environment variable
+#: 'ENVISAGE_CHECK_IMPORT_TIME' is set.
+ENVISAGE_IMPORT_TIME_BUDGET = 0.02
+
+
+def imported_modules(statement):
+    """ Run a statement in a fresh interpreter.
+
+    Returns the set of the names of the modules that it imported.
+
+    """
+
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            statement + "; import sys; print('\\n'.join(sys.modules))",
+        ]
+    ).decode("utf-8")
+
+    return set(output.split())
+
+
+def import_times(statement):
+    """ Run a statement with '-X importtime' in a fresh interpreter.
+
+    Returns a dictionary mapping module names to their (self, cumulative)
+    import times in seconds.
+
+    """
+
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.STDOUT,
+    ).decode("utf-8")
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_time, cumulative_time, name = line[len("import time:"):].split(
+            "|"
+        )
+        # Skip the header line.
+        if not self_time.strip().isdigit():
+            continue
+
+        times[name.strip()] = (
+            int(self_time) / 1e6,
+            int(cumulative_time) / 1e6,
+        )
+
+    return times
+
+
+class ApiTestCase(unittest.TestCase):
+    """ Tests for the (lazily imported) 'api' modules. """
+
+    def test_all_names_are_importable(self):
+        for name in envisage.api.__all__:
+            self.assertIsNotNone(getattr(envisage.api, name))
+
+        for name in envisage.resource.api.__all__:
+            self.assertIsNotNone(getattr(envisage.resource.api, name))
+
+    def test_names_are_the_real_thing(self):
+        from envisage.application import Application
+        from envisage.resource.resource_manager import ResourceManager
+
+        self.assertIs(envisage.api.Application, Application)
+        self.assertIs(envisage.resource.api.ResourceManager, ResourceManager)
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            envisage.api.NotAnEnvisageName
+
+        with self.assertRaises(ImportError):
+            from envisage.api import NotAnEnvisageName  # noqa: F401
+
+    def test_dir(self):
+        self.assertIn("Application", dir(envisage.api))
+        self.assertIn("ResourceManager", dir(envisage.resource.api))
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "requires lazy module attributes")
+class ImportTimeTestCase(unittest.TestCase):
+    """ Import-time budgets for the 'api' modules. """
+
+    def test_envisage_api_does_not_import_heavy_modules(self):
+        modules = imported_modules("import envisage.api")
+
+        self.assertIn("envisage.api", modules)
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+    @unittest.skipUnless(
+        os.environ.get("ENVISAGE_CHECK_IMPORT_TIME"),
+        "set ENVISAGE_CHECK_IMPORT_TIME to check the import time budget",
+    )
+    def test_envisage_api_import_time_budget(self):
+        times = import_times("import envisage.api")
+
+        envisage_time = sum(
+            self_time
+            for name, (self_time, _) in times.items()
+            if name == "envisage" or name.startswith("envisage.")
+        )
+        self.assertLess(envisage_time, ENVISAGE_IMPORT_TIME_BUDGET)
+
+    def test_resource_api_does_not_import_pkg_resources(self):
+        modules = imported_modules(
+            "from envisage.resource.api import ResourceManager; "
+            "ResourceManager().resource_protocols"
+        )
+
+        self.assertIn("envisage.resource.resource_manager", modules)
+        self.assertNotIn("pkg_resources", modules)
+
+    def test_plugin_does_not_import_heavy_modules(self):
+        modules = imported_modules(
+            "from envisage.api import ExtensionPoint, Plugin"
+        )
+
+        self.assertNotIn("apptools", modules)
+        self.assertNotIn("envisage.egg_plugin_manager", modules)
+        self.assertNotIn("pkg_resources", modules)
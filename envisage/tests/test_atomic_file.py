@@ -0,0 +1,127 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for writing files atomically. """
+
+# Standard library imports.
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+# Enthought library imports.
+from envisage._atomic_file import _get_umask, atomic_open
+
+
+class AtomicOpenTestCase(unittest.TestCase):
+    """ Tests for writing files atomically. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "file.txt")
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        """ write """
+
+        with atomic_open(self.path, "w", encoding="utf-8") as f:
+            f.write("café")
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "café")
+
+    def test_write_bytes_by_default(self):
+        """ write bytes by default """
+
+        with atomic_open(self.path) as f:
+            f.write(b"\x00\x01")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"\x00\x01")
+
+    def test_file_is_synced(self):
+        """ file is synced """
+
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            with atomic_open(self.path) as f:
+                f.write(b"new")
+
+        self.assertEqual(1, fsync.call_count)
+
+    def test_permissions_are_kept(self):
+        """ permissions are kept """
+
+        with open(self.path, "w") as f:
+            f.write("old")
+        os.chmod(self.path, 0o640)
+
+        with atomic_open(self.path, "w") as f:
+            f.write("new")
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_new_file_permissions_follow_umask(self):
+        """ new file permissions follow the umask """
+
+        umask = os.umask(0o027)
+        try:
+            with atomic_open(self.path) as f:
+                f.write(b"new")
+
+            with open(os.path.join(self.directory, "plain"), "wb") as f:
+                f.write(b"new")
+
+        finally:
+            os.umask(umask)
+
+        # The same permissions as 'open' gives a new file.
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+        self.assertEqual(
+            stat.S_IMODE(os.stat(self.path).st_mode),
+            stat.S_IMODE(
+                os.stat(os.path.join(self.directory, "plain")).st_mode
+            ),
+        )
+
+    def test_umask_without_proc(self):
+        """ umask without /proc """
+
+        umask = os.umask(0o027)
+        try:
+            with mock.patch(
+                "envisage._atomic_file.open", side_effect=OSError, create=True
+            ):
+                self.assertEqual(_get_umask(), 0o027)
+
+            self.assertEqual(os.umask(0o027), 0o027)
+
+        finally:
+            os.umask(umask)
+
+    def test_error(self):
+        """ error """
+
+        with open(self.path, "w") as f:
+            f.write("old")
+
+        with self.assertRaises(ZeroDivisionError):
+            with atomic_open(self.path, "w") as f:
+                f.write("new")
+                1 / 0
+
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.directory), ["file.txt"])
@@ -0,0 +1,139 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the class load hook dispatcher. """
+
+import unittest
+
+from envisage.api import ClassLoadHook, ClassLoadHookDispatcher
+from traits.api import HasTraits, MetaHasTraits
+
+
+class ClassLoadHookDispatcherTestCase(unittest.TestCase):
+    """ Tests for the class load hook dispatcher. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.dispatcher = ClassLoadHookDispatcher()
+        self.hooks = []
+        self.loaded = []
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        # Make sure that the dispatcher stops listening to 'MetaHasTraits'.
+        self.dispatcher.disconnect(self.hooks)
+
+    def test_connect(self):
+        """ connect """
+
+        self.dispatcher.connect(
+            [self._create_hook("Foo"), self._create_hook("Bar")]
+        )
+
+        class Foo(HasTraits):
+            pass
+
+        class Bar(HasTraits):
+            pass
+
+        self.assertEqual([("Foo", Foo), ("Bar", Bar)], self.loaded)
+
+    def test_single_metaclass_listener(self):
+        """ single metaclass listener """
+
+        listeners = MetaHasTraits._listeners.get("", [])
+        count = len(listeners)
+
+        self.dispatcher.connect(
+            [self._create_hook("Foo%d" % i) for i in range(100)]
+        )
+
+        self.assertEqual(count + 1, len(MetaHasTraits._listeners[""]))
+
+    def test_class_already_loaded(self):
+        """ class already loaded """
+
+        hooks = [
+            self._create_hook("ClassLoadHookDispatcherTestCase"),
+            self._create_hook("ClassLoadHookDispatcherTestCase"),
+            self._create_hook("NotLoaded"),
+        ]
+        self.dispatcher.connect(hooks)
+
+        # Both of the hooks for the loaded class get called immediately.
+        self.assertEqual(
+            [
+                ("ClassLoadHookDispatcherTestCase", type(self)),
+                ("ClassLoadHookDispatcherTestCase", type(self)),
+            ],
+            self.loaded,
+        )
+
+    def test_hook_called_once_per_class(self):
+        """ hook called once per class """
+
+        hook = self._create_hook("Foo")
+        self.dispatcher.connect([hook, hook])
+        self.dispatcher.connect([hook])
+
+        class Foo(HasTraits):
+            pass
+
+        self.assertEqual([("Foo", Foo)], self.loaded)
+
+    def test_undotted_class_name(self):
+        """ undotted class name """
+
+        hook = ClassLoadHook(class_name="Foo", on_load=self.loaded.append)
+        self.hooks.append(hook)
+        self.dispatcher.connect([hook])
+
+        class Foo(HasTraits):
+            pass
+
+        self.assertEqual([], self.loaded)
+
+    def test_disconnect(self):
+        """ disconnect """
+
+        listeners = MetaHasTraits._listeners.get("", [])
+        count = len(listeners)
+
+        foo_hook = self._create_hook("Foo")
+        bar_hook = self._create_hook("Bar")
+        self.dispatcher.connect([foo_hook, bar_hook])
+        self.dispatcher.disconnect([foo_hook])
+
+        class Foo(HasTraits):
+            pass
+
+        class Bar(HasTraits):
+            pass
+
+        self.assertEqual([("Bar", Bar)], self.loaded)
+
+        # The metaclass listener goes once all of the hooks have gone.
+        self.dispatcher.disconnect([bar_hook])
+        self.assertEqual(count, len(MetaHasTraits._listeners.get("", [])))
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _create_hook(self, name):
+        """ Create a hook for a class in this module. """
+
+        def on_load(cls):
+            self.loaded.append((name, cls))
+
+        hook = ClassLoadHook(class_name=__name__ + "." + name, on_load=on_load)
+        self.hooks.append(hook)
+
+        return hook
@@ -0,0 +1,109 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the lightweight event objects and their debug validation. """
+
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from envisage.api import ExtensionPointChangedEvent, Plugin
+from envisage.event_validation import (
+    is_event_validation_enabled,
+    set_event_validation,
+)
+from envisage.plugin_event import PluginEvent
+from traits.api import TraitError
+
+
+class EventsTestCase(unittest.TestCase):
+    """ Tests for the lightweight event objects. """
+
+    def test_extension_point_changed_event_attributes(self):
+        event = ExtensionPointChangedEvent(
+            extension_point_id="my.ep", index=2, removed=[1], added=[3, 4]
+        )
+
+        self.assertEqual(event.extension_point_id, "my.ep")
+        self.assertEqual(event.index, 2)
+        self.assertEqual(event.removed, [1])
+        self.assertEqual(event.added, [3, 4])
+        self.assertIn("my.ep", repr(event))
+
+    def test_extension_point_changed_event_defaults(self):
+        event = ExtensionPointChangedEvent()
+
+        self.assertIsNone(event.extension_point_id)
+        self.assertEqual(event.index, 0)
+        self.assertEqual(event.removed, [])
+        self.assertEqual(event.added, [])
+
+    def test_plugin_event_attributes(self):
+        plugin = Plugin(id="my.plugin")
+        event = PluginEvent(plugin=plugin)
+
+        self.assertIs(event.plugin, plugin)
+        self.assertFalse(event.veto)
+
+        event.veto = True
+        self.assertTrue(event.veto)
+
+    def test_events_are_slotted(self):
+        for event in [ExtensionPointChangedEvent(), PluginEvent()]:
+            self.assertFalse(hasattr(event, "__dict__"))
+            with self.assertRaises(AttributeError):
+                event.not_an_attribute = 42
+
+
+class EventValidationTestCase(unittest.TestCase):
+    """ Tests for validating events in debug mode. """
+
+    def setUp(self):
+        self.previous = set_event_validation(True)
+
+    def tearDown(self):
+        set_event_validation(self.previous)
+
+    def test_set_event_validation(self):
+        self.assertTrue(is_event_validation_enabled())
+
+        self.assertTrue(set_event_validation(False))
+        self.assertFalse(is_event_validation_enabled())
+
+    def test_valid_extension_point_changed_event(self):
+        event = ExtensionPointChangedEvent(
+            extension_point_id="my.ep",
+            index=slice(0, 2),
+            removed=[],
+            added=[1, 2],
+        )
+
+        self.assertEqual(event.added, [1, 2])
+
+    def test_invalid_extension_point_changed_event(self):
+        with self.assertRaises(TraitError):
+            ExtensionPointChangedEvent(extension_point_id="my.ep", added="x")
+
+        with self.assertRaises(TraitError):
+            ExtensionPointChangedEvent(extension_point_id="my.ep", index="0")
+
+    def test_valid_plugin_event(self):
+        plugin = Plugin(id="my.plugin")
+
+        self.assertIs(PluginEvent(plugin=plugin).plugin, plugin)
+
+    def test_invalid_plugin_event(self):
+        with self.assertRaises(TraitError):
+            PluginEvent(plugin="my.plugin")
+
+    def test_no_validation_when_disabled(self):
+        set_event_validation(False)
+
+        event = PluginEvent(plugin="my.plugin")
+        self.assertEqual(event.plugin, "my.plugin")
@@ -14,7 +14,7 @@ import unittest
 # Enthought library imports.
 from envisage.api import ExtensionPoint
 from envisage.api import bind_extension_point
-from traits.api import HasTraits, List
+from traits.api import HasTraits, Int, List, TraitError
 
 # Local imports.
 from envisage.tests.mutable_extension_registry import MutableExtensionRegistry
@@ -217,6 +217,130 @@ class ExtensionPointBindingTestCase(unittest.TestCase):
         self.assertEqual(1, len(f.x))
         self.assertEqual(3, len(f.y))
 
+    def test_extension_changes_are_applied_in_place(self):
+        registry = self.extension_registry
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+        registry.add_extensions("my.ep", [1, 2, 3])
+
+        class Foo(HasTraits):
+            x = List
+
+        f = Foo()
+        bind_extension_point(f, "x", "my.ep")
+        x = f.x
+
+        events = []
+        f.on_trait_change(lambda new: events.append(new), "x_items")
+
+        registry.add_extension("my.ep", 4)
+
+        # The trait's list is changed in place, and only a single event (the
+        # extension point changed event itself) is fired.
+        self.assertIs(x, f.x)
+        self.assertEqual([1, 2, 3, 4], f.x)
+        self.assertEqual(1, len(events))
+        self.assertEqual(3, events[0].index)
+        self.assertEqual([4], events[0].added)
+
+    def test_extension_changes_are_validated(self):
+        registry = self.extension_registry
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+
+        class Foo(HasTraits):
+            x = List(Int)
+
+        f = Foo()
+        bind_extension_point(f, "x", "my.ep")
+
+        with self.assertRaises(TraitError):
+            registry.add_extension("my.ep", "not an int")
+
+    def test_trait_out_of_step_with_extension_point(self):
+        registry = self.extension_registry
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+        registry.add_extensions("my.ep", [1, 2, 3])
+
+        class Foo(HasTraits):
+            x = List
+
+        f = Foo()
+        bind_extension_point(f, "x", "my.ep")
+
+        # Change the trait behind the binding's back.
+        f._trait_change_notify(False)
+        try:
+            f.x[0] = 42
+        finally:
+            f._trait_change_notify(True)
+
+        registry.update_extensions("my.ep", 0, [1], [])
+
+        # The change can't be applied so the extensions are re-read.
+        self.assertEqual([2, 3], f.x)
+
+    def test_trait_item_changes_update_the_extension_point(self):
+        registry = self.extension_registry
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+        registry.add_extensions("my.ep", [1, 2, 3])
+
+        class Foo(HasTraits):
+            x = List
+
+        f = Foo()
+        g = Foo()
+        bind_extension_point(f, "x", "my.ep")
+        bind_extension_point(g, "x", "my.ep")
+        g_x = g.x
+
+        # Listeners are weakly referenced so we need to keep hold of this one.
+        extension_point_events = []
+
+        def extension_point_listener(registry, event):
+            extension_point_events.append(event)
+
+        registry.add_extension_point_listener(
+            extension_point_listener, "my.ep"
+        )
+        f_events = []
+        f.on_trait_change(lambda new: f_events.append(new), "x_items")
+        g_events = []
+        g.on_trait_change(lambda new: g_events.append(new), "x_items")
+
+        f.x.append(4)
+        f.x[0] = 0
+
+        self.assertEqual([0, 2, 3, 4], registry.get_extensions("my.ep"))
+        self.assertEqual([0, 2, 3, 4], f.x)
+        self.assertEqual([0, 2, 3, 4], g.x)
+        self.assertIs(g_x, g.x)
+
+        # Listeners are told exactly what changed.
+        self.assertEqual(2, len(extension_point_events))
+        self.assertEqual(3, extension_point_events[0].index)
+        self.assertEqual([4], extension_point_events[0].added)
+        self.assertEqual(0, extension_point_events[1].index)
+        self.assertEqual([1], extension_point_events[1].removed)
+        self.assertEqual([0], extension_point_events[1].added)
+
+        # The object that made the change doesn't get it back again.
+        self.assertEqual(2, len(f_events))
+        self.assertEqual(2, len(g_events))
+
+    def test_extended_slice_changes_set_the_extension_point(self):
+        registry = self.extension_registry
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+        registry.add_extensions("my.ep", [1, 2, 3, 4])
+
+        class Foo(HasTraits):
+            x = List
+
+        f = Foo()
+        bind_extension_point(f, "x", "my.ep")
+
+        f.x[::2] = [5, 6]
+
+        self.assertEqual([5, 2, 6, 4], registry.get_extensions("my.ep"))
+
     ###########################################################################
     # Private interface.
     ###########################################################################
@@ -142,6 +142,36 @@ class ExtensionRegistryTestCase(unittest.TestCase):
         # Make sure we can get them.
         self.assertEqual([1, 2, 3], registry.get_extensions("my.ep"))
 
+    def test_update_extensions(self):
+        """ update extensions """
+
+        registry = self.registry
+
+        # Add an extension *point*.
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+
+        # Set some extensions (and keep hold of the list!).
+        extensions = [1, 2, 3]
+        registry.set_extensions("my.ep", extensions)
+
+        # Listeners are weakly referenced so we need to keep hold of this one.
+        events = []
+        listener = make_function_listener(events)
+        registry.add_extension_point_listener(listener, "my.ep")
+
+        # Replace the middle extension.
+        registry.update_extensions("my.ep", 1, [2], [4, 5])
+
+        self.assertEqual([1, 4, 5, 3], registry.get_extensions("my.ep"))
+        self.assertEqual([1, 2, 3], extensions)
+
+        # Make sure listeners are told exactly what changed.
+        self.assertEqual(1, len(events))
+        self.assertEqual("my.ep", events[0].extension_point_id)
+        self.assertEqual(1, events[0].index)
+        self.assertEqual([2], events[0].removed)
+        self.assertEqual([4, 5], events[0].added)
+
     ###########################################################################
     # Private interface.
     ###########################################################################
@@ -152,6 +182,26 @@ class ExtensionRegistryTestCase(unittest.TestCase):
         return ExtensionPoint(id=id, trait_type=trait_type, desc=desc)
 
 
+class ExtensionRegistryImplementationTestCase(unittest.TestCase):
+    """ Tests for the implementation of the base extension registry. """
+
+    def test_update_extensions_in_place(self):
+        """ update extensions in place """
+
+        registry = ExtensionRegistry()
+        registry.add_extension_point(ExtensionPoint(id="my.ep"))
+        registry.set_extensions("my.ep", [1, 2, 3])
+
+        # The registry's own list is changed in place (rather than being
+        # rebuilt for every change).
+        extensions = registry._extensions["my.ep"]
+        registry.update_extensions("my.ep", 3, [], [4])
+        registry.update_extensions("my.ep", 0, [1], [])
+
+        self.assertIs(extensions, registry._extensions["my.ep"])
+        self.assertEqual([2, 3, 4], registry.get_extensions("my.ep"))
+
+
 def make_function_listener(events):
     """
     Return a simple non-method extension point listener.
@@ -0,0 +1,309 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the pickle policy. """
+
+
+# Standard library imports.
+import contextlib
+import io
+import os
+import pickle
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Enthought library imports.
+import apptools.sweet_pickle
+from envisage.pickle_policy import (
+    FORMAT_VERSION,
+    MAGIC,
+    main,
+    migrate,
+    PicklePolicy,
+)
+
+
+#: Out-of-band pickle buffers (Python 3.8 and later).
+PickleBuffer = getattr(pickle, "PickleBuffer", None)
+
+
+class Array(object):
+    """ A (very) minimal array that supports out-of-band pickling. """
+
+    def __init__(self, data):
+        """ Constructor. """
+
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        """ Reduce the array (with an out-of-band buffer if possible). """
+
+        if protocol >= 5 and PickleBuffer is not None:
+            return (Array, (PickleBuffer(self.data),))
+
+        return (Array, (bytearray(self.data),))
+
+
+class Thing(object):
+    """ A class that has been renamed (from 'OldThing'). """
+
+    def __init__(self, value):
+        """ Constructor. """
+
+        self.value = value
+
+
+class PicklePolicyTestCase(unittest.TestCase):
+    """ Tests for the pickle policy. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "data.pkl")
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        shutil.rmtree(self.tmpdir)
+
+    def test_header(self):
+        """ header """
+
+        policy = PicklePolicy(protocol=2)
+        data = policy.dumps({"a": 1})
+
+        self.assertTrue(data.startswith(MAGIC))
+        self.assertEqual(FORMAT_VERSION, data[len(MAGIC)])
+        self.assertEqual(2, data[len(MAGIC) + 1])
+        self.assertEqual({"a": 1}, policy.loads(data))
+
+    def test_no_header(self):
+        """ no header """
+
+        policy = PicklePolicy(protocol=2, header=False)
+        data = policy.dumps({"a": 1})
+
+        self.assertEqual(pickle.dumps({"a": 1}, protocol=2), data)
+
+        # Any policy can load files with or without a header.
+        self.assertEqual({"a": 1}, PicklePolicy().loads(data))
+        self.assertEqual(
+            {"a": 1}, policy.loads(PicklePolicy(protocol=2).dumps({"a": 1}))
+        )
+
+    def test_pickle_package(self):
+        """ pickle package """
+
+        class Package(object):
+            calls = []
+
+            def dump(self, obj, file, protocol):
+                self.calls.append(("dump", protocol))
+                pickle.dump(obj, file, protocol)
+
+            def load(self, file):
+                self.calls.append(("load",))
+                return pickle.load(file)
+
+        package = Package()
+        policy = PicklePolicy(protocol=3)
+        data = policy.dumps([1, 2], package)
+
+        self.assertEqual([1, 2], policy.loads(data, package))
+        self.assertEqual([("dump", 3), ("load",)], package.calls)
+
+    @unittest.skipIf(PickleBuffer is None, "Needs pickle protocol 5")
+    def test_out_of_band_buffers(self):
+        """ out-of-band buffers """
+
+        data = bytearray(os.urandom(100000))
+        policy = PicklePolicy(protocol=5)
+        blocks = policy.serialize(Array(data))
+
+        # The data isn't copied into the pickle.
+        self.assertEqual(4, len(blocks))
+        self.assertLess(len(blocks[1]), 1000)
+        self.assertEqual(data, blocks[3])
+
+        loaded = policy.loads(b"".join(blocks))
+        self.assertEqual(data, bytes(loaded.data))
+
+        # The loaded buffer is writable.
+        memoryview(loaded.data)[0] = 0
+
+    @unittest.skipIf(PickleBuffer is None, "Needs pickle protocol 5")
+    def test_copy_out_of_band_buffers(self):
+        """ copy out-of-band buffers """
+
+        data = bytearray(b"x" * 1000)
+        policy = PicklePolicy(protocol=5)
+        blocks = policy.serialize(Array(data), copy_buffers=True)
+
+        # Changing the object afterwards doesn't change the blocks.
+        data[0] = ord("y")
+        self.assertEqual(b"x" * 1000, bytes(blocks[3]))
+
+        data = bytearray(b"x" * 1000)
+        blocks = policy.serialize(Array(data))
+        data[0] = ord("y")
+        self.assertEqual(b"y" + b"x" * 999, bytes(blocks[3]))
+
+    @unittest.skipIf(PickleBuffer is None, "Needs pickle protocol 5")
+    def test_out_of_band_buffers_need_a_header(self):
+        """ out-of-band buffers need a header """
+
+        data = bytearray(b"x" * 1000)
+        policy = PicklePolicy(protocol=5, header=False)
+        blocks = policy.serialize(Array(data))
+
+        self.assertEqual(1, len(blocks))
+        self.assertEqual(data, bytes(pickle.loads(blocks[0]).data))
+
+    def test_protocol_too_high(self):
+        """ protocol too high """
+
+        data = bytearray(PicklePolicy(protocol=2).dumps([1]))
+        data[len(MAGIC) + 1] = pickle.HIGHEST_PROTOCOL + 1
+
+        with self.assertRaises(ValueError):
+            PicklePolicy().loads(bytes(data))
+
+        with self.assertRaises(ValueError):
+            PicklePolicy(protocol=pickle.HIGHEST_PROTOCOL + 1).dumps([1])
+
+    def test_newer_format(self):
+        """ newer format """
+
+        data = bytearray(PicklePolicy(protocol=2).dumps([1]))
+        data[len(MAGIC)] = FORMAT_VERSION + 1
+
+        with self.assertRaises(ValueError):
+            PicklePolicy().loads(bytes(data))
+
+    def test_truncated(self):
+        """ truncated """
+
+        data = PicklePolicy(protocol=2).dumps(list(range(100)))
+
+        with self.assertRaises(EOFError):
+            PicklePolicy().loads(data[:-10])
+
+    def test_load_from_middle_of_file(self):
+        """ load from the middle of a file """
+
+        policy = PicklePolicy(protocol=2, header=False)
+        f = io.BytesIO(b"xyz" + policy.dumps([1]))
+        f.seek(3)
+
+        self.assertEqual([1], policy.load(f))
+
+    def test_migrate(self):
+        """ migrate """
+
+        with open(self.filename, "wb") as f:
+            pickle.dump({"a": [1, 2]}, f, protocol=1)
+
+        old_protocol = migrate(self.filename, PicklePolicy(protocol=4))
+
+        self.assertIsNone(old_protocol)
+        with open(self.filename, "rb") as f:
+            header = f.read(len(MAGIC) + 2)
+            f.seek(0)
+            self.assertEqual({"a": [1, 2]}, PicklePolicy().load(f))
+
+        self.assertEqual(MAGIC + struct.pack("BB", FORMAT_VERSION, 4), header)
+        self.assertEqual(4, migrate(self.filename, PicklePolicy(protocol=3)))
+        self.assertEqual(["data.pkl"], os.listdir(self.tmpdir))
+
+    def test_migrate_keeps_persistent_ids(self):
+        """ migrate keeps persistent IDs """
+
+        f = io.BytesIO()
+        pickler = pickle.Pickler(f, 2)
+        pickler.persistent_id = lambda obj: "self" if obj is self else None
+        pickler.dump([self, 1])
+        with open(self.filename, "wb") as fh:
+            fh.write(f.getvalue())
+
+        migrate(self.filename, PicklePolicy(protocol=4))
+
+        def configure(unpickler):
+            unpickler.persistent_load = lambda persistent_id: persistent_id
+
+        with open(self.filename, "rb") as f:
+            self.assertEqual(
+                ["self", 1], PicklePolicy().load(f, configure=configure)
+            )
+
+    def test_migrate_with_sweet_pickle(self):
+        """ migrate with sweet pickle """
+
+        # Pickle a 'Thing' (and a persistent ID) as it was before 'Thing'
+        # was renamed.
+        f = io.BytesIO()
+        pickler = pickle.Pickler(f, 2)
+        pickler.persistent_id = lambda obj: "self" if obj is self else None
+        module = sys.modules[__name__]
+        with mock.patch.object(module, "OldThing", Thing, create=True):
+            Thing.__qualname__ = "OldThing"
+            try:
+                pickler.dump([Thing(1), self])
+
+            finally:
+                Thing.__qualname__ = "Thing"
+
+        with open(self.filename, "wb") as fh:
+            fh.write(f.getvalue())
+
+        # Only sweet pickle (with the class mapping) can load it.
+        registry = apptools.sweet_pickle.get_global_registry()
+        registry.add_mapping(__name__, "OldThing", __name__, "Thing")
+        self.addCleanup(registry.class_map.pop, (__name__, "OldThing"))
+
+        migrate(
+            self.filename, PicklePolicy(protocol=4), apptools.sweet_pickle
+        )
+
+        def configure(unpickler):
+            unpickler.persistent_load = lambda persistent_id: persistent_id
+
+        with open(self.filename, "rb") as fh:
+            thing, persistent_id = PicklePolicy().load(fh, configure=configure)
+
+        self.assertIsInstance(thing, Thing)
+        self.assertEqual(1, thing.value)
+        self.assertEqual("self", persistent_id)
+
+    def test_main(self):
+        """ main """
+
+        with open(self.filename, "wb") as f:
+            pickle.dump([1], f, protocol=2)
+
+        other_filename = os.path.join(self.tmpdir, "other.pkl")
+        with open(other_filename, "wb") as f:
+            f.write(b"not a pickle")
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            with contextlib.redirect_stderr(output):
+                status = main(
+                    ["--protocol", "3", self.filename, other_filename]
+                )
+
+        self.assertEqual(1, status)
+        with open(self.filename, "rb") as f:
+            self.assertEqual(3, f.read(len(MAGIC) + 2)[-1])
+
+        with open(other_filename, "rb") as f:
+            self.assertEqual(b"not a pickle", f.read())
@@ -0,0 +1,168 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the preferences cache. """
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import unittest
+
+# Enthought library imports.
+from apptools.preferences.api import Preferences
+from envisage.preferences_cache import PreferencesCache
+from envisage.resource.api import NoSuchResourceError
+
+
+class PreferencesCacheTestCase(unittest.TestCase):
+    """ Tests for the preferences cache. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "preferences.cache")
+
+    def tearDown(self):
+        """ Called immediately after each test method has been called. """
+
+        shutil.rmtree(self.tmpdir)
+
+    def test_merge(self):
+        """ merge """
+
+        a = self._write("a.ini", "[acme]\nx = 1\ny = 2\n[acme.ui]\nz = 3\n")
+        b = self._write("b.ini", "[acme]\ny = 42\n")
+
+        cache = PreferencesCache(filename=self.filename)
+        merged = cache.load([a, b])
+
+        self.assertEqual(
+            {"acme": {"x": "1", "y": "42"}, "acme.ui": {"z": "3"}}, merged
+        )
+
+        # The snapshot can be loaded straight into a preferences node.
+        preferences = Preferences()
+        preferences.load(merged)
+        self.assertEqual("1", preferences.get("acme.x"))
+        self.assertEqual("42", preferences.get("acme.y"))
+        self.assertEqual("3", preferences.get("acme.ui.z"))
+
+    def test_unchanged_files_are_not_parsed(self):
+        """ unchanged files are not parsed """
+
+        a = self._write("a.ini", "[acme]\nx = 1\n")
+        b = self._write("b.ini", "[acme]\ny = 2\n")
+
+        PreferencesCache(filename=self.filename).load([a, b])
+
+        # A new cache (e.g. the next time the application is started) reads
+        # the snapshot from the cache file.
+        cache = _CountingPreferencesCache(filename=self.filename)
+        merged = cache.load([a, b])
+
+        self.assertEqual({"acme": {"x": "1", "y": "2"}}, merged)
+        self.assertEqual([], cache.parsed)
+
+    def test_changed_file_is_parsed(self):
+        """ changed file is parsed """
+
+        a = self._write("a.ini", "[acme]\nx = 1\n")
+        b = self._write("b.ini", "[acme]\ny = 2\n")
+
+        PreferencesCache(filename=self.filename).load([a, b])
+
+        b = self._write("b.ini", "[acme]\ny = 42\nz = 3\n")
+
+        cache = _CountingPreferencesCache(filename=self.filename)
+        merged = cache.load([a, b])
+
+        self.assertEqual({"acme": {"x": "1", "y": "42", "z": "3"}}, merged)
+        self.assertEqual([b], cache.parsed)
+
+    def test_package_resource(self):
+        """ package resource """
+
+        url = "pkgfile://envisage.tests/preferences.ini"
+
+        PreferencesCache(filename=self.filename).load([url])
+
+        cache = _CountingPreferencesCache(filename=self.filename)
+        merged = cache.load([url])
+
+        self.assertEqual({"enthought.test": {"x": "42"}}, merged)
+        self.assertEqual([], cache.parsed)
+
+    def test_no_such_resource(self):
+        """ no such resource """
+
+        cache = PreferencesCache(filename=self.filename)
+
+        with self.assertRaises(NoSuchResourceError):
+            cache.load(["file://" + os.path.join(self.tmpdir, "bogus.ini")])
+
+    def test_corrupt_cache_file(self):
+        """ corrupt cache file """
+
+        with open(self.filename, "wb") as f:
+            f.write(b"not a pickle")
+
+        a = self._write("a.ini", "[acme]\nx = 1\n")
+
+        cache = PreferencesCache(filename=self.filename)
+        self.assertEqual({"acme": {"x": "1"}}, cache.load([a]))
+
+    def test_in_memory(self):
+        """ in memory """
+
+        a = self._write("a.ini", "[acme]\nx = 1\n")
+
+        cache = _CountingPreferencesCache()
+        cache.load([a])
+        cache.load([a])
+
+        self.assertEqual([a], cache.parsed)
+        self.assertEqual(["a.ini"], os.listdir(self.tmpdir))
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _write(self, name, text):
+        """ Write a preferences file and return its URL. """
+
+        path = os.path.join(self.tmpdir, name)
+
+        # Make sure that the modification time changes even on file systems
+        # with a coarse timestamp resolution.
+        mtime = None
+        if os.path.exists(path):
+            mtime = os.stat(path).st_mtime + 10
+
+        with open(path, "w") as f:
+            f.write(text)
+
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+        return "file://" + path
+
+
+class _CountingPreferencesCache(PreferencesCache):
+    """ A preferences cache that records which files it parses. """
+
+    def __init__(self, **traits):
+        super().__init__(**traits)
+
+        self.parsed = []
+
+    def _parse(self, url, data):
+        self.parsed.append(url)
+
+        return super()._parse(url, data)
@@ -521,6 +521,18 @@ class ProviderExtensionRegistryTestCase(ExtensionRegistryTestCase):
         with self.assertRaises(SystemError):
             registry.set_extensions("my.ep", [1, 2, 3])
 
+    def test_update_extensions(self):
+        """ update extensions """
+
+        registry = self.registry
+
+        # Add an extension *point*.
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+
+        # Update some extensions.
+        with self.assertRaises(SystemError):
+            registry.update_extensions("my.ep", 0, [], [1, 2, 3])
+
     def test_remove_non_empty_extension_point(self):
         """ remove non-empty extension point """
 
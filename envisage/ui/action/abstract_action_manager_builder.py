@@ -11,13 +11,17 @@
 
 # Enthought library imports.
 from pyface.action.api import ActionManager, MenuManager
-from traits.api import HasTraits, Instance, List, provides
+from traits.api import Any, HasTraits, Instance, List, provides
 
 # Local imports.
+from .action_manager_tree import ActionManagerTreeCache
 from .action_set import ActionSet
 from .action_set_manager import ActionSetManager
 from .group import Group
 from .i_action_manager_builder import IActionManagerBuilder
+from .placement_error import DanglingReferenceError
+from .placement_scheduler import GroupReference, ItemReference, MenuReference
+from .placement_scheduler import PlacementScheduler, format_unplaced
 
 
 @provides(IActionManagerBuilder)
@@ -37,10 +41,22 @@ class AbstractActionManagerBuilder(HasTraits):
     # The action sets used by the builder.
     action_sets = List(ActionSet)
 
+    #### 'AbstractActionManagerBuilder' interface #############################
+
+    # An optional cache of compiled menu bars and tool bars. If builders with
+    # the same action sets (e.g. one for each window) share a cache then the
+    # menu bar and tool bars are only built from scratch once.
+    tree_cache = Instance(ActionManagerTreeCache)
+
     #### Private interface ####################################################
 
     _action_set_manager = Instance(ActionSetManager, ())
 
+    # While building for a tree cache, the (kind, definition) of each group,
+    # menu and action implementation created, keyed by the implementation's
+    # ID.
+    _created_items = Any
+
     ###########################################################################
     # 'IActionManagerBuilder' interface.
     ###########################################################################
@@ -48,83 +64,18 @@ class AbstractActionManagerBuilder(HasTraits):
     def create_menu_bar_manager(self, root):
         """ Create a menu bar manager from the builder's action sets. """
 
-        menu_bar_manager = self._create_menu_bar_manager()
+        if self.tree_cache is not None:
+            return self.tree_cache.create_menu_bar_manager(self, root)
 
-        self.initialize_action_manager(menu_bar_manager, root)
+        return self._build_menu_bar_manager(root)
 
-        return menu_bar_manager
-
-    # fixme: V3 refactor loooong (and confusing) method!
     def create_tool_bar_managers(self, root):
         """ Creates all tool bar managers from the builder's action sets. """
 
-        ########################################
-        # New style (i.e multi) tool bars.
-        ########################################
-
-        tool_bar_managers = []
-        for tool_bar in self._action_set_manager.get_tool_bars(root):
-            # Get all of the groups for the tool bar.
-            groups = []
-            for group in self._action_set_manager.get_groups(root):
-                if group.path.startswith("%s/%s" % (root, tool_bar.name)):
-                    group.path = "/".join(group.path.split("/")[1:])
-                    groups.append(group)
-
-            # Get all of the actions for the tool bar.
-            actions = []
-            for action in self._action_set_manager.get_actions(root):
-                if action.path.startswith("%s/%s" % (root, tool_bar.name)):
-                    action.path = "/".join(action.path.split("/")[1:])
-                    actions.append(action)
-
-            # We don't add the tool bar if it is empty!
-            if len(groups) + len(actions) > 0:
-                tool_bar_manager = self._create_tool_bar_manager(tool_bar)
-
-                # Add all groups and menus.
-                self._add_groups_and_menus(tool_bar_manager, groups)
-
-                # Add all of the actions ot the menu manager.
-                self._add_actions(tool_bar_manager, actions)
-
-                # Include the tool bar!
-                tool_bar_managers.append(tool_bar_manager)
-
-        ######################################################################
-        # Scoop up old groups and actions for the old style (single) tool bar.
-        ######################################################################
-
-        # Get all of the groups for the tool bar.
-        groups = []
-        for group in self._action_set_manager.get_groups(root):
-            if group.path == root:
-                groups.append(group)
-
-        # Get all of the actions for the tool bar.
-        actions = []
-        for action in self._action_set_manager.get_actions(root):
-            if action.path == root:
-                actions.append(action)
-
-        # We don't add the tool bar if it is empty!
-        if len(groups) + len(actions) > 0:
-            from .tool_bar import ToolBar
-
-            tool_bar_manager = self._create_tool_bar_manager(
-                ToolBar(name="Tool Bar", path=root, _action_set_=None)
-            )
-
-            # Add all groups and menus.
-            self._add_groups_and_menus(tool_bar_manager, groups)
-
-            # Add all of the actions ot the menu manager.
-            self._add_actions(tool_bar_manager, actions)
-
-            # Include the tool bar!
-            tool_bar_managers.insert(0, tool_bar_manager)
+        if self.tree_cache is not None:
+            return self.tree_cache.create_tool_bar_managers(self, root)
 
-        return tool_bar_managers
+        return self._build_tool_bar_managers(root)
 
     def initialize_action_manager(self, action_manager, root):
         """ Initialize an action manager from the builder's action sets. """
@@ -174,6 +125,16 @@ class AbstractActionManagerBuilder(HasTraits):
 
         raise NotImplementedError
 
+    def _create_submenu_manager(self, id):
+        """ Creates a menu manager for a menu that is only named in a path.
+
+        e.g. If an action's path is 'MenuBar/File/New' and there is no 'New'
+        menu then one is created automatically.
+
+        """
+
+        return MenuManager(id=id, name=id)
+
     ###########################################################################
     # Private interface.
     ###########################################################################
@@ -189,114 +150,247 @@ class AbstractActionManagerBuilder(HasTraits):
 
     #### Methods ##############################################################
 
-    def _add_actions(self, action_manager, actions):
-        """ Add the specified actions to an action manager. """
+    def _build(self, created, method, *args):
+        """ Call a method to build action managers, recording what it creates.
+
+        'created' is a dictionary that the (kind, definition) of each group,
+        menu and action implementation created is added to, keyed by the
+        implementation's ID.
+
+        """
+
+        self._created_items = created
+        try:
+            return method(*args)
+
+        finally:
+            self._created_items = None
+
+    def _build_menu_bar_manager(self, root):
+        """ Build a menu bar manager from the builder's action sets. """
+
+        menu_bar_manager = self._create_menu_bar_manager()
+
+        self.initialize_action_manager(menu_bar_manager, root)
+
+        return menu_bar_manager
+
+    # fixme: V3 refactor loooong (and confusing) method!
+    def _build_tool_bar_managers(self, root):
+        """ Build all tool bar managers from the builder's action sets. """
+
+        ########################################
+        # New style (i.e multi) tool bars.
+        ########################################
+
+        tool_bar_managers = []
+        for tool_bar in self._action_set_manager.get_tool_bars(root):
+            # Get all of the groups and actions for the tool bar (i.e. those
+            # with paths that start with the name of the tool bar).
+            groups = self._action_set_manager.get_groups(root, tool_bar.name)
+            actions = self._action_set_manager.get_actions(
+                root, tool_bar.name
+            )
+
+            # We don't add the tool bar if it is empty!
+            if len(groups) + len(actions) > 0:
+                tool_bar_manager = self._created(
+                    "tool_bar",
+                    tool_bar,
+                    self._create_tool_bar_manager(tool_bar),
+                )
+
+                # The paths are relative to the tool bar (and not the root).
+                self._add_groups_and_menus(tool_bar_manager, groups, depth=2)
+                self._add_actions(tool_bar_manager, actions, depth=2)
+
+                # Include the tool bar!
+                tool_bar_managers.append(tool_bar_manager)
+
+        ######################################################################
+        # Scoop up old groups and actions for the old style (single) tool bar.
+        ######################################################################
+
+        # Get all of the groups and actions for the tool bar (i.e. those at
+        # the root itself).
+        groups = self._action_set_manager.get_groups(root, "")
+        actions = self._action_set_manager.get_actions(root, "")
+
+        # We don't add the tool bar if it is empty!
+        if len(groups) + len(actions) > 0:
+            from .tool_bar import ToolBar
+
+            tool_bar = ToolBar(name="Tool Bar", path=root, _action_set_=None)
+            tool_bar_manager = self._created(
+                "tool_bar", tool_bar, self._create_tool_bar_manager(tool_bar)
+            )
+
+            # Add all groups and menus.
+            self._add_groups_and_menus(tool_bar_manager, groups)
+
+            # Add all of the actions ot the menu manager.
+            self._add_actions(tool_bar_manager, actions)
+
+            # Include the tool bar!
+            tool_bar_managers.insert(0, tool_bar_manager)
+
+        return tool_bar_managers
+
+    def _created(self, kind, definition, implementation):
+        """ Record that an implementation was created from a definition.
+
+        Returns the implementation.
 
-        while len(actions) > 0:
-            start = len(actions)
+        """
 
-            for action in actions[:]:
-                # Resolve the action's path to find the action manager that it
-                # should be added to.
-                #
-                # If any of the menus in path are missing then this creates
-                # them automatically (think 'mkdirs'!).
-                target = self._make_submenus(action_manager, action.path)
+        if self._created_items is not None:
+            self._created_items[id(implementation)] = (kind, definition)
 
-                # Attempt to place the action.
-                #
-                # If the action needs to be placed 'before' or 'after' some
-                # other action, but the other action has not yet been added
-                # then we will try again later!
-                if self._add_action(target, action):
-                    actions.remove(action)
+        return implementation
 
-            end = len(actions)
+    def _add_actions(self, action_manager, actions, depth=1):
+        """ Add the specified actions to an action manager.
+
+        'depth' is the number of components at the start of the actions'
+        paths that identify the action manager itself.
+
+        """
+
+        paths = {"": action_manager}
+        items = _ItemIndex()
+        implementations = {}
+        scheduler = PlacementScheduler(actions)
+
+        def place(action):
+            # Resolve the action's path to find the action manager that it
+            # should be added to.
+            #
+            # If any of the menus in path are missing then this creates
+            # them automatically (think 'mkdirs'!).
+            target = self._make_submenus(
+                action_manager, action.path, paths, items, scheduler, depth
+            )
 
-            # If we didn't succeed in placing *any* actions then we must have a
-            # problem!
-            if start == end:
-                raise ValueError("Could not place %s" % actions)
+            # Attempt to place the action.
+            #
+            # If the action needs to be placed 'before' or 'after' some
+            # other action, but the other action has not yet been added
+            # then it waits until it has!
+            return self._add_action(target, action, depth, items, scheduler)
+
+        def get_references(action):
+            implementation = implementations.get(action)
+            if implementation is None:
+                implementation = implementations[action] = (
+                    self._create_action(action)
+                )
+
+            return [
+                ItemReference(
+                    self._get_relative_path(action.path, depth),
+                    action.group or "additions",
+                    implementation.id,
+                )
+            ]
+
+        scheduler.run(place, get_references)
 
         return
 
-    def _add_action(self, action_manager, action):
+    def _add_action(self, action_manager, action, depth, items, scheduler):
         """ Add an action to an action manager.
 
-        Return True if the action was added successfully.
+        Return None if the action was added successfully.
 
-        Return False if the action needs to be placed 'before' or 'after' some
-        other action, but the other action has not yet been added.
+        Return a reference to the missing item if the action needs to be
+        placed 'before' or 'after' some other item, but the other item has not
+        yet been added.
 
         """
 
+        path = self._get_relative_path(action.path, depth)
+
         group = self._find_group(action_manager, action.group)
         if group is None:
-            msg = "No such group (%s) for %s" % (action.group, action)
-            raise ValueError(msg)
-
-        if len(action.before) > 0:
-            item = group.find(action.before)
-            if item is None:
-                return False
-
-            index = group.items.index(item)
-
-        elif len(action.after) > 0:
-            item = group.find(action.after)
-            if item is None:
-                return False
+            reference = GroupReference(path, action.group or "additions")
+            raise DanglingReferenceError(
+                format_unplaced(action, reference), [action]
+            )
 
-            index = group.items.index(item) + 1
+        index, reference = self._get_index(group, action, path, items)
+        if reference is not None:
+            return reference
 
-        else:
-            index = len(group.items)
+        implementation = self._created(
+            "action", action, self._create_action(action)
+        )
 
-        group.insert(index, self._create_action(action))
+        item = group.insert(index, implementation)
+        items.add(group, item)
+        scheduler.available(ItemReference(path, group.id, item.id))
 
-        return True
+        return None
 
-    def _add_groups_and_menus(self, action_manager, groups_and_menus):
-        """ Add the specified groups and menus to an action manager. """
+    def _add_groups_and_menus(self, action_manager, groups_and_menus, depth=1):
+        """ Add the specified groups and menus to an action manager.
 
-        # The reason we put the groups and menus together is that as we iterate
-        # over the list trying to add them, we might need to add a group before
-        # we can add a menu and we might need to add a menu before we can add a
-        # group! Hence, we take multiple passes over the list and we only barf
-        # if, in any single iteration, we cannot add anything.
-        while len(groups_and_menus) > 0:
-            start = len(groups_and_menus)
+        'depth' is the number of components at the start of the items' paths
+        that identify the action manager itself.
 
-            for item in groups_and_menus[:]:
-                # Resolve the path to find the menu manager that we are about
-                # to add the sub-menu or group to.
-                target = self._find_action_manager(action_manager, item.path)
-                if target is not None:
-                    # Attempt to place a group.
-                    if isinstance(item, Group):
-                        if self._add_group(target, item):
-                            groups_and_menus.remove(item)
+        """
 
-                    # Attempt to place a menu.
-                    elif self._add_menu(target, item):
-                        groups_and_menus.remove(item)
+        # The reason we put the groups and menus together is that we might
+        # need to add a group before we can add a menu and we might need to
+        # add a menu before we can add a group! Hence, anything that can't be
+        # placed yet waits until whatever it needs has been added, and we only
+        # barf if, in the end, there are things that we cannot add.
+        paths = {"": action_manager}
+        items = _ItemIndex()
+        scheduler = PlacementScheduler(groups_and_menus)
+
+        def place(item):
+            # Resolve the path to find the menu manager that we are about to
+            # add the sub-menu or group to.
+            path = self._get_relative_path(item.path, depth)
+            target = self._find_action_manager(action_manager, path, paths)
+            if target is None:
+                return MenuReference(path)
+
+            # Attempt to place a group.
+            if isinstance(item, Group):
+                return self._add_group(target, item, path, scheduler)
+
+            # Attempt to place a menu.
+            return self._add_menu(target, item, path, paths, items, scheduler)
+
+        def get_references(item):
+            path = self._get_relative_path(item.path, depth)
+            if isinstance(item, Group):
+                return [GroupReference(path, item.id)]
+
+            menu_path = self._join_path(path, item.id)
+            references = [
+                ItemReference(path, item.group or "additions", item.id),
+                MenuReference(menu_path),
+            ]
+            references.extend(
+                GroupReference(menu_path, group.id) for group in item.groups
+            )
 
-            end = len(groups_and_menus)
+            return references
 
-            # If we didn't succeed in adding *any* menus or groups then we
-            # must have a problem!
-            if start == end:
-                raise ValueError("Could not place %s" % groups_and_menus)
+        scheduler.run(place, get_references)
 
         return
 
-    def _add_group(self, action_manager, group):
+    def _add_group(self, action_manager, group, path, scheduler):
         """ Add a group to an action manager.
 
-        Return True if the group was added successfully.
+        Return None if the group was added successfully.
 
-        Return False if the group needs to be placed 'before' or 'after' some
-        other group, but the other group has not yet been added.
+        Return a reference to the missing group if the group needs to be
+        placed 'before' or 'after' some other group, but the other group has
+        not yet been added.
 
         """
 
@@ -306,14 +400,14 @@ class AbstractActionManagerBuilder(HasTraits):
             if len(group.before) > 0:
                 item = action_manager.find_group(group.before)
                 if item is None:
-                    return False
+                    return GroupReference(path, group.before)
 
                 index = action_manager.groups.index(item)
 
             elif len(group.after) > 0:
                 item = action_manager.find_group(group.after)
                 if item is None:
-                    return False
+                    return GroupReference(path, group.after)
 
                 index = action_manager.groups.index(item) + 1
 
@@ -329,52 +423,77 @@ class AbstractActionManagerBuilder(HasTraits):
                 else:
                     index = len(action_manager.groups)
 
-            action_manager.insert(index, self._create_group(group))
+            action_manager.insert(
+                index, self._created("group", group, self._create_group(group))
+            )
+            scheduler.available(GroupReference(path, group.id))
 
-        return True
+        return None
 
-    def _add_menu(self, menu_manager, menu):
+    def _add_menu(self, menu_manager, menu, path, paths, items, scheduler):
         """ Add a menu manager to a errr, menu manager.
 
-        Return True if the menu was added successfully.
+        Return None if the menu was added successfully.
 
-        Return False if the menu needs to be placed 'before' or 'after' some
-        other item, but the other item has not yet been added.
+        Return a reference to the missing group or item if the menu needs to
+        be added to a group that has not yet been added, or placed 'before' or
+        'after' some other item, but the other item has not yet been added.
 
         """
 
         group = self._find_group(menu_manager, menu.group)
         if group is None:
-            return False
+            return GroupReference(path, menu.group or "additions")
 
-        if len(menu.before) > 0:
-            item = group.find(menu.before)
-            if item is None:
-                return False
-
-            index = group.items.index(item)
-
-        elif len(menu.after) > 0:
-            item = group.find(menu.after)
-            if item is None:
-                return False
-
-            index = group.items.index(item) + 1
-
-        else:
-            index = len(group.items)
+        index, reference = self._get_index(group, menu, path, items)
+        if reference is not None:
+            return reference
 
         # If the menu does *not* already exist in the group then add it.
-        menu_item = group.find(menu.id)
+        menu_path = self._join_path(path, menu.id)
+        menu_item = items.find(group, menu.id)
         if menu_item is None:
-            group.insert(index, self._create_menu_manager(menu))
+            menu_item = group.insert(
+                index,
+                self._created("menu", menu, self._create_menu_manager(menu)),
+            )
+            items.add(group, menu_item)
+            paths.setdefault(menu_path, menu_item)
+
+            scheduler.available(ItemReference(path, group.id, menu_item.id))
+            scheduler.available(MenuReference(menu_path))
 
         # Otherwise, add all of the new menu's groups to the existing one.
         else:
             for group in menu.groups:
-                self._add_group(menu_item, group)
+                self._add_group(menu_item, group, menu_path, scheduler)
+
+        return None
 
-        return True
+    def _get_index(self, group, definition, path, items):
+        """ Return the index to insert a menu or action into a group at.
+
+        Returns a tuple in the form (index, reference) where the reference is
+        to the missing item if the definition needs to be placed 'before' or
+        'after' an item that has not yet been added (in which case the index
+        is None).
+
+        """
+
+        if len(definition.before) > 0:
+            id, offset = definition.before, 0
+
+        elif len(definition.after) > 0:
+            id, offset = definition.after, 1
+
+        else:
+            return len(group.items), None
+
+        item = items.find(group, id)
+        if item is None:
+            return None, ItemReference(path, group.id, id)
+
+        return group.items.index(item) + offset, None
 
     def _find_group(self, action_manager, id):
         """ Find the group with the specified ID. """
@@ -387,48 +506,146 @@ class AbstractActionManagerBuilder(HasTraits):
 
         return group
 
-    def _find_action_manager(self, action_manager, path):
-        """ Return the action manager at the specified path.
+    def _find_action_manager(self, action_manager, path, paths):
+        """ Return the action manager at the specified (relative) path.
 
         Returns None if the action manager cannot be found.
 
         """
 
-        components = path.split("/")
-        if len(components) == 1:
-            action_manager = action_manager
+        target = paths.get(path)
+        if target is None:
+            target = action_manager.find_item(path)
+            if target is not None:
+                paths[path] = target
+
+        return target
+
+    def _get_relative_path(self, path, depth=1):
+        """ Return a path relative to its root.
+
+        e.g. 'MenuBar/File/New' is 'File/New' relative to the 'MenuBar'.
+
+        'depth' is the number of components that identify the root (e.g. it
+        is 2 for paths within a tool bar such as 'ToolBar/Edit/Undo').
+
+        """
+
+        return "/".join(path.split("/")[depth:])
+
+    def _join_path(self, path, id):
+        """ Return the path to an item in the menu at a (relative) path. """
+
+        if len(path) > 0:
+            path = "%s/%s" % (path, id)
 
         else:
-            action_manager = action_manager.find_item("/".join(components[1:]))
+            path = id
 
-        return action_manager
+        return path
 
-    def _make_submenus(self, menu_manager, path):
+    def _make_submenus(
+        self, menu_manager, path, paths, items, scheduler, depth=1
+    ):
         """ Retutn the menu manager identified by the path.
 
         Make any intermediate menu-managers that are missing.
 
         """
 
-        components = path.split("/")
+        relative_path = self._get_relative_path(path, depth)
+        if relative_path in paths:
+            return paths[relative_path]
 
         # We skip the first component, because if the path is of length 1, then
         # the target menu manager is the menu manager passed in.
-        for component in components[1:]:
-            item = menu_manager.find_item(component)
+        components = path.split("/")[depth:]
+        for i, component in enumerate(components):
+            parent_path = "/".join(components[:i])
+            menu_path = self._join_path(parent_path, component)
 
-            # If the menu manager does *not* contain an item with this ID then
-            # create a sub-menu automatically.
+            item = paths.get(menu_path)
             if item is None:
-                item = MenuManager(id=component, name=component)
-                menu_manager.append(item)
+                item = menu_manager.find_item(component)
 
-            # If the menu manager *does* already contain an item with this ID
-            # then make sure it is a menu and not an action!
-            elif not isinstance(item, ActionManager):
-                msg = "%s is not a menu in path %s" % (item, path)
-                raise ValueError(msg)
+                # If the menu manager does *not* contain an item with this ID
+                # then create a sub-menu automatically.
+                if item is None:
+                    item = self._created(
+                        "submenu",
+                        None,
+                        self._create_submenu_manager(component),
+                    )
+                    group = menu_manager.append(item)
+                    items.add(group, item)
+
+                    scheduler.available(
+                        ItemReference(parent_path, group.id, component)
+                    )
+
+                # If the menu manager *does* already contain an item with this
+                # ID then make sure it is a menu and not an action!
+                elif not isinstance(item, ActionManager):
+                    msg = "%s is not a menu in path %s" % (item, path)
+                    raise ValueError(msg)
+
+                paths[menu_path] = item
 
             menu_manager = item
 
         return menu_manager
+
+
+class _ItemIndex(object):
+    """ An index of the items in Pyface groups by ID.
+
+    This saves searching a group (with 'group.find') every time that an item
+    is placed 'before' or 'after' another.
+
+    """
+
+    def __init__(self):
+        """ Constructor. """
+
+        # The items in the indexed groups, keyed by (group, id).
+        self._items = {}
+
+        # The groups that have been indexed.
+        self._groups = set()
+
+        return
+
+    def add(self, group, item):
+        """ Index an item that has just been added to a group. """
+
+        if group not in self._groups:
+            self._index_group(group)
+
+        else:
+            # Like 'group.find', the index finds the *first* item with an ID.
+            key = (group, item.id)
+            existing = self._items.get(key)
+            if existing is None or (
+                group.items.index(item) < group.items.index(existing)
+            ):
+                self._items[key] = item
+
+        return
+
+    def find(self, group, id):
+        """ Find the item with the specified ID in a group. """
+
+        if group not in self._groups:
+            self._index_group(group)
+
+        return self._items.get((group, id))
+
+    def _index_group(self, group):
+        """ Index all of the items in a group. """
+
+        for item in group.items:
+            self._items.setdefault((group, item.id), item)
+
+        self._groups.add(group)
+
+        return
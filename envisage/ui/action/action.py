@@ -34,6 +34,8 @@ class Action(Location):
     def __str__(self):
         """ Return the 'informal' string representation of the object. """
 
-        return "Action(%s)" % self.name
+        # Actions don't have to have a name (it can be set by the class that
+        # implements the action), so fall back to the class name.
+        return "Action(%s)" % (self.name or self.class_name)
 
     __repr__ = __str__
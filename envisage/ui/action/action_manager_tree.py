@@ -0,0 +1,376 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Compiled trees of menus, groups and actions that can be reused. """
+
+
+# Standard library imports.
+from collections import namedtuple
+
+# Enthought library imports.
+from pyface.action.api import ActionItem, ActionManager, Group
+from traits.api import Dict, HasTraits
+
+
+#: A compiled action manager (e.g. a menu bar, a tool bar or a menu).
+ManagerNode = namedtuple("ManagerNode", ["groups"])
+
+#: A compiled group in an action manager.
+#:
+#: If the group was not created from a definition (e.g. it is the 'additions'
+#: group, or it was created along with its action manager) then the
+#: definition is None.
+GroupNode = namedtuple("GroupNode", ["definition", "id", "items"])
+
+#: A compiled item in a group.
+#:
+#: The kind is one of 'action', 'menu' (created from a definition), 'submenu'
+#: (created automatically for a path) or 'existing' (created along with its
+#: group). If the item is an action manager then 'manager' is its compiled
+#: node, otherwise it is None.
+ItemNode = namedtuple("ItemNode", ["kind", "definition", "id", "manager"])
+
+
+#: The attributes of an action set that contain definitions.
+DEFINITION_ATTRIBUTES = ["actions", "groups", "menus", "tool_bars"]
+
+
+def get_signature(action_sets):
+    """ Return a signature for the placement of the items in action sets.
+
+    Action sets with the same signature produce the same menu bar and tool
+    bars (even if they are different instances, e.g. for different windows).
+
+    """
+
+    def get_item_signature(item):
+        groups = getattr(item, "groups", [])
+        return (
+            type(item),
+            item.path,
+            item.group,
+            item.before,
+            item.after,
+            getattr(item, "id", ""),
+            getattr(item, "name", ""),
+            getattr(item, "class_name", ""),
+            tuple(get_item_signature(group) for group in groups),
+        )
+
+    return tuple(
+        (
+            type(action_set),
+            tuple(sorted(action_set.aliases.items())),
+            tuple(
+                tuple(
+                    get_item_signature(item)
+                    for item in getattr(action_set, attribute_name)
+                )
+                for attribute_name in DEFINITION_ATTRIBUTES
+            ),
+        )
+        for action_set in action_sets
+    )
+
+
+class ActionManagerTree(object):
+    """ A compiled, toolkit-agnostic tree of menus, groups and actions.
+
+    The tree records which definition created each group, menu and action in
+    an action manager and where it ended up, without keeping any of the
+    toolkit-specific objects. Definitions are referred to by their position
+    in the action sets, so a tree compiled from one window's action sets can
+    be used to create the same action manager for another window (with its
+    own action set instances) without resolving any paths or placement
+    constraints.
+
+    """
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, definition, node):
+        """ Constructor.
+
+        The definition is that of a tool bar (or None for a menu bar).
+
+        """
+
+        self.definition = definition
+        self.node = node
+
+        return
+
+    ###########################################################################
+    # 'ActionManagerTree' interface.
+    ###########################################################################
+
+    @classmethod
+    def compile(cls, action_manager, definition, created, action_sets):
+        """ Compile an action manager that has just been built.
+
+        'created' maps the ID of each group, menu and action implementation
+        created by the builder to a tuple in the form (kind, definition).
+
+        """
+
+        compiler = _Compiler(created, action_sets)
+
+        return cls(
+            compiler.get_reference(definition),
+            compiler.compile_manager(action_manager),
+        )
+
+    def create(self, builder):
+        """ Create an action manager from the tree using a builder.
+
+        The builder's action sets must have the same signature as the ones
+        that the tree was compiled from.
+
+        """
+
+        stamper = _Stamper(builder)
+
+        if self.definition is None:
+            action_manager = builder._create_menu_bar_manager()
+
+        else:
+            action_manager = builder._create_tool_bar_manager(
+                stamper.get_definition(self.definition)
+            )
+
+        stamper.stamp_manager(self.node, action_manager)
+
+        return action_manager
+
+
+class ActionManagerTreeCache(HasTraits):
+    """ A cache of compiled menu bars and tool bars.
+
+    A cache can be shared by builders (e.g. one for each window) so that the
+    menu bar and tool bars are only built from scratch once for each
+    different collection of action sets.
+
+    """
+
+    #### Private interface ####################################################
+
+    # The compiled trees keyed by (kind, root, signature).
+    _trees = Dict
+
+    ###########################################################################
+    # 'ActionManagerTreeCache' interface.
+    ###########################################################################
+
+    def clear(self):
+        """ Discard all compiled trees (e.g. if the action sets change). """
+
+        self._trees = {}
+
+        return
+
+    def create_menu_bar_manager(self, builder, root):
+        """ Create a menu bar manager using a builder. """
+
+        key = ("menu_bar", root, get_signature(builder.action_sets))
+
+        tree = self._trees.get(key)
+        if tree is None:
+            created = {}
+            menu_bar_manager = builder._build(
+                created, builder._build_menu_bar_manager, root
+            )
+
+            self._trees[key] = ActionManagerTree.compile(
+                menu_bar_manager, None, created, builder.action_sets
+            )
+
+        else:
+            menu_bar_manager = tree.create(builder)
+
+        return menu_bar_manager
+
+    def create_tool_bar_managers(self, builder, root):
+        """ Create all tool bar managers using a builder. """
+
+        key = ("tool_bars", root, get_signature(builder.action_sets))
+
+        trees = self._trees.get(key)
+        if trees is None:
+            created = {}
+            tool_bar_managers = builder._build(
+                created, builder._build_tool_bar_managers, root
+            )
+
+            self._trees[key] = [
+                ActionManagerTree.compile(
+                    tool_bar_manager,
+                    created[id(tool_bar_manager)][1],
+                    created,
+                    builder.action_sets,
+                )
+                for tool_bar_manager in tool_bar_managers
+            ]
+
+        else:
+            tool_bar_managers = [tree.create(builder) for tree in trees]
+
+        return tool_bar_managers
+
+
+class _Compiler(object):
+    """ Compiles a built action manager into a tree of nodes. """
+
+    def __init__(self, created, action_sets):
+        """ Constructor. """
+
+        self._created = created
+
+        # References to each definition, keyed by the definition's ID.
+        self._references = {}
+        for i, action_set in enumerate(action_sets):
+            for attribute_name in DEFINITION_ATTRIBUTES:
+                items = getattr(action_set, attribute_name)
+                for j, item in enumerate(items):
+                    self._references[id(item)] = (i, attribute_name, j)
+                    for k, group in enumerate(getattr(item, "groups", [])):
+                        self._references[id(group)] = (i, attribute_name, j, k)
+
+        return
+
+    def compile_manager(self, action_manager):
+        """ Compile an action manager. """
+
+        return ManagerNode(
+            [self._compile_group(group) for group in action_manager.groups]
+        )
+
+    def get_reference(self, definition):
+        """ Return a reference to a definition.
+
+        Definitions that are not in the action sets (e.g. the tool bar used
+        for old style tool bar items) are referred to directly.
+
+        """
+
+        return self._references.get(id(definition), definition)
+
+    def _compile_group(self, group):
+        """ Compile a group. """
+
+        kind, definition = self._created.get(id(group), (None, None))
+
+        return GroupNode(
+            self.get_reference(definition),
+            group.id,
+            [self._compile_item(item) for item in group.items],
+        )
+
+    def _compile_item(self, item):
+        """ Compile an item in a group. """
+
+        # Actions are wrapped in action items when they are added to a group.
+        if isinstance(item, ActionItem):
+            implementation = item.action
+
+        else:
+            implementation = item
+
+        kind, definition = self._created.get(
+            id(implementation), ("existing", None)
+        )
+
+        if isinstance(item, ActionManager):
+            manager = self.compile_manager(item)
+
+        else:
+            manager = None
+
+        return ItemNode(kind, self.get_reference(definition), item.id, manager)
+
+
+class _Stamper(object):
+    """ Creates action managers from compiled nodes using a builder. """
+
+    def __init__(self, builder):
+        """ Constructor. """
+
+        self._builder = builder
+        self._action_sets = builder.action_sets
+
+        # Make sure that the definitions are tagged with their action sets
+        # (the builder expects them to be).
+        builder._action_set_manager.get_tool_bars("")
+
+        return
+
+    def get_definition(self, reference):
+        """ Return the definition that a reference refers to. """
+
+        if not isinstance(reference, tuple):
+            return reference
+
+        action_set = self._action_sets[reference[0]]
+        definition = getattr(action_set, reference[1])[reference[2]]
+        if len(reference) > 3:
+            definition = definition.groups[reference[3]]
+
+        return definition
+
+    def stamp_manager(self, node, action_manager):
+        """ Add the groups and items in a node to an action manager. """
+
+        for index, group_node in enumerate(node.groups):
+            if group_node.definition is None:
+                group = action_manager.find_group(group_node.id)
+                if group is None:
+                    group = Group(id=group_node.id)
+                    action_manager.insert(index, group)
+
+            else:
+                group = self._builder._create_group(
+                    self.get_definition(group_node.definition)
+                )
+                action_manager.insert(index, group)
+
+            self._stamp_group(group_node, group)
+
+        return
+
+    def _stamp_group(self, node, group):
+        """ Add the items in a node to a group. """
+
+        builder = self._builder
+
+        for index, item_node in enumerate(node.items):
+            kind = item_node.kind
+            if kind == "existing":
+                item = group.find(item_node.id)
+
+            elif kind == "submenu":
+                item = group.insert(
+                    index, builder._create_submenu_manager(item_node.id)
+                )
+
+            else:
+                definition = self.get_definition(item_node.definition)
+                if kind == "action":
+                    item = group.insert(
+                        index, builder._create_action(definition)
+                    )
+
+                else:
+                    item = group.insert(
+                        index, builder._create_menu_manager(definition)
+                    )
+
+            if item_node.manager is not None:
+                self.stamp_manager(item_node.manager, item)
+
+        return
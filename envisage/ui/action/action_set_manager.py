@@ -10,7 +10,7 @@
 
 
 # Enthought library imports.
-from traits.api import HasTraits, List
+from traits.api import Any, HasTraits, List
 
 # Local imports.
 from .action_set import ActionSet
@@ -24,48 +24,116 @@ class ActionSetManager(HasTraits):
     # The action sets that this manager manages.
     action_sets = List(ActionSet)
 
+    #### Private interface ####################################################
+
+    # The actions, groups, menus and tool bars in the action sets, keyed by
+    # (attribute name, root) and by (attribute name, root, component) where
+    # component is the first component of the path after the root. This is
+    # built on demand and discarded whenever the action sets change.
+    _index = Any
+
     ###########################################################################
     # 'ActionSetManager' interface.
     ###########################################################################
 
-    def get_actions(self, root):
-        """ Return all action definitions for a root. """
+    def get_actions(self, root, component=None):
+        """ Return all action definitions for a root.
+
+        If a component is given then only return the actions whose path
+        starts with it (after the root), e.g. the actions for a particular
+        tool bar. Use an empty component for the actions at the root itself.
+
+        """
+
+        return self._get_items("actions", root, component)
+
+    def get_groups(self, root, component=None):
+        """ Return all group definitions for a root.
 
-        return self._get_items(self.action_sets, "actions", root)
+        If a component is given then only return the groups whose path
+        starts with it (after the root), e.g. the groups for a particular
+        tool bar. Use an empty component for the groups at the root itself.
 
-    def get_groups(self, root):
-        """ Return all group definitions for a root. """
+        """
+
+        return self._get_items("groups", root, component)
 
-        return self._get_items(self.action_sets, "groups", root)
+    def get_menus(self, root, component=None):
+        """ Return all menu definitions for a root.
 
-    def get_menus(self, root):
-        """ Return all menu definitions for a root. """
+        If a component is given then only return the menus whose path
+        starts with it (after the root). Use an empty component for the menus
+        at the root itself.
+
+        """
 
-        return self._get_items(self.action_sets, "menus", root)
+        return self._get_items("menus", root, component)
 
     def get_tool_bars(self, root):
         """ Return all tool bar definitions for a root. """
 
-        return self._get_items(self.action_sets, "tool_bars", root)
+        return self._get_items("tool_bars", root)
 
     ###########################################################################
     # 'Private' interface.
     ###########################################################################
 
-    def _get_items(self, action_sets, attribute_name, root):
-        """ Return all actions, groups or menus for a particular root.
+    #### Trait change handlers ################################################
+
+    def _action_sets_changed(self):
+        """ Static trait change handler. """
+
+        self._index = None
+
+        return
+
+    def _action_sets_items_changed(self):
+        """ Static trait change handler. """
+
+        self._index = None
+
+        return
+
+    #### Methods ##############################################################
+
+    def _get_items(self, attribute_name, root, component=None):
+        """ Return all actions, groups, menus or tool bars for a root.
 
         e.g. To get all of the groups::
 
-            self._get_items(action_sets, 'groups', root)
+            self._get_items('groups', root)
+
+        """
+
+        if self._index is None:
+            self._index = self._build_index(self.action_sets)
+
+        if component is None:
+            key = (attribute_name, root)
+
+        else:
+            key = (attribute_name, root, component)
+
+        # Return a copy as callers are free to modify the list.
+        return list(self._index.get(key, []))
+
+    def _build_index(self, action_sets):
+        """ Index all of the items in the action sets by root and component.
 
         """
 
-        items = []
+        index = {}
         for action_set in action_sets:
-            for item in getattr(action_set, attribute_name):
-                if self._get_root(item.path, action_set.aliases) == root:
-                    items.append(item)
+            for attribute_name in ["actions", "groups", "menus", "tool_bars"]:
+                for item in getattr(action_set, attribute_name):
+                    components = item.path.split("/")
+                    root = self._get_root(item.path, action_set.aliases)
+                    component = components[1] if len(components) > 1 else ""
+
+                    index.setdefault((attribute_name, root), []).append(item)
+                    index.setdefault(
+                        (attribute_name, root, component), []
+                    ).append(item)
 
                     # fixme: Hacky, but the model needs to maintain the
                     # action set that contributed the item.
@@ -77,7 +145,7 @@ class ActionSetManager(HasTraits):
                         for group in item.groups:
                             group._action_set_ = action_set
 
-        return items
+        return index
 
     def _get_root(self, path, aliases):
         """ Return the effective root for a path.
@@ -11,7 +11,10 @@ from .i_action_manager_builder import IActionManagerBuilder
 
 from .abstract_action_manager_builder import AbstractActionManagerBuilder
 from .action import Action
+from .action_manager_tree import ActionManagerTreeCache
 from .action_set import ActionSet
 from .group import Group
 from .menu import Menu
+from .placement_error import DanglingReferenceError, PlacementCycleError
+from .placement_error import PlacementError
 from .tool_bar import ToolBar
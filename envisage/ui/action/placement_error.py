@@ -0,0 +1,45 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" The exceptions raised when groups, menus or actions cannot be placed. """
+
+
+class PlacementError(ValueError):
+    """ The exception raised when groups, menus or actions cannot be placed.
+
+    """
+
+    def __init__(self, message, items):
+        """ Constructor.
+
+        'items' is a list of the definitions that could not be placed.
+
+        """
+
+        super(PlacementError, self).__init__(message)
+
+        self.items = items
+
+
+class DanglingReferenceError(PlacementError):
+    """ The exception raised when an item refers to something that is not
+    defined anywhere.
+
+    e.g. An action that is to be placed 'before' an action that doesn't
+    exist, or a menu that is to be added to a group that doesn't exist.
+
+    """
+
+
+class PlacementCycleError(PlacementError):
+    """ The exception raised when items have cyclic placement constraints.
+
+    e.g. Action 'A' is to be placed 'after' action 'B' and action 'B' is to
+    be placed 'after' action 'A'.
+
+    """
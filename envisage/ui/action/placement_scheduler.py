@@ -0,0 +1,223 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Places groups, menus and actions in dependency order. """
+
+
+# Standard library imports.
+from collections import namedtuple
+import heapq
+
+# Local imports.
+from .placement_error import DanglingReferenceError, PlacementCycleError
+
+
+def _format_path(path):
+    """ Return a description of a path (relative to the root). """
+
+    if len(path) > 0:
+        description = "menu '%s'" % path
+
+    else:
+        description = "the root"
+
+    return description
+
+
+class MenuReference(namedtuple("MenuReference", ["path"])):
+    """ A reference to the menu at a path (relative to the root). """
+
+    def __str__(self):
+        """ Return the 'informal' string representation of the object. """
+
+        return _format_path(self.path)
+
+
+class GroupReference(namedtuple("GroupReference", ["path", "id"])):
+    """ A reference to a group in the menu at a path. """
+
+    def __str__(self):
+        """ Return the 'informal' string representation of the object. """
+
+        return "group '%s' in %s" % (self.id, _format_path(self.path))
+
+
+class ItemReference(namedtuple("ItemReference", ["path", "group", "id"])):
+    """ A reference to an item (a menu or an action) in a group. """
+
+    def __str__(self):
+        """ Return the 'informal' string representation of the object. """
+
+        return "item '%s' in group '%s' of %s" % (
+            self.id,
+            self.group,
+            _format_path(self.path),
+        )
+
+
+def format_unplaced(item, reference):
+    """ Return a message saying that an item is missing a reference. """
+
+    return "Could not place %s (path '%s'): there is no %s" % (
+        item,
+        item.path,
+        reference,
+    )
+
+
+class PlacementScheduler(object):
+    """ Places groups, menus and actions in dependency order.
+
+    Items are offered to a 'place' function in the order that they were
+    given. If an item can't be placed yet (e.g. it is to be placed 'before'
+    an item that hasn't been added yet) then the function returns a reference
+    to whatever is missing and the item waits until 'available' is called
+    with that reference. This is a topological sort (Kahn's algorithm) over
+    the placement constraints, so each item is only retried once what it is
+    waiting for has been added.
+
+    The order that items are placed in is *exactly* the same as repeatedly
+    passing over the list of items until nothing else can be placed, so the
+    resulting menus and tool bars are the same as they have always been.
+
+    """
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, items):
+        """ Constructor. """
+
+        # The items to place.
+        self.items = items
+
+        # The indices of the items waiting for each reference.
+        self._waiting = {}
+
+        # The indices of the items to try in the current pass (a heap).
+        self._current = []
+
+        # The indices of the items to try in the next pass.
+        self._next = []
+
+        # The index of the item currently being placed.
+        self._index = -1
+
+        return
+
+    ###########################################################################
+    # 'PlacementScheduler' interface.
+    ###########################################################################
+
+    def available(self, reference):
+        """ Called when the thing that a reference refers to has been added.
+
+        """
+
+        for index in self._waiting.pop(reference, []):
+            # Items that come after the current one would still have been
+            # tried in this pass, the others have to wait for the next one.
+            if index > self._index:
+                heapq.heappush(self._current, index)
+
+            else:
+                self._next.append(index)
+
+        return
+
+    def run(self, place, get_references):
+        """ Place all of the items.
+
+        'place' is called with an item, and returns None if the item was
+        placed or the reference that it is waiting for otherwise.
+
+        'get_references' is called with an item, and returns the references
+        that would be available if it was placed. This is only used to report
+        any items that can't be placed.
+
+        Raise a 'DanglingReferenceError' if any item refers to something that
+        doesn't exist, or a 'PlacementCycleError' if there is a cycle in the
+        placement constraints.
+
+        """
+
+        self._current = list(range(len(self.items)))
+        while len(self._current) > 0:
+            while len(self._current) > 0:
+                self._index = heapq.heappop(self._current)
+
+                reference = place(self.items[self._index])
+                if reference is not None:
+                    self._waiting.setdefault(reference, []).append(
+                        self._index
+                    )
+
+            # A sorted list is a heap!
+            self._current = sorted(self._next)
+            self._next = []
+
+        if len(self._waiting) > 0:
+            self._raise_placement_error(get_references)
+
+        return
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _raise_placement_error(self, get_references):
+        """ Raise an exception describing the items that were not placed. """
+
+        # The reference that each unplaced item is waiting for.
+        waiting_for = {}
+        for reference, indices in self._waiting.items():
+            for index in indices:
+                waiting_for[index] = reference
+
+        unplaced = sorted(waiting_for)
+        items = [self.items[index] for index in unplaced]
+
+        # The unplaced items that would make each reference available.
+        providers = {}
+        for index in unplaced:
+            for reference in get_references(self.items[index]):
+                providers.setdefault(reference, []).append(index)
+
+        # Items waiting for something that no other unplaced item provides
+        # refer to something that doesn't exist.
+        dangling = [
+            index for index in unplaced if waiting_for[index] not in providers
+        ]
+        if len(dangling) > 0:
+            messages = [
+                format_unplaced(self.items[index], waiting_for[index])
+                for index in dangling
+            ]
+            if len(unplaced) > len(dangling):
+                messages.append(
+                    "(and %d item(s) placed relative to them)"
+                    % (len(unplaced) - len(dangling))
+                )
+
+            raise DanglingReferenceError("\n".join(messages), items)
+
+        # Otherwise, every unplaced item is waiting for another unplaced item
+        # and so following what they are waiting for must lead to a cycle.
+        index = unplaced[0]
+        path = []
+        while index not in path:
+            path.append(index)
+            index = providers[waiting_for[index]][0]
+
+        cycle = path[path.index(index):] + [index]
+        raise PlacementCycleError(
+            "Could not place items with cyclic placement constraints: %s"
+            % " -> ".join(str(self.items[index]) for index in cycle),
+            items,
+        )
@@ -11,7 +11,7 @@
 # Enthought library imports.
 from envisage.ui.action.api import AbstractActionManagerBuilder
 from pyface.action.api import Action, Group, MenuManager
-from pyface.action.api import MenuBarManager
+from pyface.action.api import ActionManager, MenuBarManager
 
 
 class DummyActionManagerBuilder(AbstractActionManagerBuilder):
@@ -56,3 +56,13 @@ class DummyActionManagerBuilder(AbstractActionManagerBuilder):
             menu_manager.insert(-1, Group(id=group_definition.id))
 
         return menu_manager
+
+    def _create_tool_bar_manager(self, tool_bar_definition):
+        """ Create a tool bar manager implementation from a definition. """
+
+        # Tool bar managers need a toolkit, so use a plain action manager.
+        tool_bar_manager = ActionManager(id=tool_bar_definition.id)
+        for group_definition in tool_bar_definition.groups:
+            tool_bar_manager.insert(-1, Group(id=group_definition.id))
+
+        return tool_bar_manager
@@ -0,0 +1,45 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" A menu builder that doesn't build real actions, but can use a tree cache!
+"""
+
+# Enthought library imports.
+from envisage.ui.action.api import AbstractActionManagerBuilder
+from pyface.action.api import MenuBarManager
+
+# Local imports.
+from .dummy_action_manager_builder import DummyActionManagerBuilder
+
+
+class DummyTreeActionManagerBuilder(DummyActionManagerBuilder):
+    """ A dummy action manager builder that can use a tree cache.
+
+    The menu bar is built by the abstract builder (rather than with
+    'initialize_action_manager'), so that it can be compiled into (and
+    created from) a tree.
+
+    """
+
+    ###########################################################################
+    # 'IActionManagerBuilder' interface.
+    ###########################################################################
+
+    def create_menu_bar_manager(self, root):
+        """ Create a menu bar manager from the builder's action sets. """
+
+        return AbstractActionManagerBuilder.create_menu_bar_manager(self, root)
+
+    ###########################################################################
+    # Protected 'AbstractActionManagerBuilder' interface.
+    ###########################################################################
+
+    def _create_menu_bar_manager(self):
+        """ Create a menu bar manager implementation. """
+
+        return MenuBarManager(id="MenuBar")
@@ -13,6 +13,8 @@ import unittest
 
 # Enthought library imports.
 from envisage.ui.action.api import Action, ActionSet, Group, Menu
+from envisage.ui.action.api import DanglingReferenceError, PlacementCycleError
+from envisage.ui.action.api import ToolBar
 
 # Local imports.
 from .dummy_action_manager_builder import DummyActionManagerBuilder
@@ -651,3 +653,172 @@ class ActionManagerBuilderTestCase(unittest.TestCase):
 
         ids = [group.id for group in menu.groups]
         self.assertEqual(["NewGroup", "ExitGroup", "additions"], ids)
+
+    def test_actions_in_reverse_dependency_order(self):
+        """ actions in reverse dependency order """
+
+        # Each action is placed relative to the *next* one, so they can only
+        # be placed back to front.
+        action_sets = [
+            ActionSet(
+                actions=[
+                    Action(class_name="A", path="MenuBar/File", after="B"),
+                    Action(class_name="B", path="MenuBar/File", before="C"),
+                    Action(class_name="C", path="MenuBar/File", after="D"),
+                    Action(class_name="D", path="MenuBar/File"),
+                    Action(class_name="E", path="MenuBar/File", after="D"),
+                ]
+            )
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # Create a menu bar manager for the 'MenuBar'.
+        menu_manager = builder.create_menu_bar_manager("MenuBar")
+
+        # 'E' is placed straight after 'D' *before* 'C' is (and so 'C' ends
+        # up between them).
+        menu = menu_manager.find_item("File")
+        additions = menu.find_group("additions")
+
+        ids = [item.id for item in additions.items]
+        self.assertEqual(["D", "B", "A", "C", "E"], ids)
+
+    def test_dangling_reference_is_reported(self):
+        """ dangling reference is reported """
+
+        action_sets = [
+            ActionSet(
+                actions=[
+                    Action(class_name="Exit", path="MenuBar/File"),
+                    Action(class_name="Close", path="MenuBar/File",
+                           before="Exit"),
+                    Action(class_name="Open", path="MenuBar/File",
+                           after="New"),
+                    Action(class_name="Save", path="MenuBar/File",
+                           after="Open"),
+                ]
+            ),
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # Create a menu bar manager for the 'MenuBar'.
+        with self.assertRaises(DanglingReferenceError) as context:
+            builder.create_menu_bar_manager("MenuBar")
+
+        # Only the action that refers to the missing action is reported as
+        # dangling, but both actions that couldn't be placed are included.
+        message = str(context.exception)
+        self.assertIn("Action(Open)", message)
+        self.assertIn(
+            "item 'New' in group 'additions' of menu 'File'", message
+        )
+        self.assertNotIn("Action(Save)", message)
+        self.assertEqual(
+            ["Open", "Save"],
+            [action.class_name for action in context.exception.items],
+        )
+
+    def test_menu_in_nonexistent_menu_is_reported(self):
+        """ menu in non-existent menu is reported """
+
+        action_sets = [
+            ActionSet(menus=[Menu(name="&New", path="MenuBar/File")])
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # Create a menu bar manager for the 'MenuBar'.
+        with self.assertRaises(DanglingReferenceError) as context:
+            builder.create_menu_bar_manager("MenuBar")
+
+        self.assertIn("there is no menu 'File'", str(context.exception))
+
+    def test_action_cycle_is_reported(self):
+        """ action cycle is reported """
+
+        action_sets = [
+            ActionSet(
+                actions=[
+                    Action(class_name="Exit", path="MenuBar/File"),
+                    Action(class_name="A", path="MenuBar/File", after="B"),
+                    Action(class_name="B", path="MenuBar/File", before="C"),
+                    Action(class_name="C", path="MenuBar/File", after="A"),
+                ]
+            ),
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # Create a menu bar manager for the 'MenuBar'.
+        with self.assertRaises(PlacementCycleError) as context:
+            builder.create_menu_bar_manager("MenuBar")
+
+        self.assertIn(
+            "Action(A) -> Action(B) -> Action(C) -> Action(A)",
+            str(context.exception),
+        )
+
+    def test_group_cycle_is_reported(self):
+        """ group cycle is reported """
+
+        action_sets = [
+            ActionSet(
+                groups=[
+                    Group(id="NewGroup", path="MenuBar", before="ExitGroup"),
+                    Group(id="ExitGroup", path="MenuBar", after="NewGroup"),
+                ]
+            )
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # Create a menu bar manager for the 'MenuBar'.
+        with self.assertRaises(PlacementCycleError) as context:
+            builder.create_menu_bar_manager("MenuBar")
+
+        self.assertIn(
+            "Group(NewGroup) -> Group(ExitGroup) -> Group(NewGroup)",
+            str(context.exception),
+        )
+
+    def test_tool_bars(self):
+        """ tool bars """
+
+        action_sets = [
+            ActionSet(
+                tool_bars=[
+                    ToolBar(id="Edit", name="Edit", path="ToolBar"),
+                    ToolBar(id="EditMore", name="EditMore", path="ToolBar"),
+                ],
+                actions=[
+                    Action(class_name="Exit", path="ToolBar"),
+                    Action(class_name="Redo", path="ToolBar/Edit"),
+                    Action(
+                        class_name="Undo", path="ToolBar/Edit", before="Redo"
+                    ),
+                    Action(class_name="Cut", path="ToolBar/EditMore"),
+                ],
+            )
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # Building the tool bars doesn't change the action definitions, so we
+        # can do it more than once and always get the same tool bars.
+        for _ in range(2):
+            tool_bar_managers = builder.create_tool_bar_managers("ToolBar")
+
+            # The old style tool bar comes first.
+            ids = [
+                [item.id for item in manager.find_group("additions").items]
+                for manager in tool_bar_managers
+            ]
+            self.assertEqual([["Exit"], ["Undo", "Redo"], ["Cut"]], ids)
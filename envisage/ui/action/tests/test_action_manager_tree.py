@@ -0,0 +1,187 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for compiled action manager trees. """
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from envisage.ui.action.api import Action, ActionManagerTreeCache, ActionSet
+from envisage.ui.action.api import Group, Menu, ToolBar
+from traits.api import List
+
+# Local imports.
+from .dummy_action_manager_builder import DummyActionManagerBuilder
+from .dummy_tree_action_manager_builder import DummyTreeActionManagerBuilder
+
+
+class RecordingActionManagerBuilder(DummyTreeActionManagerBuilder):
+    """ A builder that records the definitions that it creates actions for.
+
+    """
+
+    # The definitions that actions were created for.
+    action_definitions = List
+
+    def _create_action(self, action_definition):
+        """ Create an action implementation from a definition. """
+
+        self.action_definitions.append(action_definition)
+
+        return super(RecordingActionManagerBuilder, self)._create_action(
+            action_definition
+        )
+
+
+def make_action_sets():
+    """ Create some action sets (a new instance each time). """
+
+    return [
+        ActionSet(
+            menus=[
+                Menu(name="&File", path="MenuBar", groups=["OpenGroup"]),
+                Menu(name="&Edit", path="MenuBar", after="File"),
+            ],
+            groups=[Group(id="ExitGroup", path="MenuBar/File")],
+            tool_bars=[ToolBar(name="Edit", path="ToolBar")],
+            actions=[
+                Action(
+                    class_name="Exit", path="MenuBar/File", group="ExitGroup"
+                ),
+                Action(
+                    class_name="Open", path="MenuBar/File", group="OpenGroup"
+                ),
+                Action(class_name="Copy", path="MenuBar/Edit", after="Cut"),
+                Action(class_name="Cut", path="MenuBar/Edit"),
+                Action(class_name="Folder", path="MenuBar/File/New"),
+                Action(class_name="Undo", path="ToolBar/Edit"),
+                Action(class_name="Quit", path="ToolBar"),
+            ],
+        ),
+        ActionSet(
+            menus=[Menu(name="&File", path="MenuBar", groups=["SaveGroup"])],
+        ),
+    ]
+
+
+def dump(action_manager):
+    """ Return a description of the groups and items in an action manager.
+    """
+
+    lines = []
+    for group in action_manager.groups:
+        lines.append(group.id)
+        for item in group.items:
+            lines.append("%s/%s" % (group.id, item.id))
+            if hasattr(item, "groups"):
+                lines.extend("  " + line for line in dump(item))
+
+    return lines
+
+
+class ActionManagerTreeTestCase(unittest.TestCase):
+    """ Tests for compiled action manager trees. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.tree_cache = ActionManagerTreeCache()
+
+    def test_menu_bar_from_tree(self):
+        """ menu bar from tree """
+
+        expected = dump(
+            DummyActionManagerBuilder(
+                action_sets=make_action_sets()
+            ).create_menu_bar_manager("MenuBar")
+        )
+
+        first = self._create_builder().create_menu_bar_manager("MenuBar")
+        self.assertEqual(expected, dump(first))
+
+        # The second menu bar is created from the compiled tree, and so
+        # doesn't resolve any placements.
+        builder = self._create_builder()
+        builder._add_actions = None
+        builder._add_groups_and_menus = None
+
+        second = builder.create_menu_bar_manager("MenuBar")
+        self.assertEqual(expected, dump(second))
+
+        # The menu bars don't share any implementations.
+        self.assertIsNot(
+            first.find_item("File/New/Folder"),
+            second.find_item("File/New/Folder"),
+        )
+
+        # The actions are created from the second builder's definitions.
+        self.assertEqual(
+            set(map(id, builder.action_sets[0].actions[:5])),
+            set(map(id, builder.action_definitions)),
+        )
+
+    def test_tool_bars_from_tree(self):
+        """ tool bars from tree """
+
+        first = self._create_builder().create_tool_bar_managers("ToolBar")
+        second = self._create_builder().create_tool_bar_managers("ToolBar")
+
+        self.assertEqual(
+            [dump(manager) for manager in first],
+            [dump(manager) for manager in second],
+        )
+        self.assertEqual(
+            [["additions", "additions/Quit"], ["additions", "additions/Undo"]],
+            [dump(manager) for manager in second],
+        )
+
+    def test_different_action_sets(self):
+        """ different action sets """
+
+        self._create_builder().create_menu_bar_manager("MenuBar")
+
+        action_sets = make_action_sets()
+        action_sets[0].actions[0].after = "Bogus"
+        action_sets[1].menus.append(Menu(name="&Help", path="MenuBar"))
+        builder = self._create_builder(action_sets=action_sets)
+
+        # The action sets have changed so the menu bar is built from scratch
+        # (and any errors are reported).
+        with self.assertRaises(ValueError):
+            builder.create_menu_bar_manager("MenuBar")
+
+        action_sets[0].actions[0].after = ""
+        menu_bar_manager = builder.create_menu_bar_manager("MenuBar")
+
+        self.assertIsNotNone(menu_bar_manager.find_item("Help"))
+
+    def test_clear(self):
+        """ clear """
+
+        self._create_builder().create_menu_bar_manager("MenuBar")
+        self.tree_cache.clear()
+
+        builder = self._create_builder()
+        builder._add_actions = None
+        with self.assertRaises(TypeError):
+            builder.create_menu_bar_manager("MenuBar")
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _create_builder(self, action_sets=None):
+        """ Create a builder that uses the tree cache. """
+
+        if action_sets is None:
+            action_sets = make_action_sets()
+
+        return RecordingActionManagerBuilder(
+            action_sets=action_sets, tree_cache=self.tree_cache
+        )
@@ -0,0 +1,103 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the action set manager. """
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from envisage.ui.action.action_set_manager import ActionSetManager
+from envisage.ui.action.api import Action, ActionSet, Group, Menu, ToolBar
+
+
+class ActionSetManagerTestCase(unittest.TestCase):
+    """ Tests for the action set manager. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.exit = Action(class_name="Exit", path="MenuBar/File")
+        self.undo = Action(class_name="Undo", path="ToolBar/Edit")
+        self.quit = Action(class_name="Quit", path="ToolBar")
+        self.group = Group(id="EditGroup", path="ToolBar/Edit")
+        self.menu = Menu(name="&File", path="MenuBar")
+        self.tool_bar = ToolBar(name="Edit", path="ToolBar")
+
+        self.action_set = ActionSet(
+            actions=[self.exit, self.undo, self.quit],
+            groups=[self.group],
+            menus=[self.menu],
+            tool_bars=[self.tool_bar],
+        )
+
+        self.manager = ActionSetManager(action_sets=[self.action_set])
+
+    def test_get_items_by_root(self):
+        """ get items by root """
+
+        self.assertEqual([self.exit], self.manager.get_actions("MenuBar"))
+        self.assertEqual(
+            [self.undo, self.quit], self.manager.get_actions("ToolBar")
+        )
+        self.assertEqual([self.group], self.manager.get_groups("ToolBar"))
+        self.assertEqual([self.menu], self.manager.get_menus("MenuBar"))
+        self.assertEqual(
+            [self.tool_bar], self.manager.get_tool_bars("ToolBar")
+        )
+        self.assertEqual([], self.manager.get_actions("Bogus"))
+
+    def test_get_items_by_component(self):
+        """ get items by component """
+
+        self.assertEqual(
+            [self.undo], self.manager.get_actions("ToolBar", "Edit")
+        )
+        self.assertEqual([self.quit], self.manager.get_actions("ToolBar", ""))
+        self.assertEqual(
+            [self.group], self.manager.get_groups("ToolBar", "Edit")
+        )
+        self.assertEqual([], self.manager.get_groups("ToolBar", "Ed"))
+
+    def test_items_are_tagged_with_action_set(self):
+        """ items are tagged with action set """
+
+        self.manager.get_actions("MenuBar")
+
+        self.assertIs(self.action_set, self.exit._action_set_)
+        self.assertIs(self.action_set, self.tool_bar._action_set_)
+
+    def test_aliases(self):
+        """ aliases """
+
+        self.action_set.aliases = {"ToolBar": "envisage.toolbar"}
+        self.manager.action_sets = [self.action_set]
+
+        self.assertEqual(
+            [self.undo], self.manager.get_actions("envisage.toolbar", "Edit")
+        )
+        self.assertEqual([], self.manager.get_actions("ToolBar"))
+
+    def test_returned_lists_are_copies(self):
+        """ returned lists are copies """
+
+        self.manager.get_actions("MenuBar").append(self.undo)
+
+        self.assertEqual([self.exit], self.manager.get_actions("MenuBar"))
+
+    def test_index_is_rebuilt_when_action_sets_change(self):
+        """ index is rebuilt when action sets change """
+
+        self.assertEqual([self.exit], self.manager.get_actions("MenuBar"))
+
+        new = Action(class_name="New", path="MenuBar/File")
+        self.manager.action_sets.append(ActionSet(actions=[new]))
+        self.assertEqual([self.exit, new], self.manager.get_actions("MenuBar"))
+
+        self.manager.action_sets = []
+        self.assertEqual([], self.manager.get_actions("MenuBar"))
@@ -10,11 +10,13 @@
 from .services import IPROJECT_MODEL, IPROJECT_UI
 
 # Commonly referred to classes within this plugin
+from .chunked_project import ChunkedProject
 from .factory_definition import FactoryDefinition
 from .model_service import ModelService
 from .project import Project
 from .project_action import ProjectAction
 from .project_factory import ProjectFactory
+from .project_io import ProjectIO, ProjectJob
 from .view.project_view import ProjectView
 
 # FIXME: Add back this import when it actually works :)
@@ -0,0 +1,585 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+"""
+A base class for projects that are saved incrementally, as a directory of
+content-addressed chunks.
+
+"""
+
+# Standard library imports.
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+
+# Enthought library imports
+import traits
+from traits.api import Instance, List
+
+# Local imports.
+from envisage.pickle_policy import PicklePolicy
+from envisage._atomic_file import atomic_open
+from .project import Project
+
+# The type of default value that is computed by calling a function with the
+# object (Traits 6 moved the constant).
+try:
+    from traits.trait_handlers import CALLABLE_DEFAULT_VALUE
+except ImportError:
+    from traits.constants import DefaultValue
+
+    CALLABLE_DEFAULT_VALUE = DefaultValue.callable
+
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+# The format recorded in the manifest of a chunked project.
+MANIFEST_FORMAT = "envisage.ui.single_project.chunked"
+
+# The version of the format (incremented when it changes incompatibly).
+MANIFEST_VERSION = 1
+
+# The persistent ID used for references to the project itself in chunks.
+_PROJECT_ID = "project"
+
+
+class ChunkedProject(Project):
+    """
+    A base class for projects that are saved incrementally, as a directory
+    of content-addressed chunks.
+
+    Each component of the project (i.e. each trait that would be pickled,
+    such as a list of resources) is pickled separately and stored as a
+    chunk named by the hash of its contents, and a small manifest records
+    which chunk holds each component.  So saving a project only pickles
+    and writes the components that have changed since it was last saved
+    (unchanged chunks are simply linked or copied when a project is saved
+    to a different location), and loading a project only reads the
+    manifest: each component is unpickled the first time that it is used.
+
+    Components are changed when their trait is assigned to or, for lists,
+    dictionaries and sets, when items are added or removed.  Derived
+    classes that change a component in any other way (e.g. by changing an
+    attribute of one of the resources in a list) must call
+    *_component_changed* to make sure that it is saved.
+
+    Components may refer to the project itself, but any other object that
+    is shared by more than one component is loaded as a separate copy for
+    each component.  The project's *__getstate__* and *__setstate__*
+    methods are not used by this format.
+
+    Projects saved by the legacy (whole project pickle) format can still be
+    loaded, and are saved in this format from then on.
+
+    """
+
+    ##########################################################################
+    # CLASS Attributes
+    ##########################################################################
+
+    #### public 'Project' class interface ####################################
+
+    # Chunks are pickled with the highest protocol, with a header and with
+    # large buffers (e.g. the data of arrays) out-of-band.  Chunks saved
+    # with any other policy can still be loaded.
+    PICKLE_POLICY = PicklePolicy()
+
+    # Chunked projects are always stored as directories.
+    PROJECTS_ARE_FILES = False
+
+    #### public 'ChunkedProject' class interface #############################
+
+    # The name of the directory (within a project's location) that holds its
+    # chunks.
+    CHUNKS_DIRECTORY = "chunks"
+
+    # The name of the manifest file within a project's location.
+    MANIFEST_FILENAME = "manifest.json"
+
+    ##########################################################################
+    # Attributes
+    ##########################################################################
+
+    #### protected 'ChunkedProject' interface ################################
+
+    # The digest of the chunk that holds each component as it was when the
+    # project was last loaded or saved.
+    _chunk_digests = Instance(dict, (), transient=True)
+
+    # The directories that hold chunks that have been loaded or saved (most
+    # recent first).
+    _chunk_directories = List(transient=True)
+
+    # The names of the components that have changed since the project was
+    # last loaded or saved.
+    _changed_components = Instance(set, (), transient=True)
+
+    ##########################################################################
+    # 'Project' interface.
+    ##########################################################################
+
+    #### public interface ####################################################
+
+    def get_pickle_filename(cls, location):
+        """
+        Generate the project's pickle filename given a source location.
+
+        Overridden to return the project's manifest, unless the project
+        at the location was saved in the legacy format.
+
+        """
+
+        filename = cls.get_manifest_filename(location)
+        if not os.path.exists(filename):
+            legacy_filename = super(ChunkedProject, cls).get_pickle_filename(
+                location
+            )
+            if os.path.exists(legacy_filename):
+                filename = legacy_filename
+
+        return filename
+
+    get_pickle_filename = classmethod(get_pickle_filename)
+
+    #### protected interface #################################################
+
+    def _get_save_snapshot(self):
+        """
+        Return a snapshot of the state of this project for saving in the
+        background.
+
+        Overridden to pickle only the components that have changed (and
+        to snapshot the digests of those that haven't).  The changes are
+        forgotten until the save finishes (and remembered again if it
+        fails).
+
+        """
+
+        snapshot = _ChunkedSnapshot(
+            list(self._chunk_directories), set(self._changed_components)
+        )
+        for name in self._get_component_names():
+            digest = self._chunk_digests.get(name)
+            if (
+                name in snapshot.changed
+                or digest is None
+                or self._find_chunk(digest) is None
+            ):
+                # Components that haven't been loaded yet are loaded here.
+                snapshot.blocks[name] = self._dump_component(
+                    getattr(self, name)
+                )
+
+            else:
+                snapshot.digests[name] = digest
+
+        self._changed_components = set()
+
+        return snapshot
+
+    def _load(cls, location):
+        """
+        Load a project from the specified location.
+
+        Overridden to load the manifest of a chunked project (the legacy
+        format is loaded as before).  Each component is loaded the first
+        time that it is used.
+
+        """
+
+        filename = cls.get_manifest_filename(location)
+        if not os.path.exists(filename):
+            return super(ChunkedProject, cls)._load(location)
+
+        logger.debug("Loading Project of class [%s] from [%s]", cls, filename)
+
+        with open(filename, "r") as fh:
+            manifest = json.load(fh)
+
+        if manifest.get("format") != MANIFEST_FORMAT:
+            raise ValueError("[%s] is not a project manifest" % filename)
+
+        if manifest.get("version", 0) > MANIFEST_VERSION:
+            raise ValueError(
+                "[%s] was saved by a newer version of this format" % filename
+            )
+
+        # Create the project exactly as unpickling it would, but with its
+        # components left to be loaded when they are first used.
+        project = cls.__new__(cls)
+        project._chunk_directories = [
+            os.path.join(location, cls.CHUNKS_DIRECTORY)
+        ]
+        components = manifest["components"]
+        project._chunk_digests = dict(components)
+        for name, digest in components.items():
+            if project._find_chunk(digest) is None:
+                raise IOError(
+                    "The chunk for [%s] is missing from [%s]"
+                    % (name, location)
+                )
+
+            project._load_component_later(name)
+
+        project.__setstate__(
+            {
+                "__traits_version__": manifest["traits_version"],
+                "_project_version_major": manifest["project_version"][0],
+                "_project_version_minor": manifest["project_version"][1],
+            }
+        )
+        project._changed_components = set()
+
+        # Allow derived classes to customize behavior after loading is
+        # complete.
+        project._load_hook(location)
+
+        logger.debug(
+            "Loaded Project [%s] from location [%s]", project, filename
+        )
+
+        return project
+
+    _load = classmethod(_load)
+
+    def _save(self, location):
+        """
+        Save this project to the specified location.
+
+        Overridden to save only the components that have changed.
+
+        """
+
+        # Allow derived classes to customize behavior before saving.
+        self._save_hook(location)
+
+        snapshot = self._get_save_snapshot()
+        try:
+            self._write_save_snapshot(snapshot, location)
+
+        except Exception as exc:
+            self._save_snapshot_finished(snapshot, location, exc)
+            raise
+
+        self._save_snapshot_finished(snapshot, location, None)
+
+        return
+
+    def _save_snapshot_finished(self, snapshot, location, exception):
+        """
+        Finish saving a snapshot of this project.
+
+        Overridden to remember the chunks that were saved (or, if the save
+        failed, the changes that weren't).
+
+        """
+
+        if exception is not None:
+            self._changed_components.update(snapshot.changed)
+
+        else:
+            self._chunk_digests.update(snapshot.digests)
+            directory = os.path.join(location, self.CHUNKS_DIRECTORY)
+            if directory in self._chunk_directories:
+                self._chunk_directories.remove(directory)
+
+            self._chunk_directories.insert(0, directory)
+
+        return
+
+    def _write_save_snapshot(self, snapshot, location, progress=None):
+        """
+        Write a snapshot of this project to the specified location.
+
+        Overridden to write the chunks for the components that have changed
+        (and any other chunks that aren't already at the location), then
+        the manifest, and then to remove any chunks that are no longer
+        used.
+
+        """
+
+        filename = self.get_manifest_filename(location)
+        directory = os.path.join(location, self.CHUNKS_DIRECTORY)
+        logger.debug("Saving Project [%s] to [%s]", self, filename)
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # Make sure that the unchanged chunks are at the location.
+        total = len(snapshot.digests) + len(snapshot.blocks)
+        count = 0
+        for digest in snapshot.digests.values():
+            path = os.path.join(directory, digest)
+            if not os.path.exists(path):
+                self._copy_chunk(
+                    self._find_chunk(digest, snapshot.directories), path
+                )
+
+            count += 1
+            if progress is not None:
+                progress(count / total)
+
+        # Write the changed components.
+        for name, blocks in snapshot.blocks.items():
+            sha1 = hashlib.sha1()
+            for block in blocks:
+                sha1.update(block)
+
+            digest = sha1.hexdigest()
+            path = os.path.join(directory, digest)
+            if not os.path.exists(path):
+                with atomic_open(path) as fh:
+                    for block in blocks:
+                        fh.write(block)
+
+            snapshot.digests[name] = digest
+
+            count += 1
+            if progress is not None:
+                progress(count / total)
+
+        # Only now does the location hold the new version of the project.
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "version": MANIFEST_VERSION,
+            "project_class": "%s:%s"
+            % (type(self).__module__, type(self).__name__),
+            "project_version": [1, 0],
+            "traits_version": traits.__version__,
+            "components": snapshot.digests,
+        }
+        with atomic_open(filename, "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+
+        # Remove any legacy pickle (so that it isn't loaded instead), and
+        # any chunks that belonged to earlier versions of the project.
+        legacy_filename = super(ChunkedProject, self).get_pickle_filename(
+            location
+        )
+        if os.path.exists(legacy_filename):
+            os.remove(legacy_filename)
+
+        used = set(snapshot.digests.values())
+        for name in os.listdir(directory):
+            if name not in used and not name.startswith("."):
+                os.remove(os.path.join(directory, name))
+
+        logger.debug("Saved Project [%s] to [%s]", self, filename)
+
+        return
+
+    ##########################################################################
+    # 'ChunkedProject' interface.
+    ##########################################################################
+
+    #### public interface ####################################################
+
+    def get_manifest_filename(cls, location):
+        """
+        Return the filename of the manifest of a project at a location.
+
+        """
+
+        return os.path.join(location, cls.MANIFEST_FILENAME)
+
+    get_manifest_filename = classmethod(get_manifest_filename)
+
+    #### protected interface #################################################
+
+    def _component_changed(self, name):
+        """
+        Mark a component as changed (so that it is saved next time).
+
+        """
+
+        self._changed_components.add(name)
+
+        return
+
+    def _copy_chunk(self, source, destination):
+        """
+        Copy a chunk to another directory.
+
+        Chunks never change, so they are hard-linked if possible.
+
+        """
+
+        if source is None:
+            raise IOError(
+                "Unable to find the chunk [%s]" % os.path.basename(destination)
+            )
+
+        try:
+            os.link(source, destination)
+
+        except (AttributeError, OSError):
+            with atomic_open(destination) as fh:
+                with open(source, "rb") as source_fh:
+                    shutil.copyfileobj(source_fh, fh)
+
+        return
+
+    def _dump_component(self, value):
+        """
+        Pickle a component.
+
+        Returns the list of blocks of bytes that make up its chunk (see
+        *PicklePolicy.serialize*, with copies of any out-of-band buffers so
+        that the chunk can be written after the component has changed).
+        References to the project itself are pickled by persistent ID.
+
+        """
+
+        def configure(pickler):
+            pickler.persistent_id = (
+                lambda obj: _PROJECT_ID if obj is self else None
+            )
+
+        return self.PICKLE_POLICY.serialize(
+            value, configure=configure, copy_buffers=True
+        )
+
+    def _find_chunk(self, digest, directories=None):
+        """
+        Return the path of the chunk with the specified digest (or None if
+        it can't be found).
+
+        """
+
+        if directories is None:
+            directories = self._chunk_directories
+
+        for directory in directories:
+            path = os.path.join(directory, digest)
+            if os.path.exists(path):
+                return path
+
+        return None
+
+    def _get_component_names(self):
+        """
+        Return the names of the components of this project.
+
+        These are the traits that would be pickled by *__getstate__*.
+
+        """
+
+        return self.trait_names(transient=lambda value: value is None)
+
+    def _is_component(self, name):
+        """
+        Is the trait with the specified name a component of this project?
+
+        """
+
+        trait = self.trait(name)
+
+        return trait is not None and trait.transient is None
+
+    def _load_component(self, name):
+        """
+        Load a component from its chunk.
+
+        """
+
+        digest = self._chunk_digests[name]
+        path = self._find_chunk(digest)
+        if path is None:
+            raise IOError("Unable to find the chunk for [%s]" % name)
+
+        logger.debug("Loading component [%s] of [%s]", name, self)
+
+        def configure(unpickler):
+            unpickler.persistent_load = self._persistent_load
+
+        with open(path, "rb") as fh:
+            value = self.PICKLE_POLICY.load(fh, configure=configure)
+
+        return value
+
+    def _load_component_later(self, name):
+        """
+        Make a component be loaded the first time that it is used.
+
+        This gives this project its own copy of the component's trait, with
+        a default value that loads the component.
+
+        """
+
+        def load_component(project):
+            return project._load_component(name)
+
+        trait = self._trait(name, 2)
+        trait.default_value(CALLABLE_DEFAULT_VALUE, load_component)
+
+        return
+
+    def _persistent_load(self, persistent_id):
+        """
+        Resolve a persistent ID in a chunk.
+
+        """
+
+        if persistent_id != _PROJECT_ID:
+            raise pickle.UnpicklingError(
+                "Unknown persistent ID [%s]" % persistent_id
+            )
+
+        return self
+
+    #### trait handlers ######################################################
+
+    def _anytrait_changed(self, name, old, new):
+        """
+        Called whenever any trait changes.
+
+        """
+
+        # Changes to the items in a list, dictionary or set are reported as
+        # changes to the 'name_items' trait.
+        if name.endswith("_items"):
+            name = name[: -len("_items")]
+
+        if self._is_component(name):
+            self._component_changed(name)
+
+        return
+
+
+class _ChunkedSnapshot(object):
+    """
+    A snapshot of the components of a chunked project.
+
+    """
+
+    def __init__(self, directories, changed):
+        """
+        Constructor.
+
+        """
+
+        # The directories that hold the chunks of the unchanged components.
+        self.directories = directories
+
+        # The names of the components that had changed.
+        self.changed = changed
+
+        # The digests of the chunks for the unchanged components (the
+        # changed components are added once they have been written).
+        self.digests = {}
+
+        # The pickled changed components (and any components whose chunks
+        # can't be found), as lists of blocks of bytes.
+        self.blocks = {}
+
+        return
@@ -38,12 +38,19 @@ from traitsui.api import Group, View
 # from envisage.ui.single_project.editor.project_editor import \
 #    ProjectEditor
 from envisage.api import Application
+from envisage.pickle_policy import PicklePolicy
+from envisage._atomic_file import atomic_open
 
 
 # Setup a logger for this module.
 logger = logging.getLogger(__name__)
 
 
+# The number of bytes written between progress notifications when a project
+# is saved in the background.
+WRITE_BLOCK_SIZE = 1024 * 1024
+
+
 class Project(HasTraits):
     """
     A base class for projects that can be displayed by the single_project
@@ -64,6 +71,12 @@ class Project(HasTraits):
     # This is meant to be a constant for the lifetime of this class!
     PROJECTS_ARE_FILES = True
 
+    # The pickle policy used to save instances of this project class (any
+    # project can be loaded whatever the policy it was saved with).  This is
+    # protocol 1 without a header by default, so that projects can still be
+    # loaded by older versions.
+    PICKLE_POLICY = PicklePolicy(protocol=1, header=False)
+
     # Current envisage application.
     application = Instance(Application, transient=True)
 
@@ -372,49 +385,8 @@ class Project(HasTraits):
 
         """
 
-        # Ensure saving (or save as) is allowed at this time.
-        if location is None or location == self.location:
-            if not self.is_save_allowed:
-                raise AssertionError("Saving is currently not allowed.")
-        elif location != self.location:
-            if not self.is_save_as_allowed:
-                raise AssertionError("Save as is currently not allowed.")
-
-        # Use the internally-specified location unless a new location was
-        # explicitly provided.  The new location can not contain any starting
-        # or trailing whitespace and it cannot overwrite an existing file or
-        # directory unless that was explicitly allowed.
-        loc = self.location
-        if location is not None:
-            location = location.strip()
-            if len(location) > 0 and location != self.location:
-
-                # Ensure we never overwrite existing files / directories just
-                # because someone specified a new location.  (Confirmation or
-                # correction of overwriting requires prompting of the user and
-                # is thus not part of the project model.)
-                if os.path.exists(location) and overwrite is False:
-                    raise AssertionError(
-                        "Can not overwrite existing "
-                        + "location [%s]" % location
-                    )
-
-                # The requested location is valid so let's use it.
-                loc = location
-
-        # Ensure all necessary directories exist.  If we're saving a file, then
-        # these are the path upto the file name.  If we're saving to a directory
-        # then the path is the complete location.
-        if self.PROJECTS_ARE_FILES:
-            path, filename = os.path.split(loc)
-        else:
-            path = loc
-        if len(path) > 0:
-            f = File(path)
-            if f.is_file:
-                f.delete()
-            if not f.exists:
-                f.create_folders()
+        # Check the location and create any necessary directories.
+        loc = self._prepare_save(location, overwrite)
 
         # Save this project in a manner that derived classes can modify.
         self._save(loc)
@@ -550,6 +522,25 @@ class Project(HasTraits):
 
         return result
 
+    def _get_save_snapshot(self):
+        """
+        Return a snapshot of the state of this project for saving in the
+        background.
+
+        This is called in the GUI thread, and the snapshot is written by
+        *_write_save_snapshot* in a worker thread, so it must not refer to
+        anything that may be changed while the project is being saved.
+
+        The default snapshot is the pickled project (a list of blocks of
+        bytes, including copies of any out-of-band buffers), as pickling is
+        cheap compared with writing the file.
+
+        """
+
+        return self.PICKLE_POLICY.serialize(
+            self, self.get_pickle_package(), copy_buffers=True
+        )
+
     def _load(cls, location):
         """
         Load a project from the specified location.
@@ -573,7 +564,7 @@ class Project(HasTraits):
         try:
             fh = open(filename, "rb")
             pickle_package = cls.get_pickle_package()
-            project = pickle_package.load(fh)
+            project = cls.PICKLE_POLICY.load(fh, pickle_package)
 
             # Allow derived classes to customize behavior after unpickling
             # is complete.
@@ -638,6 +629,64 @@ class Project(HasTraits):
 
     _make_location_unique = classmethod(_make_location_unique)
 
+    def _prepare_save(self, location, overwrite):
+        """
+        Check that this project can be saved to a location and create any
+        directories needed to save it there.
+
+        The arguments are the same as for the *save* method.  Returns the
+        location that the project should actually be saved to.
+
+        An exception will be raised to indicate a failure.
+
+        """
+
+        # Ensure saving (or save as) is allowed at this time.
+        if location is None or location == self.location:
+            if not self.is_save_allowed:
+                raise AssertionError("Saving is currently not allowed.")
+        elif location != self.location:
+            if not self.is_save_as_allowed:
+                raise AssertionError("Save as is currently not allowed.")
+
+        # Use the internally-specified location unless a new location was
+        # explicitly provided.  The new location can not contain any starting
+        # or trailing whitespace and it cannot overwrite an existing file or
+        # directory unless that was explicitly allowed.
+        loc = self.location
+        if location is not None:
+            location = location.strip()
+            if len(location) > 0 and location != self.location:
+
+                # Ensure we never overwrite existing files / directories just
+                # because someone specified a new location.  (Confirmation or
+                # correction of overwriting requires prompting of the user and
+                # is thus not part of the project model.)
+                if os.path.exists(location) and overwrite is False:
+                    raise AssertionError(
+                        "Can not overwrite existing "
+                        + "location [%s]" % location
+                    )
+
+                # The requested location is valid so let's use it.
+                loc = location
+
+        # Ensure all necessary directories exist.  If we're saving a file, then
+        # these are the path upto the file name.  If we're saving to a directory
+        # then the path is the complete location.
+        if self.PROJECTS_ARE_FILES:
+            path, filename = os.path.split(loc)
+        else:
+            path = loc
+        if len(path) > 0:
+            f = File(path)
+            if f.is_file:
+                f.delete()
+            if not f.exists:
+                f.create_folders()
+
+        return loc
+
     def _save(self, location):
         """
         Save this project to the specified location.
@@ -655,29 +704,20 @@ class Project(HasTraits):
         filename = self.get_pickle_filename(location)
         logger.debug("Saving Project [%s] to [%s]", self, filename)
 
-        # Pickle the object to a file while making sure to close any file we
-        # open.  Note that we can't just log or ignore errors here as the
-        # caller needs to know whether we succeeded or not, and could possibly
-        # handle the exception if they knew what it was.
-        fh = None
-        try:
-            # Allow derived classes to customize behavior before pickling is
-            # applied.
-            self._save_hook(location)
+        # Allow derived classes to customize behavior before pickling is
+        # applied.
+        self._save_hook(location)
 
-            fh = open(filename, "wb")
+        # Pickle the object to a temporary file that only replaces the
+        # project's file once it has been completely written.  Note that we
+        # can't just log or ignore errors here as the caller needs to know
+        # whether we succeeded or not, and could possibly handle the
+        # exception if they knew what it was.
+        with atomic_open(filename) as fh:
             pickle_package = self.get_pickle_package()
-            pickle_package.dump(self, fh, 1)
+            self.PICKLE_POLICY.dump(self, fh, pickle_package)
 
-            logger.debug("Saved Project [%s] to [%s]", self, filename)
-        finally:
-            try:
-                if fh is not None:
-                    fh.close()
-            except:
-                logger.exception(
-                    "Unable to close project pickle file [%s]", filename
-                )
+        logger.debug("Saved Project [%s] to [%s]", self, filename)
 
         return
 
@@ -695,6 +735,53 @@ class Project(HasTraits):
 
         pass
 
+    def _save_snapshot_finished(self, snapshot, location, exception):
+        """
+        Finish saving a snapshot of this project.
+
+        This is called in the GUI thread after a snapshot returned by
+        *_get_save_snapshot* has been written by *_write_save_snapshot* (or
+        has failed to be written, in which case 'exception' is the exception
+        that was raised).
+
+        """
+
+        pass
+
+    def _write_save_snapshot(self, snapshot, location, progress=None):
+        """
+        Write a snapshot of this project to the specified location.
+
+        This is called in a worker thread to save a project in the
+        background, with a snapshot returned by *_get_save_snapshot*.  The
+        project itself must not be used.  If 'progress' is not None then it
+        is called with the fraction of the snapshot written so far.
+
+        Derived classes that override *_save* should override this too if
+        they can be saved in the background.
+
+        The caller is notified of saving errors by raised exceptions.
+
+        """
+
+        filename = self.get_pickle_filename(location)
+        logger.debug("Saving Project [%s] to [%s]", self, filename)
+
+        total = sum(len(block) for block in snapshot)
+        written = 0
+        with atomic_open(filename) as fh:
+            for block in snapshot:
+                for start in range(0, len(block), WRITE_BLOCK_SIZE):
+                    data = block[start:start + WRITE_BLOCK_SIZE]
+                    fh.write(data)
+                    written += len(data)
+                    if progress is not None:
+                        progress(written / total)
+
+        logger.debug("Saved Project [%s] to [%s]", self, filename)
+
+        return
+
     #### trait handlers ######################################################
 
     def _location_changed(self, old, new):
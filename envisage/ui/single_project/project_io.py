@@ -0,0 +1,531 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+"""
+Saves and loads projects on a worker thread.
+
+"""
+
+# Standard library imports.
+import logging
+import os
+import queue
+import threading
+
+# Enthought library imports
+from traits.api import Enum, Event, HasTraits, Instance
+from traits.trait_notifiers import ui_dispatch
+
+# Local imports.
+from .project import Project
+
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+#: The number of bytes read between progress events.
+BLOCK_SIZE = 1024 * 1024
+
+
+class ProjectJob(object):
+    """
+    A project save or load submitted to a project IO service.
+
+    """
+
+    def __init__(self, kind, location, project=None, project_class=None,
+                 application=None, autosave=False):
+        """
+        Constructor.
+
+        """
+
+        # Either 'save' or 'load'.
+        self.kind = kind
+
+        # The location that the project is being saved to or loaded from.
+        self.location = location
+
+        # The project being saved (or, once loaded, the project that was
+        # loaded).
+        self.project = project
+
+        # The class of the project being saved or loaded.
+        self.project_class = project_class
+
+        # The application that a loaded project is part of.
+        self.application = application
+
+        # If True then the project's location and dirty flag are left as
+        # they are when it has been saved.
+        self.autosave = autosave
+
+        # The exception raised by the save or load (if any).
+        self.exception = None
+
+        # The snapshot of the project taken when the save was submitted (see
+        # *Project._get_save_snapshot*).
+        self._snapshot = None
+
+        # Set when the project has been written or read.
+        self._done = threading.Event()
+
+        # Set when the project has been updated and the 'completed' event
+        # fired.
+        self._completed = threading.Event()
+
+        return
+
+    def __repr__(self):
+        """
+        Return the official string representation of this object.
+
+        """
+
+        return "ProjectJob(%r, %r)" % (self.kind, self.location)
+
+    @property
+    def completed(self):
+        """
+        Has the project been updated (and the 'completed' event fired)?
+
+        """
+
+        return self._completed.is_set()
+
+    @property
+    def done(self):
+        """
+        Has the project been written or read?
+
+        """
+
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the project to be written or read.
+
+        Returns True if it has been, or False if the timeout expired first.
+
+        Note that the project is updated (and the 'completed' event fired)
+        afterwards (see *wait_completed*).
+
+        """
+
+        return self._done.wait(timeout)
+
+    def wait_completed(self, timeout=None):
+        """
+        Wait for the project to be updated and the 'completed' event fired.
+
+        Returns True if they have been, or False if the timeout expired
+        first.
+
+        Note that if the project IO service dispatches to the GUI thread
+        then this happens in the GUI thread, so don't wait for it there.
+
+        """
+
+        return self._completed.wait(timeout)
+
+
+class ProjectIO(HasTraits):
+    """
+    Saves and loads projects on a worker thread.
+
+    When a project is saved, it is pickled in the calling (GUI) thread, and
+    then written to a temporary file that replaces the project's file on a
+    single worker thread (created when the first job is submitted).  So the
+    GUI doesn't block while a large project is written, and the project's
+    file is never left half-written.
+
+    Projects that override *_save* (e.g. to save other files as well) are
+    saved in the calling thread exactly as *Project.save* would, unless
+    they also override *_write_save_snapshot*.  Projects that override
+    *_load* are loaded in the calling thread.
+
+    """
+
+    ##########################################################################
+    # Attributes
+    ##########################################################################
+
+    #### public 'ProjectIO' interface ########################################
+
+    # Fired with each job when it has finished and the project has been
+    # updated.  This is fired in the thread chosen by 'dispatch'.
+    completed = Event
+
+    # How finished jobs are handled.  If 'ui' then the project is updated
+    # (and the 'completed' event fired) in the GUI thread, which requires a
+    # running GUI toolkit.  If 'same' then they are handled in the worker
+    # thread (e.g. in applications without a GUI).
+    dispatch = Enum("ui", "same")
+
+    # Fired with a tuple in the form (job, fraction) as each job progresses,
+    # where 'fraction' is between 0.0 and 1.0.  This is fired in the worker
+    # thread, so GUI code should listen to it with 'dispatch="ui"'.
+    progress = Event
+
+    #### protected 'ProjectIO' interface #####################################
+
+    # The jobs waiting to be run ('None' tells the worker thread to exit).
+    _queue = Instance(queue.Queue, ())
+
+    # The worker thread.
+    _thread = Instance(threading.Thread)
+
+    ##########################################################################
+    # 'ProjectIO' interface.
+    ##########################################################################
+
+    #### public interface ####################################################
+
+    def load(self, project_class, location, application=None):
+        """
+        Load a project in the background.
+
+        Once loaded, the project's location, dirty flag and application are
+        set exactly as *Project.load* sets them.
+
+        Returns the job (whose 'project' is the loaded project once it has
+        completed).
+
+        """
+
+        job = ProjectJob(
+            "load", location, project_class=project_class,
+            application=application
+        )
+
+        if project_class._load.__func__ is not Project._load.__func__:
+            try:
+                job.project = project_class._load(location)
+
+            except Exception as exc:
+                job.exception = exc
+
+            job._done.set()
+            self._complete(job)
+
+        else:
+            self._submit(job)
+
+        return job
+
+    def save(self, project, location=None, overwrite=False, autosave=False):
+        """
+        Save a project in the background.
+
+        The arguments are the same as for *Project.save*, and any problems
+        with the location (e.g. it already exists and 'overwrite' is False)
+        raise an exception here.  If 'autosave' is True then the project's
+        location and dirty flag are left as they are.
+
+        Otherwise the project's dirty flag is cleared immediately (so that
+        any changes made while it is being saved make it dirty again), and
+        set again if the save fails.  Its location is updated when the save
+        completes.
+
+        Returns the job (which can be used to wait for the project to be
+        written).
+
+        """
+
+        loc = project._prepare_save(location, overwrite)
+        job = ProjectJob(
+            "save", loc, project=project, project_class=type(project),
+            autosave=autosave
+        )
+
+        project_class = type(project)
+        if (
+            project_class._save is not Project._save
+            and project_class._write_save_snapshot
+            is Project._write_save_snapshot
+        ):
+            if not autosave:
+                project.dirty = False
+
+            try:
+                project._save(loc)
+
+            except Exception as exc:
+                job.exception = exc
+
+            job._done.set()
+            self._complete(job)
+
+            return job
+
+        project._save_hook(loc)
+
+        # Only the snapshot is used in the background, so the project can be
+        # changed as soon as this returns.
+        try:
+            job._snapshot = project._get_save_snapshot()
+
+        except Exception as exc:
+            job.exception = exc
+            job._done.set()
+            self._complete(job)
+
+            return job
+
+        if not autosave:
+            project.dirty = False
+
+        self._submit(job)
+
+        return job
+
+    def shutdown(self, timeout=None):
+        """
+        Wait for any submitted jobs to finish and stop the worker thread.
+
+        """
+
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+        return
+
+    #### protected interface #################################################
+
+    def _complete(self, job):
+        """
+        Update the project of a finished job and fire the 'completed' event.
+
+        """
+
+        try:
+            project = job.project
+            if job.kind == "save" and job._snapshot is not None:
+                project._save_snapshot_finished(
+                    job._snapshot, job.location, job.exception
+                )
+
+            if job.exception is not None:
+                logger.error(
+                    "Unable to %s project at [%s]", job.kind, job.location,
+                    exc_info=job.exception
+                )
+                if job.kind == "save" and not job.autosave:
+                    project.dirty = True
+
+            elif job.kind == "load":
+                project.location = job.location
+                project.dirty = False
+                project.application = job.application
+
+            elif not job.autosave:
+                # Changing the location makes the project dirty, but the
+                # project is only dirty if it was changed while it was being
+                # saved.
+                dirty = project.dirty
+                project.location = job.location
+                project.dirty = dirty
+
+            job._snapshot = None
+            self.completed = job
+
+        # Waiters are released even if a listener raised an exception.
+        finally:
+            job._completed.set()
+
+        return
+
+    def _read(self, job):
+        """
+        Read and unpickle a project (in the worker thread).
+
+        """
+
+        project_class = job.project_class
+        filename = project_class.get_pickle_filename(job.location)
+        logger.debug(
+            "Loading Project of class [%s] from [%s]", project_class, filename
+        )
+
+        def progress(fraction):
+            self.progress = (job, fraction)
+
+        # The project is unpickled straight from the file.
+        with open(filename, "rb") as fh:
+            pickle_package = project_class.get_pickle_package()
+            project = project_class.PICKLE_POLICY.load(
+                _ProgressFile(fh, progress), pickle_package
+            )
+
+        project._load_hook(job.location)
+        job.project = project
+
+        self.progress = (job, 1.0)
+        logger.debug(
+            "Loaded Project [%s] from location [%s]", project, filename
+        )
+
+        return
+
+    def _submit(self, job):
+        """
+        Submit a job to the worker thread.
+
+        """
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._work, name="ProjectIO"
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+        self._queue.put(job)
+
+        return
+
+    def _work(self):
+        """
+        Run jobs until asked to exit (in the worker thread).
+
+        """
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            try:
+                if job.kind == "save":
+                    self._write(job)
+
+                else:
+                    self._read(job)
+
+            except Exception as exc:
+                job.exception = exc
+
+            job._done.set()
+
+            try:
+                if self.dispatch == "ui":
+                    ui_dispatch(self._complete, job)
+
+                else:
+                    self._complete(job)
+
+            except Exception:
+                logger.exception("Error completing %s", job)
+
+        return
+
+    def _write(self, job):
+        """
+        Write the snapshot of a project (in the worker thread).
+
+        """
+
+        def progress(fraction):
+            self.progress = (job, fraction)
+
+        progress(0.0)
+        job.project._write_save_snapshot(job._snapshot, job.location, progress)
+        progress(1.0)
+
+        return
+
+
+class _ProgressFile(object):
+    """
+    A (binary, seekable) file that reports how much of it has been read.
+
+    """
+
+    def __init__(self, file, progress):
+        """
+        Constructor.
+
+        'progress' is called with the fraction of the file read so far
+        (whenever another BLOCK_SIZE bytes have been read).
+
+        """
+
+        self._file = file
+        self._progress = progress
+        self._size = os.fstat(file.fileno()).st_size
+        self._reported = 0
+
+        progress(0.0)
+
+        return
+
+    def read(self, size=-1):
+        """
+        Read (up to) 'size' bytes.
+
+        """
+
+        data = self._file.read(size)
+        self._report()
+
+        return data
+
+    def readinto(self, buffer):
+        """
+        Read bytes into a buffer.
+
+        """
+
+        count = self._file.readinto(buffer)
+        self._report()
+
+        return count
+
+    def readline(self, size=-1):
+        """
+        Read a line.
+
+        """
+
+        line = self._file.readline(size)
+        self._report()
+
+        return line
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """
+        Change the position in the file.
+
+        """
+
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        """
+        Return the position in the file.
+
+        """
+
+        return self._file.tell()
+
+    def _report(self):
+        """
+        Report the progress (if another block has been read).
+
+        """
+
+        position = self._file.tell()
+        if position - self._reported >= BLOCK_SIZE:
+            self._reported = position
+            self._progress(min(position / self._size, 1.0))
+
+        return
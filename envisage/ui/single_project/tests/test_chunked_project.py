@@ -0,0 +1,246 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for projects saved as content-addressed chunks. """
+
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from traits.api import Any, Dict, HasTraits, Int, List, Str
+
+from envisage.pickle_policy import MAGIC, PicklePolicy
+from envisage.ui.single_project.api import ChunkedProject, Project, ProjectIO
+
+
+class Resource(HasTraits):
+    """ A resource in a project (that refers back to the project). """
+
+    project = Any
+
+    value = Int
+
+
+class Unpicklable(object):
+    """ An object that can't be pickled. """
+
+    def __reduce_ex__(self, protocol):
+        raise RuntimeError("can't pickle this")
+
+
+class MyProject(ChunkedProject):
+    resources = List
+
+    notes = Str
+
+    settings = Dict
+
+    def add_resource(self, value):
+        self.resources.append(Resource(project=self, value=value))
+
+
+class TestChunkedProject(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.location = os.path.join(self.directory, "project")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_project(self):
+        project = MyProject(location=self.location, notes="notes")
+        for value in range(3):
+            project.add_resource(value)
+
+        project.settings = {"a": 1}
+        project.save()
+
+        return project
+
+    def get_chunks(self, location=None):
+        if location is None:
+            location = self.location
+
+        return set(os.listdir(os.path.join(location, "chunks")))
+
+    def test_save_and_load(self):
+        self.create_project()
+
+        project = MyProject.load(self.location, None)
+
+        self.assertEqual(self.location, project.location)
+        self.assertFalse(project.dirty)
+        self.assertEqual("notes", project.notes)
+        self.assertEqual({"a": 1}, project.settings)
+        self.assertEqual([0, 1, 2], [r.value for r in project.resources])
+        for resource in project.resources:
+            self.assertIs(project, resource.project)
+
+    def test_components_are_loaded_when_first_used(self):
+        self.create_project()
+
+        project = MyProject.load(self.location, None)
+        self.assertNotIn("resources", project.__dict__)
+
+        with mock.patch.object(
+            MyProject, "_load_component", autospec=True,
+            side_effect=ChunkedProject._load_component
+        ) as load_component:
+            project.resources
+            project.resources
+
+        load_component.assert_called_once_with(project, "resources")
+        self.assertEqual(3, len(project.resources))
+
+    def test_save_only_writes_changed_components(self):
+        self.create_project()
+        project = MyProject.load(self.location, None)
+        chunks = self.get_chunks()
+
+        project.notes = "changed"
+        with mock.patch.object(
+            MyProject, "_dump_component", autospec=True,
+            side_effect=ChunkedProject._dump_component
+        ) as dump_component:
+            project.save()
+
+        dump_component.assert_called_once_with(project, "changed")
+
+        # Saving doesn't load the components that haven't been used.
+        self.assertNotIn("resources", project.__dict__)
+
+        # The old chunk for the notes has been replaced.
+        self.assertEqual(len(chunks), len(self.get_chunks()))
+        self.assertNotEqual(chunks, self.get_chunks())
+
+        loaded = MyProject.load(self.location, None)
+        self.assertEqual("changed", loaded.notes)
+        self.assertEqual([0, 1, 2], [r.value for r in loaded.resources])
+
+    def test_items_changed(self):
+        project = self.create_project()
+
+        project.add_resource(3)
+        project.settings["b"] = 2
+        project.save()
+
+        loaded = MyProject.load(self.location, None)
+        self.assertEqual([0, 1, 2, 3], [r.value for r in loaded.resources])
+        self.assertEqual({"a": 1, "b": 2}, loaded.settings)
+
+    def test_component_changed(self):
+        project = self.create_project()
+
+        # Changes inside a component must be reported.
+        project.resources[0].value = 10
+        project._component_changed("resources")
+        project.save()
+
+        loaded = MyProject.load(self.location, None)
+        self.assertEqual([10, 1, 2], [r.value for r in loaded.resources])
+
+    def test_save_as(self):
+        self.create_project()
+        project = MyProject.load(self.location, None)
+        other_location = os.path.join(self.directory, "other")
+
+        project.save(other_location)
+        shutil.rmtree(self.location)
+
+        # The chunks of the components that weren't loaded were copied.
+        loaded = MyProject.load(other_location, None)
+        self.assertEqual([0, 1, 2], [r.value for r in loaded.resources])
+        self.assertEqual([0, 1, 2], [r.value for r in project.resources])
+
+    def test_failed_save(self):
+        project = self.create_project()
+        manifest_filename = MyProject.get_manifest_filename(self.location)
+        with open(manifest_filename) as fh:
+            manifest = fh.read()
+
+        project.notes = "changed"
+        project.resources.append(Unpicklable())
+        with self.assertRaises(RuntimeError):
+            project.save()
+
+        # The project at the location is unchanged.
+        with open(manifest_filename) as fh:
+            self.assertEqual(manifest, fh.read())
+
+        self.assertEqual("notes", MyProject.load(self.location, None).notes)
+
+        # The changes will be saved next time.
+        project.resources.pop()
+        project.save()
+        self.assertEqual("changed", MyProject.load(self.location, None).notes)
+
+    def test_load_legacy_project(self):
+        project = MyProject(location=self.location, notes="legacy")
+        project.add_resource(5)
+        os.makedirs(self.location)
+        with open(os.path.join(self.location, "project"), "wb") as fh:
+            Project.get_pickle_package().dump(project, fh, 1)
+
+        project = MyProject.load(self.location, None)
+        self.assertEqual("legacy", project.notes)
+        self.assertEqual([5], [r.value for r in project.resources])
+
+        project.save()
+        self.assertEqual(
+            ["chunks", "manifest.json"], sorted(os.listdir(self.location))
+        )
+        self.assertEqual("legacy", MyProject.load(self.location, None).notes)
+
+    def test_chunks_have_a_header(self):
+        self.create_project()
+
+        for name in self.get_chunks():
+            with open(os.path.join(self.location, "chunks", name), "rb") as fh:
+                self.assertEqual(MAGIC, fh.read(len(MAGIC)))
+
+    def test_load_chunks_saved_with_another_policy(self):
+        policy = PicklePolicy(protocol=1, header=False)
+        with mock.patch.object(MyProject, "PICKLE_POLICY", policy):
+            self.create_project()
+
+        project = MyProject.load(self.location, None)
+        self.assertEqual("notes", project.notes)
+        self.assertEqual([0, 1, 2], [r.value for r in project.resources])
+
+        # Only the components that change are saved with the new policy.
+        project.notes = "changed"
+        project.save()
+        self.assertEqual("changed", MyProject.load(self.location, None).notes)
+
+    def test_missing_chunk(self):
+        self.create_project()
+        for name in self.get_chunks():
+            os.remove(os.path.join(self.location, "chunks", name))
+
+        with self.assertRaises(IOError):
+            MyProject.load(self.location, None)
+
+    def test_save_in_background(self):
+        self.create_project()
+        project = MyProject.load(self.location, None)
+        project.notes = "changed"
+
+        project_io = ProjectIO(dispatch="same")
+        try:
+            job = project_io.save(project)
+            job.wait_completed(5)
+
+        finally:
+            project_io.shutdown()
+
+        self.assertIsNone(job.exception)
+        self.assertNotIn("resources", project.__dict__)
+        self.assertEqual("changed", MyProject.load(self.location, None).notes)
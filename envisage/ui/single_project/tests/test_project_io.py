@@ -0,0 +1,265 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for saving and loading projects in the background. """
+
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from traits.api import Any, HasTraits, Int, List
+
+from envisage.ui.single_project import project_io
+from envisage.ui.single_project.api import Project, ProjectIO
+
+
+class Resource(HasTraits):
+    """ A resource in a project (that refers back to the project). """
+
+    project = Any
+
+    value = Int
+
+
+class Unpicklable(object):
+    """ An object that can't be pickled. """
+
+    def __reduce_ex__(self, protocol):
+        raise RuntimeError("can't pickle this")
+
+
+class MyProject(Project):
+    resources = List
+
+    def add_resource(self, value):
+        self.resources.append(Resource(project=self, value=value))
+        self.dirty = True
+
+
+class SelfSavingProject(Project):
+    saved_to = List
+
+    def _save(self, location):
+        self.saved_to.append(location)
+
+
+class TestProjectIO(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.project_io = ProjectIO(dispatch="same")
+
+    def tearDown(self):
+        self.project_io.shutdown()
+        shutil.rmtree(self.directory)
+
+    def create_project(self, name="project", resources=3):
+        project = MyProject(location=os.path.join(self.directory, name))
+        for value in range(resources):
+            project.add_resource(value)
+
+        return project
+
+    def test_save(self):
+        project = self.create_project()
+        job = self.project_io.save(project)
+
+        self.assertTrue(job.wait_completed(5))
+        self.assertIsNone(job.exception)
+        self.assertFalse(project.dirty)
+
+        loaded = MyProject.load(project.location, None)
+        self.assertEqual([0, 1, 2], [r.value for r in loaded.resources])
+
+        # References back to the project are still references to the same
+        # object.
+        for resource in loaded.resources:
+            self.assertIs(loaded, resource.project)
+
+    def test_save_as(self):
+        project = self.create_project()
+        location = os.path.join(self.directory, "other")
+
+        events = []
+        self.project_io.on_trait_change(
+            lambda job: events.append(job), "completed"
+        )
+        job = self.project_io.save(project, location)
+        job.wait_completed(5)
+
+        self.assertEqual([job], events)
+        self.assertEqual(location, project.location)
+        self.assertFalse(project.dirty)
+        self.assertTrue(os.path.exists(location))
+
+    def test_wait_completed(self):
+        project = self.create_project()
+        location = os.path.join(self.directory, "other")
+
+        # Updating the project happens after the project has been written.
+        complete = self.project_io._complete
+
+        def slow_complete(job):
+            time.sleep(0.05)
+            complete(job)
+
+        with mock.patch.object(self.project_io, "_complete", slow_complete):
+            job = self.project_io.save(project, location)
+            self.assertTrue(job.wait_completed(5))
+
+        self.assertTrue(job.done)
+        self.assertTrue(job.completed)
+        self.assertEqual(location, project.location)
+
+    def test_autosave_leaves_the_project_alone(self):
+        project = self.create_project()
+        original_location = project.location
+        location = original_location + ".autosave"
+
+        job = self.project_io.save(
+            project, location, overwrite=True, autosave=True
+        )
+        job.wait_completed(5)
+
+        self.assertIsNone(job.exception)
+        self.assertTrue(os.path.exists(location))
+        self.assertEqual(original_location, project.location)
+        self.assertTrue(project.dirty)
+
+    def test_project_changed_while_saving(self):
+        project = self.create_project()
+
+        # Hold the worker thread until the project has been changed.
+        started = threading.Event()
+        changed = threading.Event()
+
+        def on_progress(progress):
+            started.set()
+            changed.wait(5)
+
+        self.project_io.on_trait_change(on_progress, "progress")
+        job = self.project_io.save(project)
+
+        started.wait(5)
+        project.add_resource(3)
+        project.resources[0].value = 10
+        changed.set()
+        job.wait_completed(5)
+
+        # The project was changed after it was saved.
+        self.assertTrue(project.dirty)
+
+        # Nothing changed while saving is saved (including changes to the
+        # resources themselves).
+        loaded = MyProject.load(project.location, None)
+        self.assertEqual([0, 1, 2], [r.value for r in loaded.resources])
+
+    def test_failed_save_leaves_file_intact(self):
+        project = self.create_project()
+        project.save()
+        with open(project.location, "rb") as f:
+            data = f.read()
+
+        project.resources.append(Unpicklable())
+        job = self.project_io.save(project)
+        job.wait_completed(5)
+
+        self.assertIsInstance(job.exception, RuntimeError)
+        self.assertTrue(project.dirty)
+        with open(project.location, "rb") as f:
+            self.assertEqual(data, f.read())
+
+        # No temporary files are left behind.
+        self.assertEqual(["project"], os.listdir(self.directory))
+
+    def test_failed_synchronous_save_leaves_file_intact(self):
+        project = self.create_project()
+        project.save()
+        with open(project.location, "rb") as f:
+            data = f.read()
+
+        project.resources.append(Unpicklable())
+        with self.assertRaises(RuntimeError):
+            project.save()
+
+        with open(project.location, "rb") as f:
+            self.assertEqual(data, f.read())
+
+        self.assertEqual(["project"], os.listdir(self.directory))
+
+    def test_progress(self):
+        project = self.create_project()
+
+        fractions = []
+        self.project_io.on_trait_change(
+            lambda progress: fractions.append(progress[1]), "progress"
+        )
+        self.project_io.save(project).wait(5)
+
+        self.assertEqual(0.0, fractions[0])
+        self.assertEqual(1.0, fractions[-1])
+        self.assertEqual(sorted(fractions), fractions)
+
+    def test_overridden_save(self):
+        project = SelfSavingProject(
+            location=os.path.join(self.directory, "project")
+        )
+        project.dirty = True
+
+        job = self.project_io.save(project)
+
+        # Projects that save themselves are saved immediately.
+        self.assertTrue(job.done)
+        self.assertEqual([project.location], project.saved_to)
+        self.assertFalse(project.dirty)
+
+    def test_load(self):
+        project = self.create_project()
+        project.save()
+
+        job = self.project_io.load(MyProject, project.location)
+        job.wait_completed(5)
+
+        self.assertIsNone(job.exception)
+        loaded = job.project
+        self.assertEqual(project.location, loaded.location)
+        self.assertFalse(loaded.dirty)
+        self.assertEqual([0, 1, 2], [r.value for r in loaded.resources])
+
+    def test_load_progress(self):
+        project = self.create_project()
+        project.resources.extend([Resource(value=i) for i in range(1000)])
+        project.save()
+
+        fractions = []
+        self.project_io.on_trait_change(
+            lambda progress: fractions.append(progress[1]), "progress"
+        )
+        with mock.patch.object(project_io, "BLOCK_SIZE", 1000):
+            job = self.project_io.load(MyProject, project.location)
+            job.wait_completed(5)
+
+        # The project is read in blocks (straight from the file).
+        self.assertIsNone(job.exception)
+        self.assertEqual(1003, len(job.project.resources))
+        self.assertGreater(len(fractions), 3)
+        self.assertEqual(0.0, fractions[0])
+        self.assertEqual(1.0, fractions[-1])
+        self.assertEqual(sorted(fractions), fractions)
+
+    def test_load_missing_project(self):
+        location = os.path.join(self.directory, "missing")
+        job = self.project_io.load(MyProject, location)
+        job.wait_completed(5)
+
+        self.assertIsInstance(job.exception, IOError)
+        self.assertIsNone(job.project)
@@ -34,10 +34,11 @@ from pyface.api import (
 )
 from pyface.action.api import MenuManager
 from pyface.timer.api import do_later, Timer
-from traits.api import Any, Event, HasTraits, Instance, Int
+from traits.api import Any, Event, HasTraits, Instance, Int, on_trait_change
 
 # Local imports.
 from .model_service import ModelService
+from .project_io import ProjectIO
 
 
 # Setup a logger for this module.
@@ -76,6 +77,15 @@ class UiService(HasTraits):
     # The interval (minutes)at which automatic saving should occur.
     autosave_interval = Int(5)
 
+    # Saves projects in the background (so that automatic saving doesn't
+    # block the UI).
+    project_io = Instance(ProjectIO, ())
+
+    #### protected 'UiService' interface #####################################
+
+    # The automatic save that is currently in progress (if any).
+    _autosave_job = Any
+
     ##########################################################################
     # 'object' interface.
     ##########################################################################
@@ -365,6 +375,10 @@ class UiService(HasTraits):
         The auto-saved project has the extension '.autosave'.
 
         """
+        # Don't start another automatic save while one is still in progress.
+        if self._autosave_job is not None and not self._autosave_job.done:
+            return
+
         # Save the project only if it has been modified.
         if project.dirty and project.is_save_as_allowed:
             location = project.location.strip()
@@ -373,9 +387,9 @@ class UiService(HasTraits):
                 try:
                     # We do not want the project's location and name to be
                     # updated.
-                    project.save(autosave_loc, overwrite=True, autosave=True)
-                    msg = "[%s] auto-saved to [%s]" % (project, autosave_loc)
-                    logger.debug(msg)
+                    self._autosave_job = self.project_io.save(
+                        project, autosave_loc, overwrite=True, autosave=True
+                    )
                 except:
                     logger.exception(
                         "Error auto-saving project [%s]" % project
@@ -393,6 +407,11 @@ class UiService(HasTraits):
         at the specified location.
 
         """
+        # Let any automatic save finish writing first, so that it can't
+        # recreate the autosaved version after we've removed it.
+        if self._autosave_job is not None:
+            self._autosave_job.wait()
+
         autosave_loc = self._get_autosave_location(location)
         if os.path.exists(autosave_loc):
             self.model_service.clean_location(autosave_loc)
@@ -579,6 +598,11 @@ class UiService(HasTraits):
 
         location = project.location.strip()
 
+        # Let any automatic save finish writing first (so that it is moved
+        # along with the project if the location changes).
+        if self._autosave_job is not None:
+            self._autosave_job.wait()
+
         # If the project's existing location is valid, check if there are any
         # autosaved versions.
         autosave_loc = ""
@@ -778,6 +802,21 @@ class UiService(HasTraits):
 
     #### Trait change handlers ###############################################
 
+    @on_trait_change("project_io:completed")
+    def _on_project_saved(self, job):
+        """
+        Called when a project has been saved in the background.
+
+        """
+
+        # Errors have already been logged by the project IO service.
+        if job.autosave and job.exception is None:
+            logger.debug(
+                "[%s] auto-saved to [%s]", job.project, job.location
+            )
+
+        return
+
     def _autosave_interval_changed(self, old, new):
         """
         Restarts the timer when the autosave interval changes.
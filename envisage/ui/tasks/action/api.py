@@ -6,6 +6,7 @@
 # under the conditions described in the aforementioned license.  The license
 # is also available online at http://www.enthought.com/licenses/BSD.txt
 # Thanks for using Enthought open source!
+from .task_toggle_group import DeferredTaskToggleAction, TaskToggleGroup
 from .task_window_launch_group import (
     TaskWindowLaunchAction,
     TaskWindowLaunchGroup,
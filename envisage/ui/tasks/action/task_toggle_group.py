@@ -0,0 +1,103 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+# Enthought library imports.
+from pyface.action.api import Action, ActionItem
+from pyface.tasks.action.api import TaskToggleGroup as PyfaceTaskToggleGroup
+from pyface.tasks.action.task_toggle_group import TaskToggleAction
+from traits.api import Instance, Property, Str
+
+
+class DeferredTaskToggleAction(Action):
+    """ An action for activating a task that hasn't been created yet.
+    """
+
+    #### 'Action' interface ###################################################
+
+    style = "toggle"
+    tooltip = Property(Str, depends_on="name")
+
+    #### 'DeferredTaskToggleAction' interface #################################
+
+    # The ID of the deferred task.
+    task_id = Str
+
+    # The window that the task has been added to.
+    window = Instance("envisage.ui.tasks.task_window.TaskWindow")
+
+    ###########################################################################
+    # 'Action' interface.
+    ###########################################################################
+
+    def perform(self, event=None):
+        # Activating the task by ID creates it.
+        self.window.activate_task(self.task_id)
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_tooltip(self):
+        return "Switch to the %s task." % self.name
+
+
+class TaskToggleGroup(PyfaceTaskToggleGroup):
+    """ A menu for changing the active task in a task window.
+
+    Unlike the Pyface group, which only lists the tasks that have been
+    created, this also lists the deferred tasks of an Envisage task window
+    (see 'TaskWindow.add_deferred_task'), in the order that they were added.
+    """
+
+    #### 'TaskToggleGroup' interface ##########################################
+
+    # The window that contains the group.
+    window = Instance("envisage.ui.tasks.task_window.TaskWindow")
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_items(self):
+        tasks = {task.id: task for task in self.window.tasks}
+        task_ids = [
+            task_id
+            for task_id in self.window._task_order
+            if task_id in tasks or task_id in self.window.deferred_task_ids
+        ]
+
+        items = []
+        if len(task_ids) > 1:
+            # at least two tasks, so something to toggle
+            for task_id in task_ids:
+                if task_id in tasks:
+                    action = TaskToggleAction(task=tasks[task_id])
+
+                else:
+                    action = DeferredTaskToggleAction(
+                        name=self._get_task_name(task_id),
+                        task_id=task_id,
+                        window=self.window,
+                    )
+                items.append(ActionItem(action=action))
+
+        return items
+
+    def _get_task_name(self, task_id):
+        """ Returns the name of a deferred task (from its factory).
+        """
+        factory = self.window.application._get_task_factory(task_id)
+        return task_id if factory is None else factory.name
+
+    #### Trait initializers ###################################################
+
+    def _items_default(self):
+        self.window.on_trait_change(
+            self._rebuild, "tasks[], deferred_task_ids[]"
+        )
+        return self._get_items()
@@ -7,13 +7,203 @@
 # is also available online at http://www.enthought.com/licenses/BSD.txt
 # Thanks for using Enthought open source!
 
+# Standard library imports.
+import logging
+
 # Enthought library imports.
 from pyface.image_resource import ImageResource
 from pyface.tasks.api import TaskWindow as PyfaceTaskWindow
-from traits.api import Instance, Property
+from traits.api import Dict, HasTraits, Instance, List, Property, Str
+
+
+# Logging.
+logger = logging.getLogger(__name__)
+
+
+class DeferredTasksMixin(HasTraits):
+    """ Adds deferred tasks to a Pyface TaskWindow.
+
+    A deferred task is only created (by the window's application) when it is
+    first needed. This doesn't depend on the GUI toolkit, only on the task
+    bookkeeping of the Pyface TaskWindow that it is mixed into (and on the
+    window having an 'application' that can create the tasks).
+    """
+
+    # The IDs of the tasks that have been added with 'add_deferred_task' but
+    # not created yet.
+    deferred_task_ids = List(Str)
+
+    #### Protected interface ##################################################
+
+    # The layouts to apply to deferred tasks when they are created.
+    _deferred_layouts = Dict(Str, Instance("pyface.tasks.api.TaskLayout"))
+
+    # The IDs of all tasks (created or deferred) in the order that they were
+    # added.
+    _task_order = List(Str)
+
+    ###########################################################################
+    # 'TaskWindow' interface.
+    ###########################################################################
+
+    def activate_task(self, task):
+        """ Activates a task that has already been added to the window.
+
+        Deferred tasks can also be activated by ID (which creates them).
+        """
+        if isinstance(task, str):
+            task_id = task
+            task = self.get_task(task_id)
+            if task is None:
+                logger.warning(
+                    "Cannot activate task %r: task does not belong to the "
+                    "window." % task_id
+                )
+                return
+
+        super(DeferredTasksMixin, self).activate_task(task)
+
+    def add_deferred_task(self, task_id):
+        """ Adds a task to the window without creating it.
+
+        The task (and its panes, menus and tool bars) is only created, by the
+        application, when it is first needed, e.g. when it is activated (by
+        ID, such as from the Envisage 'TaskToggleGroup') or retrieved with
+        'get_task'.
+        """
+        if task_id in self.deferred_task_ids or self._has_state(task_id):
+            logger.error(
+                "Cannot add deferred task %r: task has already been added "
+                "to the window!" % task_id
+            )
+            return
+
+        self.deferred_task_ids.append(task_id)
+        self._task_order.append(task_id)
+
+    def add_task(self, task):
+        """ Adds a task to the window. The task is not activated.
+        """
+        super(DeferredTasksMixin, self).add_task(task)
+        if task.id not in self._task_order:
+            self._task_order.append(task.id)
+
+    def create_deferred_task(self, task_id):
+        """ Creates a deferred task and adds it to the window.
+
+        Returns the task, or None if it could not be created.
+        """
+        self.deferred_task_ids.remove(task_id)
+        task = self.application.create_task(task_id)
+        if task is None:
+            logger.error("Missing factory for task with ID %r", task_id)
+            self._task_order.remove(task_id)
+            return None
+
+        super(DeferredTasksMixin, self).add_task(task)
+
+        state = self._states[-1]
+        layout = self._deferred_layouts.pop(task_id, None)
+        if layout is not None:
+            state.layout = layout
+
+        # Keep the tasks in the order that they were added.
+        index = len(
+            [
+                id
+                for id in self._task_order[: self._task_order.index(task_id)]
+                if id not in self.deferred_task_ids
+            ]
+        )
+        if index != len(self._states) - 1:
+            self._states.remove(state)
+            self._states.insert(index, state)
+
+        return task
+
+    def get_window_layout(self):
+        """ Returns a TaskWindowLayout for the current state of the window.
+
+        Overridden to include the layouts of the deferred tasks.
+        """
+        result = super(DeferredTasksMixin, self).get_window_layout()
+        if self.deferred_task_ids:
+            items = {item.id: item for item in result.items}
+            for task_id in self.deferred_task_ids:
+                layout = self._deferred_layouts.get(task_id)
+                items[task_id] = (
+                    task_id if layout is None else layout.clone_traits()
+                )
+
+            result.items = [
+                items[task_id]
+                for task_id in self._task_order
+                if task_id in items
+            ]
+        return result
+
+    def remove_task(self, task):
+        """ Removes a task that has already been added to the window.
+
+        Deferred tasks can also be removed by ID (without being created).
+        """
+        task_id = task if isinstance(task, str) else task.id
+        if task_id in self.deferred_task_ids:
+            self.deferred_task_ids.remove(task_id)
+            self._deferred_layouts.pop(task_id, None)
+        else:
+            super(DeferredTasksMixin, self).remove_task(task)
+
+        if task_id in self._task_order and not self._has_state(task_id):
+            self._task_order.remove(task_id)
+
+    def set_window_layout(self, window_layout):
+        """ Applies a TaskWindowLayout to the window.
+
+        Overridden so that the layouts of deferred tasks are stored until the
+        tasks are created (and so that only the active task is created).
+        """
+        if self.deferred_task_ids:
+            active_task = window_layout.get_active_task()
+            window_layout = window_layout.clone_traits()
+            window_layout.active_task = active_task or ""
+            items = []
+            for item in window_layout.items:
+                task_id = item if isinstance(item, str) else item.id
+                if task_id in self.deferred_task_ids:
+                    if not isinstance(item, str):
+                        self._deferred_layouts[task_id] = item
+                else:
+                    items.append(item)
+            window_layout.items = items
+
+        super(DeferredTasksMixin, self).set_window_layout(window_layout)
+
+    ###########################################################################
+    # Protected 'TaskWindow' interface.
+    ###########################################################################
+
+    def _get_state(self, id_or_task):
+        """ Returns the TaskState that contains the specified Task, or None if
+            no such state exists.
+
+        Overridden to create a deferred task when it is asked for by ID.
+        """
+        if (
+            isinstance(id_or_task, str)
+            and id_or_task in self.deferred_task_ids
+        ):
+            self.create_deferred_task(id_or_task)
+
+        return super(DeferredTasksMixin, self)._get_state(id_or_task)
+
+    def _has_state(self, task_id):
+        """ Returns whether a task with the specified ID has been created.
+        """
+        return any(state.task.id == task_id for state in self._states)
 
 
-class TaskWindow(PyfaceTaskWindow):
+class TaskWindow(DeferredTasksMixin, PyfaceTaskWindow):
     """ A TaskWindow for use with the Envisage Tasks plugin.
     """
 
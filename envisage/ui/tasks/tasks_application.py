@@ -8,12 +8,12 @@
 # Thanks for using Enthought open source!
 # Standard library imports.
 import logging
-import pickle
 import os.path
 
 # Enthought library imports.
 from envisage.api import Application, ExtensionPoint
 from traits.api import (
+    Any,
     Bool,
     Callable,
     Directory,
@@ -22,6 +22,7 @@ from traits.api import (
     Instance,
     Int,
     List,
+    on_trait_change,
     Str,
     Vetoable,
 )
@@ -53,6 +54,16 @@ class TasksApplication(Application):
     # Python >= 3.4.
     layout_save_protocol = Int(2)
 
+    # Pickle policy to use for persisting layout information. If this is None
+    # then the layout information is pickled with 'layout_save_protocol' and
+    # no header. Use a policy with a header (e.g. 'PicklePolicy()' for the
+    # highest protocol) to record the protocol in the file, so that a newer
+    # one is rejected cleanly by older versions of Python. Layout information
+    # saved with any policy can be restored.
+    layout_pickle_policy = Instance(
+        "envisage.pickle_policy.PicklePolicy", allow_none=True
+    )
+
     #### 'TasksApplication' interface #########################################
 
     # The active task window (the last one to get focus).
@@ -80,6 +91,11 @@ class TasksApplication(Application):
     # information.
     state_filename = Str(DEFAULT_STATE_FILENAME)
 
+    # The maximum number of window layouts that are remembered across
+    # sessions. The least recently used layouts are discarded first. If this
+    # is zero then there is no limit.
+    max_window_layouts = Int(20)
+
     # Contributed task factories. This attribute is primarily for run-time
     # inspection; to instantiate a task, use the 'create_task' method.
     task_factories = ExtensionPoint(id=TASK_FACTORIES)
@@ -93,6 +109,13 @@ class TasksApplication(Application):
     # The factory for creating task windows.
     window_factory = Callable
 
+    # Whether windows are created with deferred tasks. If this is True then
+    # only the active task in a window layout is created with the window, and
+    # every other task is only created (with its panes, menus and tool bars)
+    # when it is first activated. The windows created by 'window_factory'
+    # must support 'add_deferred_task' (as the default TaskWindow does).
+    lazy_tasks = Bool(False)
+
     #### Application layout ###################################################
 
     # The default layout for the application. If not specified, a single window
@@ -152,6 +175,25 @@ class TasksApplication(Application):
         "envisage.ui.tasks.tasks_application.TasksApplicationState"
     )
 
+    # The task factories keyed by task ID (None until it is first needed, and
+    # whenever the 'task_factories' extension point changes).
+    _task_factories_by_id = Any
+
+    # The task extensions for each task ID that has been created (reset
+    # whenever the 'task_extensions' extension point changes).
+    _task_extensions_by_id = Any
+
+    # Are we listening to the extension registry for changes to the task
+    # factories and extensions?
+    _listening_to_tasks = Bool(False)
+
+    # The store that is loading the application state in the background (if
+    # any).
+    _state_store = Instance(
+        "envisage.ui.tasks.tasks_application_state_store."
+        "TasksApplicationStateStore"
+    )
+
     ###########################################################################
     # 'IApplication' interface.
     ###########################################################################
@@ -169,6 +211,10 @@ class TasksApplication(Application):
         # screen is shown).
         gui = self.gui
 
+        # Load the saved application state while the plugins are started.
+        self._state_store = self._create_state_store()
+        self._state_store.load_in_background()
+
         started = self.start()
         if started:
             # Create windows from the default or saved application layout.
@@ -198,11 +244,7 @@ class TasksApplication(Application):
             return None
 
         # Create the task using suitable task extensions.
-        extensions = [
-            ext
-            for ext in self.task_extensions
-            if ext.task_id == id or not ext.task_id
-        ]
+        extensions = self._get_task_extensions(id)
         task = factory.create_with_extensions(extensions)
         task.id = factory.id
         return task
@@ -215,8 +257,9 @@ class TasksApplication(Application):
         layout : TaskWindowLayout, optional
              The layout to use for the window. The tasks described in
              the layout will be created and added to the window
-             automatically. If not specified, the window will contain
-             no tasks.
+             automatically (if 'lazy_tasks' is True then only the active
+             task is created, and the others are added as deferred tasks).
+             If not specified, the window will contain no tasks.
 
         restore : bool, optional (default True)
              If set, the application will restore old size and
@@ -250,14 +293,7 @@ class TasksApplication(Application):
 
         if layout:
             # Create and add tasks.
-            for task_id in layout.get_tasks():
-                task = self.create_task(task_id)
-                if task:
-                    window.add_task(task)
-                else:
-                    logger.error(
-                        "Missing factory for task with ID %r", task_id
-                    )
+            self._add_tasks(window, layout)
 
             # Apply a suitable layout.
             if restore:
@@ -353,13 +389,88 @@ class TasksApplication(Application):
                 window = self.create_window(window_layout, restore=True)
             window.open()
 
+    def _add_tasks(self, window, layout):
+        """ Adds the tasks in a TaskWindowLayout to a window.
+
+        If 'lazy_tasks' is True then only the active task is created, and the
+        others are added as deferred tasks.
+        """
+        active_task_id = layout.get_active_task()
+        for task_id in layout.get_tasks():
+            if self.lazy_tasks and task_id != active_task_id:
+                if self._get_task_factory(task_id) is not None:
+                    window.add_deferred_task(task_id)
+                    continue
+                task = None
+            else:
+                task = self.create_task(task_id)
+            if task:
+                window.add_task(task)
+            else:
+                logger.error("Missing factory for task with ID %r", task_id)
+
+    def _create_state_store(self):
+        """ Creates a store for the application state.
+        """
+        from .tasks_application_state_store import TasksApplicationStateStore
+
+        state_store = TasksApplicationStateStore(
+            filename=os.path.join(self.state_location, self.state_filename),
+            max_window_layouts=self.max_window_layouts,
+            protocol=self.layout_save_protocol,
+        )
+        if self.layout_pickle_policy is not None:
+            state_store.policy = self.layout_pickle_policy
+        return state_store
+
     def _get_task_factory(self, id):
         """ Returns the TaskFactory with the specified ID, or None.
         """
-        for factory in self.task_factories:
-            if factory.id == id:
-                return factory
-        return None
+        if self._task_factories_by_id is None:
+            self._listen_to_tasks()
+
+            # The first factory with an ID wins (as it would in a linear scan).
+            factories_by_id = {}
+            for factory in self.task_factories:
+                factories_by_id.setdefault(factory.id, factory)
+            self._task_factories_by_id = factories_by_id
+
+        return self._task_factories_by_id.get(id)
+
+    def _get_task_extensions(self, id):
+        """ Returns the TaskExtensions for the task with the specified ID.
+
+        These are the extensions for that task and the extensions for all
+        tasks (i.e. those with no task ID), in the order that they were
+        contributed.
+        """
+        if self._task_extensions_by_id is None:
+            self._listen_to_tasks()
+            self._task_extensions_by_id = {}
+
+        extensions = self._task_extensions_by_id.get(id)
+        if extensions is None:
+            extensions = [
+                ext
+                for ext in self.task_extensions
+                if ext.task_id == id or not ext.task_id
+            ]
+            self._task_extensions_by_id[id] = extensions
+
+        return extensions
+
+    def _listen_to_tasks(self):
+        """ Listen for changes to the task factories and extensions, so that
+            the indexes of them can be reset.
+        """
+        if not self._listening_to_tasks:
+            self.add_extension_point_listener(
+                self._on_task_factories_changed, self.TASK_FACTORIES
+            )
+            self.add_extension_point_listener(
+                self._on_task_extensions_changed, self.TASK_EXTENSIONS
+            )
+            self._listening_to_tasks = True
 
     def _prepare_exit(self):
         """ Called immediately before the extant windows are destroyed and the
@@ -371,32 +482,13 @@ class TasksApplication(Application):
     def _load_state(self):
         """ Loads saved application state, if possible.
         """
-        state = TasksApplicationState()
-        filename = os.path.join(self.state_location, self.state_filename)
-        if os.path.exists(filename):
-            # Attempt to unpickle the saved application state.
-            logger.debug("Loading application state from %s", filename)
-            try:
-                with open(filename, "rb") as f:
-                    restored_state = pickle.load(f)
-            except Exception:
-                # If anything goes wrong, log the error and continue.
-                logger.exception("Error while restoring application state")
-            else:
-                if state.version == restored_state.version:
-                    state = restored_state
-                    logger.debug("Application state successfully restored")
-                else:
-                    logger.warning(
-                        "Discarding outdated application state: "
-                        "expected version %s, got version %s",
-                        state.version,
-                        restored_state.version,
-                    )
-        else:
-            logger.debug("No saved application state found at %s", filename)
+        # Use the state that has been loading in the background (if any).
+        state_store = self._state_store
+        if state_store is None:
+            state_store = self._create_state_store()
+        self._state_store = None
 
-        self._state = state
+        self._state = state_store.get_state()
 
     def _restore_layout_from_state(self, layout):
         """ Restores an equivalent layout from saved application state.
@@ -429,16 +521,7 @@ class TasksApplication(Application):
         self._state.previous_window_layouts = window_layouts
 
         # Attempt to pickle the application state.
-        filename = os.path.join(self.state_location, self.state_filename)
-        logger.debug("Saving application state to %s", filename)
-        try:
-            with open(filename, "wb") as f:
-                pickle.dump(self._state, f, protocol=self.layout_save_protocol)
-        except Exception:
-            # If anything goes wrong, log the error and continue.
-            logger.exception("Error while saving application state")
-        else:
-            logger.debug("Application state successfully saved")
+        self._create_state_store().save(self._state)
 
     #### Trait initializers ###################################################
 
@@ -473,6 +556,18 @@ class TasksApplication(Application):
 
     #### Trait change handlers ################################################
 
+    @on_trait_change("extension_registry")
+    def _reset_task_indexes(self):
+        self._task_factories_by_id = None
+        self._task_extensions_by_id = None
+        self._listening_to_tasks = False
+
+    def _on_task_factories_changed(self, extension_registry, event):
+        self._task_factories_by_id = None
+
+    def _on_task_extensions_changed(self, extension_registry, event):
+        self._task_extensions_by_id = None
+
     def _on_window_activated(self, window, trait_name, event):
         self.active_window = window
 
@@ -550,22 +645,30 @@ class TasksApplicationState(HasStrictTraits):
     # classes. This ensures that loading application state is always safe.
     version = Int(1)
 
+    # The window layouts keyed by the set of their task IDs (None until it is
+    # first needed, and whenever 'window_layouts' changes).
+    _window_layouts_by_tasks = Any(transient=True)
+
+    # The task layouts keyed by task ID (as for '_window_layouts_by_tasks').
+    _task_layouts_by_id = Any(transient=True)
+
     def get_equivalent_window_layout(self, window_layout):
         """ Gets an equivalent TaskWindowLayout, if there is one.
         """
-        for layout in self.window_layouts:
-            if layout.is_equivalent_to(window_layout):
-                return layout
-        return None
+        if self._window_layouts_by_tasks is None:
+            self._build_indexes()
+
+        return self._window_layouts_by_tasks.get(
+            frozenset(window_layout.get_tasks())
+        )
 
     def get_task_layout(self, task_id):
         """ Gets a TaskLayout with the specified ID, there is one.
         """
-        for window_layout in self.window_layouts:
-            for layout in window_layout.items:
-                if layout.id == task_id:
-                    return layout
-        return None
+        if self._task_layouts_by_id is None:
+            self._build_indexes()
+
+        return self._task_layouts_by_id.get(task_id)
 
     def push_window_layout(self, window_layout):
         """ Merge a TaskWindowLayout into the accumulated list.
@@ -576,3 +679,28 @@ class TasksApplicationState(HasStrictTraits):
             if not layout.is_equivalent_to(window_layout)
         ]
         self.window_layouts.insert(0, window_layout)
+
+    def _build_indexes(self):
+        """ Builds the indexes used by the 'get_*' methods.
+
+        The first match wins in each index, just as it would when searching
+        the layouts in order.
+        """
+        window_layouts_by_tasks = {}
+        task_layouts_by_id = {}
+        for window_layout in self.window_layouts:
+            window_layouts_by_tasks.setdefault(
+                frozenset(window_layout.get_tasks()), window_layout
+            )
+            for layout in window_layout.items:
+                # Items that are just task IDs have no layout to restore.
+                if not isinstance(layout, str):
+                    task_layouts_by_id.setdefault(layout.id, layout)
+
+        self._window_layouts_by_tasks = window_layouts_by_tasks
+        self._task_layouts_by_id = task_layouts_by_id
+
+    @on_trait_change("window_layouts, window_layouts_items")
+    def _reset_indexes(self):
+        self._window_layouts_by_tasks = None
+        self._task_layouts_by_id = None
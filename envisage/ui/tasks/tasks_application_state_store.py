@@ -0,0 +1,190 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+# Standard library imports.
+import logging
+import os
+import threading
+
+# Enthought library imports.
+from envisage._atomic_file import atomic_open
+from envisage.pickle_policy import PicklePolicy
+from traits.api import Any, HasStrictTraits, Instance, Int, Str
+
+# Local imports.
+from .tasks_application import TasksApplicationState
+
+
+# Logging.
+logger = logging.getLogger(__name__)
+
+#: Default maximum number of window layouts that are remembered.
+DEFAULT_MAX_WINDOW_LAYOUTS = 20
+
+
+class TasksApplicationStateStore(HasStrictTraits):
+    """ Loads and saves the state of a TasksApplication.
+
+    The state is saved atomically (it is written to a temporary file which
+    then replaces the previous one), so a crash while saving never leaves
+    behind a truncated state file.
+
+    The state can also be loaded in the background (e.g. while the splash
+    screen is shown and the plugins are started), so that unpickling it does
+    not delay the first window.
+
+    """
+
+    # The file that the state is saved in.
+    filename = Str
+
+    # The maximum number of window layouts that are remembered. The layouts
+    # are kept in most recently used order, so the least recently used ones
+    # are discarded first. If this is zero then there is no limit.
+    max_window_layouts = Int(DEFAULT_MAX_WINDOW_LAYOUTS)
+
+    # The pickle protocol used to save the state (if 'policy' is None).
+    protocol = Int(2)
+
+    # The pickle policy used to save the state. If this is None then the state
+    # is pickled with 'protocol' and no header. The state can be loaded
+    # whatever the policy it was saved with.
+    policy = Instance(PicklePolicy)
+
+    #### Private interface ####################################################
+
+    # The state loaded in the background (if it has been loaded).
+    _state = Any
+
+    # The thread that is loading the state in the background (if any).
+    _thread = Any
+
+    ###########################################################################
+    # 'TasksApplicationStateStore' interface.
+    ###########################################################################
+
+    def get_state(self):
+        """ Returns the saved state.
+
+        If the state is being loaded in the background then this waits for it
+        to finish, otherwise the state is loaded now.
+
+        Returns
+        -------
+        TasksApplicationState
+            The saved state, or a new state if there isn't one (or it cannot
+            be loaded).
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._state is None:
+            self._state = self.load()
+
+        state, self._state = self._state, None
+        return state
+
+    def load(self):
+        """ Loads the saved state.
+
+        Returns
+        -------
+        TasksApplicationState
+            The saved state, or a new state if there isn't one (or it cannot
+            be loaded).
+        """
+        state = TasksApplicationState()
+        if os.path.exists(self.filename):
+            # Attempt to unpickle the saved application state.
+            logger.debug("Loading application state from %s", self.filename)
+            try:
+                with open(self.filename, "rb") as f:
+                    restored_state = self._get_policy().load(f)
+            except Exception:
+                # If anything goes wrong, log the error and continue.
+                logger.exception("Error while restoring application state")
+            else:
+                if state.version == restored_state.version:
+                    state = restored_state
+                    self._trim(state)
+                    logger.debug("Application state successfully restored")
+                else:
+                    logger.warning(
+                        "Discarding outdated application state: "
+                        "expected version %s, got version %s",
+                        state.version,
+                        restored_state.version,
+                    )
+        else:
+            logger.debug(
+                "No saved application state found at %s", self.filename
+            )
+
+        return state
+
+    def load_in_background(self):
+        """ Starts loading the saved state in a background thread.
+
+        Use 'get_state' to get the state once it has been loaded.
+        """
+        if self._thread is not None:
+            return
+
+        self._state = None
+        self._thread = threading.Thread(
+            target=self._load_in_background, name="TasksApplicationState"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def save(self, state):
+        """ Saves the state atomically.
+
+        Returns
+        -------
+        bool
+            Whether the state was saved.
+        """
+        self._trim(state)
+
+        logger.debug("Saving application state to %s", self.filename)
+        try:
+            with atomic_open(self.filename) as f:
+                self._get_policy().dump(state, f)
+        except Exception:
+            # If anything goes wrong, log the error and continue.
+            logger.exception("Error while saving application state")
+            return False
+        else:
+            logger.debug("Application state successfully saved")
+            return True
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_policy(self):
+        """ Returns the pickle policy used to save the state.
+        """
+        if self.policy is not None:
+            return self.policy
+
+        # Pickle with 'protocol' and no header (for compatibility).
+        return PicklePolicy(protocol=self.protocol, header=False)
+
+    def _load_in_background(self):
+        """ Loads the state (called in the background thread).
+        """
+        self._state = self.load()
+
+    def _trim(self, state):
+        """ Discards the least recently used window layouts from a state.
+        """
+        if 0 < self.max_window_layouts < len(state.window_layouts):
+            del state.window_layouts[self.max_window_layouts:]
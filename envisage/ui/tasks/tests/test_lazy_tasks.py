@@ -0,0 +1,386 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import functools
+import os
+import unittest
+from unittest import mock
+
+from pyface.tasks.api import Task
+from pyface.tasks.task_layout import TaskLayout
+from pyface.tasks.task_window import TaskState
+from pyface.tasks.task_window_layout import TaskWindowLayout
+from traits.api import HasTraits, Instance, List, on_trait_change, Str
+
+from envisage.api import ExtensionPoint, Plugin
+from envisage.ui.tasks.action.api import (
+    DeferredTaskToggleAction,
+    TaskToggleGroup,
+)
+from envisage.ui.tasks.api import TaskFactory, TasksApplication
+from envisage.ui.tasks.task_window import DeferredTasksMixin
+
+requires_gui = unittest.skipIf(
+    os.environ.get("ETS_TOOLKIT", "none") in {"null", "none"},
+    "Test requires a non-null GUI backend",
+)
+
+#: The number of tasks in the window layouts used by the tests.
+NUM_TASKS = 20
+
+
+class TasksExtensionPointsPlugin(Plugin):
+    """ Offers the task extension points (without any of the GUI). """
+
+    id = "test.tasks"
+
+    task_factories = ExtensionPoint(id=TasksApplication.TASK_FACTORIES)
+
+    task_extensions = ExtensionPoint(id=TasksApplication.TASK_EXTENSIONS)
+
+
+class CountingTasksPlugin(Plugin):
+    """ Contributes task factories that record the tasks that they create. """
+
+    id = "test.counting_tasks"
+
+    task_factories = List(contributes_to=TasksApplication.TASK_FACTORIES)
+
+    # The IDs of the tasks that have been created, in order.
+    created_task_ids = List(Str)
+
+    def _task_factories_default(self):
+        return [
+            TaskFactory(
+                id="task_%d" % i,
+                name="Task %d" % i,
+                factory=functools.partial(self._create_task, "task_%d" % i),
+            )
+            for i in range(NUM_TASKS)
+        ]
+
+    def _create_task(self, task_id, **traits):
+        self.created_task_ids.append(task_id)
+        return Task(**traits)
+
+
+class HeadlessPyfaceTaskWindow(HasTraits):
+    """ The task bookkeeping of a Pyface TaskWindow (without any GUI). """
+
+    active_task = Instance(Task)
+
+    tasks = List(Task)
+
+    _active_state = Instance(TaskState)
+
+    _states = List(Instance(TaskState))
+
+    def activate_task(self, task):
+        state = self._get_state(task)
+        if state:
+            self._active_state = state
+
+    def add_task(self, task):
+        self._states.append(TaskState(task=task, layout=task.default_layout))
+
+    def get_task(self, id):
+        state = self._get_state(id)
+        return state.task if state else None
+
+    def get_window_layout(self):
+        result = TaskWindowLayout()
+        for state in self._states:
+            if state == self._active_state:
+                result.active_task = state.task.id
+            layout = state.layout.clone_traits()
+            layout.id = state.task.id
+            result.items.append(layout)
+        return result
+
+    def remove_task(self, task):
+        state = self._get_state(task)
+        if state == self._active_state:
+            self._active_state = None
+        self._states.remove(state)
+
+    def set_window_layout(self, window_layout):
+        for layout in window_layout.items:
+            if not isinstance(layout, str):
+                self._get_state(layout.id).layout = layout
+
+        state = self._get_state(window_layout.get_active_task())
+        if state:
+            self.activate_task(state.task)
+
+    def _get_state(self, id_or_task):
+        for state in self._states:
+            if state.task == id_or_task or state.task.id == id_or_task:
+                return state
+        return None
+
+    @on_trait_change("_active_state")
+    def _update_active_task(self, state):
+        self.active_task = state.task if state else None
+
+    @on_trait_change("_states[]")
+    def _update_tasks(self):
+        self.tasks = [state.task for state in self._states]
+
+
+class HeadlessTaskWindow(DeferredTasksMixin, HeadlessPyfaceTaskWindow):
+    """ An Envisage task window's deferred tasks (without any GUI). """
+
+    application = Instance(TasksApplication)
+
+
+def create_application(**traits):
+    return TasksApplication(
+        plugins=[TasksExtensionPointsPlugin(), CountingTasksPlugin()],
+        **traits
+    )
+
+
+def create_window_layout(active_task=""):
+    return TaskWindowLayout(
+        *["task_%d" % i for i in range(NUM_TASKS)], active_task=active_task
+    )
+
+
+class TestLazyTasksHeadless(unittest.TestCase):
+    """ Tests for deferred tasks that don't need a GUI toolkit. """
+
+    def setUp(self):
+        self.application = create_application(lazy_tasks=True)
+        self.window = HeadlessTaskWindow(application=self.application)
+        self.created_task_ids = self.application.get_plugin(
+            "test.counting_tasks"
+        ).created_task_ids
+
+    def test_only_active_task_is_created(self):
+        layout = create_window_layout("task_5")
+        self.application._add_tasks(self.window, layout)
+
+        self.assertEqual([task.id for task in self.window.tasks], ["task_5"])
+        self.assertEqual(
+            self.window.deferred_task_ids,
+            ["task_%d" % i for i in range(NUM_TASKS) if i != 5],
+        )
+
+    def test_first_task_is_active_by_default(self):
+        self.application._add_tasks(self.window, create_window_layout())
+
+        self.assertEqual([task.id for task in self.window.tasks], ["task_0"])
+
+    def test_missing_factory_is_not_deferred(self):
+        layout = TaskWindowLayout("task_0", "bogus")
+        with self.assertLogs("envisage.ui.tasks.tasks_application", "ERROR"):
+            self.application._add_tasks(self.window, layout)
+
+        self.assertEqual(self.window.deferred_task_ids, [])
+
+    def test_eager_tasks_by_default(self):
+        application = create_application()
+        window = HeadlessTaskWindow(application=application)
+
+        application._add_tasks(window, create_window_layout())
+
+        self.assertEqual(len(window.tasks), NUM_TASKS)
+        self.assertEqual(window.deferred_task_ids, [])
+
+    def test_tasks_are_created_when_activated(self):
+        self.application._add_tasks(self.window, create_window_layout())
+
+        # Only the active task is created with the window.
+        self.assertEqual(self.created_task_ids, ["task_0"])
+
+        # The others are created (once) when they are activated.
+        self.window.activate_task("task_7")
+        self.window.activate_task("task_3")
+        self.window.activate_task("task_7")
+
+        self.assertEqual(self.created_task_ids, ["task_0", "task_7", "task_3"])
+        self.assertEqual(self.window.active_task.id, "task_7")
+
+        # All the tasks are created eagerly without 'lazy_tasks'.
+        del self.created_task_ids[:]
+        self.application.lazy_tasks = False
+        self.application._add_tasks(
+            HeadlessTaskWindow(application=self.application),
+            create_window_layout(),
+        )
+
+        self.assertEqual(len(self.created_task_ids), NUM_TASKS)
+
+    def test_add_deferred_task_twice(self):
+        self.window.add_deferred_task("task_1")
+        self.window.add_task(self.application.create_task("task_2"))
+
+        with self.assertLogs("envisage.ui.tasks.task_window", "ERROR"):
+            self.window.add_deferred_task("task_1")
+        with self.assertLogs("envisage.ui.tasks.task_window", "ERROR"):
+            self.window.add_deferred_task("task_2")
+
+        self.assertEqual(self.window.deferred_task_ids, ["task_1"])
+
+    def test_get_task_creates_deferred_task(self):
+        self.application._add_tasks(
+            self.window, TaskWindowLayout("task_0", "task_1", "task_2")
+        )
+
+        task = self.window.get_task("task_2")
+
+        self.assertEqual(task.id, "task_2")
+        self.assertEqual(self.window.deferred_task_ids, ["task_1"])
+
+        # The tasks stay in the order that they were added.
+        self.window.get_task("task_1")
+        self.assertEqual(
+            [task.id for task in self.window.tasks],
+            ["task_0", "task_1", "task_2"],
+        )
+
+    def test_activate_deferred_task_by_id(self):
+        self.application._add_tasks(
+            self.window, TaskWindowLayout("task_0", "task_1", "task_2")
+        )
+
+        self.window.activate_task("task_2")
+
+        self.assertEqual(self.window.active_task.id, "task_2")
+        self.assertEqual(self.window.deferred_task_ids, ["task_1"])
+
+    def test_activate_unknown_task_by_id(self):
+        self.application._add_tasks(self.window, TaskWindowLayout("task_0"))
+
+        with self.assertLogs("envisage.ui.tasks.task_window", "WARNING"):
+            self.window.activate_task("bogus")
+
+        self.assertEqual(self.created_task_ids, ["task_0"])
+
+    def test_remove_deferred_task(self):
+        self.application._add_tasks(
+            self.window, TaskWindowLayout("task_0", "task_1", "task_2")
+        )
+
+        self.window.remove_task("task_1")
+
+        self.assertEqual(self.window.deferred_task_ids, ["task_2"])
+        self.assertEqual(
+            self.window.get_window_layout().get_tasks(), ["task_0", "task_2"]
+        )
+
+        # Removing a task that has been created also works.
+        self.window.remove_task(self.window.get_task("task_2"))
+
+        self.assertEqual(
+            self.window.get_window_layout().get_tasks(), ["task_0"]
+        )
+        self.assertEqual(self.created_task_ids, ["task_0", "task_2"])
+
+    def test_window_layout_includes_deferred_tasks(self):
+        window_layout = TaskWindowLayout(
+            "task_0",
+            TaskLayout(id="task_1"),
+            "task_2",
+            active_task="task_0",
+        )
+        self.application._add_tasks(self.window, window_layout)
+        self.window.set_window_layout(window_layout)
+
+        layout = self.window.get_window_layout()
+
+        self.assertEqual(layout.get_tasks(), ["task_0", "task_1", "task_2"])
+        self.assertEqual(layout.get_active_task(), "task_0")
+        self.assertEqual(self.created_task_ids, ["task_0"])
+
+        # The deferred task's layout is applied when it is created.
+        self.window.activate_task("task_1")
+
+        self.assertEqual(self.window._get_state("task_1").layout.id, "task_1")
+
+
+@requires_gui
+class TestLazyTasks(unittest.TestCase):
+    """ Tests for deferred tasks in real task windows. """
+
+    def setUp(self):
+        self.application = create_application(lazy_tasks=True)
+        self.window = self.application.create_window(
+            TaskWindowLayout(
+                "task_0",
+                TaskLayout(id="task_1"),
+                "task_2",
+                active_task="task_0",
+            ),
+            restore=False,
+        )
+        self.addCleanup(self.window.destroy)
+
+    def test_create_window(self):
+        self.assertEqual([task.id for task in self.window.tasks], ["task_0"])
+        self.assertEqual(self.window.deferred_task_ids, ["task_1", "task_2"])
+
+    def test_get_task_creates_deferred_task(self):
+        task = self.window.get_task("task_2")
+
+        self.assertEqual(task.id, "task_2")
+        self.assertEqual(
+            [task.id for task in self.window.tasks], ["task_0", "task_2"]
+        )
+        self.assertEqual(self.window.deferred_task_ids, ["task_1"])
+
+    def test_activate_deferred_task(self):
+        self.window.activate_task(self.window.get_task("task_1"))
+
+        self.assertEqual(self.window.active_task.id, "task_1")
+
+        # The tasks stay in the order that they were added.
+        self.assertEqual(
+            [task.id for task in self.window.tasks], ["task_0", "task_1"]
+        )
+
+    def test_window_layout_includes_deferred_tasks(self):
+        layout = self.window.get_window_layout()
+
+        self.assertEqual(layout.get_tasks(), ["task_0", "task_1", "task_2"])
+        self.assertEqual(layout.get_active_task(), "task_0")
+
+    def test_remove_deferred_task(self):
+        self.window.remove_task("task_1")
+
+        self.assertEqual(self.window.deferred_task_ids, ["task_2"])
+        self.assertEqual(
+            self.window.get_window_layout().get_tasks(), ["task_0", "task_2"]
+        )
+
+    def test_activate_deferred_task_by_id(self):
+        self.window.activate_task("task_2")
+
+        self.assertEqual(self.window.active_task.id, "task_2")
+        self.assertEqual(self.window.deferred_task_ids, ["task_1"])
+
+    def test_task_toggle_group_includes_deferred_tasks(self):
+        group = TaskToggleGroup(window=self.window, manager=mock.Mock())
+
+        actions = [item.action for item in group.items]
+        self.assertEqual(
+            [action.name for action in actions], ["Task 0", "Task 1", "Task 2"]
+        )
+        self.assertIsInstance(actions[1], DeferredTaskToggleAction)
+
+        # Switching to a deferred task creates it.
+        actions[1].perform()
+
+        self.assertEqual(self.window.active_task.id, "task_1")
+        self.assertEqual(self.window.deferred_task_ids, ["task_2"])
+
+        # The menu now has the created task.
+        actions = [item.action for item in group.items]
+        self.assertIs(actions[1].task, self.window.active_task)
+        self.assertTrue(actions[1].checked)
@@ -15,6 +15,7 @@ import unittest
 
 import pkg_resources
 
+from envisage.pickle_policy import MAGIC, PicklePolicy
 from envisage.ui.tasks.api import TasksApplication
 from envisage.ui.tasks.tasks_application import DEFAULT_STATE_FILENAME
 
@@ -72,6 +73,26 @@ class TestTasksApplication(unittest.TestCase):
             protocol_bytes = f.read(2)
         self.assertEqual(protocol_bytes, b"\x80\x03")
 
+    def test_layout_save_with_pickle_policy(self):
+        # Test that a pickle policy (with a header) can be used instead.
+        state_location = self.tmpdir
+
+        # Create application, and set it up to exit as soon as it's launched.
+        app = TasksApplication(
+            state_location=state_location,
+            layout_pickle_policy=PicklePolicy(),
+        )
+        app.on_trait_change(app.exit, "application_initialized")
+
+        memento_file = os.path.join(state_location, app.state_filename)
+        app.run()
+
+        # Check that the generated file starts with the header.
+        with open(memento_file, "rb") as f:
+            header = f.read(len(MAGIC) + 2)
+        self.assertEqual(header[:len(MAGIC)], MAGIC)
+        self.assertEqual(header[-1], pickle.HIGHEST_PROTOCOL)
+
     def test_layout_load(self):
         # Check we can load a previously-created state. That previous state
         # has an main window size of (492, 743) (to allow us to check that
@@ -0,0 +1,154 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import pickle
+import unittest
+
+from pyface.tasks.api import Task
+from pyface.tasks.task_layout import TaskLayout
+from pyface.tasks.task_window_layout import TaskWindowLayout
+from traits.api import List
+
+from envisage.api import ExtensionPoint, Plugin
+from envisage.ui.tasks.api import TaskExtension, TaskFactory, TasksApplication
+from envisage.ui.tasks.tasks_application import TasksApplicationState
+
+
+class TasksExtensionPointsPlugin(Plugin):
+    """ Offers the task extension points (without any of the GUI). """
+
+    id = "test.tasks"
+
+    task_factories = ExtensionPoint(id=TasksApplication.TASK_FACTORIES)
+
+    task_extensions = ExtensionPoint(id=TasksApplication.TASK_EXTENSIONS)
+
+
+class TasksContributionsPlugin(Plugin):
+    """ Contributes task factories and extensions. """
+
+    contributed_task_factories = List(
+        contributes_to=TasksApplication.TASK_FACTORIES
+    )
+
+    contributed_task_extensions = List(
+        contributes_to=TasksApplication.TASK_EXTENSIONS
+    )
+
+
+class TestTasksApplicationIndexes(unittest.TestCase):
+    def setUp(self):
+        self.first = TaskFactory(id="first", factory=Task)
+        self.global_extension = TaskExtension()
+        self.first_extension = TaskExtension(task_id="first")
+        self.other_extension = TaskExtension(task_id="other")
+
+        self.application = TasksApplication(
+            plugins=[
+                TasksExtensionPointsPlugin(),
+                TasksContributionsPlugin(
+                    id="test.contributions",
+                    contributed_task_factories=[
+                        self.first,
+                        TaskFactory(id="first", factory=Task),
+                    ],
+                    contributed_task_extensions=[
+                        self.first_extension,
+                        self.other_extension,
+                        self.global_extension,
+                    ],
+                ),
+            ]
+        )
+
+    def test_get_task_factory(self):
+        # The first factory with an ID wins.
+        self.assertIs(self.application._get_task_factory("first"), self.first)
+        self.assertIsNone(self.application._get_task_factory("bogus"))
+
+    def test_task_factories_changed(self):
+        self.assertIsNone(self.application._get_task_factory("second"))
+
+        second = TaskFactory(id="second", factory=Task)
+        self.application.add_plugin(
+            TasksContributionsPlugin(
+                id="test.more_contributions",
+                contributed_task_factories=[second],
+            )
+        )
+
+        self.assertIs(self.application._get_task_factory("second"), second)
+
+    def test_create_task(self):
+        task = self.application.create_task("first")
+
+        self.assertEqual(task.id, "first")
+        self.assertEqual(
+            self.application._get_task_extensions("first"),
+            [self.first_extension, self.global_extension],
+        )
+        self.assertIsNone(self.application.create_task("bogus"))
+
+    def test_task_extensions_changed(self):
+        self.application.create_task("first")
+
+        extension = TaskExtension(task_id="first")
+        self.application.add_plugin(
+            TasksContributionsPlugin(
+                id="test.more_contributions",
+                contributed_task_extensions=[extension],
+            )
+        )
+
+        self.assertEqual(
+            self.application._get_task_extensions("first"),
+            [self.first_extension, self.global_extension, extension],
+        )
+
+
+class TestTasksApplicationStateIndexes(unittest.TestCase):
+    def setUp(self):
+        self.state = TasksApplicationState()
+        self.ab = TaskWindowLayout(TaskLayout(id="a"), TaskLayout(id="b"))
+        self.c = TaskWindowLayout(TaskLayout(id="c"), "a")
+        self.state.window_layouts = [self.ab, self.c]
+
+    def test_get_equivalent_window_layout(self):
+        self.assertIs(
+            self.state.get_equivalent_window_layout(
+                TaskWindowLayout("b", "a")
+            ),
+            self.ab,
+        )
+        self.assertIsNone(
+            self.state.get_equivalent_window_layout(TaskWindowLayout("a"))
+        )
+
+    def test_get_task_layout(self):
+        self.assertIs(self.state.get_task_layout("a"), self.ab.items[0])
+        self.assertIs(self.state.get_task_layout("c"), self.c.items[0])
+        self.assertIsNone(self.state.get_task_layout("bogus"))
+
+    def test_push_window_layout(self):
+        self.state.get_task_layout("a")
+
+        ba = TaskWindowLayout(TaskLayout(id="b"), TaskLayout(id="a"))
+        self.state.push_window_layout(ba)
+
+        self.assertIs(self.state.get_equivalent_window_layout(self.ab), ba)
+        self.assertIs(self.state.get_task_layout("a"), ba.items[1])
+        self.assertEqual(self.state.window_layouts, [ba, self.c])
+
+    def test_indexes_are_not_pickled(self):
+        self.state.get_task_layout("a")
+
+        state = pickle.loads(pickle.dumps(self.state))
+
+        self.assertIsNone(state._task_layouts_by_id)
+        self.assertEqual(state.get_task_layout("c").id, "c")
@@ -0,0 +1,185 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pkg_resources
+from pyface.tasks.task_window_layout import TaskWindowLayout
+
+from envisage.pickle_policy import MAGIC, PicklePolicy
+
+from envisage.ui.tasks.tasks_application import TasksApplicationState
+from envisage.ui.tasks.tasks_application_state_store import (
+    TasksApplicationStateStore,
+)
+
+
+class TestTasksApplicationStateStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        self.filename = os.path.join(self.tmpdir, "application_memento")
+
+    def test_save_and_load(self):
+        store = TasksApplicationStateStore(filename=self.filename)
+
+        state = TasksApplicationState()
+        state.previous_window_layouts = [TaskWindowLayout("a", size=(1, 2))]
+        self.assertTrue(store.save(state))
+
+        restored_state = store.load()
+        self.assertEqual(
+            restored_state.previous_window_layouts[0].size, (1, 2)
+        )
+
+        # Only the state file itself is left behind.
+        self.assertEqual(os.listdir(self.tmpdir), ["application_memento"])
+
+    def test_save_uses_protocol(self):
+        store = TasksApplicationStateStore(filename=self.filename, protocol=3)
+        store.save(TasksApplicationState())
+
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(2), b"\x80\x03")
+
+    def test_protocol_can_be_changed(self):
+        store = TasksApplicationStateStore(filename=self.filename)
+        store.save(TasksApplicationState())
+        store.protocol = 3
+        store.save(TasksApplicationState())
+
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(2), b"\x80\x03")
+
+    def test_save_uses_policy(self):
+        store = TasksApplicationStateStore(
+            filename=self.filename, policy=PicklePolicy(protocol=4)
+        )
+        state = TasksApplicationState()
+        state.previous_window_layouts = [TaskWindowLayout("a", size=(1, 2))]
+        store.save(state)
+
+        # The file starts with a header that records the protocol.
+        with open(self.filename, "rb") as f:
+            header = f.read(len(MAGIC) + 2)
+        self.assertEqual(header[:len(MAGIC)], MAGIC)
+        self.assertEqual(header[-1], 4)
+
+        # The state can be loaded whatever the policy.
+        restored_state = TasksApplicationStateStore(
+            filename=self.filename
+        ).load()
+        self.assertEqual(
+            restored_state.previous_window_layouts[0].size, (1, 2)
+        )
+
+    def test_failed_save_keeps_previous_state(self):
+        store = TasksApplicationStateStore(filename=self.filename)
+
+        state = TasksApplicationState()
+        state.previous_window_layouts = [TaskWindowLayout("a", size=(1, 2))]
+        store.save(state)
+
+        # Instances of local classes can't be pickled.
+        class LocalTaskWindowLayout(TaskWindowLayout):
+            pass
+
+        state.window_layouts = [LocalTaskWindowLayout("b")]
+
+        with self.assertLogs(
+            "envisage.ui.tasks.tasks_application_state_store", "ERROR"
+        ):
+            self.assertFalse(store.save(state))
+
+        restored_state = store.load()
+        self.assertEqual(
+            restored_state.previous_window_layouts[0].size, (1, 2)
+        )
+        self.assertEqual(os.listdir(self.tmpdir), ["application_memento"])
+
+    def test_load_missing_file(self):
+        store = TasksApplicationStateStore(filename=self.filename)
+
+        state = store.load()
+        self.assertEqual(state.previous_window_layouts, [])
+
+    def test_load_corrupt_file(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"not a pickle")
+
+        store = TasksApplicationStateStore(filename=self.filename)
+        with self.assertLogs(
+            "envisage.ui.tasks.tasks_application_state_store", "ERROR"
+        ):
+            state = store.load()
+
+        self.assertEqual(state.previous_window_layouts, [])
+
+    def test_load_in_background(self):
+        stored_state_location = pkg_resources.resource_filename(
+            "envisage.ui.tasks.tests", "data"
+        )
+        shutil.copyfile(
+            os.path.join(stored_state_location, "application_memento_v2.pkl"),
+            self.filename,
+        )
+
+        store = TasksApplicationStateStore(filename=self.filename)
+        store.load_in_background()
+
+        state = store.get_state()
+        self.assertEqual(state.previous_window_layouts[0].size, (492, 743))
+
+    def test_get_state_without_background_load(self):
+        store = TasksApplicationStateStore(filename=self.filename)
+
+        state = store.get_state()
+        self.assertIsInstance(state, TasksApplicationState)
+
+    def test_window_layouts_are_capped(self):
+        store = TasksApplicationStateStore(
+            filename=self.filename, max_window_layouts=3
+        )
+
+        state = TasksApplicationState()
+        for task_id in "abcde":
+            state.push_window_layout(TaskWindowLayout(task_id))
+
+        # Using 'b' again makes it the most recently used.
+        state.push_window_layout(TaskWindowLayout("b"))
+
+        store.save(state)
+        restored_state = store.load()
+
+        self.assertEqual(
+            [layout.get_tasks() for layout in restored_state.window_layouts],
+            [["b"], ["e"], ["d"]],
+        )
+
+    def test_capping_an_existing_file(self):
+        state = TasksApplicationState()
+        for task_id in "abcde":
+            state.push_window_layout(TaskWindowLayout(task_id))
+        TasksApplicationStateStore(
+            filename=self.filename, max_window_layouts=0
+        ).save(state)
+
+        store = TasksApplicationStateStore(
+            filename=self.filename, max_window_layouts=2
+        )
+        restored_state = store.load()
+
+        self.assertEqual(
+            [layout.get_tasks() for layout in restored_state.window_layouts],
+            [["e"], ["d"]],
+        )
@@ -0,0 +1,93 @@
+# (C) Copyright 2007-2019 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only
+# under the conditions described in the aforementioned license.  The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+# Thanks for using Enthought open source!
+""" Tests for the workbench. """
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from envisage.api import Application, ExtensionPoint, Plugin
+from envisage.ui.action.api import ActionSet, Menu
+from envisage.ui.action.tests.dummy_tree_action_manager_builder import (
+    DummyTreeActionManagerBuilder,
+)
+from envisage.ui.workbench.api import Workbench, WorkbenchWindow
+from traits.api import Int, List
+
+
+class CountingActionManagerBuilder(DummyTreeActionManagerBuilder):
+    """ A builder that counts the action managers it builds from scratch. """
+
+    # The number of action managers built from scratch (i.e. not created
+    # from a compiled tree).
+    builds = Int
+
+    def initialize_action_manager(self, action_manager, root):
+        """ Initialize an action manager from the builder's action sets. """
+
+        self.builds += 1
+
+        super(CountingActionManagerBuilder, self).initialize_action_manager(
+            action_manager, root
+        )
+
+        return
+
+
+class ActionSetsPlugin(Plugin):
+    """ Offers the action sets extension point. """
+
+    id = "test.action_sets"
+
+    action_sets = ExtensionPoint(id=WorkbenchWindow.ACTION_SETS)
+
+
+class ActionSetContributionsPlugin(Plugin):
+    """ Contributes action sets. """
+
+    id = "test.action_set_contributions"
+
+    my_action_sets = List(
+        [ActionSet], contributes_to=WorkbenchWindow.ACTION_SETS
+    )
+
+
+class WorkbenchTestCase(unittest.TestCase):
+    """ Tests for the workbench. """
+
+    def test_action_manager_tree_cache_is_cleared(self):
+        """ action manager tree cache is cleared """
+
+        application = Application(plugins=[ActionSetsPlugin()])
+        workbench = Workbench(application=application)
+
+        # Windows get the contributed action sets before they build their
+        # menu bars and tool bars.
+        application.get_extensions(WorkbenchWindow.ACTION_SETS)
+
+        tree_cache = workbench.action_manager_tree_cache
+
+        def build_menu_bar():
+            builder = CountingActionManagerBuilder(
+                action_sets=[ActionSet(menus=[Menu(name="&File")])],
+                tree_cache=tree_cache,
+            )
+            builder.create_menu_bar_manager("MenuBar")
+
+            return builder.builds
+
+        # Only the first menu bar is built from scratch.
+        self.assertEqual(1, build_menu_bar())
+        self.assertEqual(0, build_menu_bar())
+
+        application.add_plugin(ActionSetContributionsPlugin())
+
+        # The compiled tree was discarded, so the menu bar is built again.
+        self.assertEqual(1, build_menu_bar())
+        self.assertEqual(0, build_menu_bar())
@@ -13,6 +13,7 @@
 import pyface.workbench.api as pyface
 
 from envisage.api import IApplication
+from envisage.ui.action.api import ActionManagerTreeCache
 from pyface.api import YES
 from traits.api import Delegate, Instance
 
@@ -39,6 +40,11 @@ class Workbench(pyface.Workbench):
     # The application that the workbench is part of.
     application = Instance(IApplication)
 
+    # The compiled menu bars and tool bars shared by the workbench windows
+    # (so that they are only built from scratch for the first window). The
+    # cache is cleared whenever the contributed action sets change.
+    action_manager_tree_cache = Instance(ActionManagerTreeCache, ())
+
     # Should the user be prompted before exiting the workbench?
     prompt_on_exit = Delegate("_preferences")
 
@@ -51,6 +57,23 @@ class Workbench(pyface.Workbench):
     # Private interface.
     ###########################################################################
 
+    def _application_changed(self, old, new):
+        """ Static trait change handler. """
+
+        if old is not None:
+            old.remove_extension_point_listener(
+                self._on_action_sets_changed, WorkbenchWindow.ACTION_SETS
+            )
+
+        if new is not None:
+            new.add_extension_point_listener(
+                self._on_action_sets_changed, WorkbenchWindow.ACTION_SETS
+            )
+
+        self.action_manager_tree_cache.clear()
+
+        return
+
     def _exiting_changed(self, event):
         """ Called when the workbench is exiting. """
 
@@ -62,3 +85,10 @@ class Workbench(pyface.Workbench):
                 event.veto = True
 
         return
+
+    def _on_action_sets_changed(self, extension_registry, event):
+        """ Called when the contributed action sets change. """
+
+        self.action_manager_tree_cache.clear()
+
+        return
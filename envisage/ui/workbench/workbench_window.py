@@ -228,7 +228,9 @@ class WorkbenchWindow(pyface.WorkbenchWindow):
         """ Trait initializer. """
 
         action_manager_builder = WorkbenchActionManagerBuilder(
-            window=self, action_sets=self.action_sets
+            window=self,
+            action_sets=self.action_sets,
+            tree_cache=self.workbench.action_manager_tree_cache,
         )
 
         return action_manager_builder
@@ -1,5 +1,6 @@
 # Enthought library imports.
-from pyface.tasks.action.api import SGroup, SMenu, SMenuBar, TaskToggleGroup
+from envisage.ui.tasks.action.api import TaskToggleGroup
+from pyface.tasks.action.api import SGroup, SMenu, SMenuBar
 from pyface.tasks.api import Task, TaskLayout, Tabbed, PaneItem
 from traits.api import Any, List
 